@@ -0,0 +1,96 @@
+"""
+Reporte de tiempos de importación desde el login hasta la primera venta.
+
+Cada etapa corre en un proceso nuevo con `python -X importtime`, así que mide
+lo que paga un usuario al abrir la aplicación en frío. Para cada etapa se
+muestra el tiempo total y los paquetes que más tiempo propio consumen.
+
+La última etapa repite la primera boleta después de la precarga en segundo
+plano (utils/carga_diferida.py), que es lo que ocurre cuando el cajero tarda
+más que la precarga en cobrar su primera venta.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_arranque.py [--top 8]
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+from comun import imprimir_tabla, project_root
+
+LOGIN = "import ui.login, ui.main"
+BOLETA = "from utils.plantillas_pdf import obtener_plantilla_boleta; obtener_plantilla_boleta()"
+
+# (etapa, código previo que no se mide, código medido)
+ETAPAS = [
+    ("Login y ventana principal", "", LOGIN),
+    ("Abrir punto de venta", LOGIN, "import ui.punto_venta"),
+    ("Primera boleta (en frío)", f"{LOGIN}; import ui.punto_venta", BOLETA),
+    ("Primera boleta (tras precarga)",
+     f"{LOGIN}; import ui.punto_venta; from utils.carga_diferida import precargar; precargar(['ventas']).join()",
+     BOLETA),
+    ("Abrir dashboard", LOGIN, "import ui.dashboard"),
+]
+
+PLANTILLA = """
+{previo}
+import sys, time
+print("--inicio--", file=sys.stderr)
+inicio = time.perf_counter()
+{medido}
+print(f"{{(time.perf_counter() - inicio) * 1000:.1f}}")
+"""
+
+
+def medir_etapa(previo, medido):
+    """
+    Ejecuta la etapa en un proceso nuevo.
+
+    Returns:
+        tuple: (ms de pared, {paquete raíz: µs propios}) o (None, error)
+    """
+    codigo = PLANTILLA.format(previo=previo or "pass", medido=medido)
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        return None, proceso.stderr.strip().splitlines()[-1]
+
+    # Solo cuentan las importaciones posteriores a la marca de inicio
+    lineas = proceso.stderr.split("--inicio--", 1)[-1].splitlines()
+    por_paquete = defaultdict(int)
+    for linea in lineas:
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, _, nombre = linea[len("import time:"):].split("|")
+        por_paquete[nombre.strip().split(".")[0]] += int(propio)
+    return float(proceso.stdout.strip().splitlines()[-1]), por_paquete
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=8, help="Paquetes a mostrar por etapa")
+    args = parser.parse_args()
+
+    resumen = []
+    for etapa, previo, medido in ETAPAS:
+        ms, detalle = medir_etapa(previo, medido)
+        if ms is None:
+            resumen.append((etapa, "-", f"no disponible: {detalle}"))
+            continue
+        importacion = sum(detalle.values()) / 1000
+        resumen.append((etapa, f"{ms:.1f}", f"{importacion:.1f}"))
+
+        mayores = sorted(detalle.items(), key=lambda x: -x[1])[:args.top]
+        if mayores:
+            imprimir_tabla(f"{etapa}: paquetes más costosos", ["Paquete", "ms propios"],
+                           [(nombre, f"{us / 1000:.1f}") for nombre, us in mayores])
+
+    imprimir_tabla("Etapas desde el login hasta la primera venta",
+                   ["Etapa", "ms totales", "ms importando"], resumen)
+
+
+if __name__ == "__main__":
+    main()
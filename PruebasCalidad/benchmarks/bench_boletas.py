@@ -0,0 +1,56 @@
+"""
+Benchmark: milisegundos por boleta con y sin plantilla en caché.
+
+'Sin caché' construye una PlantillaBoleta nueva por documento, que equivale
+al flujo anterior de _generar_boleta_premium (getSampleStyleSheet, cada
+ParagraphStyle y cada TableStyle rehechos en cada venta). 'Con caché' usa la
+plantilla compartida del proceso. Los PDF se escriben en memoria para no
+medir el disco.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_boletas.py [--boletas 200] [--renglones 5]
+"""
+import argparse
+import io
+
+from comun import imprimir_tabla, medir
+from utils.plantillas_pdf import PlantillaBoleta, obtener_plantilla_boleta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--boletas", type=int, default=200)
+    parser.add_argument("--renglones", type=int, default=5)
+    args = parser.parse_args()
+
+    carrito = [
+        {"nombre": f"Producto de prueba {i}", "precio": 10.0 + i, "cantidad": 1 + i % 3}
+        for i in range(args.renglones)
+    ]
+    total = sum(i["precio"] * i["cantidad"] for i in carrito) * 1.16
+    datos = (1, "Cliente de Prueba", "XAXX010101000", carrito, total)
+
+    def sin_cache():
+        PlantillaBoleta().generar(io.BytesIO(), *datos)
+
+    def con_cache():
+        obtener_plantilla_boleta().generar(io.BytesIO(), *datos)
+
+    # Calentamiento (carga de fuentes e imports internos de ReportLab)
+    sin_cache()
+    con_cache()
+
+    antes = medir(sin_cache, args.boletas)
+    despues = medir(con_cache, args.boletas)
+    imprimir_tabla(
+        f"{args.boletas} boletas de {args.renglones} renglones",
+        ["Modo", "ms/boleta"],
+        [
+            ("Sin caché (antes)", f"{antes / args.boletas * 1000:.2f}"),
+            ("Plantilla en caché", f"{despues / args.boletas * 1000:.2f}"),
+        ]
+    )
+
+
+if __name__ == "__main__":
+    main()
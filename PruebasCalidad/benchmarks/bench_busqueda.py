@@ -0,0 +1,77 @@
+"""
+Benchmark: latencia de búsqueda de clientes según el tamaño de la tabla.
+
+Compara la búsqueda anterior de PantallaClientes (LIKE '%x%' sobre cada campo
+unido con OR, que recorre la tabla completa) con el índice Clientes_fts.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_busqueda.py [--consultas 50]
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from comun import crear_db_prueba, imprimir_tabla, medir
+from db import db
+from db.migraciones import aplicar_migraciones
+from db.texto_completo import subconsulta_fts
+
+NOMBRES = ["Ana", "Luis", "María", "José", "Carmen", "Jorge", "Lucía", "Pedro", "Sofía", "Diego"]
+APELLIDOS = ["García", "López", "Martínez", "Hernández", "Pérez", "Ramírez", "Torres", "Flores", "Rivera"]
+CAMPOS = ["c.nombres", "c.apellido_p", "c.apellido_m", "c.rfc"]
+CONSULTAS = ["mar", "hernan", "pedro flo", "xq9"]
+
+
+def sembrar_clientes(total, semilla=7):
+    rnd = random.Random(semilla)
+    db.ejecutar_transaccion([
+        ("INSERT INTO Clientes (nombres, apellido_p, apellido_m, rfc, tipo_persona, estado) VALUES (?,?,?,?,'Física',1)",
+         (rnd.choice(NOMBRES), rnd.choice(APELLIDOS), rnd.choice(APELLIDOS),
+          "".join(rnd.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _ in range(13))))
+        for _ in range(total)
+    ])
+
+
+def buscar_like(texto):
+    where = " OR ".join(f"{c} LIKE ?" for c in CAMPOS)
+    return db.obtener_datos(f"SELECT c.id_cliente FROM Clientes c WHERE {where} LIMIT 200",
+                            [f"%{texto}%"] * len(CAMPOS))
+
+
+def buscar_fts(texto):
+    sql, params = subconsulta_fts("Clientes", texto)
+    return db.obtener_datos(
+        f"SELECT c.id_cliente FROM Clientes c JOIN ({sql}) f ON f.rowid = c.id_cliente ORDER BY f.rank LIMIT 200",
+        params
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--consultas", type=int, default=50, help="Repeticiones por texto")
+    args = parser.parse_args()
+
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configurar_db(crear_db_prueba(os.path.join(tmp, "bench.db")))
+        aplicar_migraciones()
+        sembrados = 0
+        for total in (10_000, 100_000, 300_000):
+            sembrar_clientes(total - sembrados)
+            sembrados = total
+            for texto in CONSULTAS:
+                antes = medir(lambda: buscar_like(texto), args.consultas)
+                despues = medir(lambda: buscar_fts(texto), args.consultas)
+                filas.append((
+                    f"{total:,}", texto,
+                    f"{antes / args.consultas * 1000:.2f}",
+                    f"{despues / args.consultas * 1000:.2f}",
+                ))
+        db.cerrar_conexiones()
+
+    imprimir_tabla("ms por búsqueda de clientes", ["Clientes", "Texto", "LIKE %x%", "FTS5"], filas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: varias cajas vendiendo el mismo producto a la vez.
+
+Cada caja es un proceso que intenta vender de a una unidad de un producto
+con stock limitado. Se compara el flujo anterior (leer el stock, validar y
+luego descontar sin condición) con registrar_venta, que descuenta con un
+UPDATE condicional (db/stock.py).
+
+Con el flujo anterior dos cajas pueden validar contra el mismo stock y
+vender las mismas unidades: el stock final queda negativo (sobreventa).
+Con el descuento condicional las ventas que no alcanzan se rechazan.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_concurrencia_stock.py [--cajas 4] [--stock 200] [--intentos 100]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from comun import crear_db_prueba, imprimir_tabla
+from db import db
+from db.consultas import normalizar_fecha
+from db.migraciones import aplicar_migraciones
+from db.stock import StockInsuficiente
+from db.ventas import registrar_venta
+
+ID_PRODUCTO = 2
+TOTALES = {"subtotal": 10.0, "iva": 0.0, "total": 10.0}
+CARRITO = [{"id_producto": ID_PRODUCTO, "cantidad": 1, "precio": 10.0}]
+
+
+def venta_anterior(gestor):
+    """Validación y descuento en pasos separados, como antes"""
+    conn = gestor.conexion()
+    stock = conn.execute("SELECT stock_actual FROM Productos WHERE id_producto = ?", (ID_PRODUCTO,)).fetchone()[0]
+    if stock < 1:
+        raise StockInsuficiente([])
+    time.sleep(0)  # cede el turno: la ventana entre validar y guardar
+    with gestor.transaccion() as conn:
+        id_tx = conn.execute(
+            "INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) "
+            "VALUES ('venta', ?, 1, 1, 10, 0, 10, 'completada')", (normalizar_fecha(),)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado) "
+            "VALUES (?, ?, 1, 10, 0, 0)", (id_tx, ID_PRODUCTO)
+        )
+        conn.execute("UPDATE Productos SET stock_actual = stock_actual - 1 WHERE id_producto = ?", (ID_PRODUCTO,))
+
+
+def caja(ruta, flujo, intentos, salida, inicio):
+    """Proceso de una caja: devuelve (aceptadas, rechazadas) por la cola"""
+    db.configurar_db(ruta)
+    gestor = db.obtener_gestor()
+    aceptadas = rechazadas = 0
+    inicio.wait()
+    for _ in range(intentos):
+        try:
+            if flujo == "anterior":
+                venta_anterior(gestor)
+            else:
+                registrar_venta(1, 1, CARRITO, TOTALES)
+            aceptadas += 1
+        except StockInsuficiente:
+            rechazadas += 1
+    db.cerrar_conexiones()
+    salida.put((aceptadas, rechazadas))
+
+
+def correr(flujo, cajas, stock, intentos):
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"))
+        conn = sqlite3.connect(ruta)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("UPDATE Productos SET stock_actual = ? WHERE id_producto = ?", (stock, ID_PRODUCTO))
+        conn.commit()
+        conn.close()
+        db.configurar_db(ruta)
+        aplicar_migraciones()
+        db.cerrar_conexiones()  # cada caja abre las suyas
+
+        salida = multiprocessing.Queue()
+        inicio = multiprocessing.Event()
+        procesos = [
+            multiprocessing.Process(target=caja, args=(ruta, flujo, intentos, salida, inicio))
+            for _ in range(cajas)
+        ]
+        for p in procesos:
+            p.start()
+        t0 = time.perf_counter()
+        inicio.set()
+        resultados = [salida.get() for _ in procesos]
+        segundos = time.perf_counter() - t0
+        for p in procesos:
+            p.join()
+
+        conn = sqlite3.connect(ruta)
+        final = conn.execute("SELECT stock_actual FROM Productos WHERE id_producto = ?", (ID_PRODUCTO,)).fetchone()[0]
+        conn.close()
+
+    aceptadas = sum(a for a, _ in resultados)
+    rechazadas = sum(r for _, r in resultados)
+    return aceptadas, rechazadas, final, (aceptadas + rechazadas) / segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cajas", type=int, default=4, help="Procesos vendiendo a la vez")
+    parser.add_argument("--stock", type=int, default=200, help="Stock inicial del producto")
+    parser.add_argument("--intentos", type=int, default=100, help="Ventas que intenta cada caja")
+    args = parser.parse_args()
+
+    filas = []
+    for flujo, nombre in (("anterior", "Leer y descontar"), ("condicional", "registrar_venta")):
+        aceptadas, rechazadas, final, por_segundo = correr(flujo, args.cajas, args.stock, args.intentos)
+        filas.append((
+            nombre, aceptadas, rechazadas, final,
+            max(0, aceptadas - args.stock), f"{por_segundo:,.0f}",
+        ))
+
+    imprimir_tabla(
+        f"{args.cajas} cajas x {args.intentos} intentos sobre {args.stock} unidades",
+        ["Flujo", "Aceptadas", "Rechazadas", "Stock final", "Sobreventa", "Intentos/s"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: costo de las consultas del dashboard según el largo del periodo.
+
+Compara las consultas originales de PantallaDashboard.cargar_datos (sumas
+sobre Transacciones y Detalle_transaccion) con las de db/resumenes.py, que
+leen los resúmenes diarios.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_dashboard.py [--transacciones 200000] [--repeticiones 5]
+"""
+import argparse
+import os
+import tempfile
+from datetime import date, timedelta
+
+from comun import crear_db_prueba, imprimir_tabla, medir
+from db import db
+from db.consultas import rango_fechas
+from db.migraciones import aplicar_migraciones
+from db.resumenes import top_clientes, top_productos, totales_periodo, ventas_por_dia
+
+
+def dashboard_crudo(desde, hasta):
+    filtro, params = rango_fechas("fecha", desde, hasta)
+    filtro_t, _ = rango_fechas("t.fecha", desde, hasta)
+    db.obtener_datos(f"SELECT SUM(total), COUNT(*) FROM Transacciones WHERE tipo='venta' AND {filtro}", params)
+    db.obtener_datos(f"""
+        SELECT p.nombre, SUM(d.cantidad) as total_qty
+        FROM Detalle_transaccion d
+        JOIN Productos p ON d.id_producto = p.id_producto
+        JOIN Transacciones t ON d.id_transaccion = t.id_transaccion
+        WHERE t.tipo='venta' AND {filtro_t}
+        GROUP BY p.id_producto ORDER BY total_qty DESC LIMIT 5
+    """, params)
+    db.obtener_datos(f"""
+        SELECT c.nombres || ' ' || IFNULL(c.apellido_p, ''), SUM(t.total)
+        FROM Transacciones t
+        JOIN Clientes c ON t.id_cliente = c.id_cliente
+        WHERE t.tipo='venta' AND {filtro_t}
+        GROUP BY c.id_cliente ORDER BY SUM(t.total) DESC LIMIT 5
+    """, params)
+    db.obtener_datos(f"""
+        SELECT date(fecha), SUM(total) FROM Transacciones
+        WHERE tipo='venta' AND {filtro}
+        GROUP BY date(fecha) ORDER BY date(fecha)
+    """, params)
+
+
+def dashboard_resumido(desde, hasta):
+    totales_periodo(desde, hasta)
+    top_productos(desde, hasta)
+    top_clientes(desde, hasta)
+    ventas_por_dia(desde, hasta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacciones", type=int, default=200_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    hoy = date.today()
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"), transacciones=args.transacciones)
+        db.configurar_db(ruta)
+        aplicar_migraciones()  # la migración de resúmenes procesa el historial sembrado
+
+        for nombre, dias in (("1 semana", 7), ("1 mes", 30), ("1 año", 365)):
+            desde = hoy - timedelta(days=dias - 1)
+            antes = medir(lambda: dashboard_crudo(desde, hoy), args.repeticiones)
+            despues = medir(lambda: dashboard_resumido(desde, hoy), args.repeticiones)
+            filas.append((
+                nombre,
+                f"{antes / args.repeticiones * 1000:.1f}",
+                f"{despues / args.repeticiones * 1000:.1f}",
+            ))
+        db.cerrar_conexiones()
+
+    imprimir_tabla(f"ms por carga del dashboard ({args.transacciones:,} ventas)",
+                   ["Periodo", "Transacciones crudas", "Resúmenes"], filas)
+
+
+if __name__ == "__main__":
+    main()
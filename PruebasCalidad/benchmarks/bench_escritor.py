@@ -0,0 +1,105 @@
+"""
+Benchmark: escrituras por segundo con commits por llamada o con el hilo escritor.
+
+Varios hilos (cajas y recepción de mercadería) registran movimientos de
+inventario a la vez. Se compara el esquema anterior (cada llamada abre su
+transacción en la conexión de su hilo y hace su propio commit) con
+EscritorUnico, que junta las escrituras pendientes en un solo commit.
+
+Se mide con los dos perfiles de almacenamiento: con 'compatible'
+(synchronous=FULL) cada commit cuesta un fsync y agrupar rinde más.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_escritor.py [--hilos 8] [--escrituras 200]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from comun import crear_db_prueba, imprimir_tabla
+from db.escritor import EscritorUnico
+from db.perfiles import obtener_perfil
+from db.pool import GestorConexiones
+
+QUERIES = [
+    ("INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia) "
+     "VALUES ('entrada', datetime('now'), 1, 1, 'bench')", ()),
+    ("UPDATE Productos SET stock_actual = stock_actual + 1 WHERE id_producto = 1", ()),
+]
+
+
+def por_llamada(gestor):
+    """Como el ejecutar_transaccion anterior: transacción y commit propios"""
+    with gestor.transaccion() as conn:
+        cursor = conn.cursor()
+        for query, params in QUERIES:
+            cursor.execute(query, params)
+
+
+def con_escritor(escritor):
+    escritor.enviar(QUERIES).result()
+
+
+def correr(perfil, modo, hilos, escrituras):
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"))
+        gestor = GestorConexiones(ruta, pragmas=obtener_perfil(perfil))
+        escritor = EscritorUnico(gestor) if modo == "escritor" else None
+        errores = []
+        inicio = threading.Barrier(hilos + 1)
+
+        def trabajar():
+            inicio.wait()
+            for _ in range(escrituras):
+                try:
+                    con_escritor(escritor) if escritor else por_llamada(gestor)
+                except sqlite3.OperationalError as e:
+                    errores.append(e)
+
+        trabajadores = [threading.Thread(target=trabajar) for _ in range(hilos)]
+        for t in trabajadores:
+            t.start()
+        inicio.wait()
+        t0 = time.perf_counter()
+        for t in trabajadores:
+            t.join()
+        segundos = time.perf_counter() - t0
+
+        commits = hilos * escrituras - len(errores)
+        if escritor:
+            commits = escritor.lotes
+            escritor.detener()
+        gestor.cerrar_todas()
+
+    return hilos * escrituras / segundos, commits, len(errores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hilos", type=int, default=8, help="Hilos escribiendo a la vez")
+    parser.add_argument("--escrituras", type=int, default=200, help="Escrituras por hilo")
+    args = parser.parse_args()
+
+    filas = []
+    for perfil in ("compatible", "rendimiento"):
+        antes, commits_antes, errores_antes = correr(perfil, "por_llamada", args.hilos, args.escrituras)
+        despues, commits_despues, errores_despues = correr(perfil, "escritor", args.hilos, args.escrituras)
+        filas.append((
+            perfil,
+            f"{antes:,.0f}", commits_antes, errores_antes,
+            f"{despues:,.0f}", commits_despues, errores_despues,
+            f"x{despues / antes:.1f}",
+        ))
+
+    imprimir_tabla(
+        f"Escrituras/segundo ({args.hilos} hilos x {args.escrituras} escrituras)",
+        ["Perfil", "Por llamada", "Commits", "Errores", "Escritor", "Commits", "Errores", "Mejora"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: memoria y tiempo de exportar el detalle de ventas a CSV.
+
+'Todo en memoria' lee el rango con fetchall y escribe después, como haría un
+DataFrame armado de una vez; 'Por bloques' usa utils/exportacion.py
+(fetchmany + escritura incremental). Se mide el pico de memoria de Python
+con tracemalloc, que crece con el rango en el primer caso y no en el segundo.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_exportacion.py [--transacciones 200000]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from comun import crear_db_prueba, imprimir_tabla
+from db import db
+from db.consultas import rango_fechas
+from db.migraciones import aplicar_migraciones
+from utils.exportacion import COLUMNAS, SQL_DETALLE, exportar_detalle_ventas
+
+
+def todo_en_memoria(destino, desde, hasta):
+    filtro, params = rango_fechas("t.fecha", desde, hasta)
+    filas = db.obtener_gestor().conexion().execute(SQL_DETALLE.format(filtro=filtro), params).fetchall()
+    with open(destino, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow([nombre for nombre, _ in COLUMNAS])
+        escritor.writerows(filas)
+    return len(filas)
+
+
+def medir_pico(funcion):
+    """Devuelve (segundos, MB de pico, resultado)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico / 1024 / 1024, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transacciones", type=int, default=200_000)
+    args = parser.parse_args()
+
+    hoy = date.today()
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"), transacciones=args.transacciones)
+        db.configurar_db(ruta)
+        aplicar_migraciones()
+        destino = os.path.join(tmp, "detalle.csv")
+
+        for nombre, dias in (("1 mes", 30), ("6 meses", 182), ("1 año", 365)):
+            desde = hoy - timedelta(days=dias - 1)
+            t_antes, mb_antes, renglones = medir_pico(lambda: todo_en_memoria(destino, desde, hoy))
+            t_despues, mb_despues, _ = medir_pico(lambda: exportar_detalle_ventas(destino, desde, hoy))
+            filas.append((nombre, f"{renglones:,}", f"{t_antes:.2f}", f"{mb_antes:.1f}",
+                          f"{t_despues:.2f}", f"{mb_despues:.1f}"))
+        db.cerrar_conexiones()
+
+    imprimir_tabla(
+        f"Exportación CSV del detalle ({args.transacciones:,} ventas)",
+        ["Rango", "Renglones", "s memoria", "MB memoria", "s bloques", "MB bloques"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: exportación a PDF de un reporte con muchos gráficos.
+
+'Archivos temporales' reproduce el flujo anterior de generar_reporte_pdf:
+cada figura se guarda como temp_<clave>.png en el directorio actual, ReportLab
+la vuelve a leer del disco y al final se borra. 'PNG en memoria' rasteriza
+cada figura a un io.BytesIO (figura_a_png) y se lo pasa directo a ReportLab.
+El PDF se escribe en memoria en ambos casos.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_exportar_pdf.py [--graficos 24] [--reportes 5]
+"""
+import argparse
+import io
+import os
+import tempfile
+
+from matplotlib.figure import Figure
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Image as RLImage
+
+from comun import imprimir_tabla, medir
+from ui.components.graficos import figura_a_png
+
+
+def crear_figuras(cantidad):
+    figuras = {}
+    for i in range(cantidad):
+        figura = Figure(figsize=(5, 4), dpi=100)
+        ax = figura.add_subplot(111)
+        if i % 2:
+            ax.barh([f"Cliente {j}" for j in range(5)], [5 - j + i for j in range(5)], color='#5E81AC')
+        else:
+            ax.plot(range(30), [(j * (i + 3)) % 17 for j in range(30)], marker='o', color='#BF616A')
+        ax.set_title(f"Gráfico {i}", fontsize=10)
+        figuras[f"chart_{i}"] = figura
+    return figuras
+
+
+def construir_pdf(imagenes):
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4)
+    doc.build([RLImage(imagen, width=120*mm, height=80*mm) for imagen in imagenes.values()])
+
+
+def con_archivos_temporales(figuras, directorio):
+    imagenes = {}
+    for clave, figura in figuras.items():
+        ruta = os.path.join(directorio, f"temp_{clave}.png")
+        figura.savefig(ruta, format='png', bbox_inches='tight')
+        imagenes[clave] = ruta
+    construir_pdf(imagenes)
+    for ruta in imagenes.values():
+        os.remove(ruta)
+
+
+def en_memoria(figuras):
+    construir_pdf({clave: figura_a_png(figura) for clave, figura in figuras.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graficos", type=int, default=24)
+    parser.add_argument("--reportes", type=int, default=5)
+    args = parser.parse_args()
+
+    figuras = crear_figuras(args.graficos)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Calentamiento (fuentes de matplotlib e imports internos de ReportLab)
+        con_archivos_temporales(figuras, tmp)
+        en_memoria(figuras)
+
+        antes = medir(lambda: con_archivos_temporales(figuras, tmp), args.reportes)
+        despues = medir(lambda: en_memoria(figuras), args.reportes)
+
+    imprimir_tabla(
+        f"{args.reportes} reportes de {args.graficos} gráficos",
+        ["Modo", "ms/reporte"],
+        [
+            ("Archivos temporales (antes)", f"{antes / args.reportes * 1000:.1f}"),
+            ("PNG en memoria", f"{despues / args.reportes * 1000:.1f}"),
+        ]
+    )
+
+
+if __name__ == "__main__":
+    main()
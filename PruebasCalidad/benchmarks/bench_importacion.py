@@ -0,0 +1,114 @@
+"""
+Benchmark: alta de un catálogo de proveedor producto por producto o con la importación masiva.
+
+- por_producto: lo que hace DialogoProducto por cada alta (mismas reglas de
+  validación, un COUNT por SKU y otro por código de barras, y un INSERT con
+  su propio commit).
+- importacion: utils/importacion.py sobre un CSV con las mismas filas
+  (lectura en streaming, una consulta de duplicados y un executemany por bloque).
+
+El 2 % de las filas repite un SKU para que ambos caminos rechacen algo.
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_importacion.py [--filas 20000] [--bloque 450]
+"""
+import argparse
+import csv
+import os
+import tempfile
+
+from comun import crear_db_prueba, imprimir_tabla, medir
+from db import db
+from db.migraciones import aplicar_migraciones
+from utils.importacion import ENCABEZADOS, importar_productos
+from utils.validacion_productos import (
+    CAMPOS_NUMERICOS, convertir_numero, precio_bajo_costo, stocks_coherentes
+)
+
+
+def generar_filas(cantidad):
+    for n in range(cantidad):
+        sku = f"BEN-{n - 1 if n % 50 == 49 else n}"
+        yield {
+            "nombre": f"Producto proveedor {n}", "descripcion": "Importado", "precio_venta": "19.90",
+            "costo": "12.50", "codigo_barras": f"880{n:010d}", "sku": sku, "stock_minimo": "2",
+            "stock_maximo": "40", "stock_actual": "10", "categoria": "", "proveedor": "",
+        }
+
+
+def escribir_csv(ruta, cantidad):
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=ENCABEZADOS)
+        escritor.writeheader()
+        escritor.writerows(generar_filas(cantidad))
+
+
+def por_producto(cantidad):
+    """Como DialogoProducto: validar, dos COUNT y un INSERT por producto"""
+    insertados = 0
+    for fila in generar_filas(cantidad):
+        numeros = {campo: convertir_numero(fila[campo], decimal) for campo, decimal in CAMPOS_NUMERICOS.items()}
+        if not stocks_coherentes(numeros["stock_minimo"], numeros["stock_maximo"]):
+            continue
+        if precio_bajo_costo(numeros["precio_venta"], numeros["costo"]):
+            continue
+        if any(
+            db.obtener_datos(f"SELECT COUNT(*) FROM Productos WHERE {campo} = ?", (fila[campo],))[0][0]
+            for campo in ("sku", "codigo_barras")
+        ):
+            continue
+        db.ejecutar_query(
+            """INSERT INTO Productos (
+                nombre, descripcion, precio_venta, costo,
+                codigo_barras, sku, stock_minimo, stock_maximo, stock_actual,
+                id_categoria, id_proveedor, fecha_creacion, estado
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), 1)""",
+            (fila["nombre"], fila["descripcion"], numeros["precio_venta"], numeros["costo"],
+             fila["codigo_barras"], fila["sku"], numeros["stock_minimo"], numeros["stock_maximo"],
+             numeros["stock_actual"], None, None)
+        )
+        insertados += 1
+    return insertados
+
+
+def correr(modo, cantidad, bloque):
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"))
+        db.configurar_db(ruta)
+        aplicar_migraciones()
+        archivo = os.path.join(tmp, "catalogo.csv")
+        escribir_csv(archivo, cantidad)
+
+        resultado = {}
+        if modo == "por_producto":
+            segundos = medir(lambda: resultado.update(insertados=por_producto(cantidad)))
+        else:
+            segundos = medir(lambda: resultado.update(
+                insertados=importar_productos(archivo, tamano_bloque=bloque).insertados
+            ))
+        db.configurar_db()
+    return segundos, resultado["insertados"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=20000, help="Productos del catálogo")
+    parser.add_argument("--bloque", type=int, default=450, help="Filas por bloque de la importación")
+    args = parser.parse_args()
+
+    filas = []
+    base = None
+    for modo in ("por_producto", "importacion"):
+        segundos, insertados = correr(modo, args.filas, args.bloque)
+        base = base or segundos
+        filas.append((modo, f"{segundos:.2f}", f"{args.filas / segundos:,.0f}", insertados, f"x{base / segundos:.1f}"))
+
+    imprimir_tabla(
+        f"Alta de {args.filas:,} productos",
+        ["Modo", "Segundos", "Filas/s", "Insertados", "Mejora"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Generador de carga: N cajas vendiendo a la vez, directo a la base o por el servicio.
+
+Cada caja es un proceso que repite el ciclo del punto de venta: lee el
+catálogo (cada --catalogo-cada ventas) y registra una venta de tres
+renglones. Se compara:
+
+- directo: cada caja abre ventas.db y escribe ella misma (como hoy). Cada
+  venta de otra caja invalida el catálogo completo de las demás.
+- servicio: las cajas hablan con db/servicio.py por 127.0.0.1; el servicio
+  agrupa las ventas en su escritor y sirve el catálogo desde su caché (304
+  mientras no cambie).
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_servicio_ventas.py [--cajas 1 4 8] [--ventas 100] [--catalogo-cada 1]
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+
+from comun import crear_db_prueba, imprimir_tabla
+from db import db
+from db.catalogo import CatalogoProductos
+from db.migraciones import aplicar_migraciones
+from db.servicio import ClienteVentas, ServicioVentas
+from db.ventas import registrar_venta
+
+TOTALES = {"subtotal": 30.0, "iva": 0.0, "total": 30.0}
+
+
+def caja(numero, ruta, url, ventas, catalogo_cada, salida, inicio):
+    """Proceso de una caja; devuelve sus latencias (segundos) y errores por la cola"""
+    if url:
+        cliente = ClienteVentas(url)
+        leer, registrar = cliente.productos_venta, cliente.registrar_venta
+    else:
+        db.configurar_db(ruta)
+        leer, registrar = CatalogoProductos.compartido().productos_venta, registrar_venta
+
+    latencias, errores = [], 0
+    productos = None
+    inicio.wait()
+    for i in range(ventas):
+        t0 = time.perf_counter()
+        try:
+            if i % catalogo_cada == 0:
+                productos = leer()
+            carrito = [
+                {"id_producto": productos[(numero + i + j) % len(productos)][0], "cantidad": 1, "precio": 10.0}
+                for j in range(3)
+            ]
+            registrar(1, 1, carrito, TOTALES)
+            latencias.append(time.perf_counter() - t0)
+        except Exception:
+            errores += 1
+    if not url:
+        db.cerrar_conexiones()
+    salida.put((latencias, errores))
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def correr(modo, cajas, ventas, catalogo_cada):
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"))
+        conn = sqlite3.connect(ruta)
+        conn.execute("UPDATE Productos SET stock_actual = 1000000, estado = 1")
+        conn.commit()
+        conn.close()
+        db.configurar_db(ruta)
+        aplicar_migraciones()
+        db.cerrar_conexiones()  # las cajas se crean con fork: sin conexiones heredadas
+
+        url = f"http://127.0.0.1:{_puerto_libre()}" if modo == "servicio" else None
+        salida = multiprocessing.Queue()
+        inicio = multiprocessing.Event()
+        procesos = [
+            multiprocessing.Process(target=caja, args=(n, ruta, url, ventas, catalogo_cada, salida, inicio))
+            for n in range(cajas)
+        ]
+        for p in procesos:
+            p.start()
+
+        servicio = None
+        if url:
+            servicio = ServicioVentas(puerto=int(url.rsplit(":", 1)[1]))
+            servicio.iniciar()
+
+        t0 = time.perf_counter()
+        inicio.set()
+        resultados = [salida.get() for _ in procesos]
+        segundos = time.perf_counter() - t0
+        for p in procesos:
+            p.join()
+
+        commits = "-"
+        if servicio:
+            salud = servicio.salud()
+            commits = salud["commits"]
+            servicio.detener()
+        db.configurar_db()
+
+    latencias = sorted(l for lista, _ in resultados for l in lista)
+    errores = sum(e for _, e in resultados)
+    if not latencias:
+        return len(latencias) / segundos, 0.0, 0.0, errores, commits
+    p50 = latencias[len(latencias) // 2] * 1000
+    p95 = latencias[int(len(latencias) * 0.95)] * 1000
+    return len(latencias) / segundos, p50, p95, errores, commits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cajas", type=int, nargs="+", default=[1, 4, 8], help="Cantidades de cajas a simular")
+    parser.add_argument("--ventas", type=int, default=100, help="Ventas por caja")
+    parser.add_argument("--catalogo-cada", type=int, default=1, help="Ventas entre lecturas del catálogo")
+    args = parser.parse_args()
+
+    filas = []
+    for cajas in args.cajas:
+        for modo in ("directo", "servicio"):
+            por_segundo, p50, p95, errores, commits = correr(modo, cajas, args.ventas, args.catalogo_cada)
+            filas.append((cajas, modo, f"{por_segundo:,.0f}", f"{p50:.1f}", f"{p95:.1f}", errores, commits))
+
+    imprimir_tabla(
+        f"Ventas/segundo ({args.ventas} ventas por caja, catálogo cada {args.catalogo_cada})",
+        ["Cajas", "Modo", "Ventas/s", "p50 ms", "p95 ms", "Errores", "Commits"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: ventas por segundo según cantidad de renglones en el carrito.
+
+Compara el flujo anterior de _procesar_venta (dos transacciones, conexión
+nueva en cada una y un execute por renglón) con registrar_venta (una
+transacción, conexión reutilizada y executemany).
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_venta.py [--ventas 200]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+
+from comun import crear_db_prueba, imprimir_tabla, medir
+from db import db
+from db.consultas import normalizar_fecha
+from db.migraciones import aplicar_migraciones
+from db.perfiles import obtener_perfil
+from db.pool import abrir_conexion
+from db.ventas import registrar_venta
+
+
+def _transaccion_aislada(ruta, queries):
+    """Réplica del ejecutar_transaccion original: conexión nueva por llamada"""
+    conn = abrir_conexion(ruta, obtener_perfil())
+    try:
+        cursor = conn.cursor()
+        for query, params in queries:
+            cursor.execute(query, params)
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def venta_anterior(ruta, carrito, totales):
+    fecha = normalizar_fecha()
+    id_tx = _transaccion_aislada(ruta, [(
+        "INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) VALUES (?,?,?,?,?,?,?,?)",
+        ("venta", fecha, 1, 1, totales["subtotal"], totales["iva"], totales["total"], "completada")
+    )])
+    queries = []
+    for item in carrito:
+        queries.append(("INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado) VALUES (?,?,?,?,?,?)",
+                        (id_tx, item["id_producto"], item["cantidad"], item["precio"], 0, 0)))
+        queries.append(("UPDATE Productos SET stock_actual = stock_actual - ? WHERE id_producto = ?",
+                        (item["cantidad"], item["id_producto"])))
+        queries.append(("INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia) VALUES (?,?,?,?,?)",
+                        ("salida", fecha, -item["cantidad"], item["id_producto"], f"Venta #{id_tx}")))
+    _transaccion_aislada(ruta, queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ventas", type=int, default=200, help="Ventas por medición")
+    args = parser.parse_args()
+
+    totales = {"subtotal": 100.0, "iva": 16.0, "total": 116.0}
+    filas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"))
+        conn = sqlite3.connect(ruta)
+        conn.execute("UPDATE Productos SET stock_actual = 100000000")
+        conn.commit()
+        productos = [r[0] for r in conn.execute("SELECT id_producto FROM Productos")]
+        conn.close()
+        db.configurar_db(ruta)
+        aplicar_migraciones()  # registrar_venta también acumula los resúmenes diarios
+
+        for lineas in (1, 10, 100):
+            carrito = [
+                {"id_producto": productos[i % len(productos)], "cantidad": 1, "precio": 10.0}
+                for i in range(lineas)
+            ]
+            # Calentamiento: la primera escritura crea el WAL y llena la caché
+            venta_anterior(ruta, carrito, totales)
+            registrar_venta(1, 1, carrito, totales)
+
+            antes = medir(lambda: venta_anterior(ruta, carrito, totales), args.ventas)
+            despues = medir(lambda: registrar_venta(1, 1, carrito, totales), args.ventas)
+            filas.append((
+                lineas,
+                f"{args.ventas / antes:,.0f}",
+                f"{args.ventas / despues:,.0f}",
+                f"x{antes / despues:.1f}",
+            ))
+
+        db.cerrar_conexiones()
+
+    imprimir_tabla(
+        f"Ventas/segundo ({args.ventas} ventas por medición, perfil actual)",
+        ["Renglones", "Antes (2 commits)", "registrar_venta", "Mejora"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: lecturas y escrituras concurrentes según el perfil de almacenamiento.
+
+Simula el dashboard (lectores que recalculan KPIs) mientras el punto de venta
+registra ventas (un escritor). Compara el perfil 'compatible' (journal de
+rollback) con el perfil 'rendimiento' (WAL).
+
+Uso:
+    python PruebasCalidad/benchmarks/bench_wal.py [--segundos 5] [--lectores 3]
+"""
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+import os
+
+from comun import crear_db_prueba, imprimir_tabla
+from db.perfiles import PERFILES, obtener_perfil
+from db.pool import GestorConexiones
+
+SQL_LECTURA = """
+    SELECT COUNT(*), SUM(total) FROM Transacciones
+    WHERE tipo = 'venta' AND fecha >= date('now', '-30 day')
+"""
+
+
+def escritor(gestor, detener, contador):
+    while not detener.is_set():
+        try:
+            with gestor.transaccion() as conn:
+                cur = conn.execute(
+                    "INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) "
+                    "VALUES ('venta', datetime('now'), 1, 1, 100, 16, 116, 'completada')"
+                )
+                conn.executemany(
+                    "INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado) "
+                    "VALUES (?, 1, 1, 10, 0, 0)",
+                    [(cur.lastrowid,)] * 3
+                )
+            contador["escrituras"] += 1
+        except sqlite3.OperationalError:
+            contador["errores"] += 1
+
+
+def lector(gestor, detener, contador, lock):
+    while not detener.is_set():
+        try:
+            gestor.conexion().execute(SQL_LECTURA).fetchall()
+            with lock:
+                contador["lecturas"] += 1
+        except sqlite3.OperationalError:
+            with lock:
+                contador["errores"] += 1
+
+
+def ejecutar(perfil, segundos, lectores, transacciones):
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = crear_db_prueba(os.path.join(tmp, "bench.db"), transacciones=transacciones)
+        gestor = GestorConexiones(ruta, pragmas=obtener_perfil(perfil))
+        contador = {"lecturas": 0, "escrituras": 0, "errores": 0}
+        lock = threading.Lock()
+        detener = threading.Event()
+
+        hilos = [threading.Thread(target=escritor, args=(gestor, detener, contador))]
+        hilos += [threading.Thread(target=lector, args=(gestor, detener, contador, lock)) for _ in range(lectores)]
+        for h in hilos:
+            h.start()
+        time.sleep(segundos)
+        detener.set()
+        for h in hilos:
+            h.join()
+        gestor.cerrar_todas()
+
+    return (
+        perfil,
+        f"{contador['lecturas'] / segundos:,.0f}",
+        f"{contador['escrituras'] / segundos:,.0f}",
+        contador["errores"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--lectores", type=int, default=3)
+    parser.add_argument("--transacciones", type=int, default=20000, help="Ventas sembradas antes de medir")
+    args = parser.parse_args()
+
+    filas = [ejecutar(p, args.segundos, args.lectores, args.transacciones) for p in PERFILES]
+    imprimir_tabla(
+        f"{args.lectores} lectores + 1 escritor durante {args.segundos}s",
+        ["Perfil", "Lecturas/s", "Ventas/s", "Errores"],
+        filas
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Los benchmarks nunca tocan data/ventas.db: trabajan sobre una copia sembrada
+con datos sintéticos en un directorio temporal.
+"""
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+# --- Configuración del PATH para encontrar módulos del proyecto ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+DB_ORIGINAL = os.path.join(project_root, "data", "ventas.db")
+
+
+def crear_db_prueba(destino, transacciones=0, lineas_por_venta=3, dias=730, semilla=42):
+    """
+    Copia la base de datos del proyecto y la siembra con ventas sintéticas.
+
+    Args:
+        destino (str): Ruta del archivo a crear
+        transacciones (int): Ventas adicionales a insertar
+        lineas_por_venta (int): Renglones de detalle por venta
+        dias (int): Las fechas se reparten en los últimos N días
+        semilla (int): Semilla para que los datos sean reproducibles
+
+    Returns:
+        str: Ruta de la base creada
+    """
+    shutil.copyfile(DB_ORIGINAL, destino)
+    if not transacciones:
+        return destino
+
+    rnd = random.Random(semilla)
+    conn = sqlite3.connect(destino)
+    productos = [r[0] for r in conn.execute("SELECT id_producto FROM Productos")]
+    clientes = [r[0] for r in conn.execute("SELECT id_cliente FROM Clientes")]
+    conn.execute("UPDATE Productos SET stock_actual = 1000000")
+
+    hoy = datetime.now()
+    for _ in range(transacciones):
+        fecha = (hoy - timedelta(seconds=rnd.randint(0, dias * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+        cur = conn.execute(
+            "INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) "
+            "VALUES ('venta', ?, ?, 1, 100, 16, 116, 'completada')",
+            (fecha, rnd.choice(clientes))
+        )
+        id_tx = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado) "
+            "VALUES (?, ?, ?, 10, 0, 0)",
+            [(id_tx, rnd.choice(productos), rnd.randint(1, 5)) for _ in range(lineas_por_venta)]
+        )
+    conn.commit()
+    conn.close()
+    return destino
+
+
+def medir(funcion, repeticiones=1):
+    """Ejecuta la función N veces y devuelve los segundos transcurridos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def imprimir_tabla(titulo, encabezados, filas):
+    """Imprime resultados alineados en columnas"""
+    print(f"\n== {titulo} ==")
+    anchos = [max(len(str(x)) for x in col) for col in zip(encabezados, *filas)]
+    print("  ".join(str(h).ljust(a) for h, a in zip(encabezados, anchos)))
+    for fila in filas:
+        print("  ".join(str(v).ljust(a) for v, a in zip(fila, anchos)))
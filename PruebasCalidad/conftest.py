@@ -0,0 +1,22 @@
+import sys
+import os
+import shutil
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.migraciones import aplicar_migraciones
+
+
+@pytest.fixture
+def base_copiada(tmp_path):
+    """Copia de data/ventas.db migrada y configurada como base compartida; devuelve su ruta"""
+    ruta = tmp_path / "ventas.db"
+    shutil.copyfile(os.path.join(project_root, "data", "ventas.db"), ruta)
+    db.configurar_db(ruta)
+    aplicar_migraciones()
+    yield ruta
+    db.configurar_db()
@@ -0,0 +1,78 @@
+import sys
+import os
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.busqueda import IndiceProductos, normalizar, tokenizar
+
+PRODUCTOS = [
+    (1, "Café Molido Premium 500g", 120.0, "CAF-500", "7501000000011", 10),
+    (2, "Café en Grano", 150.0, "CAF-GR", "7501000000028", 5),
+    (3, "Azúcar Morena", 35.0, "AZU-01", None, 0),
+    (4, "Galletas de Café", 25.0, None, "7501000000042", 8),
+]
+
+
+def test_normaliza_acentos_y_separadores():
+    assert normalizar("Azúcar MORENA") == "azucar morena"
+    assert tokenizar("Café-Molido 500g, café") == ["cafe", "molido", "500g"]
+
+
+def test_busca_por_prefijos_de_cada_palabra():
+    indice = IndiceProductos(PRODUCTOS)
+    ids = [p[0] for p in indice.buscar("caf mol")[0]]
+    assert ids == [1]
+
+    # Sin stock no aparece salvo que se pida
+    assert indice.buscar("azu")[0] == []
+    assert [p[0] for p in indice.buscar("azu", solo_con_stock=False)[0]] == [3]
+
+
+def test_ordena_por_relevancia_y_acota_resultados():
+    indice = IndiceProductos(PRODUCTOS)
+    resultados, total = indice.buscar("cafe")
+    # Los que empiezan por "café" van antes que el que solo contiene la palabra
+    assert [p[0] for p in resultados] == [2, 1, 4]
+    assert total == 3
+
+    # Código exacto gana aunque por nombre quedaría después
+    assert indice.buscar("7501000000042")[0][0][0] == 4
+
+    resultados, total = indice.buscar("", limite=2)
+    assert len(resultados) == 2 and total == 3
+
+
+def test_actualizaciones_incrementales():
+    indice = IndiceProductos(PRODUCTOS)
+
+    indice.actualizar_stock(2, 0)
+    assert 2 not in [p[0] for p in indice.buscar("grano")[0]]
+
+    indice.agregar((5, "Té Verde", 40.0, "TE-01", None, 3))
+    assert [p[0] for p in indice.buscar("te")[0]] == [5]
+
+    indice.agregar((5, "Té Negro", 40.0, "TE-02", None, 3))
+    assert indice.buscar("verde")[0] == []
+    assert [p[0] for p in indice.buscar("negro")[0]] == [5]
+
+    indice.quitar(5)
+    assert indice.buscar("negro")[0] == [] and 5 not in indice
+    assert "negro" not in indice._tokens
+
+
+def test_busqueda_exacta_por_codigo():
+    indice = IndiceProductos(PRODUCTOS)
+    assert indice.buscar_codigo("7501000000028")[0] == 2
+    assert indice.buscar_codigo(" caf-500 ")[0] == 1
+    assert indice.buscar_codigo("75010000000") is None
+
+    # El mapa sigue al producto cuando cambia o se elimina
+    indice.actualizar_stock(4, 2)
+    assert indice.buscar_codigo("7501000000042")[5] == 2
+    indice.agregar((4, "Galletas de Café", 25.0, "GAL-01", "7501000000099", 8))
+    assert indice.buscar_codigo("7501000000042") is None
+    assert indice.buscar_codigo("gal-01")[0] == 4
+    indice.quitar(4)
+    assert indice.buscar_codigo("7501000000099") is None
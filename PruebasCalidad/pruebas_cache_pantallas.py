@@ -0,0 +1,102 @@
+import sys
+import os
+import ast
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ui.components.cache_pantallas import CachePantallas
+
+
+class PantallaSimulada:
+    """Frame de mentira: registra si está empaquetado, destruido y cuántas veces reapareció"""
+    construidas = []
+
+    def __init__(self, clave):
+        self.clave = clave
+        self.visible = False
+        self.viva = True
+        self.mostrada = 0
+        PantallaSimulada.construidas.append(clave)
+
+    def pack(self, **opciones):
+        self.visible = True
+
+    def pack_forget(self):
+        self.visible = False
+
+    def destroy(self):
+        self.viva = False
+
+    def winfo_exists(self):
+        return self.viva
+
+    def update_idletasks(self):
+        pass
+
+    def al_mostrar(self):
+        self.mostrada += 1
+
+
+def _cache(maximo=3):
+    PantallaSimulada.construidas = []
+    claves = ["inicio", "ventas", "clientes", "transacciones", "inventario"]
+    return CachePantallas({c: (lambda c=c: PantallaSimulada(c)) for c in claves}, maximo=maximo)
+
+
+def test_reutiliza_en_vez_de_reconstruir():
+    cache = _cache()
+    ventas = cache.mostrar("ventas")
+    clientes = cache.mostrar("clientes")
+    assert not ventas.visible and clientes.visible
+
+    assert cache.mostrar("ventas") is ventas
+    assert ventas.visible and not clientes.visible
+    assert ventas.mostrada == 1  # al_mostrar solo al reaparecer
+    assert PantallaSimulada.construidas == ["ventas", "clientes"]
+
+
+def test_desaloja_la_menos_usada():
+    cache = _cache(maximo=2)
+    ventas = cache.mostrar("ventas")
+    clientes = cache.mostrar("clientes")
+    cache.mostrar("ventas")
+    cache.mostrar("transacciones")  # clientes es la menos usada
+
+    assert not clientes.viva and "clientes" not in cache
+    assert ventas.viva and "ventas" in cache
+
+    nueva = cache.mostrar("clientes")
+    assert nueva is not clientes
+    assert PantallaSimulada.construidas.count("clientes") == 2
+
+
+def test_pantalla_destruida_por_fuera_se_reconstruye():
+    cache = _cache()
+    ventas = cache.mostrar("ventas")
+    cache.mostrar("inicio")
+    ventas.destroy()
+    assert cache.mostrar("ventas") is not ventas
+
+
+def test_registra_tiempos_por_origen():
+    cache = _cache()
+    cache.mostrar("ventas")
+    cache.mostrar("inicio")
+    cache.mostrar("ventas")
+
+    resumen = cache.resumen_tiempos()
+    assert resumen[("ventas", "creada")][0] == 1
+    assert resumen[("ventas", "reutilizada")][0] == 1
+    assert ("inicio", "reutilizada") not in resumen
+
+
+def test_pantallas_importadas_explicitamente_para_pyinstaller():
+    """PyInstaller solo empaqueta lo que encuentra en sentencias import, no en importlib"""
+    with open(os.path.join(project_root, "ui", "main.py"), encoding="utf-8") as archivo:
+        arbol = ast.parse(archivo.read())
+    importados = {nodo.module for nodo in ast.walk(arbol) if isinstance(nodo, ast.ImportFrom)}
+    pantallas = {"ui.dashboard", "ui.punto_venta", "ui.inventario", "ui.clientes", "ui.transacciones", "ui.movimientos"}
+    assert pantallas <= importados
+    assert "importlib" not in {alias.name for nodo in ast.walk(arbol) if isinstance(nodo, ast.Import) for alias in nodo.names}
@@ -0,0 +1,146 @@
+import sys
+import os
+import sqlite3
+import threading
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.cambios import ObservadorCambios, Sondeo, cambio_desde, version
+from db.catalogo import CatalogoProductos, NOMBRE
+from db.ventas import registrar_venta
+
+
+class WidgetSimulado:
+    """Lo mínimo de un widget de Tk que usa Sondeo; los after() se disparan a mano"""
+    def __init__(self):
+        self.programados = {}
+        self.visible = True
+
+    def bind(self, evento, funcion, add=None):
+        pass
+
+    def after(self, ms, funcion):
+        clave = f"after#{len(self.programados)}"
+        self.programados[clave] = funcion
+        return clave
+
+    def after_cancel(self, clave):
+        self.programados.pop(clave, None)
+
+    def winfo_ismapped(self):
+        return self.visible
+
+    def tic(self):
+        clave, funcion = self.programados.popitem()
+        funcion()
+
+
+def _escribir_desde_otro_proceso(ruta, sql):
+    """Otra conexión, sin pasar por db.db: como otra caja o la CLI"""
+    conn = sqlite3.connect(ruta)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def test_escritura_local_solo_cambia_su_tabla(base_copiada):
+    clientes = version("Clientes")
+    productos = version("Productos")
+
+    db.ejecutar_query("UPDATE Clientes SET telefono = '555' WHERE id_cliente = 1")
+
+    assert cambio_desde(clientes, "Clientes")
+    assert not cambio_desde(productos, "Productos")
+    assert cambio_desde(None, "Productos")  # sin marca siempre hay que cargar
+
+
+def test_venta_cambia_resumenes_y_no_cuenta_como_externa(base_copiada):
+    marca = version("Resumen_ventas_dia")
+    externos = ObservadorCambios.compartido().revisar()
+
+    registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 1, "precio": 10.0}],
+                    {"subtotal": 10.0, "iva": 0.0, "total": 10.0})
+
+    assert cambio_desde(marca, "Resumen_ventas_dia")
+    assert ObservadorCambios.compartido().revisar() == externos
+
+
+def test_revisar_durante_un_commit_local_no_lo_cuenta_como_externo(base_copiada, monkeypatch):
+    observador = ObservadorCambios.compartido()
+    externos = observador.revisar()
+    gestor = db.obtener_gestor()
+    confirmar = gestor.confirmar
+    hilos = []
+
+    def confirmar_y_revisar(commit):
+        def commit_y_revisar():
+            commit()
+            # Otro hilo (un Sondeo) revisa entre el COMMIT y la relectura local
+            hilo = threading.Thread(target=observador.revisar)
+            hilo.start()
+            hilos.append(hilo)
+            hilo.join(0.2)
+        confirmar(commit_y_revisar)
+
+    monkeypatch.setattr(gestor, "confirmar", confirmar_y_revisar)
+    db.ejecutar_query("UPDATE Clientes SET telefono = '3' WHERE id_cliente = 1")
+    hilos[0].join()
+
+    assert observador.revisar() == externos
+
+
+def test_escritura_de_otro_proceso_cambia_todo(base_copiada):
+    marca = version("Productos", "Clientes")
+    assert not cambio_desde(marca, "Productos", "Clientes")
+
+    _escribir_desde_otro_proceso(base_copiada, "UPDATE Clientes SET telefono = '1' WHERE id_cliente = 1")
+
+    assert cambio_desde(marca, "Productos", "Clientes")
+
+
+def test_escritura_externa_previa_a_una_local_no_se_pierde(base_copiada):
+    marca = version("Productos")
+    _escribir_desde_otro_proceso(base_copiada, "UPDATE Productos SET nombre = 'Externo' WHERE id_producto = 1")
+    # El commit local siguiente no debe "absorber" el cambio ajeno
+    db.ejecutar_query("UPDATE Clientes SET telefono = '2' WHERE id_cliente = 1")
+    assert cambio_desde(marca, "Productos")
+
+
+def test_catalogo_relee_tras_escritura_externa(base_copiada):
+    catalogo = CatalogoProductos.compartido()
+    catalogo.filas()
+    _escribir_desde_otro_proceso(base_copiada, "UPDATE Productos SET nombre = 'Desde otra caja' WHERE id_producto = 1")
+    assert catalogo.obtener(1)[NOMBRE] == "Desde otra caja"
+
+
+def test_sondeo_solo_refresca_si_hubo_cambios_y_esta_visible(base_copiada):
+    widget = WidgetSimulado()
+    recargas = []
+    sondeo = Sondeo(widget, ("Clientes",), lambda: recargas.append(1), intervalo_ms=1000)
+    sondeo.marcar()
+
+    widget.tic()
+    assert recargas == []
+
+    widget.visible = False
+    _escribir_desde_otro_proceso(base_copiada, "UPDATE Clientes SET telefono = '3' WHERE id_cliente = 1")
+    widget.tic()
+    assert recargas == []
+
+    widget.visible = True
+    widget.tic()
+    widget.tic()
+    assert recargas == [1]
+
+    sondeo.detener()
+    assert widget.programados == {}
+
+
+def test_sondeo_desactivado(base_copiada, monkeypatch):
+    monkeypatch.setenv("VENTAS_SONDEO_MS", "0")
+    widget = WidgetSimulado()
+    Sondeo(widget, ("Clientes",), lambda: None)
+    assert widget.programados == {}
@@ -0,0 +1,46 @@
+import sys
+import os
+import subprocess
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils import carga_diferida
+
+
+def _modulos_cargados_tras(codigo, modulos):
+    """Importa en un proceso nuevo y devuelve cuáles de los módulos quedaron cargados"""
+    salida = subprocess.run(
+        [sys.executable, "-c", f"import sys; {codigo}; print([m for m in {modulos!r} if m in sys.modules])"],
+        cwd=project_root, capture_output=True, text=True, check=True
+    ).stdout
+    return eval(salida)
+
+
+def test_punto_de_venta_no_importa_reportlab_al_abrir():
+    assert _modulos_cargados_tras("import ui.punto_venta", ["utils.plantillas_pdf", "reportlab"]) == []
+
+
+def test_pasos_sin_repetir_y_en_orden(monkeypatch):
+    monkeypatch.setattr(carga_diferida, "PRECARGAS", {"a": ["x", "y"], "b": ["y", "z"]})
+    assert carga_diferida.pasos_para(["a", "b", "sin_pasos"]) == ["x", "y", "z"]
+
+
+def test_precarga_en_segundo_plano_salta_los_pasos_que_fallan(monkeypatch):
+    monkeypatch.setattr(carga_diferida, "PRECARGAS", {
+        "prueba": ["colorsys", "modulo_que_no_existe", "fractions:Fraction"],
+    })
+    monkeypatch.setattr(carga_diferida, "tiempos", {})
+    resultado = []
+
+    hilo = carga_diferida.precargar(["prueba"], al_terminar=resultado.append)
+    hilo.join(5)
+
+    assert "colorsys" in sys.modules
+    assert set(resultado[0]) == {"colorsys", "fractions:Fraction"}
+
+
+def test_precarga_desactivada(monkeypatch):
+    monkeypatch.setenv("VENTAS_PRECARGA", "0")
+    assert carga_diferida.precargar(["ventas"]) is None
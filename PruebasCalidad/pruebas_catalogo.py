@@ -0,0 +1,94 @@
+import sys
+import os
+import shutil
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.catalogo import CatalogoProductos, ID, NOMBRE, STOCK, SKU
+from db.ventas import registrar_venta
+
+TOTALES = {"subtotal": 100.0, "iva": 16.0, "total": 116.0}
+
+
+@pytest.fixture
+def catalogo(base_copiada):
+    return CatalogoProductos.compartido()
+
+
+def test_indices_secundarios(catalogo):
+    assert catalogo.obtener(1)[NOMBRE] == "Bocina Bluetooth"
+    assert catalogo.por_sku("boc-01")[ID] == 1
+    assert catalogo.por_codigo_barras(" 7503021234569 ")[ID] == 3
+    assert {f[ID] for f in catalogo.de_categoria("computación")} >= {4, 5}
+    assert [f[ID] for f in catalogo.filas()] == sorted(f[ID] for f in catalogo.filas())
+
+
+def test_escritura_en_productos_invalida(catalogo):
+    version = catalogo.version
+    filas = catalogo.filas()
+    assert catalogo.filas() is filas  # sin escrituras no se relee nada
+
+    db.ejecutar_query("UPDATE Productos SET sku = 'NUEVO-1' WHERE id_producto = 1")
+
+    assert catalogo.por_sku("NUEVO-1")[ID] == 1
+    assert catalogo.por_sku("BOC-01") is None
+    assert catalogo.version > version
+
+
+def test_escrituras_ajenas_no_invalidan(catalogo):
+    catalogo.filas()
+    version = catalogo.version
+    db.ejecutar_query("UPDATE Clientes SET telefono = telefono WHERE id_cliente = 1")
+    catalogo.filas()
+    assert catalogo.version == version
+
+
+def test_venta_relee_solo_sus_productos(catalogo):
+    antes = {f[ID]: f for f in catalogo.filas()}
+    carrito = [{"id_producto": 2, "cantidad": 3, "precio": 10.0}]
+
+    registrar_venta(1, 1, carrito, TOTALES)
+
+    despues = {f[ID]: f for f in catalogo.filas()}
+    assert despues[2][STOCK] == antes[2][STOCK] - 3
+    # Las demás filas son los mismos objetos: no se releyeron
+    assert all(despues[i] is antes[i] for i in antes if i != 2)
+    assert list(despues) == list(antes)
+
+
+def test_altas_bajas_y_vista_de_venta(catalogo):
+    venta = catalogo.productos_venta()
+    assert venta == sorted(venta, key=lambda p: p[1])
+    assert catalogo.productos_venta() is venta
+
+    id_nuevo = db.ejecutar_transaccion([(
+        "INSERT INTO Productos (nombre, precio_venta, costo, sku, stock_actual, estado) VALUES (?, ?, ?, ?, ?, 1)",
+        ("Zzz prueba", 5.0, 2.0, "ZZZ-1", 7)
+    )])
+    assert catalogo.obtener(id_nuevo)[SKU] == "ZZZ-1"
+    assert id_nuevo in [p[0] for p in catalogo.productos_venta()]
+
+    db.ejecutar_query("DELETE FROM Productos WHERE id_producto = ?", (id_nuevo,))
+    assert catalogo.obtener(id_nuevo) is None
+    assert catalogo.por_sku("ZZZ-1") is None
+
+
+def test_cambio_de_base_recarga(catalogo, tmp_path):
+    catalogo.filas()
+    otra = tmp_path / "otra.db"
+    shutil.copyfile(os.path.join(project_root, "data", "ventas.db"), otra)
+    db.configurar_db(otra)
+    db.obtener_gestor().conexion().execute("UPDATE Productos SET nombre = 'Otra base' WHERE id_producto = 1")
+    db.obtener_gestor().conexion().commit()
+    assert catalogo.obtener(1)[NOMBRE] == "Otra base"
+
+
+def test_tabla_escrita():
+    assert db.tabla_escrita("  update Productos set x = 1") == "productos"
+    assert db.tabla_escrita("INSERT OR REPLACE INTO \"Categorias\" VALUES (1)") == "categorias"
+    assert db.tabla_escrita("DELETE FROM Proveedores") == "proveedores"
+    assert db.tabla_escrita("SELECT * FROM Productos") is None
@@ -0,0 +1,68 @@
+import sys
+import os
+import time
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.trabajos import ColaTrabajos
+
+
+class RaizSimulada:
+    """Sustituye a la raíz de Tk: guarda los `after()` para ejecutarlos a mano"""
+    def __init__(self):
+        self.programados = []
+
+    def after(self, ms, funcion):
+        self.programados.append(funcion)
+
+    def bombear(self, limite=5.0):
+        """Simula el bucle de eventos hasta que no queden revisiones pendientes"""
+        fin = time.monotonic() + limite
+        while self.programados and time.monotonic() < fin:
+            self.programados.pop(0)()
+            time.sleep(0.01)
+
+
+def test_entrega_progreso_y_resultado_en_orden():
+    raiz = RaizSimulada()
+    cola = ColaTrabajos(raiz)
+    eventos = []
+
+    def trabajo(x, progreso):
+        progreso(0.5)
+        return x * 2
+
+    cola.enviar(trabajo, 21, al_progreso=lambda p: eventos.append(("p", p)),
+                al_terminar=lambda r: eventos.append(("ok", r)))
+    raiz.bombear()
+
+    assert eventos == [("p", 0.5), ("ok", 42)]
+    assert cola.pendientes() == 0
+    cola.detener()
+
+
+def test_reintenta_antes_de_fallar():
+    raiz = RaizSimulada()
+    cola = ColaTrabajos(raiz, reintentos=2, espera_reintento=0)
+    intentos = []
+    errores = []
+
+    def inestable():
+        intentos.append(1)
+        if len(intentos) < 3:
+            raise IOError("disco ocupado")
+        return "listo"
+
+    resultado = []
+    cola.enviar(inestable, al_terminar=resultado.append, al_fallar=errores.append)
+    raiz.bombear()
+
+    assert resultado == ["listo"] and not errores
+    assert len(intentos) == 3
+
+    cola.enviar(lambda: 1 / 0, al_fallar=errores.append, reintentos=0)
+    raiz.bombear()
+    assert isinstance(errores[0], ZeroDivisionError)
+    cola.detener()
@@ -0,0 +1,89 @@
+import sys
+import os
+import sqlite3
+import threading
+import time
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.ejecutor import EjecutorConsultas
+
+# Cuenta hasta mil millones: tarda lo suficiente para cancelarla a mitad de camino
+CONSULTA_LENTA = """
+    WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 1000000000)
+    SELECT count(*) FROM n
+"""
+
+
+class RaizSimulada:
+    """Sustituye a la raíz de Tk: guarda los `after()` para ejecutarlos a mano"""
+    def __init__(self):
+        self.programados = []
+
+    def after(self, ms, funcion):
+        self.programados.append(funcion)
+
+    def bombear(self, limite=5.0):
+        """Simula el bucle de eventos hasta que no queden revisiones pendientes"""
+        fin = time.monotonic() + limite
+        while self.programados and time.monotonic() < fin:
+            self.programados.pop(0)()
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def ejecutor(base_copiada):
+    raiz = RaizSimulada()
+    ejecutor = EjecutorConsultas(raiz)
+    ejecutor.raiz = raiz
+    yield ejecutor
+    ejecutor.detener()
+
+
+def test_entrega_filas_en_el_hilo_de_tk(ejecutor):
+    recibido = []
+    ejecutor.consultar("clientes", "SELECT count(*) FROM Clientes",
+                       al_terminar=lambda filas: recibido.append((filas[0][0], threading.current_thread())))
+    ejecutor.raiz.bombear()
+
+    total = db.obtener_datos("SELECT count(*) FROM Clientes")[0][0]
+    assert recibido == [(total, threading.main_thread())]
+    assert ejecutor.pendientes() == 0
+
+
+def test_solo_se_entrega_la_ultima_consulta_del_canal(ejecutor):
+    recibido = []
+    for texto in ("a", "an", "ana"):
+        ejecutor.consultar("busqueda", "SELECT ?", (texto,), al_terminar=lambda f: recibido.append(f[0][0]))
+    ejecutor.consultar("otro", "SELECT 'x'", al_terminar=lambda f: recibido.append(f[0][0]))
+    ejecutor.raiz.bombear()
+
+    assert sorted(recibido) == ["ana", "x"]
+    assert ejecutor.pendientes() == 0
+
+
+def test_cancela_la_consulta_en_curso(ejecutor):
+    recibido, errores = [], []
+    ejecutor.consultar("lenta", CONSULTA_LENTA, al_terminar=recibido.append, al_fallar=errores.append)
+    time.sleep(0.2)
+
+    inicio = time.monotonic()
+    ejecutor.consultar("lenta", "SELECT 1", al_terminar=lambda f: recibido.append(f[0][0]))
+    ejecutor.raiz.bombear()
+
+    # La consulta lenta se interrumpió sin esperar a que termine ni reportar error
+    assert recibido == [1] and not errores
+    assert time.monotonic() - inicio < 2
+
+
+def test_conexiones_de_solo_lectura(ejecutor):
+    errores = []
+    ejecutor.consultar("escritura", "DELETE FROM Clientes", al_fallar=errores.append)
+    ejecutor.raiz.bombear()
+
+    assert isinstance(errores[0], sqlite3.OperationalError)
+    assert db.obtener_datos("SELECT count(*) FROM Clientes")[0][0] > 0
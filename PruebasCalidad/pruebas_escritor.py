@@ -0,0 +1,123 @@
+import sys
+import os
+import threading
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.escritor import EscritorUnico
+
+INSERTAR = "INSERT INTO Items (nombre) VALUES (?)"
+
+
+@pytest.fixture
+def gestor(tmp_path):
+    gestor = db.configurar_db(tmp_path / "prueba.db")
+    db.ejecutar_query("CREATE TABLE Items (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL)")
+    yield gestor
+    db.configurar_db()
+
+
+@pytest.fixture
+def escritor(gestor):
+    # Ventana amplia: todo lo enviado seguido cae en el mismo lote
+    escritor = EscritorUnico(gestor, notificar=db.notificar_escritura, ventana_ms=200)
+    yield escritor
+    escritor.detener()
+
+
+def _nombres():
+    return [f[0] for f in db.obtener_datos("SELECT nombre FROM Items ORDER BY id")]
+
+
+def test_agrupa_escrituras_en_un_commit(escritor):
+    futuros = [escritor.enviar([(INSERTAR, (f"item {i}",))]) for i in range(20)]
+
+    ids = [f.result(timeout=5) for f in futuros]
+
+    assert ids == list(range(1, 21))
+    assert escritor.lotes == 1 and escritor.escrituras == 20
+
+
+def test_una_escritura_fallida_no_arrastra_al_lote(escritor):
+    buena = escritor.enviar([(INSERTAR, ("a",))])
+    mala = escritor.enviar([(INSERTAR, ("b",)), (INSERTAR, (None,))])  # viola NOT NULL
+    otra = escritor.enviar([(INSERTAR, ("c",))])
+
+    assert buena.result(timeout=5) and otra.result(timeout=5)
+    with pytest.raises(Exception, match="NOT NULL"):
+        mala.result(timeout=5)
+    assert _nombres() == ["a", "c"]  # "b" se revirtió con su escritura
+
+
+def test_notifica_antes_de_resolver(escritor):
+    antes = db.contador_escrituras("Items")
+    escritor.enviar([(INSERTAR, ("a",))], escrituras=[("Items", None)]).result(timeout=5)
+    assert db.contador_escrituras("Items") == antes + 1
+
+
+def test_un_oyente_no_puede_esperar_al_escritor(escritor):
+    errores = []
+
+    def oyente(tabla, ids):
+        try:
+            escritor.enviar([(INSERTAR, ("desde el oyente",))])
+        except RuntimeError as e:
+            errores.append(e)
+
+    escritor.notificar = oyente
+    escritor.enviar([(INSERTAR, ("a",))], escrituras=[("items", None)]).result(timeout=5)
+    assert len(errores) == 1
+
+
+def test_detenido_rechaza_escrituras(escritor):
+    escritor.detener()
+    with pytest.raises(RuntimeError):
+        escritor.enviar([(INSERTAR, ("a",))])
+
+
+def test_escrituras_concurrentes_del_modulo_db(gestor):
+    escritor = db.obtener_escritor()
+    antes = escritor.escrituras
+
+    def caja(n):
+        for i in range(25):
+            db.ejecutar_query(INSERTAR, (f"caja {n} - {i}",))
+
+    hilos = [threading.Thread(target=caja, args=(n,)) for n in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(_nombres()) == 200
+    assert db.obtener_escritor() is escritor and escritor.escrituras - antes == 200
+
+
+def test_configurar_otra_base_reemplaza_el_escritor(gestor, tmp_path):
+    anterior = db.obtener_escritor()
+    db.configurar_db(tmp_path / "otra.db")
+    assert not anterior.activo()
+    assert db.obtener_escritor() is not anterior
+    assert db.ejecutar_query("CREATE TABLE Otra (id INTEGER PRIMARY KEY)") is not None
+
+
+def test_un_oyente_roto_no_hace_fallar_la_escritura(gestor, caplog):
+    avisados = []
+
+    def roto(tabla, ids):
+        raise RuntimeError("oyente roto")
+
+    db.escuchar_escrituras("items", roto)
+    db.escuchar_escrituras("items", lambda tabla, ids: avisados.append(tabla))
+    try:
+        db.ejecutar_query(INSERTAR, ("a",))
+    finally:
+        db._oyentes.pop("items", None)
+
+    assert _nombres() == ["a"]
+    assert avisados == ["items"]  # el oyente siguiente se enteró igual
+    assert "oyente roto" in caplog.text
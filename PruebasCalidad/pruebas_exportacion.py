@@ -0,0 +1,97 @@
+import sys
+import os
+import csv
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.consultas import rango_fechas
+from db.ventas import registrar_venta
+from utils.exportacion import (COLUMNAS, SQL_DETALLE, contar_detalle_ventas,
+                               exportar_detalle_ventas, formato_de, iterar_detalle_ventas)
+
+DESDE, HASTA = "2000-01-01", "2100-12-31"
+
+
+def test_csv_completo_y_con_avance(base_copiada, tmp_path):
+    total = contar_detalle_ventas(DESDE, HASTA)
+    assert total > 3
+    destino = tmp_path / "detalle.csv"
+    avances = []
+
+    escritas = exportar_detalle_ventas(str(destino), DESDE, HASTA, tamano_bloque=3, progreso=avances.append)
+
+    assert escritas == total
+    with open(destino, encoding="utf-8-sig", newline="") as archivo:
+        filas = list(csv.reader(archivo))
+    assert filas[0] == [nombre for nombre, _ in COLUMNAS]
+    assert len(filas) == total + 1
+    # Un aviso por bloque, creciente y terminando en 1
+    assert len(avances) == -(-total // 3)
+    assert avances == sorted(avances) and avances[-1] == 1.0
+
+
+def test_importe_neto_de_descuentos(base_copiada):
+    carrito = [{"id_producto": 2, "cantidad": 2, "precio": 50.0, "descuento": 0.1}]
+    neto = 2 * 50.0 * (1 - 0.2 - 0.1)
+    id_tx = registrar_venta(1, 1, carrito, {"subtotal": neto, "iva": 0.0, "total": neto},
+                            fecha="2031-07-01 12:00:00", descuento_global=0.2)
+
+    filas = [f for b in iterar_detalle_ventas("2031-07-01", "2031-07-01") for f in b if f[0] == id_tx]
+    columnas = [nombre for nombre, _ in COLUMNAS]
+    fila = dict(zip(columnas, filas[0]))
+    assert fila["descuento"] == pytest.approx(30.0)
+    assert fila["importe"] == pytest.approx(neto)
+    total = db.obtener_datos("SELECT total FROM Transacciones WHERE id_transaccion = ?", (id_tx,))[0][0]
+    assert fila["importe"] == pytest.approx(total)
+
+
+def test_bloques_acotados_y_rango_respetado(base_copiada):
+    bloques = list(iterar_detalle_ventas(DESDE, HASTA, tamano_bloque=4))
+    assert all(len(b) <= 4 for b in bloques)
+    fechas = [fila[1] for bloque in bloques for fila in bloque]
+    assert fechas == sorted(fechas)
+
+    primera = fechas[0][:10]
+    solo_un_dia = [f for b in iterar_detalle_ventas(primera, primera) for f in b]
+    assert solo_un_dia and all(f[1].startswith(primera) for f in solo_un_dia)
+
+
+def test_consulta_no_ordena_en_memoria(base_copiada):
+    # Con temp_store=MEMORY un ORDER BY sin índice acumularía todo el rango en RAM
+    filtro, params = rango_fechas("t.fecha", DESDE, HASTA)
+    conn = db.obtener_gestor().conexion()
+    plan = [fila[3] for fila in conn.execute(f"EXPLAIN QUERY PLAN {SQL_DETALLE.format(filtro=filtro)}", params)]
+    assert not any("TEMP B-TREE" in paso for paso in plan), plan
+
+
+def test_formato_por_extension_y_rango_vacio(base_copiada, tmp_path):
+    assert formato_de("a/b/Detalle.XLSX") == "xlsx"
+    with pytest.raises(ValueError):
+        formato_de("detalle.txt")
+
+    avances = []
+    destino = tmp_path / "vacio.csv"
+    assert exportar_detalle_ventas(str(destino), "1990-01-01", "1990-01-02", progreso=avances.append) == 0
+    assert avances == [1.0]
+    assert destino.read_text(encoding="utf-8-sig").strip() == ",".join(n for n, _ in COLUMNAS)
+
+
+def test_excel_modo_write_only(base_copiada, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    destino = tmp_path / "detalle.xlsx"
+    escritas = exportar_detalle_ventas(str(destino), DESDE, HASTA, tamano_bloque=5)
+    hoja = openpyxl.load_workbook(destino, read_only=True).active
+    assert hoja.max_row == escritas + 1
+
+
+def test_parquet_por_bloques(base_copiada, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    destino = tmp_path / "detalle.parquet"
+    escritas = exportar_detalle_ventas(str(destino), DESDE, HASTA, tamano_bloque=5)
+    archivo = pq.ParquetFile(destino)
+    assert archivo.metadata.num_rows == escritas
+    assert archivo.num_row_groups == -(-escritas // 5)
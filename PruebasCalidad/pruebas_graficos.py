@@ -0,0 +1,37 @@
+import sys
+import os
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+pytest.importorskip("matplotlib")
+
+from matplotlib.figure import Figure
+from ui.components.graficos import PanelGrafico, geometria_pastel
+
+
+def test_geometria_pastel_reparte_360_grados():
+    porciones = geometria_pastel([1, 1, 2], angulo_inicio=45)
+    assert porciones == [(45, 135, 0.25), (135, 225, 0.25), (225, 405, 0.5)]
+    assert geometria_pastel([]) == []
+
+
+@pytest.mark.parametrize("angulo", [0, 45])
+def test_geometria_coincide_con_axes_pie(angulo):
+    valores = [7, 3, 12, 1]
+    porciones, _ = Figure().add_subplot(111).pie(valores, startangle=angulo)
+    esperado = [(p.theta1, p.theta2) for p in porciones]
+    calculado = [(t1, t2) for t1, t2, _ in geometria_pastel(valores, angulo)]
+    assert calculado == pytest.approx(esperado)
+
+
+def test_subclase_incompleta_falla_al_crearse():
+    class SinActualizar(PanelGrafico):
+        def _crear_artistas(self):
+            pass
+
+    # Antes de tocar Tk o matplotlib, no en el primer refresco del dashboard
+    with pytest.raises(TypeError, match="_actualizar_artistas"):
+        SinActualizar(None, "Prueba", 0, 0)
@@ -0,0 +1,177 @@
+import sys
+import os
+import csv
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.catalogo import CatalogoProductos
+from utils.importacion import ENCABEZADOS, ErrorImportacion, formato_de, importar_productos
+from utils.validacion_productos import MENSAJE_PRECIO_COSTO, MENSAJE_REQUERIDO, MENSAJE_STOCKS
+
+
+def _producto(n, **cambios):
+    fila = {
+        "nombre": f"Producto {n}", "descripcion": "", "precio_venta": "15.5", "costo": "10",
+        "codigo_barras": f"990{n:010d}", "sku": f"IMP-{n}", "stock_minimo": "1",
+        "stock_maximo": "20", "stock_actual": "5", "categoria": "audio", "proveedor": "",
+    }
+    fila.update(cambios)
+    return fila
+
+
+def _csv(ruta, filas, delimitador=","):
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=[e.upper() for e in ENCABEZADOS], delimiter=delimitador)
+        escritor.writeheader()
+        for fila in filas:
+            escritor.writerow({clave.upper(): valor for clave, valor in fila.items()})
+    return ruta
+
+
+def _contar_productos():
+    return db.obtener_datos("SELECT COUNT(*) FROM Productos")[0][0]
+
+
+def test_importa_en_bloques_con_avance(base_copiada, tmp_path):
+    antes = _contar_productos()
+    catalogo = CatalogoProductos.compartido()
+    catalogo.productos_venta()
+    avances = []
+
+    resultado = importar_productos(
+        _csv(tmp_path / "catalogo.csv", [_producto(n) for n in range(25)]),
+        tamano_bloque=10, progreso=avances.append
+    )
+
+    assert (resultado.leidas, resultado.insertados, resultado.errores) == (25, 25, [])
+    assert _contar_productos() == antes + 25
+    assert avances == sorted(avances) and avances[-1] == 1.0
+    fila = db.obtener_datos(
+        "SELECT p.precio_venta, p.stock_maximo, c.nombre, p.id_proveedor, p.descripcion, p.estado "
+        "FROM Productos p JOIN Categorias c ON c.id_categoria = p.id_categoria WHERE p.sku = 'IMP-3'"
+    )[0]
+    assert tuple(fila) == (15.5, 20, "Audio", None, None, 1)
+    # La escritura pasó por el escritor: el catálogo en caché se invalidó
+    assert any(p[1] == "Producto 3" for p in catalogo.productos_venta())
+
+
+def test_filas_invalidas_quedan_en_el_reporte(base_copiada, tmp_path):
+    antes = _contar_productos()
+    filas = [
+        _producto(1, nombre=""),
+        _producto(2, precio_venta="abc"),
+        _producto(3, costo="0"),
+        _producto(4, stock_actual="-2"),
+        _producto(5, stock_minimo="30"),
+        _producto(6, categoria="No existe"),
+        _producto(7),
+    ]
+
+    resultado = importar_productos(_csv(tmp_path / "catalogo.csv", filas, delimitador=";"))
+
+    assert resultado.insertados == 1 and resultado.rechazadas == 6
+    errores = {(e.fila, e.campo): e.mensaje for e in resultado.errores}
+    assert errores[(2, "nombre")] == MENSAJE_REQUERIDO
+    assert (3, "precio_venta") in errores
+    assert errores[(4, "costo")] == "Debe ser mayor a 0"
+    assert errores[(5, "stock_actual")] == "No puede ser negativo"
+    assert errores[(6, "stock_maximo")] == MENSAJE_STOCKS
+    assert (7, "categoria") in errores
+    assert _contar_productos() == antes + 1
+
+    reporte = tmp_path / "errores.csv"
+    resultado.guardar_errores(reporte)
+    with open(reporte, encoding="utf-8-sig") as archivo:
+        lineas = list(csv.DictReader(archivo))
+    assert [int(l["fila"]) for l in lineas] == [2, 3, 4, 5, 6, 7]
+
+
+def test_duplicados_contra_la_base_y_dentro_del_archivo(base_copiada, tmp_path):
+    existente = db.obtener_datos("SELECT sku, codigo_barras FROM Productos WHERE sku IS NOT NULL LIMIT 1")[0]
+    filas = [
+        _producto(1, sku=existente[0]),
+        _producto(2, codigo_barras=existente[1]),
+        _producto(3),
+        _producto(4, sku="IMP-3"),
+        _producto(5, sku="IMP-3", codigo_barras="990" + "0" * 9 + "3"),
+    ]
+
+    resultado = importar_productos(_csv(tmp_path / "catalogo.csv", filas), tamano_bloque=2)
+
+    errores = {(e.fila, e.campo): e.mensaje for e in resultado.errores}
+    assert errores == {
+        (2, "sku"): "Este sku ya existe",
+        (3, "codigo_barras"): "Este codigo barras ya existe",
+        (5, "sku"): "Repetido en el archivo (fila 4)",
+        (6, "sku"): "Repetido en el archivo (fila 4)",
+        (6, "codigo_barras"): "Repetido en el archivo (fila 4)",
+    }
+    assert resultado.insertados == 1
+
+
+def test_precio_bajo_costo(base_copiada, tmp_path):
+    ruta = _csv(tmp_path / "catalogo.csv", [_producto(1, precio_venta="5")])
+
+    rechazado = importar_productos(ruta)
+    assert rechazado.insertados == 0 and rechazado.errores[0].mensaje == MENSAJE_PRECIO_COSTO
+
+    aceptado = importar_productos(ruta, aceptar_precio_bajo_costo=True)
+    assert aceptado.insertados == 1 and aceptado.errores == []
+    assert aceptado.advertencias[0].mensaje == MENSAJE_PRECIO_COSTO
+
+
+def test_simulacion_no_inserta(base_copiada, tmp_path):
+    antes = _contar_productos()
+    resultado = importar_productos(
+        _csv(tmp_path / "catalogo.csv", [_producto(1), _producto(2, sku="IMP-1")]), simular=True
+    )
+    assert (resultado.insertados, resultado.rechazadas) == (1, 1)
+    assert "Se insertarían 1 de 2" in resultado.resumen()
+    assert _contar_productos() == antes
+
+
+def test_archivo_danado_a_mitad_informa_lo_ya_insertado(base_copiada, tmp_path):
+    antes = _contar_productos()
+    ruta = _csv(tmp_path / "catalogo.csv", [_producto(n) for n in range(400)])
+    with open(ruta, "ab") as archivo:
+        archivo.write(b"\xff\xfe no es utf-8,1,1\n")  # se lee mucho después de los primeros bloques
+
+    with pytest.raises(ErrorImportacion) as error:
+        importar_productos(ruta, tamano_bloque=50)
+
+    resultado = error.value.resultado
+    assert isinstance(error.value.__cause__, UnicodeDecodeError)
+    assert resultado.insertados > 0
+    assert _contar_productos() == antes + resultado.insertados
+    assert f"{resultado.insertados:,} productos ya quedaron insertados" in str(error.value)
+
+
+def test_columnas_requeridas_y_formato(base_copiada, tmp_path):
+    ruta = tmp_path / "catalogo.csv"
+    ruta.write_text("nombre,precio_venta\nA,10\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="costo"):
+        importar_productos(ruta)
+    with pytest.raises(ValueError):
+        formato_de("catalogo.parquet")
+
+
+def test_excel(base_copiada, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    libro = openpyxl.Workbook()
+    hoja = libro.active
+    hoja.append(ENCABEZADOS)
+    hoja.append(["Cable XLSX", None, 12.5, 8, 7501112223334, "XLS-1", 1, 10, 3.0, "Cables", None])
+    hoja.append(["Cable roto", None, 12.5, 8, None, None, 1, 10, 2.5, None, None])
+    ruta = tmp_path / "catalogo.xlsx"
+    libro.save(ruta)
+
+    resultado = importar_productos(ruta)
+
+    assert resultado.insertados == 1
+    assert resultado.errores[0][:2] == (3, "stock_actual")
+    fila = db.obtener_datos("SELECT codigo_barras, stock_actual FROM Productos WHERE sku = 'XLS-1'")[0]
+    assert tuple(fila) == ("7501112223334", 3)
@@ -0,0 +1,111 @@
+import sys
+import os
+import shutil
+import sqlite3
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db.migraciones import aplicar_migraciones, version_actual, MIGRACIONES
+from db.consultas import rango_fechas, normalizar_fecha
+
+RANGO, _ = rango_fechas("fecha", "2025-01-01", "2025-12-31")
+RANGO_T, _ = rango_fechas("t.fecha", "2025-01-01", "2025-12-31")
+
+# Consultas de las rutas críticas de la app: (nombre, sql, tablas/alias que
+# nunca deben recorrerse completas). Si alguna pierde su índice, la prueba falla.
+CONSULTAS_FRECUENTES = [
+    ("kpi_total_ventas",
+     f"SELECT SUM(total), COUNT(*) FROM Transacciones WHERE tipo='venta' AND {RANGO}",
+     {"Transacciones"}),
+    ("dashboard_top_productos",
+     f"""SELECT p.nombre, SUM(d.cantidad) as total_qty
+        FROM Detalle_transaccion d
+        JOIN Productos p ON d.id_producto = p.id_producto
+        JOIN Transacciones t ON d.id_transaccion = t.id_transaccion
+        WHERE t.tipo='venta' AND {RANGO_T}
+        GROUP BY p.id_producto ORDER BY total_qty DESC LIMIT 5""",
+     {"d", "t", "p"}),
+    ("dashboard_top_clientes",
+     f"""SELECT c.nombres || ' ' || IFNULL(c.apellido_p, ''), SUM(t.total)
+        FROM Transacciones t
+        JOIN Clientes c ON t.id_cliente = c.id_cliente
+        WHERE t.tipo='venta' AND {RANGO_T}
+        GROUP BY c.id_cliente ORDER BY SUM(t.total) DESC LIMIT 5""",
+     {"t", "c"}),
+    ("dashboard_ventas_por_dia",
+     f"""SELECT date(fecha), SUM(total) FROM Transacciones
+        WHERE tipo='venta' AND {RANGO}
+        GROUP BY date(fecha) ORDER BY date(fecha)""",
+     {"Transacciones"}),
+    ("historial_transacciones",
+     f"""SELECT t.id_transaccion, t.fecha,
+            CASE WHEN t.id_cliente IS NOT NULL THEN c.nombres || ' ' || IFNULL(c.apellido_p, '')
+                 ELSE 'Público General' END as ClienteNombre,
+            t.tipo, t.total, t.estado
+        FROM Transacciones t
+        LEFT JOIN Clientes c ON t.id_cliente = c.id_cliente
+        WHERE {RANGO_T}
+        AND (ClienteNombre LIKE ? OR t.id_transaccion LIKE ?)
+        ORDER BY t.fecha DESC""",
+     {"t", "c"}),
+    ("detalle_ticket",
+     """SELECT p.nombre, dt.cantidad, (dt.cantidad * dt.precio_unitario)
+        FROM Detalle_transaccion dt
+        JOIN Productos p ON dt.id_producto = p.id_producto
+        WHERE dt.id_transaccion = ?""",
+     {"dt", "p"}),
+    ("clientes_direccion_principal",
+     """SELECT c.id_cliente, d.calle
+        FROM Clientes c
+        LEFT JOIN Direcciones d ON c.id_cliente = d.id_cliente AND d.principal = 1
+        WHERE c.estado = 1""",
+     {"d"}),
+    ("producto_sku_unico",
+     "SELECT COUNT(*) FROM Productos WHERE sku = ?",
+     {"Productos"}),
+    ("producto_codigo_barras_unico",
+     "SELECT COUNT(*) FROM Productos WHERE codigo_barras = ?",
+     {"Productos"}),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    ruta = tmp_path / "ventas.db"
+    shutil.copyfile(os.path.join(project_root, "data", "ventas.db"), ruta)
+    conn = sqlite3.connect(ruta)
+    aplicar_migraciones(conn)
+    yield conn
+    conn.close()
+
+
+def _tablas_escaneadas(conn, sql):
+    parametros = (None,) * sql.count("?")
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+    return {fila[3].split()[1] for fila in plan if fila[3].startswith("SCAN ")}
+
+
+@pytest.mark.parametrize("nombre,sql,protegidas", CONSULTAS_FRECUENTES, ids=[c[0] for c in CONSULTAS_FRECUENTES])
+def test_consulta_frecuente_usa_indices(conn, nombre, sql, protegidas):
+    escaneadas = _tablas_escaneadas(conn, sql) & protegidas
+    assert not escaneadas, f"{nombre} recorre completas: {escaneadas}"
+
+
+def test_migraciones_son_idempotentes(conn):
+    assert version_actual(conn) == MIGRACIONES[-1][0]
+    assert aplicar_migraciones(conn) == []
+
+
+def test_migracion_normaliza_fechas(conn):
+    fechas = {f for (f,) in conn.execute("SELECT fecha FROM Transacciones UNION SELECT fecha FROM Movimientos")}
+    assert all(len(f) == 19 and f[10] == " " for f in fechas if f)
+
+
+def test_rango_fechas_es_semiabierto():
+    sql, params = rango_fechas("t.fecha", "2025-03-01", "2025-03-31")
+    assert sql == "t.fecha >= ? AND t.fecha < ?"
+    assert params == ("2025-03-01", "2025-04-01")
+    assert normalizar_fecha("2025-03-24T08:32:02.553") == "2025-03-24 08:32:02"
@@ -0,0 +1,75 @@
+import sys
+import os
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.movimientos import ORDENES, consulta_pagina, pagina_movimientos
+
+
+@pytest.fixture
+def base(base_copiada):
+    """Copia migrada de ventas.db con movimientos repetidos y con NULLs"""
+    db.ejecutar_transaccion([
+        ("INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia) VALUES (?,?,?,?,?)",
+         (tipo, fecha, cantidad, 2, referencia))
+        for tipo, fecha, cantidad, referencia in [
+            ("entrada", None, 5, None),
+            ("salida", "2025-01-01 10:00:00", -1, "Venta #1"),
+            ("salida", "2025-01-01 10:00:00", -1, "Venta #1"),
+            ("ajuste", "2025-01-02 10:00:00", 3, "100% revisado"),
+        ] * 5
+    ])
+    return base_copiada
+
+
+def _todas_las_paginas(**filtro):
+    filas, cursor = pagina_movimientos(limite=7, **filtro)
+    paginas = [filas]
+    while cursor is not None:
+        filas, cursor = pagina_movimientos(despues=cursor, limite=7, **filtro)
+        paginas.append(filas)
+    return [f[0] for pagina in paginas for f in pagina]
+
+
+@pytest.mark.parametrize("columna", list(ORDENES))
+@pytest.mark.parametrize("ascendente", [True, False])
+def test_paginas_por_clave_cubren_el_orden_completo(base, columna, ascendente):
+    completo, cursor = pagina_movimientos(columna=columna, ascendente=ascendente, limite=100000)
+    assert cursor is None
+
+    por_paginas = _todas_las_paginas(columna=columna, ascendente=ascendente)
+    assert por_paginas == [f[0] for f in completo]
+
+
+def test_busqueda_por_referencia_producto_e_id(base):
+    assert len(_todas_las_paginas(busqueda="revis")) == 5
+    assert len(_todas_las_paginas(busqueda="100% REVISADO")) == 5
+
+    # Por producto: todos los movimientos sembrados son del producto 2
+    nombre = db.obtener_datos("SELECT nombre FROM Productos WHERE id_producto = 2")[0][0]
+    por_producto = _todas_las_paginas(busqueda=nombre)
+    assert len(por_producto) >= 20
+
+    ultimo = por_producto[0]
+    assert ultimo in _todas_las_paginas(busqueda=str(ultimo))
+    assert _todas_las_paginas(busqueda="%%") == _todas_las_paginas()
+
+
+@pytest.mark.parametrize("columna", ["id_movimiento", "fecha", "tipo", "cantidad"])
+def test_pagina_siguiente_no_ordena_todo_el_historial(base, columna):
+    sql, params = consulta_pagina(columna=columna, despues=("x", 1))
+    conn = db.obtener_gestor().conexion()
+    plan = [fila[3] for fila in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    assert not any("TEMP B-TREE" in paso for paso in plan), plan
+    assert plan[0].startswith("SEARCH m"), plan
+
+
+def test_busqueda_lee_solo_los_ids_que_coinciden(base):
+    sql, params = consulta_pagina(busqueda="venta")
+    conn = db.obtener_gestor().conexion()
+    plan = [fila[3] for fila in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    assert plan[0] == "SEARCH m USING INTEGER PRIMARY KEY (rowid=?)", plan
@@ -0,0 +1,87 @@
+import sys
+import os
+import threading
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.pool import GestorConexiones
+from db.perfiles import obtener_perfil
+
+
+@pytest.fixture
+def gestor(tmp_path):
+    """Gestor compartido apuntando a una base de datos temporal"""
+    gestor = db.configurar_db(tmp_path / "prueba.db")
+    db.ejecutar_query("CREATE TABLE Items (id INTEGER PRIMARY KEY, nombre TEXT)")
+    yield gestor
+    db.configurar_db()
+    gestor.cerrar_todas()
+
+
+def test_reutiliza_conexion_en_el_mismo_hilo(gestor):
+    assert gestor.conexion() is gestor.conexion()
+    db.obtener_datos("SELECT * FROM Items")
+    db.ejecutar_query("INSERT INTO Items (nombre) VALUES (?)", ("a",))
+    assert gestor.total_conexiones() == 1
+
+
+def test_cada_hilo_tiene_su_conexion(gestor):
+    principal = gestor.conexion()
+    resultado = {}
+
+    def trabajo():
+        resultado['conn'] = gestor.conexion()
+        resultado['filas'] = db.obtener_datos("SELECT COUNT(*) FROM Items")[0][0]
+
+    hilo = threading.Thread(target=trabajo)
+    hilo.start()
+    hilo.join()
+
+    assert resultado['conn'] is not principal
+    assert resultado['filas'] == 0
+
+
+def test_transaccion_revierte_si_falla(gestor):
+    with pytest.raises(Exception):
+        db.ejecutar_transaccion([
+            ("INSERT INTO Items (nombre) VALUES (?)", ("a",)),
+            ("INSERT INTO Tabla_inexistente VALUES (1)", ()),
+        ])
+    assert db.obtener_datos("SELECT COUNT(*) FROM Items")[0][0] == 0
+
+
+def test_verificacion_reabre_conexion_cerrada(tmp_path):
+    gestor = GestorConexiones(tmp_path / "salud.db", intervalo_verificacion=0)
+    conn = gestor.conexion()
+    conn.close()
+
+    nueva = gestor.conexion()
+    assert nueva is not conn
+    assert nueva.execute("SELECT 1").fetchone()[0] == 1
+    gestor.cerrar_todas()
+
+
+def test_aplica_pragmas_al_abrir(tmp_path):
+    gestor = GestorConexiones(tmp_path / "pragmas.db", pragmas={"busy_timeout": 1234})
+    assert gestor.conexion().execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+    gestor.cerrar_todas()
+
+
+def test_perfil_rendimiento_activa_wal(tmp_path):
+    gestor = GestorConexiones(tmp_path / "wal.db", pragmas=obtener_perfil("rendimiento"))
+    conn = gestor.conexion()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    gestor.cerrar_todas()
+
+
+def test_perfil_desde_variable_de_entorno(monkeypatch):
+    monkeypatch.setenv("VENTAS_PERFIL_DB", "compatible")
+    assert "journal_mode" not in obtener_perfil()
+    with pytest.raises(ValueError):
+        obtener_perfil("inexistente")
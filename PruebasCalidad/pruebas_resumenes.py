@@ -0,0 +1,113 @@
+import sys
+import os
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.consultas import rango_fechas
+from db.resumenes import (reconstruir_resumenes, top_clientes, top_productos,
+                          totales_periodo, ventas_por_dia)
+from db.ventas import registrar_venta
+
+TOTALES = {"subtotal": 100.0, "iva": 16.0, "total": 116.0}
+DESDE, HASTA = "2000-01-01", "2100-12-31"
+
+
+def _crudo(desde=DESDE, hasta=HASTA):
+    """Lo que calculaba el dashboard sobre las transacciones crudas"""
+    filtro, params = rango_fechas("t.fecha", desde, hasta)
+    kpis = db.obtener_datos(f"SELECT SUM(total), COUNT(*) FROM Transacciones t WHERE tipo='venta' AND {filtro}", params)[0]
+    productos = db.obtener_datos(f"""
+        SELECT d.id_producto, SUM(d.cantidad) FROM Detalle_transaccion d
+        JOIN Transacciones t ON d.id_transaccion = t.id_transaccion
+        WHERE t.tipo='venta' AND {filtro} GROUP BY d.id_producto""", params)
+    dias = db.obtener_datos(f"""
+        SELECT date(fecha), SUM(total) FROM Transacciones t
+        WHERE tipo='venta' AND {filtro} GROUP BY date(fecha) ORDER BY 1""", params)
+    return (round(kpis[0] or 0, 2), kpis[1]), {p: c for p, c in productos}, [(d, round(t, 2)) for d, t in dias]
+
+
+def _resumido(desde=DESDE, hasta=HASTA):
+    filtro, params = rango_fechas("dia", desde, hasta)
+    productos = db.obtener_datos(
+        f"SELECT id_producto, SUM(cantidad) FROM Resumen_producto_dia WHERE {filtro} GROUP BY id_producto", params)
+    total, ventas = totales_periodo(desde, hasta)
+    # Las sumas se agrupan distinto: se comparan al centavo
+    return ((round(total, 2), ventas),
+            {p: c for p, c in productos},
+            [(d, round(t, 2)) for d, t in ventas_por_dia(desde, hasta)])
+
+
+def test_migracion_llena_los_resumenes_con_el_historial(base_copiada):
+    assert _resumido() == _crudo()
+
+
+def test_venta_actualiza_los_resumenes_en_su_transaccion(base_copiada):
+    total, ventas = totales_periodo(DESDE, HASTA)
+    carrito = [{"id_producto": 2, "cantidad": 3, "precio": 20.0}, {"id_producto": 3, "cantidad": 1, "precio": 56.0}]
+    registrar_venta(1, 1, carrito, TOTALES, fecha="2031-05-04 10:00:00")
+    registrar_venta(1, 1, carrito[:1], TOTALES, fecha="2031-05-04 18:30:00")
+
+    assert totales_periodo(DESDE, HASTA) == (pytest.approx(total + 232.0), ventas + 2)
+    assert [tuple(d) for d in ventas_por_dia("2031-05-04", "2031-05-04")] == [("2031-05-04", 232.0)]
+    assert dict(db.obtener_datos(
+        "SELECT id_producto, cantidad FROM Resumen_producto_dia WHERE dia = '2031-05-04'")) == {2: 6, 3: 1}
+    assert tuple(db.obtener_datos(
+        "SELECT total, ventas FROM Resumen_cliente_dia WHERE dia = '2031-05-04' AND id_cliente = 1")[0]) == (232.0, 2)
+    assert _resumido() == _crudo()
+
+    # Si la venta falla, los resúmenes tampoco cambian
+    with pytest.raises(Exception):
+        registrar_venta(1, 1, [{"id_producto": 2, "cantidad": None, "precio": 1.0}], TOTALES, fecha="2031-05-04 20:00:00")
+    assert totales_periodo("2031-05-04", "2031-05-04") == (232.0, 2)
+
+
+def test_importe_por_producto_descuenta_como_el_punto_de_venta(base_copiada):
+    carrito = [{"id_producto": 2, "cantidad": 3, "precio": 20.0, "descuento": 0.05},
+               {"id_producto": 3, "cantidad": 1, "precio": 56.0, "descuento": 0.0}]
+    # Mismas cuentas que PantallaVentas._actualizar_totales, sin IVA para comparar con el total
+    neto = sum(i["precio"] * i["cantidad"] * (1 - 0.10 - i["descuento"]) for i in carrito)
+    id_tx = registrar_venta(1, 1, carrito, {"subtotal": neto, "iva": 0.0, "total": neto},
+                            fecha="2031-06-01 10:00:00", descuento_global=0.10)
+
+    total = db.obtener_datos("SELECT total FROM Transacciones WHERE id_transaccion = ?", (id_tx,))[0][0]
+    importe = "SELECT SUM(importe) FROM Resumen_producto_dia WHERE dia = '2031-06-01'"
+    assert db.obtener_datos(importe)[0][0] == pytest.approx(total)
+    assert dict(db.obtener_datos(
+        "SELECT id_producto, descuento FROM Detalle_transaccion WHERE id_transaccion = ?", (id_tx,)
+    )) == {2: pytest.approx(9.0), 3: pytest.approx(5.6)}
+
+    reconstruir_resumenes(desde="2031-06-01", hasta="2031-06-01")
+    assert db.obtener_datos(importe)[0][0] == pytest.approx(total)
+
+
+def test_reconstruir_un_rango_incorpora_ventas_externas(base_copiada):
+    # Venta escrita sin pasar por registrar_venta
+    id_tx = db.ejecutar_query(
+        "INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) "
+        "VALUES ('venta', '2032-02-10 09:00:00', 1, 1, 10, 0, 10, 'completada')")
+    db.ejecutar_query(
+        "INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario) VALUES (?, 2, 4, 2.5)",
+        (id_tx,))
+    assert totales_periodo("2032-02-01", "2032-02-28") == (0, 0)
+
+    antes = ventas_por_dia(DESDE, "2032-01-31")
+    reconstruir_resumenes(desde="2032-02-01", hasta="2032-02-28")
+
+    assert totales_periodo("2032-02-01", "2032-02-28") == (10.0, 1)
+    assert ventas_por_dia(DESDE, "2032-01-31") == antes
+    assert _resumido() == _crudo()
+
+
+def test_tops_del_dashboard(base_copiada):
+    # La venta no puede dejar stock negativo: se repone antes de vender 500
+    db.ejecutar_query("UPDATE Productos SET stock_actual = 1000 WHERE id_producto = 3")
+    registrar_venta(1, 1, [{"id_producto": 3, "cantidad": 500, "precio": 1.0}],
+                    {"subtotal": 500, "iva": 0, "total": 99999.0}, fecha="2033-01-01")
+    nombre_producto = db.obtener_datos("SELECT nombre FROM Productos WHERE id_producto = 3")[0][0]
+    assert tuple(top_productos("2033-01-01", "2033-01-01")[0]) == (nombre_producto, 500)
+    assert top_clientes("2033-01-01", "2033-01-01")[0][1] == 99999.0
+    assert top_productos("2034-01-01", "2034-12-31") == []
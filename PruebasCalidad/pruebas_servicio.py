@@ -0,0 +1,127 @@
+import sys
+import os
+import http.client
+import threading
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.servicio import ClienteVentas, ErrorServicio, ServicioVentas, cliente_configurado
+from db.stock import StockInsuficiente
+
+TOTALES = {"subtotal": 10.0, "iva": 0.0, "total": 10.0}
+
+
+@pytest.fixture
+def cliente(base_copiada):
+    """Servicio en 127.0.0.1 (puerto libre) sobre una copia de ventas.db"""
+    db.ejecutar_query("UPDATE Productos SET stock_actual = 50, estado = 1 WHERE id_producto = 2")
+    servicio = ServicioVentas(puerto=0)
+    cliente = ClienteVentas(servicio.iniciar())
+    yield cliente
+    cliente.cerrar()
+    servicio.detener()
+
+
+def _stock(productos, id_producto):
+    return next(p[5] for p in productos if p[0] == id_producto)
+
+
+def test_catalogo_no_se_reenvia_si_no_cambio(cliente):
+    productos = cliente.productos_venta()
+    assert _stock(productos, 2) == 50
+    assert cliente.productos_venta() is productos  # 304: misma lista
+
+    cliente.registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 3, "precio": 10.0}], TOTALES)
+
+    nuevos = cliente.productos_venta()
+    assert nuevos is not productos and _stock(nuevos, 2) == 47
+
+
+def test_registra_la_venta_en_la_base(cliente):
+    id_tx = cliente.registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 1, "precio": 10.0, "nombre": "ignorado"}],
+                                    TOTALES, fecha="2031-05-04 10:00:00")
+    fila = db.obtener_datos("SELECT fecha, total FROM Transacciones WHERE id_transaccion = ?", (id_tx,))[0]
+    assert tuple(fila) == ("2031-05-04 10:00:00", 10.0)
+
+
+def test_conflicto_de_stock_llega_a_la_caja(cliente):
+    with pytest.raises(StockInsuficiente) as error:
+        cliente.registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 51, "precio": 10.0}], TOTALES)
+    conflicto = error.value.conflictos[0]
+    assert (conflicto.id_producto, conflicto.solicitado, conflicto.disponible) == (2, 51, 50)
+    assert cliente.salud()["conflictos"] == 1
+
+
+def test_pedido_mal_formado(cliente):
+    with pytest.raises(ErrorServicio) as error:
+        cliente.registrar_venta(1, 1, [{"cantidad": 1, "precio": 10.0}], TOTALES)
+    assert error.value.estado == 400
+
+
+def test_venta_reenviada_tras_perder_la_respuesta_no_se_duplica(cliente):
+    cliente.productos_venta()  # deja abierta la conexión persistente
+    conn = cliente._local.conn
+    original = conn.getresponse
+
+    def perder_respuesta():
+        original().read()  # el servicio ya registró la venta
+        raise http.client.RemoteDisconnected("conexión cerrada sin respuesta")
+
+    conn.getresponse = perder_respuesta
+    antes = db.obtener_datos("SELECT COUNT(*) FROM Transacciones")[0][0]
+
+    id_tx = cliente.registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 1, "precio": 10.0}], TOTALES)
+
+    assert db.obtener_datos("SELECT COUNT(*) FROM Transacciones")[0][0] == antes + 1
+    assert db.obtener_datos("SELECT MAX(id_transaccion) FROM Transacciones")[0][0] == id_tx
+    assert cliente.salud()["ventas"] == 1
+
+
+def test_post_sin_clave_no_se_reintenta(cliente):
+    cliente.productos_venta()
+
+    def sin_respuesta():
+        raise http.client.RemoteDisconnected("conexión cerrada sin respuesta")
+
+    cliente._local.conn.getresponse = sin_respuesta
+    with pytest.raises(http.client.RemoteDisconnected):
+        cliente._pedir("POST", "/ventas", {"carrito": []})
+
+
+def test_varias_cajas_no_sobrevenden(cliente):
+    resultados = {"ventas": 0, "rechazos": 0}
+    lock = threading.Lock()
+
+    def caja():
+        propio = ClienteVentas(cliente.url)
+        for _ in range(10):
+            try:
+                propio.registrar_venta(1, 1, [{"id_producto": 2, "cantidad": 1, "precio": 10.0}], TOTALES)
+                clave = "ventas"
+            except StockInsuficiente:
+                clave = "rechazos"
+            with lock:
+                resultados[clave] += 1
+        propio.cerrar()
+
+    hilos = [threading.Thread(target=caja) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert resultados == {"ventas": 50, "rechazos": 30}
+    assert db.obtener_datos("SELECT stock_actual FROM Productos WHERE id_producto = 2")[0][0] == 0
+    salud = cliente.salud()
+    assert salud["ventas"] == 50 and salud["commits"] <= salud["escrituras"]
+
+
+def test_sin_url_la_caja_escribe_directo(monkeypatch):
+    monkeypatch.delenv("VENTAS_SERVICIO_URL", raising=False)
+    assert cliente_configurado() is None
+    monkeypatch.setenv("VENTAS_SERVICIO_URL", "http://127.0.0.1:9/")
+    assert cliente_configurado().url == "http://127.0.0.1:9"
@@ -0,0 +1,102 @@
+import sys
+import os
+import sqlite3
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.movimientos import registrar_movimiento
+from db.stock import StockInsuficiente, descontar_stock
+from db.ventas import registrar_venta
+
+TOTALES = {"subtotal": 100.0, "iva": 16.0, "total": 116.0}
+
+
+@pytest.fixture
+def base(base_copiada):
+    db.ejecutar_query("UPDATE Productos SET stock_actual = 5 WHERE id_producto IN (2, 3)")
+    return base_copiada
+
+
+def _stock(id_producto):
+    return db.obtener_datos("SELECT stock_actual FROM Productos WHERE id_producto = ?", (id_producto,))[0][0]
+
+
+def _contar(tabla):
+    return db.obtener_datos(f"SELECT COUNT(*) FROM {tabla}")[0][0]
+
+
+def test_venta_sin_stock_no_deja_rastro_y_reporta_cada_producto(base):
+    transacciones, movimientos = _contar("Transacciones"), _contar("Movimientos")
+    carrito = [
+        {"id_producto": 2, "cantidad": 6, "precio": 10.0},
+        {"id_producto": 3, "cantidad": 9, "precio": 10.0},
+    ]
+
+    with pytest.raises(StockInsuficiente) as error:
+        registrar_venta(1, 1, carrito, TOTALES)
+
+    assert [(c.id_producto, c.solicitado, c.disponible) for c in error.value.conflictos] == [(2, 6, 5), (3, 9, 5)]
+    assert "2 productos" in error.value.reporte()
+    assert (_stock(2), _stock(3)) == (5, 5)
+    assert (_contar("Transacciones"), _contar("Movimientos")) == (transacciones, movimientos)
+
+
+def test_un_producto_sin_stock_revierte_los_demas(base):
+    carrito = [
+        {"id_producto": 2, "cantidad": 1, "precio": 10.0},
+        {"id_producto": 3, "cantidad": 6, "precio": 10.0},
+    ]
+    with pytest.raises(StockInsuficiente) as error:
+        registrar_venta(1, 1, carrito, TOTALES)
+
+    assert str(error.value) == "Stock insuficiente. Disponible: 5\nSolicitado: 6"
+    assert _stock(2) == 5
+
+
+def test_lineas_repetidas_se_suman(base):
+    repetido = [{"id_producto": 2, "cantidad": 3, "precio": 10.0}] * 2
+    with pytest.raises(StockInsuficiente):
+        registrar_venta(1, 1, repetido, TOTALES)
+
+    registrar_venta(1, 1, repetido[:1] + [{"id_producto": 2, "cantidad": 2, "precio": 10.0}], TOTALES)
+    assert _stock(2) == 0
+
+
+def test_movimientos_de_salida_no_dejan_stock_negativo(base):
+    antes = _contar("Movimientos")
+    with pytest.raises(StockInsuficiente):
+        registrar_movimiento("salida", 6, 2, "Merma")
+    assert (_stock(2), _contar("Movimientos")) == (5, antes)
+
+    registrar_movimiento("entrada", 10, 2, "Compra")
+    id_movimiento = registrar_movimiento("transferencia", 12, 2, "Sucursal")
+    assert _stock(2) == 3
+    cantidad = db.obtener_datos("SELECT cantidad FROM Movimientos WHERE id_movimiento = ?", (id_movimiento,))[0][0]
+    assert cantidad == -12
+
+
+def test_dos_cajas_no_venden_la_misma_unidad(base):
+    # Ambas cajas "vieron" 5 unidades; la segunda confirma después
+    caja_a = sqlite3.connect(base, isolation_level=None)
+    caja_b = sqlite3.connect(base, isolation_level=None, timeout=0.1)
+    try:
+        caja_a.execute("BEGIN IMMEDIATE")
+        descontar_stock(caja_a, [(2, 4)])
+        with pytest.raises(sqlite3.OperationalError):
+            caja_b.execute("BEGIN IMMEDIATE")  # espera el lock de escritura
+        caja_a.execute("COMMIT")
+
+        caja_b.execute("BEGIN IMMEDIATE")
+        with pytest.raises(StockInsuficiente) as error:
+            descontar_stock(caja_b, [(2, 4)])
+        caja_b.execute("ROLLBACK")
+    finally:
+        caja_a.close()
+        caja_b.close()
+
+    assert error.value.conflictos[0].disponible == 1
+    assert _stock(2) == 1
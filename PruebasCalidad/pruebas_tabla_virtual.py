@@ -0,0 +1,56 @@
+import sys
+import os
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from ui.components.tabla_virtual import FuenteFilas
+
+COLUMNAS = ["id", "nombre", "stock"]
+
+
+def test_ventana_no_se_sale_de_los_datos():
+    fuente = FuenteFilas(COLUMNAS)
+    fuente.establecer([(i, f"p{i}", i) for i in range(100)])
+
+    assert fuente.limitar_inicio(50, 20) == 50
+    assert [f[0] for f in fuente.ventana(20)] == list(range(50, 70))
+
+    # Al final la ventana se ajusta para seguir llena; al principio no baja de 0
+    assert fuente.limitar_inicio(95, 20) == 80
+    assert fuente.limitar_inicio(-5, 20) == 0
+
+    fuente.establecer([(1, "a", 1)])
+    assert fuente.limitar_inicio(10, 20) == 0
+    assert len(fuente.ventana(20)) == 1
+
+
+def test_orden_en_memoria_alterna_y_se_reaplica():
+    fuente = FuenteFilas(COLUMNAS)
+    fuente.establecer([(1, "beta", 5), (2, "Alfa", None), (3, "gamma", 1)])
+
+    fuente.ordenar("nombre")
+    assert [f[0] for f in fuente.filas] == [2, 1, 3]
+    fuente.ordenar("nombre")
+    assert [f[0] for f in fuente.filas] == [3, 1, 2]
+
+    # Los None quedan al final en orden ascendente
+    fuente.ordenar("stock")
+    assert [f[0] for f in fuente.filas] == [3, 1, 2]
+
+    # Datos nuevos (p. ej. tras filtrar) conservan el orden elegido
+    fuente.establecer([(4, "x", 9), (5, "y", 0)])
+    assert [f[0] for f in fuente.filas] == [5, 4]
+
+
+def test_clave_personalizada_y_orden_externo():
+    fuente = FuenteFilas(COLUMNAS, claves={"nombre": lambda f: len(f[1])})
+    fuente.establecer([(1, "ccc", 0), (2, "a", 0), (3, "bb", 0)])
+    fuente.ordenar("nombre")
+    assert [f[0] for f in fuente.filas] == [2, 3, 1]
+
+    # Con orden resuelto fuera (SQL) las filas se respetan tal como llegan
+    assert fuente.cambiar_orden("id") == ("id", True)
+    fuente.establecer([(9, "z", 0), (1, "a", 0)], ordenar=False)
+    assert [f[0] for f in fuente.filas] == [9, 1]
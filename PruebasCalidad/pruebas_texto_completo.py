@@ -0,0 +1,69 @@
+import sys
+import os
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.texto_completo import buscar_ids, expresion_fts
+
+
+def _nuevo_cliente(nombres, apellido_p, rfc=None):
+    return db.ejecutar_query(
+        "INSERT INTO Clientes (nombres, apellido_p, rfc, tipo_persona, estado) VALUES (?, ?, ?, 'Física', 1)",
+        (nombres, apellido_p, rfc)
+    )
+
+
+def test_expresion_fts_descarta_sintaxis():
+    assert expresion_fts("caf mol") == '"caf"* "mol"*'
+    assert expresion_fts('a" OR NEAR(b') == '"a"* "OR"* "NEAR"* "b"*'
+    assert expresion_fts("  %-* ") is None
+
+
+def test_indexa_filas_existentes(base_copiada):
+    existente = db.obtener_datos("SELECT id_cliente, nombres FROM Clientes LIMIT 1")[0]
+    assert existente[0] in buscar_ids("Clientes", existente[1])
+
+
+def test_triggers_mantienen_el_indice(base_copiada):
+    id_cliente = _nuevo_cliente("Zacarías", "Quintanilla", "QUZA800101AB1")
+
+    # Prefijo, sin acentos y sin distinguir mayúsculas
+    assert buscar_ids("Clientes", "zacar") == [id_cliente]
+    assert buscar_ids("Clientes", "quza8") == [id_cliente]
+
+    db.ejecutar_query("UPDATE Clientes SET apellido_p = 'Valdivia' WHERE id_cliente = ?", (id_cliente,))
+    assert buscar_ids("Clientes", "quintanilla") == []
+    assert buscar_ids("Clientes", "valdiv") == [id_cliente]
+
+    # Cambios en columnas no indexadas no alteran el índice
+    db.ejecutar_query("UPDATE Clientes SET estado = 0 WHERE id_cliente = ?", (id_cliente,))
+    assert buscar_ids("Clientes", "valdivia") == [id_cliente]
+
+    db.ejecutar_query("DELETE FROM Clientes WHERE id_cliente = ?", (id_cliente,))
+    assert buscar_ids("Clientes", "zacarias") == []
+
+
+def test_resultados_ordenados_por_relevancia(base_copiada):
+    solo_nombre = _nuevo_cliente("Xiomara", "Ortega")
+    dos_campos = _nuevo_cliente("Xiomara", "Xiomara")
+    assert buscar_ids("Clientes", "xiomara") == [dos_campos, solo_nombre]
+    assert buscar_ids("Clientes", "xiomara", limite=1) == [dos_campos]
+
+
+def test_productos_y_movimientos(base_copiada):
+    id_producto = db.ejecutar_query(
+        "INSERT INTO Productos (nombre, precio_venta, costo, sku, codigo_barras, stock_actual, estado) "
+        "VALUES ('Té Chai Especiado', 10, 5, 'TCH-77', '7509999000017', 3, 1)"
+    )
+    assert buscar_ids("Productos", "te chai") == [id_producto]
+    assert buscar_ids("Productos", "tch-77") == [id_producto]
+    assert buscar_ids("Productos", "75099990") == [id_producto]
+
+    id_mov = db.ejecutar_query(
+        "INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia) "
+        "VALUES ('ajuste', '2025-01-01 00:00:00', 1, ?, 'Merma por humedad')", (id_producto,)
+    )
+    assert buscar_ids("Movimientos", "humed") == [id_mov]
@@ -2,7 +2,7 @@ import sys
 import os
 import pytest
 import tkinter as tk
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # --- Configuraci�n del entorno ---
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -24,10 +24,12 @@ DATOS_MOCK = [
 def pantalla_movimientos():
     """
     Crea una instancia de PantallaMovimientos en un entorno controlado para cada prueba.
+    La primera página se simula sin cursor (no hay más filas).
     """
     root = tk.Tk()
-    with patch('ui.movimientos.obtener_datos', return_value=DATOS_MOCK):
+    with patch('ui.movimientos.pagina_movimientos', return_value=(DATOS_MOCK, None)) as mock_pagina:
         app = PantallaMovimientos(root)
+        app.mock_pagina = mock_pagina
         yield app
     root.destroy()
 
@@ -35,90 +37,67 @@ def pantalla_movimientos():
 
 def test_carga_inicial_de_datos(pantalla_movimientos):
     """
-    Verifica que los datos se cargan correctamente al inicializar el componente.
+    Verifica que la primera página se pide con el orden por defecto y llega a la tabla.
     """
-    assert pantalla_movimientos.datos == DATOS_MOCK
-    
-    with patch('ui.movimientos.obtener_datos') as mock_obtener_datos:
-        pantalla_movimientos.sort_column = 'm.id_movimiento'
-        pantalla_movimientos.sort_ascending = False
-        
-        pantalla_movimientos._cargar_datos()
-        mock_obtener_datos.assert_called_once()
-        
-        query_base = """
-            SELECT 
-                m.id_movimiento,
-                m.tipo,
-                strftime('%d/%m/%Y %H:%M', m.fecha) as fecha_formateada,
-                m.cantidad,
-                p.nombre AS producto,
-                COALESCE(u.nombres || ' ' || u.apellido_p, 'Sistema') AS usuario,
-                m.referencia
-            FROM Movimientos m
-            LEFT JOIN Productos p ON m.id_producto = p.id_producto
-            LEFT JOIN Usuarios u ON m.id_usuario = u.id_usuario
-            ORDER BY {} {}
-        """
-        query_esperada = query_base.format(
-            pantalla_movimientos.sort_column, 
-            'ASC' if pantalla_movimientos.sort_ascending else 'DESC'
-        )
-
-        args, _ = mock_obtener_datos.call_args
-        query_real = args[0]
-        
-        assert ' '.join(query_real.split()) == ' '.join(query_esperada.split())
+    assert list(pantalla_movimientos.tabla.filas()) == DATOS_MOCK
+    pantalla_movimientos.mock_pagina.assert_called_once_with("", 'id_movimiento', False)
 
 
 def test_aplicar_filtros(pantalla_movimientos):
     """
-    Prueba la l�gica de filtrado de datos seg�n el texto de b�squeda.
+    La búsqueda se resuelve en SQL: el texto se pasa a la consulta paginada.
     """
-    pantalla_movimientos.datos = DATOS_MOCK
-    pantalla_movimientos._actualizar_tabla = MagicMock()
+    pantalla_movimientos.mock_pagina.reset_mock()
+    pantalla_movimientos.mock_pagina.return_value = ([DATOS_MOCK[1]], None)
 
-    # Probamos con un filtro que no tenga acento.
     pantalla_movimientos.entrada_busqueda.insert(0, "mouse")
-    pantalla_movimientos._aplicar_filtros()
-    
-    args, _ = pantalla_movimientos._actualizar_tabla.call_args
-    datos_filtrados = args[0]
-    
+    pantalla_movimientos._filtrar()
+
+    pantalla_movimientos.mock_pagina.assert_called_once_with("mouse", 'id_movimiento', False)
+    datos_filtrados = pantalla_movimientos.tabla.filas()
     assert len(datos_filtrados) == 1
     assert datos_filtrados[0][4] == "Mouse Inalambrico"
 
 def test_ordenar_por_columna(pantalla_movimientos):
     """
-    Verifica que las propiedades de ordenaci�n cambian correctamente al llamar al m�todo.
+    Verifica que las propiedades de ordenación cambian según lo que pide la tabla.
     """
-    with patch.object(pantalla_movimientos, '_cargar_datos') as mock_cargar, \
-         patch.object(pantalla_movimientos, '_aplicar_filtros') as mock_filtrar:
+    with patch.object(pantalla_movimientos, '_cargar_datos') as mock_cargar:
 
-        pantalla_movimientos._ordenar_por_columna('producto')
-        assert pantalla_movimientos.sort_column == 'p.nombre'
+        pantalla_movimientos._ordenar_por_columna('producto', True)
+        assert pantalla_movimientos.sort_column == 'producto'
         assert pantalla_movimientos.sort_ascending is True
 
-        pantalla_movimientos._ordenar_por_columna('producto')
+        pantalla_movimientos._ordenar_por_columna('producto', False)
         assert pantalla_movimientos.sort_ascending is False
 
-        pantalla_movimientos._ordenar_por_columna('fecha')
-        assert pantalla_movimientos.sort_column == 'm.fecha'
+        pantalla_movimientos._ordenar_por_columna('fecha', True)
+        assert pantalla_movimientos.sort_column == 'fecha'
         assert pantalla_movimientos.sort_ascending is True
 
         assert mock_cargar.call_count == 3
-        assert mock_filtrar.call_count == 3
+
+def test_carga_perezosa_de_paginas(pantalla_movimientos):
+    """
+    La página siguiente se pide con el cursor de la anterior y se agrega al final.
+    """
+    extra = (4, 'SALIDA', '17/10/2025 12:00', -1, 'Monitor', 'Vendedor 1', 'Venta #9')
+    pantalla_movimientos._cursor = ('x', 3)
+    pantalla_movimientos.mock_pagina.return_value = ([extra], None)
+
+    pantalla_movimientos._cargar_siguiente_pagina()
+
+    _, kwargs = pantalla_movimientos.mock_pagina.call_args
+    assert kwargs['despues'] == ('x', 3)
+    assert list(pantalla_movimientos.tabla.filas()) == DATOS_MOCK + [extra]
+    assert pantalla_movimientos._cursor is None
 
 def test_formato_cantidad_en_actualizar_tabla(pantalla_movimientos):
     """
     Verifica que la cantidad se formatea con un signo '+' para valores positivos.
     """
-    pantalla_movimientos.tabla.insert = MagicMock()
-    pantalla_movimientos._actualizar_tabla(DATOS_MOCK)
-
-    llamadas = pantalla_movimientos.tabla.insert.call_args_list
-    valores_pasados = [c.kwargs['values'] for c in llamadas]
+    valores_pasados = [pantalla_movimientos._formatear_fila(fila) for fila in DATOS_MOCK]
     
     assert valores_pasados[0][3] == "+10"
     assert valores_pasados[1][3] == "-5"
-    assert valores_pasados[2][3] == "+20"   
\ No newline at end of file
+    assert valores_pasados[2][3] == "+20"
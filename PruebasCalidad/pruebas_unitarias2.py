@@ -37,9 +37,9 @@ def test_construir_where_clause(pantalla_clientes):
     assert pantalla_clientes._construir_where() == ""
 
     # Escenario 2: Solo con filtro de búsqueda
+    # La búsqueda se une con Clientes_fts en el FROM, no agrega condiciones al WHERE
     pantalla_clientes.filtros = {'busqueda': 'Juan', 'estado': 'Todos'}
-    expected_search = "WHERE c.nombres LIKE ? OR c.apellido_p LIKE ? OR c.apellido_m LIKE ? OR c.rfc LIKE ?"
-    assert pantalla_clientes._construir_where() == expected_search
+    assert pantalla_clientes._construir_where() == ""
 
     # Escenario 3: Solo con filtro de estado 'Activo'
     pantalla_clientes.filtros = {'busqueda': '', 'estado': 'Activo'}
@@ -47,11 +47,7 @@ def test_construir_where_clause(pantalla_clientes):
 
     # Escenario 4: Con ambos filtros
     pantalla_clientes.filtros = {'busqueda': 'Perez', 'estado': 'Inactivo'}
-    expected_both = "WHERE (c.nombres LIKE ? OR c.apellido_p LIKE ? OR c.apellido_m LIKE ? OR c.rfc LIKE ?) AND c.estado = ?"
-    # La implementación actual une con AND, pero la prueba detectaría si cambia.
-    # Corregimos la prueba para que coincida con la lógica de concatenación simple del código.
-    expected_both_actual_logic = "WHERE " + " AND ".join([" OR ".join([f"{campo} LIKE ?" for campo in pantalla_clientes.CAMPOS_BUSQUEDA]), "c.estado = ?"])
-    assert pantalla_clientes._construir_where() == expected_both_actual_logic
+    assert pantalla_clientes._construir_where() == "WHERE c.estado = ?"
 
 def test_construir_orden_clause(pantalla_clientes):
     """
@@ -61,6 +57,9 @@ def test_construir_orden_clause(pantalla_clientes):
     pantalla_clientes.orden = {'columna': None, 'ascendente': True}
     assert pantalla_clientes._construir_orden() == "c.id_cliente DESC"
 
+    # Al buscar sin columna elegida, primero los más relevantes
+    assert pantalla_clientes._construir_orden(por_relevancia=True) == "f.rank, c.id_cliente"
+
     # Orden por nombre descendente
     pantalla_clientes.orden = {'columna': 'nombre_completo', 'ascendente': False}
     assert pantalla_clientes._construir_orden() == "nombre_completo DESC"
\ No newline at end of file
@@ -37,22 +37,16 @@ def test_actualizar_boton_estado_segun_seleccion_en_tabla(pantalla_clientes):
     Esta prueba ahora pasa exitosamente.
     """
     # Escenario 1: No hay ningún ítem seleccionado.
-    pantalla_clientes.tabla.focus.return_value = ''
+    pantalla_clientes.tabla.seleccionada.return_value = None
     pantalla_clientes._actualizar_boton_estado()
     pantalla_clientes.btn_estado.config.assert_called_once_with(state="disabled")
 
     pantalla_clientes.btn_estado.config.reset_mock()
 
     # Escenario 2: Un ítem es seleccionado.
-    pantalla_clientes.tabla.focus.return_value = 'I001'
-
-    # ### CORRECCIÓN ###
-    # El método .item(..., "values") devuelve una TUPLA, no un diccionario.
-    # Se ajusta el mock para que devuelva una tupla de valores simulados.
-    pantalla_clientes.tabla.item.return_value = ('10', 'Ana', 'Física', 'Calle Falsa 123')
+    # TablaVirtual devuelve la fila de datos seleccionada (no el item del Treeview)
+    pantalla_clientes.tabla.seleccionada.return_value = (10, 'Ana', 'Física', 'Calle Falsa 123')
 
     pantalla_clientes._actualizar_boton_estado()
 
-    # La lógica del método _actualizar_boton_estado solo verifica si "valores" no es vacío,
-    # por lo que ahora funciona correctamente y habilita el botón.
-    pantalla_clientes.btn_estado.config.assert_called_once_with(state="normal")
\ No newline at end of file
+    pantalla_clientes.btn_estado.config.assert_called_once_with(state="normal")
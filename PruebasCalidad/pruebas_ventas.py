@@ -0,0 +1,49 @@
+import sys
+import os
+import pytest
+
+# --- Configuración del entorno ---
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from db import db
+from db.ventas import registrar_venta
+
+TOTALES = {"subtotal": 100.0, "iva": 16.0, "total": 116.0}
+
+
+def _stock(id_producto):
+    return db.obtener_datos("SELECT stock_actual FROM Productos WHERE id_producto = ?", (id_producto,))[0][0]
+
+
+def test_registra_cabecera_detalle_y_stock(base_copiada):
+    stock_1, stock_2 = _stock(2), _stock(3)
+    carrito = [
+        {"id_producto": 2, "cantidad": 2, "precio": 50.0, "descuento": 0.0},
+        {"id_producto": 3, "cantidad": 1, "precio": 10.0, "descuento": 0.0},
+    ]
+
+    id_tx = registrar_venta(1, 1, carrito, TOTALES)
+
+    cabecera = db.obtener_datos("SELECT tipo, total, estado FROM Transacciones WHERE id_transaccion = ?", (id_tx,))
+    assert tuple(cabecera[0]) == ("venta", 116.0, "completada")
+    detalle = db.obtener_datos("SELECT id_producto, cantidad FROM Detalle_transaccion WHERE id_transaccion = ? ORDER BY id_producto", (id_tx,))
+    assert [tuple(d) for d in detalle] == [(2, 2), (3, 1)]
+    movimientos = db.obtener_datos("SELECT cantidad FROM Movimientos WHERE referencia = ?", (f"Venta #{id_tx}",))
+    assert sorted(m[0] for m in movimientos) == [-2, -1]
+    assert (_stock(2), _stock(3)) == (stock_1 - 2, stock_2 - 1)
+
+
+def test_no_deja_cabeceras_huerfanas_si_falla(base_copiada):
+    antes = db.obtener_datos("SELECT COUNT(*) FROM Transacciones")[0][0]
+    stock = _stock(2)
+    carrito = [
+        {"id_producto": 2, "cantidad": 1, "precio": 50.0},
+        {"id_producto": 3, "cantidad": None, "precio": 10.0},  # viola NOT NULL
+    ]
+
+    with pytest.raises(Exception):
+        registrar_venta(1, 1, carrito, TOTALES)
+
+    assert db.obtener_datos("SELECT COUNT(*) FROM Transacciones")[0][0] == antes
+    assert _stock(2) == stock
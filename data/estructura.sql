@@ -168,3 +168,7 @@ CREATE TABLE Usuarios (
     permisos TEXT,
     estado INTEGER
 );
+
+
+-- Los índices y cambios posteriores al esquema base se aplican con
+-- migraciones versionadas: ver db/migraciones.py (python -m db.migraciones)
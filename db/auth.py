@@ -1,13 +1,8 @@
-import sqlite3
+from db.db import obtener_datos
 
 def obtener_usuario(correo):
-    conn = sqlite3.connect("data/ventas.db")
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM Usuarios WHERE correo = ?", (correo,))
-    row = cur.fetchone()
-    conn.close()
+    filas = obtener_datos("SELECT * FROM Usuarios WHERE correo = ?", (correo,))
 
-    if row:
-        return dict(row)
+    if filas:
+        return dict(filas[0])
     return None
@@ -0,0 +1,198 @@
+"""
+Detección de cambios para no recargar pantallas ni cachés sin necesidad.
+
+Combina dos fuentes:
+- Los contadores por tabla de db.db, que suben con cada commit de este
+  proceso (ejecutar_query, ejecutar_transaccion, registrar_venta...). Dicen
+  exactamente qué tabla cambió.
+- PRAGMA data_version de una conexión propia, que cambia cuando cualquier
+  otra conexión confirma algo. Se lee justo antes y justo después de cada
+  commit local (ganchos antes_de_confirmar y despues_de_confirmar del
+  gestor) sin soltar el lock entre ambas lecturas, así que lo que cambie
+  fuera de esos momentos viene de otro proceso (otra caja, la CLI de
+  resúmenes). Como no se sabe qué tablas tocó, cuenta como cambio de todas.
+
+Uso:
+    marca = version("Clientes", "Direcciones")
+    ...
+    if cambio_desde(marca, "Clientes", "Direcciones"):
+        recargar()
+
+Las pantallas abiertas pueden además sondear cada pocos segundos (Sondeo);
+el intervalo se cambia con VENTAS_SONDEO_MS y 0 lo desactiva.
+"""
+import os
+import threading
+
+from db.db import contador_escrituras, obtener_gestor
+
+# Cada cuánto revisa una pantalla abierta si otro proceso escribió
+INTERVALO_SONDEO_MS = 5000
+
+
+def intervalo_sondeo():
+    """Intervalo configurado en VENTAS_SONDEO_MS (0 = sin sondeo)"""
+    try:
+        return max(0, int(os.environ.get("VENTAS_SONDEO_MS", INTERVALO_SONDEO_MS)))
+    except ValueError:
+        return INTERVALO_SONDEO_MS
+
+
+class ObservadorCambios:
+    """
+    Lleva la cuenta de los cambios hechos por otros procesos.
+
+    Atributos:
+        externos (int): Veces que se detectó una escritura ajena a este proceso
+    """
+
+    _compartido = None
+    _lock_compartido = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gestor = None
+        self._conn = None
+        self._data_version = None
+        self.externos = 0
+
+    @classmethod
+    def compartido(cls):
+        """Observador único del proceso"""
+        if cls._compartido is None:
+            with cls._lock_compartido:
+                if cls._compartido is None:
+                    cls._compartido = cls()
+        return cls._compartido
+
+    def _leer(self):
+        """data_version actual; se llama con el lock tomado"""
+        gestor = obtener_gestor()
+        if gestor is not self._gestor:
+            # Base nueva: conexión nueva y sin comparación con la anterior
+            if self._conn is not None:
+                self._conn.close()
+            self._gestor = gestor
+            self._conn = gestor.nueva_conexion()
+            self._conn.execute("PRAGMA query_only = ON")
+            self._data_version = None
+            gestor.antes_de_confirmar = self._antes_de_confirmar
+            gestor.despues_de_confirmar = self._despues_de_confirmar
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def revisar(self):
+        """
+        Compara data_version con la última lectura.
+
+        Returns:
+            int: Valor actualizado de `externos`
+        """
+        with self._lock:
+            return self._comparar()
+
+    def _comparar(self):
+        """Cuenta como externo un cambio de data_version; se llama con el lock tomado"""
+        actual = self._leer()
+        if self._data_version is not None and actual != self._data_version:
+            self.externos += 1
+        self._data_version = actual
+        return self.externos
+
+    def _antes_de_confirmar(self):
+        # Lo que cambió hasta acá es de otro proceso. El lock queda tomado
+        # hasta _despues_de_confirmar: un revisar() de otro hilo en medio
+        # vería el commit local como externo
+        self._lock.acquire()
+        try:
+            self._comparar()
+        except Exception:
+            self._lock.release()
+            raise
+
+    def _despues_de_confirmar(self):
+        # Una sola lectura por commit (no por tabla escrita): su cambio no es externo
+        try:
+            self._data_version = self._leer()
+        finally:
+            self._lock.release()
+
+    def version(self, *tablas):
+        """
+        Marca del estado actual de las tablas indicadas.
+
+        Args:
+            *tablas (str): Tablas de las que depende quien pregunta
+
+        Returns:
+            tuple: Marca comparable con ==; cambia si alguna tabla se escribió
+                en este proceso o si otro proceso escribió en la base
+        """
+        return (self.revisar(),) + tuple(contador_escrituras(tabla) for tabla in tablas)
+
+    def cambio_desde(self, marca, *tablas):
+        """True si las tablas cambiaron desde `marca` (o si no hay marca)"""
+        return marca is None or self.version(*tablas) != marca
+
+
+def version(*tablas):
+    """Atajo de ObservadorCambios.compartido().version()"""
+    return ObservadorCambios.compartido().version(*tablas)
+
+
+def cambio_desde(marca, *tablas):
+    """Atajo de ObservadorCambios.compartido().cambio_desde()"""
+    return ObservadorCambios.compartido().cambio_desde(marca, *tablas)
+
+
+class Sondeo:
+    """
+    Revisa periódicamente si cambiaron las tablas de una pantalla y la refresca.
+
+    Solo consulta data_version y los contadores (no la base completa), y no
+    hace nada mientras el widget no esté visible. La pantalla llama a
+    `marcar()` cada vez que carga sus datos, así que sus propias recargas no
+    disparan otra.
+
+    Atributos:
+        widget (tk.Misc): Pantalla a refrescar; el sondeo termina al destruirla
+        tablas (tuple): Tablas de las que depende la pantalla
+        al_cambiar (callable): Recarga de la pantalla
+        intervalo_ms (int): Milisegundos entre revisiones (0 = sin sondeo)
+    """
+
+    def __init__(self, widget, tablas, al_cambiar, intervalo_ms=None):
+        self.widget = widget
+        self.tablas = tuple(tablas)
+        self.al_cambiar = al_cambiar
+        self.intervalo_ms = intervalo_sondeo() if intervalo_ms is None else intervalo_ms
+        self.marca = None
+        self._espera = None
+        if self.intervalo_ms:
+            widget.bind("<Destroy>", self._al_destruir, add="+")
+            self._programar()
+
+    def marcar(self):
+        """Registra que la pantalla acaba de leer el estado actual"""
+        self.marca = version(*self.tablas)
+
+    def hay_cambios(self):
+        return cambio_desde(self.marca, *self.tablas)
+
+    def detener(self):
+        if self._espera is not None:
+            self.widget.after_cancel(self._espera)
+            self._espera = None
+
+    def _programar(self):
+        self._espera = self.widget.after(self.intervalo_ms, self._revisar)
+
+    def _revisar(self):
+        self._espera = None
+        if self.widget.winfo_ismapped() and self.hay_cambios():
+            self.marcar()
+            self.al_cambiar()
+        self._programar()
+
+    def _al_destruir(self, event):
+        if event.widget is self.widget:
+            self.detener()
@@ -0,0 +1,248 @@
+"""
+Catálogo de productos compartido por todas las pantallas del proceso.
+
+El punto de venta, el inventario y el diálogo de movimientos leen los
+productos de aquí en lugar de consultar cada uno su propia copia. Las filas
+son tuplas compactas (ver las posiciones abajo) y se indexan por id, SKU,
+código de barras y categoría.
+
+La caché se invalida sola: db.db avisa después de cada commit que escribe en
+Productos, Categorias o Proveedores. Si el aviso trae los ids afectados (por
+ejemplo, los productos de una venta) solo se releen esas filas; si no, se
+relee el catálogo completo. En ambos casos la lectura ocurre la próxima vez
+que alguien consulta el catálogo, no en el hilo que escribió. Las escrituras
+de otros procesos se detectan con db/cambios.py y releen todo.
+"""
+import threading
+
+from db.cambios import ObservadorCambios
+from db.db import escuchar_escrituras, obtener_datos, obtener_gestor
+
+# Posiciones de la fila compacta (las 12 primeras son las columnas del inventario)
+(ID, NOMBRE, CATEGORIA, PROVEEDOR, STOCK, STOCK_MINIMO, STOCK_MAXIMO,
+ PRECIO, COSTO, SKU, CODIGO_BARRAS, ESTADO, ID_CATEGORIA) = range(13)
+
+SQL_PRODUCTOS = """
+    SELECT
+        p.id_producto, p.nombre, c.nombre, pr.nombre,
+        p.stock_actual, p.stock_minimo, p.stock_maximo,
+        p.precio_venta, p.costo, p.sku, p.codigo_barras, p.estado,
+        p.id_categoria
+    FROM Productos p
+    LEFT JOIN Categorias c ON p.id_categoria = c.id_categoria
+    LEFT JOIN Proveedores pr ON p.id_proveedor = pr.id_proveedor
+    {filtro}
+    ORDER BY p.id_producto
+"""
+
+# Cambiar un nombre de categoría o proveedor afecta a todas las filas que lo muestran
+TABLAS_VIGILADAS = ("productos", "categorias", "proveedores")
+
+
+def _clave(texto):
+    """Clave de los índices por texto: sin espacios sobrantes ni mayúsculas"""
+    return str(texto).strip().lower() if texto else None
+
+
+class CatalogoProductos:
+    """
+    Caché de Productos con índices secundarios e invalidación por escritura.
+
+    Las listas devueltas se comparten entre pantallas: no deben modificarse.
+
+    Atributos:
+        version (int): Aumenta cada vez que el contenido cambia
+    """
+
+    _compartido = None
+    _lock_compartido = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._gestor = None
+        self._filas = None        # id_producto -> fila; None = releer todo
+        self._por_sku = {}
+        self._por_codigo = {}
+        self._por_categoria = {}  # nombre en minúsculas -> {id_producto}
+        self._pendientes = set()  # ids a releer en el próximo acceso
+        self._lista = None
+        self._vistas = {}
+        self._externos = None
+        self.version = 0
+
+    @classmethod
+    def compartido(cls):
+        """Catálogo único del proceso; se suscribe a las escrituras la primera vez"""
+        if cls._compartido is None:
+            with cls._lock_compartido:
+                if cls._compartido is None:
+                    catalogo = cls()
+                    for tabla in TABLAS_VIGILADAS:
+                        escuchar_escrituras(tabla, catalogo._al_escribir)
+                    cls._compartido = catalogo
+        return cls._compartido
+
+    # ---------- Invalidación ----------
+
+    def invalidar(self, ids=None):
+        """
+        Marca filas para releer en el próximo acceso.
+
+        Args:
+            ids (iterable): Productos a releer (None = todo el catálogo)
+        """
+        with self._lock:
+            if ids is None:
+                self._filas = None
+                self._pendientes.clear()
+            elif self._filas is not None:
+                self._pendientes.update(ids)
+
+    def _al_escribir(self, tabla, ids):
+        self.invalidar(ids if tabla == "productos" else None)
+
+    def _sincronizar(self):
+        """Relee lo invalidado; se llama con el lock tomado"""
+        gestor = obtener_gestor()
+        if gestor is not self._gestor:
+            # Se configuró otra base de datos (pruebas, benchmarks)
+            self._gestor = gestor
+            self._filas = None
+        externos = ObservadorCambios.compartido().revisar()
+        if externos != self._externos:
+            # Otro proceso escribió: no se sabe qué filas tocó
+            self._externos = externos
+            self._filas = None
+        if self._filas is None:
+            self._cargar_todo()
+        elif self._pendientes:
+            self._recargar(self._pendientes)
+            self._pendientes = set()
+        else:
+            return
+        self._lista = None
+        self._vistas.clear()
+        self.version += 1
+
+    def _cargar_todo(self):
+        self._filas = {}
+        self._por_sku, self._por_codigo, self._por_categoria = {}, {}, {}
+        for fila in obtener_datos(SQL_PRODUCTOS.format(filtro="")):
+            self._indexar(tuple(fila))
+
+    def _recargar(self, ids):
+        ids = list(ids)
+        nuevas = {
+            fila[ID]: tuple(fila)
+            for fila in obtener_datos(
+                SQL_PRODUCTOS.format(filtro=f"WHERE p.id_producto IN ({','.join('?' * len(ids))})"), ids
+            )
+        }
+        ultimo = max(self._filas, default=0)
+        altas_intermedias = False
+        for id_producto in ids:
+            anterior = self._filas.get(id_producto)
+            if anterior is not None:
+                self._desindexar(anterior)
+                if id_producto not in nuevas:
+                    del self._filas[id_producto]
+            elif id_producto in nuevas and id_producto < ultimo:
+                altas_intermedias = True
+            if id_producto in nuevas:
+                # Reasignar una clave existente conserva su posición en el dict
+                self._indexar(nuevas[id_producto])
+        if altas_intermedias:
+            self._filas = dict(sorted(self._filas.items()))
+
+    def _indexar(self, fila):
+        id_producto = fila[ID]
+        self._filas[id_producto] = fila
+        if _clave(fila[SKU]):
+            self._por_sku[_clave(fila[SKU])] = id_producto
+        if _clave(fila[CODIGO_BARRAS]):
+            self._por_codigo[_clave(fila[CODIGO_BARRAS])] = id_producto
+        self._por_categoria.setdefault(_clave(fila[CATEGORIA]), set()).add(id_producto)
+
+    def _desindexar(self, fila):
+        """Quita la fila de los índices secundarios (no de _filas)"""
+        id_producto = fila[ID]
+        if self._por_sku.get(_clave(fila[SKU])) == id_producto:
+            del self._por_sku[_clave(fila[SKU])]
+        if self._por_codigo.get(_clave(fila[CODIGO_BARRAS])) == id_producto:
+            del self._por_codigo[_clave(fila[CODIGO_BARRAS])]
+        self._por_categoria.get(_clave(fila[CATEGORIA]), set()).discard(id_producto)
+
+    # ---------- Consultas ----------
+
+    def filas(self):
+        """
+        Todos los productos (activos e inactivos) ordenados por id.
+
+        Returns:
+            list: Tuplas con las posiciones ID ... ID_CATEGORIA
+        """
+        with self._lock:
+            self._sincronizar()
+            if self._lista is None:
+                self._lista = list(self._filas.values())
+            return self._lista
+
+    def obtener(self, id_producto):
+        """Fila de un producto por id, o None"""
+        with self._lock:
+            self._sincronizar()
+            return self._filas.get(id_producto)
+
+    def por_sku(self, sku):
+        """Fila del producto con ese SKU (sin distinguir mayúsculas), o None"""
+        with self._lock:
+            self._sincronizar()
+            return self._filas.get(self._por_sku.get(_clave(sku)))
+
+    def por_codigo_barras(self, codigo):
+        """Fila del producto con ese código de barras, o None"""
+        with self._lock:
+            self._sincronizar()
+            return self._filas.get(self._por_codigo.get(_clave(codigo)))
+
+    def de_categoria(self, categoria):
+        """
+        Productos de una categoría, ordenados por id.
+
+        Args:
+            categoria (str): Nombre de la categoría (None = sin categoría)
+
+        Returns:
+            list: Filas del catálogo
+        """
+        with self._lock:
+            self._sincronizar()
+            return [self._filas[i] for i in sorted(self._por_categoria.get(_clave(categoria), ()))]
+
+    def vista(self, nombre, construir):
+        """
+        Proyección derivada del catálogo, calculada una vez por versión.
+
+        Args:
+            nombre (str): Clave de la vista
+            construir (callable): Recibe la lista de filas y devuelve la vista
+
+        Returns:
+            Lo que devuelva `construir`, reutilizado hasta el próximo cambio
+        """
+        with self._lock:
+            filas = self.filas()
+            if nombre not in self._vistas:
+                self._vistas[nombre] = construir(filas)
+            return self._vistas[nombre]
+
+    def productos_venta(self):
+        """
+        Productos activos con stock, ordenados por nombre, con la forma que usa
+        el punto de venta: (id_producto, nombre, precio_venta, sku, codigo_barras, stock_actual).
+        """
+        return self.vista("venta", lambda filas: sorted(
+            ((f[ID], f[NOMBRE], f[PRECIO], f[SKU], f[CODIGO_BARRAS], f[STOCK])
+             for f in filas if f[ESTADO] == 1 and (f[STOCK] or 0) > 0),
+            key=lambda p: p[1]
+        ))
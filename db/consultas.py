@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta
+
+# Formato único con el que se guardan las fechas (ISO 8601 con espacio, igual
+# que datetime('now') de SQLite). Al ser de ancho fijo, comparar cadenas
+# equivale a comparar fechas y los índices sobre la columna se pueden usar.
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+FORMATO_DIA = "%Y-%m-%d"
+
+
+def normalizar_fecha(valor=None):
+    """
+    Convierte una fecha al formato de almacenamiento
+
+    Args:
+        valor (datetime|date|str): Fecha a convertir (None = ahora)
+
+    Returns:
+        str: Fecha con formato 'YYYY-MM-DD HH:MM:SS'
+    """
+    if valor is None:
+        valor = datetime.now()
+    elif isinstance(valor, str):
+        valor = datetime.fromisoformat(valor.strip())
+    elif not isinstance(valor, datetime):
+        valor = datetime(valor.year, valor.month, valor.day)
+    return valor.strftime(FORMATO_FECHA)
+
+
+def _a_dia(valor):
+    """Convierte str 'YYYY-MM-DD', date o datetime a date"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return datetime.strptime(str(valor).strip()[:10], FORMATO_DIA).date()
+
+
+def rango_fechas(columna, desde, hasta):
+    """
+    Construye un filtro de rango de días sobre la columna cruda.
+
+    Reemplaza a `date(columna) BETWEEN ? AND ?`: envolver la columna en una
+    función impide usar índices. Aquí se emite un rango semiabierto
+    [desde, hasta + 1 día) que SQLite resuelve con el índice.
+
+    Args:
+        columna (str): Columna a filtrar (por ejemplo 't.fecha')
+        desde (str|date): Primer día incluido
+        hasta (str|date): Último día incluido
+
+    Returns:
+        tuple: (fragmento_sql, parametros)
+    """
+    inicio = _a_dia(desde)
+    fin = _a_dia(hasta) + timedelta(days=1)
+    return (
+        f"{columna} >= ? AND {columna} < ?",
+        (inicio.strftime(FORMATO_DIA), fin.strftime(FORMATO_DIA)),
+    )
+
+
+def normalizar_fechas_tabla(conn, tabla, columna="fecha"):
+    """
+    Reescribe las fechas guardadas con otro formato ('T', milisegundos) al
+    formato de almacenamiento. Los valores que SQLite no reconoce se dejan igual.
+    """
+    conn.execute(
+        f"""UPDATE {tabla} SET {columna} = datetime({columna})
+            WHERE {columna} IS NOT NULL
+              AND datetime({columna}) IS NOT NULL
+              AND {columna} <> datetime({columna})"""
+    )
@@ -1,7 +1,29 @@
-import sqlite3
+import logging
 import sys
 import os
+import re
+import threading
+from collections import Counter
 from pathlib import Path
+from db.escritor import EscritorUnico
+from db.pool import GestorConexiones
+from db.perfiles import obtener_perfil
+
+_gestor = None
+_gestor_lock = threading.Lock()
+_escritor = None
+_log = logging.getLogger(__name__)
+
+# Tabla (en minúsculas) -> funciones a llamar cuando se escribe en ella;
+# los oyentes de "*" reciben las escrituras de todas las tablas
+_oyentes = {}
+# Tabla (en minúsculas) -> commits de este proceso que la modificaron
+_contadores = Counter()
+_contadores_lock = threading.Lock()
+_SENTENCIA_ESCRITURA = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE
+)
 
 def get_db_path():
     """Obtiene la ruta correcta de la base de datos según el entorno"""
@@ -27,27 +49,143 @@ def get_db_path():
     
     return db_path
 
+def obtener_gestor():
+    """Devuelve el gestor de conexiones compartido (la ruta se resuelve una sola vez)"""
+    global _gestor
+    if _gestor is None:
+        with _gestor_lock:
+            if _gestor is None:
+                _gestor = GestorConexiones(get_db_path(), pragmas=obtener_perfil())
+    return _gestor
+
+def configurar_db(ruta=None, perfil=None, **opciones):
+    """
+    Reemplaza el gestor compartido, por ejemplo para apuntar a otra base de datos.
+    
+    Args:
+        ruta (str): Ruta de la base de datos (None = ruta por defecto)
+        perfil (str): Perfil de almacenamiento (ver db/perfiles.py)
+        **opciones: Argumentos adicionales para GestorConexiones
+    """
+    global _gestor
+    with _gestor_lock:
+        _detener_escritor()
+        if _gestor is not None:
+            _gestor.cerrar_todas()
+        opciones.setdefault("pragmas", obtener_perfil(perfil))
+        _gestor = GestorConexiones(ruta or get_db_path(), **opciones)
+    return _gestor
+
+def cerrar_conexiones():
+    """Cierra las conexiones abiertas por el gestor compartido (y la del escritor)"""
+    with _gestor_lock:
+        _detener_escritor()
+    if _gestor is not None:
+        _gestor.cerrar_todas()
+
+def obtener_escritor():
+    """
+    Devuelve el hilo escritor de la base configurada, creándolo la primera vez.
+
+    Todas las escrituras del proceso pasan por él (ver db/escritor.py).
+
+    Returns:
+        EscritorUnico: Escritor con commit agrupado
+    """
+    global _escritor
+    gestor = obtener_gestor()
+    escritor = _escritor
+    if escritor is None or escritor.gestor is not gestor or not escritor.activo():
+        with _gestor_lock:
+            if _escritor is None or _escritor.gestor is not gestor or not _escritor.activo():
+                _escritor = EscritorUnico(gestor, notificar=notificar_escritura)
+            escritor = _escritor
+    return escritor
+
+def _detener_escritor():
+    """Espera las escrituras encoladas y termina el escritor; se llama con _gestor_lock tomado"""
+    global _escritor
+    if _escritor is not None:
+        _escritor.detener()
+        _escritor = None
+
 def connect_db():
-    """Establece conexión con la base de datos"""
-    db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row 
-    return conn
+    """Establece una conexión independiente con la base de datos"""
+    return obtener_gestor().nueva_conexion()
+
+def tabla_escrita(query):
+    """
+    Tabla que modifica una sentencia INSERT/REPLACE/UPDATE/DELETE.
+
+    Args:
+        query (str): Sentencia SQL
+
+    Returns:
+        str: Nombre de la tabla en minúsculas, o None si no es una escritura
+    """
+    coincidencia = _SENTENCIA_ESCRITURA.match(query)
+    return coincidencia.group(1).lower() if coincidencia else None
+
+def escuchar_escrituras(tabla, funcion):
+    """
+    Registra una función que se llama después de cada commit que escribe en la tabla.
+
+    Args:
+        tabla (str): Tabla a vigilar ("*" = todas)
+        funcion (callable): Recibe (tabla, ids); ids es un conjunto de claves
+            primarias afectadas, o None si no se conocen
+    """
+    _oyentes.setdefault(tabla.lower(), []).append(funcion)
+
+def contador_escrituras(tabla):
+    """
+    Cuántos commits de este proceso escribieron en la tabla (no cuenta otros procesos).
+
+    Args:
+        tabla (str): Nombre de la tabla
+
+    Returns:
+        int: Contador que solo crece
+    """
+    return _contadores[tabla.lower()]
+
+def notificar_escritura(tabla, ids=None):
+    """
+    Avisa a los oyentes que se escribió en una tabla. ejecutar_query y
+    ejecutar_transaccion lo hacen solos; las funciones que escriben con su
+    propia transacción lo llaman tras el commit, indicando los ids si los saben.
+    Si un oyente lanza una excepción se registra en el log y se sigue con el resto.
+
+    Args:
+        tabla (str): Tabla modificada
+        ids (iterable): Claves primarias afectadas (None = cualquiera)
+    """
+    tabla = tabla.lower()
+    with _contadores_lock:
+        _contadores[tabla] += 1
+    ids = None if ids is None else set(ids)
+    for funcion in _oyentes.get(tabla, []) + _oyentes.get("*", []):
+        # La escritura ya está confirmada: un oyente roto no debe hacerla
+        # parecer fallida ni impedir que los demás invaliden sus cachés
+        try:
+            funcion(tabla, ids)
+        except Exception:
+            _log.exception("Falló un oyente de escrituras en %s", tabla)
+
+def _escrituras(queries):
+    """Pares (tabla, ids) a notificar por las queries, sin repetir tablas"""
+    tablas = dict.fromkeys(tabla_escrita(query) for query, _ in queries)
+    return [(tabla, None) for tabla in tablas if tabla]
 
 def ejecutar_query(query, parameters=()):
-    """Ejecuta una query de modificación"""
-    with connect_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, parameters)
-        conn.commit()
-        return cursor.lastrowid
+    """Ejecuta una query de modificación (a través del escritor compartido)"""
+    queries = [(query, parameters)]
+    return obtener_escritor().enviar(queries, escrituras=_escrituras(queries)).result()
 
 def obtener_datos(query, parameters=()):
     """Obtiene resultados de una consulta SELECT"""
-    with connect_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, parameters)
-        return cursor.fetchall()
+    conn = obtener_gestor().conexion()
+    return conn.execute(query, parameters).fetchall()
 
 def ejecutar_transaccion(queries):
     """
@@ -59,21 +197,5 @@ def ejecutar_transaccion(queries):
     Returns:
         int: Último rowid de la última operación INSERT
     """
-    conn = None
-    try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        
-        for query, params in queries:
-            cursor.execute(query, params)
-            
-        conn.commit()
-        return cursor.lastrowid
-        
-    except Exception as e:
-        if conn:
-            conn.rollback()
-        raise e
-    finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+    queries = list(queries)
+    return obtener_escritor().enviar(queries, escrituras=_escrituras(queries)).result()
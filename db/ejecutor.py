@@ -0,0 +1,194 @@
+import itertools
+import queue
+import threading
+
+from db.db import obtener_gestor
+
+
+class _Solicitud:
+    """Consulta encolada: a qué canal pertenece, su generación y si se canceló"""
+    __slots__ = ("canal", "generacion", "funcion", "args", "al_terminar", "al_fallar", "cancelada")
+
+    def __init__(self, canal, generacion, funcion, args, al_terminar, al_fallar):
+        self.canal = canal
+        self.generacion = generacion
+        self.funcion = funcion
+        self.args = args
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelada = False
+
+
+class EjecutorConsultas:
+    """
+    Ejecuta consultas de lectura en hilos de fondo y entrega los resultados al
+    hilo de Tkinter con `after()`.
+
+    Cada consulta pertenece a un canal (por ejemplo, la búsqueda de una
+    pantalla). Enviar una consulta nueva a un canal cancela la anterior: si aún
+    no empezó se descarta, si está corriendo se interrumpe desde el progress
+    handler de SQLite y, si ya terminó, su resultado se ignora porque su
+    generación ya no es la vigente. Así las teclas intermedias de una búsqueda
+    nunca pintan resultados viejos sobre los nuevos.
+
+    Cada hilo usa su propia conexión de solo lectura (PRAGMA query_only), que
+    se reabre si cambia la base de datos configurada.
+
+    Atributos:
+        root (tk.Misc): Widget usado para programar `after()`
+        intervalo_ms (int): Cada cuánto se revisan los resultados pendientes
+        pasos_progreso (int): Instrucciones de SQLite entre revisiones de cancelación
+    """
+
+    _compartido = None
+
+    def __init__(self, root, hilos=2, intervalo_ms=30, pasos_progreso=1000):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.pasos_progreso = pasos_progreso
+        self._solicitudes = queue.Queue()
+        self._eventos = queue.Queue()
+        self._generaciones = itertools.count(1)
+        self._vigentes = {}  # canal -> última solicitud enviada
+        self._pendientes = 0
+        self._revisando = False
+        self._hilos = [
+            threading.Thread(target=self._trabajar, name=f"consultas-{i}", daemon=True)
+            for i in range(hilos)
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+
+    @classmethod
+    def compartido(cls, root, **opciones):
+        """Devuelve el ejecutor de la aplicación, creándolo la primera vez"""
+        ejecutor = cls._compartido
+        if ejecutor is None or not any(h.is_alive() for h in ejecutor._hilos):
+            ejecutor = cls(root.winfo_toplevel(), **opciones)
+            cls._compartido = ejecutor
+        return ejecutor
+
+    def consultar(self, canal, sql, params=(), al_terminar=None, al_fallar=None):
+        """
+        Encola un SELECT; al_terminar recibe la lista de filas.
+
+        Args:
+            canal (str): Canal de la consulta; reemplaza a la anterior del mismo canal
+            sql (str): Consulta a ejecutar
+            params (tuple|list): Parámetros de la consulta
+            al_terminar (callable): Recibe las filas (en el hilo de Tk)
+            al_fallar (callable): Recibe la excepción (en el hilo de Tk)
+
+        Returns:
+            int: Generación asignada a la consulta
+        """
+        return self.ejecutar(canal, _leer_filas, sql, params, al_terminar=al_terminar, al_fallar=al_fallar)
+
+    def ejecutar(self, canal, funcion, *args, al_terminar=None, al_fallar=None):
+        """
+        Encola una función de lectura que recibe la conexión del hilo.
+
+        Args:
+            canal (str): Canal de la consulta; reemplaza a la anterior del mismo canal
+            funcion (callable): Llamada como funcion(conn, *args) en el hilo de fondo
+            *args: Argumentos adicionales
+            al_terminar (callable): Recibe el resultado (en el hilo de Tk)
+            al_fallar (callable): Recibe la excepción (en el hilo de Tk)
+
+        Returns:
+            int: Generación asignada a la consulta
+        """
+        self.cancelar(canal)
+        solicitud = _Solicitud(canal, next(self._generaciones), funcion, args, al_terminar, al_fallar)
+        self._vigentes[canal] = solicitud
+        self._pendientes += 1
+        self._solicitudes.put(solicitud)
+        self._programar_revision()
+        return solicitud.generacion
+
+    def cancelar(self, canal):
+        """Cancela la consulta vigente del canal; su resultado no se entregará"""
+        solicitud = self._vigentes.pop(canal, None)
+        if solicitud is not None:
+            solicitud.cancelada = True
+
+    def pendientes(self):
+        """Cantidad de consultas encoladas, en ejecución o por entregar"""
+        return self._pendientes
+
+    def detener(self):
+        """Cancela todo y termina los hilos"""
+        for canal in list(self._vigentes):
+            self.cancelar(canal)
+        for _ in self._hilos:
+            self._solicitudes.put(None)
+
+    # ---------- Hilos de fondo ----------
+
+    def _trabajar(self):
+        local = {"gestor": None, "conn": None}
+        try:
+            while True:
+                solicitud = self._solicitudes.get()
+                if solicitud is None:
+                    break
+                if solicitud.cancelada:
+                    self._eventos.put(("cancelada", solicitud, None))
+                    continue
+                conn = self._conexion_lectura(local)
+                # Devolver un valor verdadero interrumpe la sentencia en curso
+                conn.set_progress_handler(lambda: solicitud.cancelada, self.pasos_progreso)
+                try:
+                    resultado = solicitud.funcion(conn, *solicitud.args)
+                    self._eventos.put(("terminar", solicitud, resultado))
+                except Exception as e:
+                    tipo = "cancelada" if solicitud.cancelada else "fallar"
+                    self._eventos.put((tipo, solicitud, e))
+                finally:
+                    conn.set_progress_handler(None, 0)
+        finally:
+            if local["conn"] is not None:
+                local["conn"].close()
+
+    def _conexion_lectura(self, local):
+        """Conexión de solo lectura del hilo; se reabre si se configuró otra base"""
+        gestor = obtener_gestor()
+        if local["gestor"] is not gestor:
+            if local["conn"] is not None:
+                local["conn"].close()
+            conn = gestor.nueva_conexion()
+            conn.execute("PRAGMA query_only = ON")
+            local["gestor"], local["conn"] = gestor, conn
+        return local["conn"]
+
+    # ---------- Hilo de Tk ----------
+
+    def _programar_revision(self):
+        if not self._revisando:
+            self._revisando = True
+            self.root.after(self.intervalo_ms, self._despachar_eventos)
+
+    def _despachar_eventos(self):
+        self._revisando = False
+        try:
+            while True:
+                try:
+                    tipo, solicitud, valor = self._eventos.get_nowait()
+                except queue.Empty:
+                    break
+                self._pendientes -= 1
+                # Solo se entrega el resultado de la última solicitud de cada canal
+                vigente = self._vigentes.get(solicitud.canal)
+                if tipo == "cancelada" or vigente is None or vigente.generacion != solicitud.generacion:
+                    continue
+                del self._vigentes[solicitud.canal]
+                callback = solicitud.al_terminar if tipo == "terminar" else solicitud.al_fallar
+                if callback:
+                    callback(valor)
+        finally:
+            if self._pendientes > 0 or not self._eventos.empty():
+                self._programar_revision()
+
+
+def _leer_filas(conn, sql, params):
+    return conn.execute(sql, params).fetchall()
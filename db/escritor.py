@@ -0,0 +1,235 @@
+"""
+Hilo escritor único con commit agrupado.
+
+Cada ejecutar_query, ejecutar_transaccion o venta abría su propia transacción
+con su propio fsync, y en horas pico (varias cajas más la recepción de
+mercadería) competían por el bloqueo de SQLite hasta agotar busy_timeout
+("database is locked"). Aquí todas las escrituras del proceso pasan por un
+solo hilo dueño de la conexión de escritura: las que llegan juntas se
+confirman en un único commit.
+
+Cada escritura corre dentro de su propio SAVEPOINT, así que si una falla se
+revierte solo ella y las demás del lote se confirman igual. Quien envía
+recibe un Future con el resultado (lastrowid para las queries) o la excepción.
+
+Uso:
+    futuro = obtener_escritor().enviar([(sql, params), ...], escrituras=[("clientes", None)])
+    id_nuevo = futuro.result()
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_log = logging.getLogger(__name__)
+
+# Milisegundos que el escritor espera más escrituras antes de confirmar un lote.
+# Con 0 no espera: el lote es lo que se encoló mientras se confirmaba el
+# anterior, así que una escritura aislada no paga demora y bajo carga los
+# lotes crecen solos. Esperar solo conviene con productores que no se
+# bloquean en result() (por ejemplo, el servicio de ingesta de ventas).
+VENTANA_MS = 0
+
+# Escrituras como máximo en un mismo commit
+MAXIMO_LOTE = 256
+
+
+class _Escritura:
+    """Trabajo encolado: función a correr con la conexión, tablas que escribe y su Future"""
+    __slots__ = ("funcion", "args", "escrituras", "futuro")
+
+    def __init__(self, funcion, args, escrituras):
+        self.funcion = funcion
+        self.args = args
+        self.escrituras = escrituras
+        self.futuro = Future()
+
+
+class EscritorUnico:
+    """
+    Serializa las escrituras de una base en un hilo propio y las confirma en lotes.
+
+    El hilo toma la primera escritura pendiente, junta las que ya estén en la
+    cola y las que lleguen dentro de `ventana_ms` (hasta `maximo_lote`) y las ejecuta en una sola
+    transacción BEGIN IMMEDIATE ... COMMIT. Tras el commit avisa a los oyentes
+    de db.db (notificar) y recién entonces resuelve los Future, así que al
+    volver de `result()` los contadores de cambios ya están al día.
+
+    Atributos:
+        gestor (GestorConexiones): Base sobre la que se escribe
+        notificar (callable): Recibe (tabla, ids) por cada tabla escrita
+        ventana_ms (float): Espera máxima para agrupar escrituras
+        maximo_lote (int): Escrituras como máximo por commit
+        lotes (int): Commits realizados
+        escrituras (int): Escrituras confirmadas
+    """
+
+    def __init__(self, gestor, notificar=None, ventana_ms=VENTANA_MS, maximo_lote=MAXIMO_LOTE):
+        self.gestor = gestor
+        self.notificar = notificar
+        self.ventana_ms = ventana_ms
+        self.maximo_lote = maximo_lote
+        self.lotes = 0
+        self.escrituras = 0
+        self._pendientes = queue.Queue()
+        self._conn = None
+        self._detenido = False
+        self._lock = threading.Lock()
+        self._hilo = threading.Thread(target=self._trabajar, name="escritor", daemon=True)
+        self._hilo.start()
+
+    def activo(self):
+        return not self._detenido and self._hilo.is_alive()
+
+    def enviar(self, queries, escrituras=()):
+        """
+        Encola queries que deben aplicarse juntas (todas o ninguna).
+
+        Args:
+            queries (list): Tuplas (query, parametros)
+            escrituras (iterable): Pares (tabla, ids) a notificar tras el commit
+
+        Returns:
+            Future: Se resuelve con el lastrowid de la última query
+        """
+        return self.ejecutar(_ejecutar_queries, list(queries), escrituras=escrituras)
+
+    def ejecutar(self, funcion, *args, escrituras=()):
+        """
+        Encola una función que escribe con la conexión del escritor.
+
+        La función no debe hacer commit ni rollback: corre dentro del
+        SAVEPOINT de su escritura y si lanza una excepción solo se revierte
+        lo que hizo ella.
+
+        Args:
+            funcion (callable): Llamada como funcion(conn, *args) en el hilo escritor
+            *args: Argumentos adicionales
+            escrituras (iterable): Pares (tabla, ids) a notificar tras el commit
+
+        Returns:
+            Future: Se resuelve con lo que devuelva la función
+
+        Raises:
+            RuntimeError: Si se llama desde el propio hilo escritor (por
+                ejemplo desde un oyente de escrituras) o si el escritor se detuvo
+        """
+        if threading.current_thread() is self._hilo:
+            raise RuntimeError("El hilo escritor no puede esperar sus propias escrituras")
+        escritura = _Escritura(funcion, args, list(escrituras))
+        with self._lock:
+            if self._detenido:
+                raise RuntimeError("El escritor está detenido")
+            self._pendientes.put(escritura)
+        return escritura.futuro
+
+    def detener(self, esperar=True):
+        """Termina el hilo al acabar las escrituras encoladas y cierra su conexión"""
+        with self._lock:
+            if not self._detenido:
+                self._detenido = True
+                self._pendientes.put(None)
+        if esperar and threading.current_thread() is not self._hilo:
+            self._hilo.join()
+
+    # ---------- Hilo escritor ----------
+
+    def _trabajar(self):
+        try:
+            while True:
+                lote, seguir = self._juntar_lote()
+                if lote:
+                    self._confirmar_lote(lote)
+                if not seguir:
+                    break
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _juntar_lote(self):
+        """Espera la primera escritura y suma las que lleguen dentro de la ventana"""
+        primera = self._pendientes.get()
+        if primera is None:
+            return [], False
+        lote = [primera]
+        limite = time.monotonic() + self.ventana_ms / 1000
+        while len(lote) < self.maximo_lote:
+            try:
+                restante = limite - time.monotonic()
+                escritura = self._pendientes.get(timeout=restante) if restante > 0 else self._pendientes.get_nowait()
+            except queue.Empty:
+                break
+            if escritura is None:
+                return lote, False
+            lote.append(escritura)
+        return lote, True
+
+    def _conexion(self):
+        if self._conn is None:
+            self._conn = self.gestor.nueva_conexion()
+            # BEGIN/COMMIT explícitos: los SAVEPOINT no deben abrir transacciones solos
+            self._conn.isolation_level = None
+        return self._conn
+
+    def _confirmar_lote(self, lote):
+        lote = [e for e in lote if e.futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        try:
+            conn = self._conexion()
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            for escritura in lote:
+                escritura.futuro.set_exception(e)
+            return
+
+        resultados = []
+        try:
+            for escritura in lote:
+                conn.execute("SAVEPOINT escritura")
+                try:
+                    resultados.append((escritura, escritura.funcion(conn, *escritura.args), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO escritura")
+                    resultados.append((escritura, None, e))
+                conn.execute("RELEASE escritura")
+
+            self.gestor.confirmar(lambda: conn.execute("COMMIT"))
+        except Exception as e:
+            # Falló el lote entero (disco lleno, base dañada...): nada quedó escrito
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            errores = {id(escritura): error for escritura, _, error in resultados}
+            for escritura in lote:
+                escritura.futuro.set_exception(errores.get(id(escritura)) or e)
+            return
+
+        # Confirmado: desde acá ninguna escritura exitosa puede informarse como fallida
+        self.lotes += 1
+        for escritura, resultado, error in resultados:
+            if error is None:
+                self.escrituras += 1
+                self._avisar(escritura.escrituras)
+                escritura.futuro.set_result(resultado)
+            else:
+                escritura.futuro.set_exception(error)
+
+    def _avisar(self, escrituras):
+        """Notifica las tablas escritas; un error de notificación solo se registra en el log"""
+        if self.notificar is None:
+            return
+        for tabla, ids in escrituras:
+            try:
+                self.notificar(tabla, ids)
+            except Exception:
+                _log.exception("Falló la notificación de escritura en %s", tabla)
+
+
+def _ejecutar_queries(conn, queries):
+    cursor = conn.cursor()
+    for query, params in queries:
+        cursor.execute(query, params)
+    return cursor.lastrowid
+
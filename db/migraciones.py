@@ -0,0 +1,140 @@
+"""
+Migraciones versionadas del esquema.
+
+data/estructura.sql define las tablas base. Los cambios posteriores (índices,
+tablas auxiliares, correcciones de datos) se registran aquí como migraciones
+numeradas; la versión aplicada se guarda en PRAGMA user_version de la propia
+base de datos, así que cada migración corre una sola vez.
+
+Uso desde consola:
+    python -m db.migraciones            # aplica las migraciones pendientes
+    python -m db.migraciones --estado   # muestra la versión actual
+"""
+import argparse
+
+from db.consultas import normalizar_fechas_tabla
+from db.texto_completo import crear_indices_texto
+from db.resumenes import crear_tablas as crear_resumenes
+from db.db import obtener_gestor
+
+# Cada migración es (version, descripcion, pasos). Un paso puede ser una
+# sentencia SQL o una función que recibe la conexión.
+MIGRACIONES = [
+    (1, "Índices para las consultas frecuentes", [
+        # Dashboard e historial: filtros por tipo y rango de fecha. Incluye
+        # id_cliente y total para resolver KPIs y top clientes sin leer la tabla.
+        """CREATE INDEX IF NOT EXISTS idx_transacciones_tipo_fecha
+           ON Transacciones (tipo, fecha, id_cliente, total)""",
+        """CREATE INDEX IF NOT EXISTS idx_transacciones_fecha
+           ON Transacciones (fecha)""",
+        # Detalle de ticket y top productos (índice de cobertura)
+        """CREATE INDEX IF NOT EXISTS idx_detalle_transaccion
+           ON Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario)""",
+        """CREATE INDEX IF NOT EXISTS idx_detalle_producto
+           ON Detalle_transaccion (id_producto)""",
+        # Dirección principal del cliente
+        """CREATE INDEX IF NOT EXISTS idx_direcciones_cliente_principal
+           ON Direcciones (id_cliente, principal)""",
+        # Validación de unicidad en DialogoProducto
+        """CREATE INDEX IF NOT EXISTS idx_productos_sku
+           ON Productos (sku)""",
+        """CREATE INDEX IF NOT EXISTS idx_productos_codigo_barras
+           ON Productos (codigo_barras)""",
+        "ANALYZE",
+    ]),
+    (2, "Fechas con formato uniforme para filtros por rango", [
+        lambda conn: normalizar_fechas_tabla(conn, "Transacciones"),
+        lambda conn: normalizar_fechas_tabla(conn, "Movimientos"),
+    ]),
+    (3, "Índices para paginar el historial de movimientos", [
+        # Cada índice termina implícitamente en id_movimiento (rowid): coincide
+        # con el ORDER BY (clave, id_movimiento) de db/movimientos.py y la
+        # página se lee por rango sin ordenar el historial completo.
+        """CREATE INDEX IF NOT EXISTS idx_movimientos_fecha
+           ON Movimientos (IFNULL(fecha, ''))""",
+        """CREATE INDEX IF NOT EXISTS idx_movimientos_tipo
+           ON Movimientos (tipo)""",
+        """CREATE INDEX IF NOT EXISTS idx_movimientos_cantidad
+           ON Movimientos (cantidad)""",
+        "ANALYZE Movimientos",
+    ]),
+    (4, "Búsqueda de texto completo (FTS5) en clientes, productos y movimientos", [
+        crear_indices_texto,
+        # Búsqueda de movimientos por nombre de producto (vía Productos_fts)
+        """CREATE INDEX IF NOT EXISTS idx_movimientos_producto
+           ON Movimientos (id_producto)""",
+    ]),
+    (5, "Resúmenes diarios de ventas para el dashboard", [
+        # Tablas por día, producto-día y cliente-día, llenas con el historial
+        crear_resumenes,
+    ]),
+]
+
+
+def version_actual(conn):
+    """Devuelve la versión de esquema registrada en la base de datos"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def aplicar_migraciones(conn=None, hasta=None):
+    """
+    Aplica en orden las migraciones pendientes, cada una en su propia transacción.
+
+    Args:
+        conn (sqlite3.Connection): Conexión a usar (por defecto la del gestor compartido)
+        hasta (int): Versión máxima a aplicar (por defecto todas)
+
+    Returns:
+        list: Versiones aplicadas en esta llamada
+    """
+    conn = conn or obtener_gestor().conexion()
+    aplicadas = []
+
+    for version, descripcion, pasos in MIGRACIONES:
+        if hasta is not None and version > hasta:
+            break
+        if version <= version_actual(conn):
+            continue
+
+        # BEGIN IMMEDIATE evita que dos cajas migren a la vez
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= version_actual(conn):
+                conn.rollback()
+                continue
+            for paso in pasos:
+                if callable(paso):
+                    paso(conn)
+                else:
+                    conn.execute(paso)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        aplicadas.append(version)
+
+    return aplicadas
+
+
+def mantener_indices(conn=None):
+    """Actualiza las estadísticas del planificador si SQLite lo considera necesario"""
+    conn = conn or obtener_gestor().conexion()
+    conn.execute("PRAGMA optimize")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de ventas.db")
+    parser.add_argument("--estado", action="store_true", help="Solo mostrar la versión actual")
+    args = parser.parse_args()
+
+    conn = obtener_gestor().conexion()
+    if not args.estado:
+        aplicadas = aplicar_migraciones(conn)
+        print(f"Migraciones aplicadas: {aplicadas or 'ninguna'}")
+    ultima = MIGRACIONES[-1][0] if MIGRACIONES else 0
+    print(f"Versión del esquema: {version_actual(conn)} (última disponible: {ultima})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+from db.db import obtener_datos, obtener_escritor
+from db.stock import descontar_stock
+from db.texto_completo import expresion_fts
+
+# Columna de la pantalla -> expresión de orden. Las columnas que admiten NULL
+# se envuelven en IFNULL: un NULL no es mayor ni menor que nada y cortaría la
+# paginación.
+ORDENES = {
+    'id_movimiento': "m.id_movimiento",
+    'tipo': "m.tipo",
+    'fecha': "IFNULL(m.fecha, '')",
+    'cantidad': "m.cantidad",
+    'producto': "IFNULL(p.nombre, '')",
+    'usuario': "IFNULL(u.nombres || ' ' || u.apellido_p, 'Sistema')",
+    'referencia': "IFNULL(m.referencia, '')",
+}
+
+TAMANO_PAGINA = 200
+
+# Tipos de movimiento que sacan unidades del inventario
+TIPOS_SALIDA = ("salida", "transferencia")
+
+SQL_REGISTRAR = """
+    INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia)
+    VALUES (?, datetime('now'), ?, ?, ?)
+"""
+
+SQL_SUMAR_STOCK = "UPDATE Productos SET stock_actual = stock_actual + ? WHERE id_producto = ?"
+
+
+def _filtro_busqueda(busqueda):
+    """
+    Condición de búsqueda resuelta con índices: referencia (Movimientos_fts),
+    nombre/SKU/código del producto (Productos_fts) o el ID exacto.
+
+    Los ids que coinciden se reúnen en una sola subconsulta para que SQLite
+    lea solo esas filas por su rowid en lugar de recorrer el historial.
+    """
+    fuentes, params = [], []
+    expresion = expresion_fts(busqueda)
+    if expresion is not None:
+        fuentes.append("SELECT rowid FROM Movimientos_fts WHERE Movimientos_fts MATCH ?")
+        fuentes.append("""SELECT id_movimiento FROM Movimientos WHERE id_producto IN
+                          (SELECT rowid FROM Productos_fts WHERE Productos_fts MATCH ?)""")
+        params.extend([expresion, expresion])
+    if busqueda.isdigit():
+        fuentes.append("SELECT ?")
+        params.append(int(busqueda))
+    if not fuentes:
+        return None
+    return f"m.id_movimiento IN ({' UNION '.join(fuentes)})", params
+
+
+def consulta_pagina(busqueda="", columna="id_movimiento", ascendente=False, despues=None, limite=TAMANO_PAGINA):
+    """
+    Arma la consulta de una página del historial de movimientos.
+
+    Usa paginación por clave (keyset): en vez de OFFSET, cada página empieza
+    justo después de la última fila de la anterior, comparando (clave de
+    orden, id_movimiento). Así el costo depende del tamaño de página y no de
+    cuántas páginas se hayan leído.
+
+    Args:
+        busqueda (str): Texto a buscar en la referencia, el producto o el ID
+        columna (str): Columna de orden (clave de ORDENES)
+        ascendente (bool): Sentido del orden
+        despues (tuple): Cursor (clave, id_movimiento) de la última fila leída
+        limite (int): Filas por página
+
+    Returns:
+        tuple: (sql, parámetros)
+    """
+    clave = ORDENES[columna]
+    sentido = "ASC" if ascendente else "DESC"
+    condiciones, params = [], []
+
+    filtro = _filtro_busqueda(busqueda) if busqueda else None
+    if filtro is not None:
+        condiciones.append(filtro[0])
+        params.extend(filtro[1])
+    if despues is not None:
+        # Equivale a (clave, id) > (?, ?); escrito así el primer término da un
+        # rango sobre el índice también cuando la clave es una expresión
+        op = ">" if ascendente else "<"
+        condiciones.append(f"{clave} {op}= ? AND ({clave} {op} ? OR m.id_movimiento {op} ?)")
+        params.extend([despues[0], despues[0], despues[1]])
+
+    where = "WHERE " + " AND ".join(condiciones) if condiciones else ""
+    sql = f"""
+        SELECT
+            m.id_movimiento,
+            m.tipo,
+            strftime('%d/%m/%Y %H:%M', m.fecha) AS fecha_formateada,
+            m.cantidad,
+            p.nombre AS producto,
+            COALESCE(u.nombres || ' ' || u.apellido_p, 'Sistema') AS usuario,
+            m.referencia,
+            {clave} AS clave_orden
+        FROM Movimientos m
+        LEFT JOIN Productos p ON m.id_producto = p.id_producto
+        LEFT JOIN Usuarios u ON m.id_usuario = u.id_usuario
+        {where}
+        ORDER BY {clave} {sentido}, m.id_movimiento {sentido}
+        LIMIT ?
+    """
+    # Se pide una fila de más para saber si hay otra página
+    params.append(limite + 1)
+    return sql, params
+
+
+def pagina_movimientos(busqueda="", columna="id_movimiento", ascendente=False, despues=None, limite=TAMANO_PAGINA):
+    """
+    Lee una página del historial de movimientos (ver consulta_pagina).
+
+    Returns:
+        tuple: (filas, cursor). cursor es (clave, id_movimiento) para pedir la
+            página siguiente, o None si no hay más filas
+    """
+    sql, params = consulta_pagina(busqueda, columna, ascendente, despues, limite)
+    filas = obtener_datos(sql, params)
+    if len(filas) <= limite:
+        return filas, None
+    filas = filas[:limite]
+    return filas, (filas[-1][7], filas[-1][0])
+
+
+def registrar_movimiento(tipo, cantidad, id_producto, referencia=""):
+    """
+    Registra un movimiento de inventario y ajusta el stock en una transacción.
+
+    Las salidas y transferencias descuentan con el UPDATE condicional de
+    db/stock.py, así que no pueden dejar el stock negativo aunque otra caja
+    haya vendido entre la validación del diálogo y el guardado.
+
+    Args:
+        tipo (str): 'entrada', 'salida' o 'transferencia'
+        cantidad (int): Unidades (positivas) que entran o salen
+        id_producto (int): Producto afectado
+        referencia (str): Texto libre (factura, motivo...)
+
+    Returns:
+        int: ID del movimiento creado
+
+    Raises:
+        StockInsuficiente: Si es una salida y no hay stock suficiente
+    """
+    return obtener_escritor().ejecutar(
+        _escribir_movimiento, tipo, cantidad, id_producto, referencia,
+        escrituras=[("Movimientos", None), ("Productos", [id_producto])]
+    ).result()
+
+
+def _escribir_movimiento(conn, tipo, cantidad, id_producto, referencia):
+    if tipo in TIPOS_SALIDA:
+        descontar_stock(conn, [(id_producto, cantidad)])
+        cantidad_ajustada = -cantidad
+    else:
+        conn.execute(SQL_SUMAR_STOCK, (cantidad, id_producto))
+        cantidad_ajustada = cantidad
+    return conn.execute(SQL_REGISTRAR, (tipo, cantidad_ajustada, id_producto, referencia)).lastrowid
@@ -0,0 +1,52 @@
+import os
+
+# Perfiles de almacenamiento: PRAGMA que se aplican a cada conexión al abrirse.
+#
+# - compatible: comportamiento por defecto de SQLite (journal de rollback,
+#   synchronous=FULL). Útil si la base vive en una unidad de red sin soporte
+#   para memoria compartida, donde WAL no funciona.
+# - rendimiento: WAL permite que las lecturas del dashboard no bloqueen las
+#   escrituras del punto de venta (y viceversa). Con WAL, synchronous=NORMAL
+#   sigue siendo seguro ante caídas de la aplicación.
+PERFILES = {
+    "compatible": {
+        "busy_timeout": 5000,
+    },
+    "rendimiento": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,        # Negativo = KiB (~20 MB)
+        "mmap_size": 268435456,      # 256 MB
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,        # ms de espera ante bloqueos
+    },
+}
+
+PERFIL_POR_DEFECTO = "rendimiento"
+
+# Variable de entorno para elegir el perfil sin tocar el código
+VARIABLE_ENTORNO = "VENTAS_PERFIL_DB"
+
+
+def obtener_perfil(nombre=None, **ajustes):
+    """
+    Devuelve los PRAGMA de un perfil de almacenamiento.
+
+    Args:
+        nombre (str): Nombre del perfil. Si es None se usa la variable de
+            entorno VENTAS_PERFIL_DB o, en su defecto, PERFIL_POR_DEFECTO
+        **ajustes: PRAGMA que reemplazan o amplían los del perfil
+
+    Returns:
+        dict: Pares nombre -> valor listos para GestorConexiones
+
+    Raises:
+        ValueError: Si el perfil no existe
+    """
+    nombre = nombre or os.environ.get(VARIABLE_ENTORNO) or PERFIL_POR_DEFECTO
+    if nombre not in PERFILES:
+        raise ValueError(f"Perfil de almacenamiento desconocido: {nombre}")
+
+    pragmas = dict(PERFILES[nombre])
+    pragmas.update(ajustes)
+    return pragmas
@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+def abrir_conexion(ruta, pragmas=None):
+    """
+    Abre una conexión SQLite y le aplica los PRAGMA indicados.
+
+    Args:
+        ruta (str): Ruta del archivo de base de datos
+        pragmas (dict): Pares nombre -> valor a ejecutar como PRAGMA
+
+    Returns:
+        sqlite3.Connection: Conexión lista para usarse
+    """
+    conn = sqlite3.connect(str(ruta), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for nombre, valor in (pragmas or {}).items():
+        conn.execute(f"PRAGMA {nombre} = {valor}")
+    return conn
+
+
+class GestorConexiones:
+    """
+    Administra conexiones SQLite reutilizables, una por hilo.
+
+    SQLite no permite compartir una conexión entre hilos de forma segura, así que
+    cada hilo obtiene la suya la primera vez que la pide y la reutiliza en las
+    llamadas siguientes. Las conexiones ociosas se verifican antes de devolverse
+    y se reabren si dejaron de responder.
+
+    Atributos:
+        ruta (str): Ruta del archivo de base de datos
+        pragmas (dict): PRAGMA aplicados a cada conexión nueva
+        intervalo_verificacion (float): Segundos de inactividad tras los que se
+            verifica la conexión antes de reutilizarla
+        antes_de_confirmar (callable): Se llama sin argumentos justo antes del
+            commit de cada transacción (ver db/cambios.py)
+        despues_de_confirmar (callable): Se llama sin argumentos apenas termina
+            ese commit, haya salido bien o no, en el mismo hilo
+    """
+
+    def __init__(self, ruta, pragmas=None, intervalo_verificacion=30.0):
+        self.ruta = str(ruta)
+        self.pragmas = dict(pragmas or {})
+        self.intervalo_verificacion = intervalo_verificacion
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conexiones = {}  # ident del hilo -> conexión
+        self.antes_de_confirmar = None
+        self.despues_de_confirmar = None
+
+    def nueva_conexion(self):
+        """Abre una conexión independiente (no administrada) con los PRAGMA del gestor"""
+        return abrir_conexion(self.ruta, self.pragmas)
+
+    def conexion(self):
+        """
+        Devuelve la conexión del hilo actual, creándola o reabriéndola si hace falta
+
+        Returns:
+            sqlite3.Connection: Conexión reutilizable del hilo
+        """
+        conn = getattr(self._local, "conn", None)
+        ahora = time.monotonic()
+
+        if conn is not None and ahora - self._local.ultimo_uso > self.intervalo_verificacion:
+            if not self.verificar(conn):
+                self._descartar(conn)
+                conn = None
+
+        if conn is None:
+            conn = self.nueva_conexion()
+            self._local.conn = conn
+            with self._lock:
+                self._purgar_hilos_terminados()
+                self._conexiones[threading.get_ident()] = conn
+
+        self._local.ultimo_uso = ahora
+        return conn
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Contexto que confirma los cambios al salir o los revierte si hay error
+
+        Yields:
+            sqlite3.Connection: Conexión del hilo actual
+        """
+        conn = self.conexion()
+        try:
+            yield conn
+            self.confirmar(conn.commit)
+        except Exception:
+            conn.rollback()
+            raise
+
+    def confirmar(self, commit):
+        """
+        Ejecuta un commit entre los avisos antes_de_confirmar y despues_de_confirmar.
+
+        Args:
+            commit (callable): Hace el commit (conn.commit o un COMMIT explícito)
+        """
+        if self.antes_de_confirmar is not None:
+            self.antes_de_confirmar()
+        try:
+            commit()
+        finally:
+            if self.despues_de_confirmar is not None:
+                self.despues_de_confirmar()
+
+    def verificar(self, conn):
+        """Comprueba que la conexión siga respondiendo"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def cerrar_todas(self):
+        """Cierra todas las conexiones administradas (por ejemplo al salir de la app)"""
+        with self._lock:
+            conexiones = list(self._conexiones.values())
+            self._conexiones.clear()
+        for conn in conexiones:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def total_conexiones(self):
+        """Cantidad de conexiones abiertas actualmente"""
+        with self._lock:
+            return len(self._conexiones)
+
+    def _descartar(self, conn):
+        """Cierra y olvida la conexión del hilo actual"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        self._local.conn = None
+        with self._lock:
+            self._conexiones.pop(threading.get_ident(), None)
+
+    def _purgar_hilos_terminados(self):
+        """Cierra conexiones de hilos que ya no existen (llamar con el lock tomado)"""
+        vivos = {hilo.ident for hilo in threading.enumerate()}
+        for ident in [i for i in self._conexiones if i not in vivos]:
+            try:
+                self._conexiones.pop(ident).close()
+            except sqlite3.Error:
+                pass
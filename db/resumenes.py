@@ -0,0 +1,216 @@
+"""
+Resúmenes diarios de ventas materializados.
+
+El dashboard no suma las transacciones crudas: lee tres tablas con un renglón
+por día (y por producto o cliente) que registrar_venta actualiza dentro de la
+misma transacción que la venta. El costo de una consulta depende de los días
+del rango (y de cuántos productos o clientes distintos vendieron cada día),
+no de cuántas ventas se registraron: un año de ventas diarias son 365
+renglones en vez de decenas de miles de transacciones.
+
+Las ventas que no pasan por registrar_venta (importaciones, datos sembrados a
+mano) se incorporan reconstruyendo los resúmenes:
+    python -m db.resumenes                          # reconstruye todo
+    python -m db.resumenes --desde 2025-01-01 --hasta 2025-01-31
+"""
+import argparse
+
+from db.consultas import rango_fechas
+from db.db import obtener_datos, obtener_escritor
+
+NOMBRES_TABLAS = ("Resumen_ventas_dia", "Resumen_producto_dia", "Resumen_cliente_dia")
+
+# Importe neto de un renglón de Detalle_transaccion (alias d): descuento es el
+# importe descontado (db/ventas.py, importe_descuento), no una fracción
+IMPORTE_RENGLON = "d.cantidad * d.precio_unitario - IFNULL(d.descuento, 0)"
+
+TABLAS = [
+    """CREATE TABLE IF NOT EXISTS Resumen_ventas_dia (
+           dia TEXT PRIMARY KEY,
+           total REAL NOT NULL,
+           ventas INTEGER NOT NULL
+       ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS Resumen_producto_dia (
+           dia TEXT NOT NULL,
+           id_producto INTEGER NOT NULL,
+           cantidad INTEGER NOT NULL,
+           importe REAL NOT NULL,
+           PRIMARY KEY (dia, id_producto)
+       ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS Resumen_cliente_dia (
+           dia TEXT NOT NULL,
+           id_cliente INTEGER NOT NULL,
+           total REAL NOT NULL,
+           ventas INTEGER NOT NULL,
+           PRIMARY KEY (dia, id_cliente)
+       ) WITHOUT ROWID""",
+]
+
+SQL_SUMAR_DIA = """
+    INSERT INTO Resumen_ventas_dia (dia, total, ventas) VALUES (?, ?, 1)
+    ON CONFLICT (dia) DO UPDATE SET total = total + excluded.total, ventas = ventas + 1
+"""
+
+SQL_SUMAR_PRODUCTO = """
+    INSERT INTO Resumen_producto_dia (dia, id_producto, cantidad, importe) VALUES (?, ?, ?, ?)
+    ON CONFLICT (dia, id_producto) DO UPDATE SET
+        cantidad = cantidad + excluded.cantidad, importe = importe + excluded.importe
+"""
+
+SQL_SUMAR_CLIENTE = """
+    INSERT INTO Resumen_cliente_dia (dia, id_cliente, total, ventas) VALUES (?, ?, ?, 1)
+    ON CONFLICT (dia, id_cliente) DO UPDATE SET total = total + excluded.total, ventas = ventas + 1
+"""
+
+
+def crear_tablas(conn):
+    """Crea las tablas de resúmenes y las llena con el historial. Usado por las migraciones."""
+    for sql in TABLAS:
+        conn.execute(sql)
+    reconstruir_resumenes(conn)
+
+
+def acumular_venta(conn, fecha, id_cliente, total, carrito):
+    """
+    Suma una venta a los resúmenes. Se llama con la conexión de la transacción
+    de la venta, de modo que ambas se confirman o se revierten juntas.
+
+    Args:
+        conn (sqlite3.Connection): Conexión con la transacción abierta
+        fecha (str): Fecha normalizada de la venta ('YYYY-MM-DD HH:MM:SS')
+        id_cliente (int): Cliente de la venta (None = sin cliente)
+        total (float): Total de la venta
+        carrito (list): Renglones con 'id_producto', 'cantidad', 'precio' y
+            opcionalmente 'descuento' (importe descontado, como en Detalle_transaccion)
+    """
+    dia = fecha[:10]
+    conn.execute(SQL_SUMAR_DIA, (dia, total))
+    if id_cliente is not None:
+        conn.execute(SQL_SUMAR_CLIENTE, (dia, id_cliente, total))
+    conn.executemany(SQL_SUMAR_PRODUCTO, [
+        (dia, item["id_producto"], item["cantidad"],
+         item["cantidad"] * item["precio"] - (item.get("descuento") or 0))
+        for item in carrito
+    ])
+
+
+def reconstruir_resumenes(conn=None, desde=None, hasta=None):
+    """
+    Recalcula los resúmenes a partir de las transacciones crudas.
+
+    Args:
+        conn (sqlite3.Connection): Conexión a usar. Sin ella se escribe a
+            través del escritor compartido y se espera su commit
+        desde (str|date): Primer día a recalcular (None = desde el inicio)
+        hasta (str|date): Último día a recalcular (None = hasta el final)
+    """
+    if conn is None:
+        obtener_escritor().ejecutar(
+            reconstruir_resumenes, desde, hasta,
+            escrituras=[(tabla, None) for tabla in NOMBRES_TABLAS]
+        ).result()
+        return
+
+    filtro_dia, filtro_t = "1", "t.fecha IS NOT NULL"
+    params = ()
+    if desde is not None or hasta is not None:
+        filtro_dia, params = rango_fechas("dia", desde or "0001-01-01", hasta or "9999-12-30")
+        filtro_t, _ = rango_fechas("t.fecha", desde or "0001-01-01", hasta or "9999-12-30")
+
+    for tabla in NOMBRES_TABLAS:
+        conn.execute(f"DELETE FROM {tabla} WHERE {filtro_dia}", params)
+
+    conn.execute(f"""
+        INSERT INTO Resumen_ventas_dia (dia, total, ventas)
+        SELECT date(t.fecha), SUM(t.total), COUNT(*)
+        FROM Transacciones t
+        WHERE t.tipo = 'venta' AND {filtro_t}
+        GROUP BY date(t.fecha)
+    """, params)
+    conn.execute(f"""
+        INSERT INTO Resumen_cliente_dia (dia, id_cliente, total, ventas)
+        SELECT date(t.fecha), t.id_cliente, SUM(t.total), COUNT(*)
+        FROM Transacciones t
+        WHERE t.tipo = 'venta' AND t.id_cliente IS NOT NULL AND {filtro_t}
+        GROUP BY date(t.fecha), t.id_cliente
+    """, params)
+    conn.execute(f"""
+        INSERT INTO Resumen_producto_dia (dia, id_producto, cantidad, importe)
+        SELECT date(t.fecha), d.id_producto, SUM(d.cantidad),
+               SUM({IMPORTE_RENGLON})
+        FROM Transacciones t
+        JOIN Detalle_transaccion d ON d.id_transaccion = t.id_transaccion
+        WHERE t.tipo = 'venta' AND d.id_producto IS NOT NULL AND {filtro_t}
+        GROUP BY date(t.fecha), d.id_producto
+    """, params)
+
+
+# ---------- Consultas del dashboard ----------
+
+def totales_periodo(desde, hasta):
+    """
+    Returns:
+        tuple: (total vendido, cantidad de ventas) entre los días indicados
+    """
+    filtro, params = rango_fechas("dia", desde, hasta)
+    fila = obtener_datos(f"SELECT SUM(total), SUM(ventas) FROM Resumen_ventas_dia WHERE {filtro}", params)[0]
+    return fila[0] or 0, fila[1] or 0
+
+
+def top_productos(desde, hasta, limite=5):
+    """
+    Returns:
+        list: (nombre, unidades vendidas) de los productos más vendidos
+    """
+    filtro, params = rango_fechas("r.dia", desde, hasta)
+    # Se agrega primero y solo se buscan los nombres de los ganadores
+    return obtener_datos(f"""
+        SELECT p.nombre, r.total_qty
+        FROM (SELECT id_producto, SUM(cantidad) AS total_qty
+              FROM Resumen_producto_dia r
+              WHERE {filtro}
+              GROUP BY id_producto ORDER BY total_qty DESC LIMIT ?) r
+        JOIN Productos p ON r.id_producto = p.id_producto
+        ORDER BY r.total_qty DESC
+    """, params + (limite,))
+
+
+def top_clientes(desde, hasta, limite=5):
+    """
+    Returns:
+        list: (nombre, total comprado) de los clientes que más compraron
+    """
+    filtro, params = rango_fechas("r.dia", desde, hasta)
+    return obtener_datos(f"""
+        SELECT c.nombres || ' ' || IFNULL(c.apellido_p, ''), r.total
+        FROM (SELECT id_cliente, SUM(total) AS total
+              FROM Resumen_cliente_dia r
+              WHERE {filtro}
+              GROUP BY id_cliente ORDER BY total DESC LIMIT ?) r
+        JOIN Clientes c ON r.id_cliente = c.id_cliente
+        ORDER BY r.total DESC
+    """, params + (limite,))
+
+
+def ventas_por_dia(desde, hasta):
+    """
+    Returns:
+        list: (día 'YYYY-MM-DD', total vendido) en orden cronológico
+    """
+    filtro, params = rango_fechas("dia", desde, hasta)
+    return obtener_datos(f"SELECT dia, total FROM Resumen_ventas_dia WHERE {filtro} ORDER BY dia", params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruye los resúmenes diarios de ventas")
+    parser.add_argument("--desde", help="Primer día a recalcular (YYYY-MM-DD)")
+    parser.add_argument("--hasta", help="Último día a recalcular (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    reconstruir_resumenes(desde=args.desde, hasta=args.hasta)
+    dias = obtener_datos("SELECT COUNT(*) FROM Resumen_ventas_dia")[0][0]
+    print(f"Resúmenes reconstruidos ({dias} días con ventas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Servicio local de ingesta de ventas para varias cajas.
+
+Con varias cajas escribiendo directo sobre el mismo ventas.db (por ejemplo en
+una unidad de red) cada proceso compite por el bloqueo del archivo. Con este
+servicio una sola máquina abre la base y las cajas le hablan por HTTP/JSON:
+
+    GET  /productos   Catálogo del punto de venta, servido desde la caché
+                      caliente (db/catalogo.py). Con If-None-Match responde
+                      304 si no cambió desde la última lectura de la caja.
+    POST /ventas      Registra una venta (los argumentos de registrar_venta).
+                      201 con el id, 409 con los conflictos de stock o 400.
+                      Con Idempotency-Key, repetir el pedido devuelve el
+                      resultado del primero sin registrar otra venta.
+    GET  /salud       Contadores del servicio y del escritor.
+
+Cada pedido se atiende en su propio hilo, pero todas las ventas pasan por el
+escritor compartido (db/escritor.py): las que llegan juntas se confirman en
+un mismo commit.
+
+Es opcional. Las cajas lo usan si VENTAS_SERVICIO_URL apunta a él; si no,
+escriben en la base como siempre. Para levantarlo:
+    python -m db.servicio --puerto 8765 [--db ruta/ventas.db]
+
+Para pruebas, ServicioVentas(puerto=0).iniciar() lo levanta en 127.0.0.1 en
+un hilo del mismo proceso y devuelve su URL.
+"""
+import argparse
+import http.client
+import json
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from db import db
+from db.catalogo import CatalogoProductos
+from db.stock import Conflicto, StockInsuficiente
+from db.ventas import enviar_venta
+
+PUERTO_POR_DEFECTO = 8765
+
+# Variable de entorno con la URL del servicio (vacía = escribir directo en la base)
+VARIABLE_ENTORNO = "VENTAS_SERVICIO_URL"
+
+# Claves de cada renglón del carrito que viajan al servicio
+CLAVES_RENGLON = ("id_producto", "cantidad", "precio", "descuento")
+
+# Encabezado con la clave única de cada venta: si la caja pierde la respuesta
+# y reenvía el pedido, el servicio no la registra dos veces
+CLAVE_IDEMPOTENCIA = "Idempotency-Key"
+
+# Claves recordadas (las más recientes); alcanza de sobra para los reintentos
+MAXIMO_CLAVES = 4096
+
+
+class ErrorServicio(RuntimeError):
+    """El servicio rechazó el pedido o respondió algo inesperado"""
+
+    def __init__(self, estado, mensaje):
+        self.estado = estado
+        super().__init__(f"Servicio de ventas ({estado}): {mensaje}")
+
+
+class ServicioVentas:
+    """
+    Servidor HTTP que recibe ventas de varias cajas y sirve el catálogo.
+
+    Atributos:
+        host (str): Interfaz de escucha (127.0.0.1 = solo esta máquina)
+        puerto (int): Puerto de escucha (0 = uno libre, ver `url`)
+        ventas (int): Ventas registradas
+        conflictos (int): Ventas rechazadas por stock insuficiente
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=PUERTO_POR_DEFECTO):
+        self.host = host
+        self.puerto = puerto
+        self.ventas = 0
+        self.conflictos = 0
+        # Distingue las versiones del catálogo de este arranque de las de uno anterior
+        self._instancia = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        # Clave de idempotencia -> Future de la venta
+        self._claves = OrderedDict()
+        self._servidor = None
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def iniciar(self):
+        """
+        Levanta el servidor en un hilo de fondo y calienta el catálogo.
+
+        Returns:
+            str: URL base del servicio
+        """
+        self._catalogo_json()
+        self._servidor = ThreadingHTTPServer((self.host, self.puerto), _crear_manejador(self))
+        self._servidor.daemon_threads = True
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, name="servicio-ventas", daemon=True)
+        self._hilo.start()
+        return self.url
+
+    def detener(self):
+        """Deja de aceptar pedidos; las ventas ya encoladas terminan en el escritor"""
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._hilo.join()
+            self._servidor = None
+
+    # ---------- Operaciones (en los hilos del servidor) ----------
+
+    def catalogo(self):
+        """
+        Returns:
+            tuple: (etag, cuerpo JSON) de la versión vigente del catálogo
+        """
+        version, cuerpo = self._catalogo_json()
+        return f'"{self._instancia}-{version}"', cuerpo
+
+    def _catalogo_json(self):
+        catalogo = CatalogoProductos.compartido()
+        # Se serializa una vez por versión del catálogo, no una vez por caja
+        return catalogo.vista("venta_json", lambda filas: (
+            catalogo.version,
+            json.dumps({"productos": catalogo.productos_venta()}).encode("utf-8"),
+        ))
+
+    def registrar(self, pedido, clave=None):
+        """
+        Registra una venta recibida.
+
+        Args:
+            pedido (dict): Claves id_cliente, id_medio_pago, carrito, totales y
+                opcionalmente fecha y descuento_global
+            clave (str): Clave de idempotencia; si ya se recibió, se devuelve el
+                resultado de esa venta (o se espera a que termine) sin registrar otra
+
+        Returns:
+            int: ID de la transacción
+
+        Raises:
+            StockInsuficiente: Si algún producto no alcanzó
+            KeyError, TypeError, ValueError: Si el pedido está mal formado
+        """
+        carrito = [{campo: renglon[campo] for campo in CLAVES_RENGLON if campo in renglon}
+                   for renglon in pedido["carrito"]]
+        with self._lock:
+            futuro = self._claves.get(clave) if clave else None
+            repetido = futuro is not None
+            if not repetido:
+                # Se encola con el lock tomado: dos reenvíos simultáneos no pueden registrar dos ventas
+                futuro = enviar_venta(
+                    pedido["id_cliente"], pedido["id_medio_pago"], carrito, pedido["totales"], pedido.get("fecha"),
+                    pedido.get("descuento_global", 0.0)
+                )
+                if clave:
+                    self._claves[clave] = futuro
+                    if len(self._claves) > MAXIMO_CLAVES:
+                        self._claves.popitem(last=False)
+        try:
+            id_transaccion = futuro.result()
+        except StockInsuficiente:
+            if not repetido:
+                with self._lock:
+                    self.conflictos += 1
+            raise
+        except Exception:
+            # Nada quedó escrito (el lote se revirtió): un reenvío puede volver a intentarlo
+            with self._lock:
+                if clave and self._claves.get(clave) is futuro:
+                    del self._claves[clave]
+            raise
+        if not repetido:
+            with self._lock:
+                self.ventas += 1
+        return id_transaccion
+
+    def salud(self):
+        escritor = db.obtener_escritor()
+        return {
+            "ventas": self.ventas,
+            "conflictos": self.conflictos,
+            "commits": escritor.lotes,
+            "escrituras": escritor.escrituras,
+        }
+
+
+def _crear_manejador(servicio):
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # conexiones persistentes: una por caja
+        # Encabezados y cuerpo salen en escrituras separadas: sin TCP_NODELAY
+        # cada respuesta esperaría el ACK diferido del cliente (~40 ms)
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if self.path == "/productos":
+                etag, cuerpo = servicio.catalogo()
+                if self.headers.get("If-None-Match") == etag:
+                    self._responder(304, b"", {"ETag": etag})
+                else:
+                    self._responder(200, cuerpo, {"ETag": etag})
+            elif self.path == "/salud":
+                self._json(200, servicio.salud())
+            else:
+                self._json(404, {"error": "ruta desconocida"})
+
+        def do_POST(self):
+            if self.path != "/ventas":
+                self._json(404, {"error": "ruta desconocida"})
+                return
+            try:
+                largo = int(self.headers.get("Content-Length", 0))
+                pedido = json.loads(self.rfile.read(largo))
+                id_transaccion = servicio.registrar(pedido, self.headers.get(CLAVE_IDEMPOTENCIA))
+            except StockInsuficiente as e:
+                self._json(409, {"error": str(e), "conflictos": [c._asdict() for c in e.conflictos]})
+            except (KeyError, TypeError, ValueError) as e:
+                self._json(400, {"error": f"Pedido inválido: {e!r}"})
+            except Exception as e:
+                self._json(500, {"error": str(e)})
+            else:
+                self._json(201, {"id_transaccion": id_transaccion})
+
+        def _json(self, estado, datos):
+            self._responder(estado, json.dumps(datos).encode("utf-8"))
+
+        def _responder(self, estado, cuerpo, encabezados=None):
+            self.send_response(estado)
+            if cuerpo:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            for nombre, valor in (encabezados or {}).items():
+                self.send_header(nombre, valor)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, formato, *args):
+            pass  # una línea por pedido ahoga la consola con varias cajas
+
+    return Manejador
+
+
+class ClienteVentas:
+    """
+    Lado de la caja: mismas operaciones que el punto de venta usa de la base.
+
+    Mantiene una conexión HTTP persistente por hilo y recuerda el último
+    catálogo recibido: si el servicio responde 304 devuelve la misma lista,
+    así quien compara por identidad (PantallaVentas.al_mostrar) no recarga.
+
+    Atributos:
+        url (str): URL base del servicio
+        timeout (float): Segundos de espera por respuesta
+    """
+
+    def __init__(self, url, timeout=10.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        partes = urlsplit(self.url)
+        self._host, self._puerto = partes.hostname, partes.port or 80
+        self._local = threading.local()
+        self._etag = None
+        self._productos = None
+
+    def productos_venta(self):
+        """
+        Returns:
+            list: Tuplas (id_producto, nombre, precio_venta, sku, codigo_barras, stock_actual)
+        """
+        encabezados = {"If-None-Match": self._etag} if self._etag else {}
+        estado, respuesta, datos = self._pedir("GET", "/productos", encabezados=encabezados)
+        if estado == 304:
+            return self._productos
+        if estado != 200:
+            raise ErrorServicio(estado, datos.get("error"))
+        self._productos = [tuple(p) for p in datos["productos"]]
+        self._etag = respuesta.getheader("ETag")
+        return self._productos
+
+    def registrar_venta(self, id_cliente, id_medio_pago, carrito, totales, fecha=None, descuento_global=0.0):
+        """
+        Igual que db.ventas.registrar_venta, pero a través del servicio.
+
+        Returns:
+            int: ID de la transacción creada
+
+        Raises:
+            StockInsuficiente: Con los conflictos que informó el servicio
+            ErrorServicio: Si el servicio rechazó el pedido
+        """
+        pedido = {
+            "id_cliente": id_cliente,
+            "id_medio_pago": id_medio_pago,
+            "carrito": [{clave: item[clave] for clave in CLAVES_RENGLON if clave in item} for item in carrito],
+            "totales": {clave: totales[clave] for clave in ("subtotal", "iva", "total")},
+            "fecha": None if fecha is None else str(fecha),
+            "descuento_global": descuento_global,
+        }
+        # Una clave por venta: los reenvíos tras una conexión caída no la duplican
+        encabezados = {CLAVE_IDEMPOTENCIA: secrets.token_hex(16)}
+        estado, _, datos = self._pedir("POST", "/ventas", pedido, encabezados)
+        if estado == 201:
+            return datos["id_transaccion"]
+        if estado == 409:
+            raise StockInsuficiente([Conflicto(**c) for c in datos["conflictos"]])
+        raise ErrorServicio(estado, datos.get("error"))
+
+    def salud(self):
+        estado, _, datos = self._pedir("GET", "/salud")
+        if estado != 200:
+            raise ErrorServicio(estado, datos.get("error"))
+        return datos
+
+    def cerrar(self):
+        """Cierra la conexión del hilo actual"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _pedir(self, metodo, ruta, datos=None, encabezados=None):
+        cuerpo = None if datos is None else json.dumps(datos).encode("utf-8")
+        encabezados = dict(encabezados or {})
+        if cuerpo is not None:
+            encabezados["Content-Type"] = "application/json"
+        while True:
+            conn = getattr(self._local, "conn", None)
+            reutilizada = conn is not None
+            if not reutilizada:
+                conn = http.client.HTTPConnection(self._host, self._puerto, timeout=self.timeout)
+                self._local.conn = conn
+            try:
+                conn.request(metodo, ruta, body=cuerpo, headers=encabezados)
+                respuesta = conn.getresponse()
+                leido = respuesta.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.cerrar()
+                # Solo se reintenta si el servidor cerró una conexión que estaba
+                # ociosa (por ejemplo, se reinició): con una nueva el error es real.
+                # Sin respuesta no se sabe si el pedido se procesó, así que un
+                # POST solo se reenvía si lleva clave de idempotencia
+                if not reutilizada or not (metodo == "GET" or CLAVE_IDEMPOTENCIA in encabezados):
+                    raise
+        return respuesta.status, respuesta, json.loads(leido) if leido else {}
+
+
+def cliente_configurado():
+    """
+    Returns:
+        ClienteVentas: Cliente del servicio indicado en VENTAS_SERVICIO_URL, o
+            None si la caja debe escribir directo en la base
+    """
+    url = os.environ.get(VARIABLE_ENTORNO, "").strip()
+    return ClienteVentas(url) if url else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de ingesta de ventas")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (0.0.0.0 = toda la red)")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument("--db", help="Ruta de la base de datos (por defecto, la de la aplicación)")
+    args = parser.parse_args()
+
+    if args.db:
+        db.configurar_db(args.db)
+    servicio = ServicioVentas(args.host, args.puerto)
+    print(f"Servicio de ventas en {servicio.iniciar()} (Ctrl+C para salir)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servicio.detener()
+        db.cerrar_conexiones()
+
+
+if __name__ == "__main__":
+    main()
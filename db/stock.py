@@ -0,0 +1,95 @@
+"""
+Descuento de stock atómico para varias cajas sobre la misma base.
+
+Leer el stock y luego descontarlo en otra llamada deja una ventana en la que
+otra caja puede vender las mismas unidades. Aquí el descuento es un único
+UPDATE condicional (`WHERE stock_actual >= ?`): SQLite lo evalúa con el
+bloqueo de escritura tomado, así que si la fila no cambió (rowcount 0) es
+porque ya no alcanzaba. Los conflictos se reportan por producto y la
+transacción del llamador se revierte entera.
+"""
+from collections import namedtuple
+
+SQL_DESCONTAR = """
+    UPDATE Productos SET stock_actual = stock_actual - ?
+    WHERE id_producto = ? AND stock_actual >= ?
+"""
+
+SQL_DISPONIBLE = "SELECT id_producto, nombre, stock_actual FROM Productos WHERE id_producto IN ({marcas})"
+
+Conflicto = namedtuple("Conflicto", "id_producto nombre solicitado disponible")
+
+
+class StockInsuficiente(ValueError):
+    """
+    Uno o más productos no tenían stock suficiente al momento de descontar.
+
+    Atributos:
+        conflictos (list): Un Conflicto por producto que no alcanzó
+    """
+
+    def __init__(self, conflictos):
+        self.conflictos = list(conflictos)
+        super().__init__(self.reporte())
+
+    def reporte(self):
+        """Texto para mostrar al usuario, un renglón por producto"""
+        if len(self.conflictos) == 1:
+            c = self.conflictos[0]
+            return f"Stock insuficiente. Disponible: {c.disponible}\nSolicitado: {c.solicitado}"
+        renglones = [f"• {c.nombre}: solicitado {c.solicitado}, disponible {c.disponible}" for c in self.conflictos]
+        return "Stock insuficiente para {} productos:\n{}".format(len(self.conflictos), "\n".join(renglones))
+
+
+def agrupar_por_producto(lineas):
+    """
+    Suma las cantidades de un mismo producto conservando el orden de aparición.
+
+    Args:
+        lineas (iterable): Pares (id_producto, cantidad)
+
+    Returns:
+        dict: id_producto -> cantidad total
+    """
+    totales = {}
+    for id_producto, cantidad in lineas:
+        totales[id_producto] = totales.get(id_producto, 0) + cantidad
+    return totales
+
+
+def descontar_stock(conn, lineas):
+    """
+    Descuenta stock dentro de la transacción abierta en `conn`.
+
+    Se intentan todos los productos antes de fallar, para que el reporte
+    incluya cada conflicto y no solo el primero. Quien llama debe revertir la
+    transacción si se lanza la excepción (GestorConexiones.transaccion lo hace).
+
+    Args:
+        conn (sqlite3.Connection): Conexión con la transacción de la venta o movimiento
+        lineas (iterable): Pares (id_producto, cantidad); un producto repetido se suma
+
+    Raises:
+        StockInsuficiente: Si algún producto no tenía stock suficiente
+    """
+    faltantes = {}
+    for id_producto, cantidad in agrupar_por_producto(lineas).items():
+        if conn.execute(SQL_DESCONTAR, (cantidad, id_producto, cantidad)).rowcount != 1:
+            faltantes[id_producto] = cantidad
+    if not faltantes:
+        return
+
+    ids = list(faltantes)
+    actuales = {
+        fila[0]: fila for fila in
+        conn.execute(SQL_DISPONIBLE.format(marcas=",".join("?" * len(ids))), ids)
+    }
+    raise StockInsuficiente([
+        Conflicto(
+            id_producto,
+            actuales[id_producto][1] if id_producto in actuales else f"Producto #{id_producto}",
+            cantidad,
+            (actuales[id_producto][2] or 0) if id_producto in actuales else 0,
+        )
+        for id_producto, cantidad in faltantes.items()
+    ])
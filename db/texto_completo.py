@@ -0,0 +1,139 @@
+"""
+Búsqueda de texto completo con FTS5.
+
+Cada tabla buscable tiene una tabla virtual <Tabla>_fts de contenido externo:
+el índice guarda solo los tokens y lee el texto de la tabla original, así que
+no duplica datos. Unos triggers lo mantienen al día en cada INSERT, DELETE y
+UPDATE de las columnas indexadas (los cambios de stock no lo tocan).
+
+Las consultas se resuelven con el índice invertido, de modo que el tiempo de
+búsqueda depende de cuántas filas coinciden y no del tamaño de la tabla.
+"""
+import re
+
+from db.db import obtener_datos
+
+# Tabla -> (columna id, columnas indexadas)
+INDICES = {
+    "Clientes": ("id_cliente", ["nombres", "apellido_p", "apellido_m", "rfc", "correo", "telefono"]),
+    "Productos": ("id_producto", ["nombre", "descripcion", "sku", "codigo_barras"]),
+    "Movimientos": ("id_movimiento", ["referencia"]),
+}
+
+# Minúsculas y sin acentos; prefix guarda índices de prefijos de 2 y 3
+# caracteres para que las búsquedas mientras se escribe no recorran el índice
+OPCIONES_FTS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+# Coincidencias que se puntúan por relevancia en cada búsqueda
+CANDIDATOS = 1000
+
+_PALABRAS = re.compile(r"\w+", re.UNICODE)
+
+
+def sentencias_indice(tabla):
+    """
+    SQL para crear la tabla FTS de contenido externo y sus triggers.
+
+    Args:
+        tabla (str): Clave de INDICES
+
+    Returns:
+        list: Sentencias a ejecutar en orden
+    """
+    id_col, columnas = INDICES[tabla]
+    fts = f"{tabla}_fts"
+    cols = ", ".join(columnas)
+    nuevos = ", ".join(f"new.{c}" for c in columnas)
+    viejos = ", ".join(f"old.{c}" for c in columnas)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+               {cols}, content = '{tabla}', content_rowid = '{id_col}', {OPCIONES_FTS})""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_insertar AFTER INSERT ON {tabla} BEGIN
+               INSERT INTO {fts} (rowid, {cols}) VALUES (new.{id_col}, {nuevos});
+           END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_borrar AFTER DELETE ON {tabla} BEGIN
+               INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{id_col}, {viejos});
+           END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_actualizar AFTER UPDATE OF {cols} ON {tabla} BEGIN
+               INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{id_col}, {viejos});
+               INSERT INTO {fts} (rowid, {cols}) VALUES (new.{id_col}, {nuevos});
+           END""",
+        # Indexa las filas que ya existían
+        f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')",
+    ]
+
+
+def crear_indices_texto(conn):
+    """Crea (o reconstruye) todos los índices de texto completo. Usado por las migraciones."""
+    for tabla in INDICES:
+        for sql in sentencias_indice(tabla):
+            conn.execute(sql)
+
+
+def expresion_fts(texto):
+    """
+    Convierte lo que escribe el usuario en una consulta MATCH segura.
+
+    Cada palabra se busca como prefijo y todas deben aparecer ("caf mol" ->
+    "caf"* "mol"*). Los signos se descartan, así que el texto nunca se
+    interpreta como sintaxis de FTS5.
+
+    Args:
+        texto (str): Texto libre
+
+    Returns:
+        str: Expresión para MATCH, o None si no hay palabras
+    """
+    palabras = _PALABRAS.findall(texto or "")
+    if not palabras:
+        return None
+    return " ".join(f'"{p}"*' for p in palabras)
+
+
+def subconsulta_fts(tabla, texto, candidatos=CANDIDATOS):
+    """
+    Subconsulta con (rowid, rank) de las filas que coinciden, para unir o filtrar.
+
+    Calcular bm25 de todas las coincidencias de una palabra muy común cuesta
+    tanto como la tabla misma; por eso solo se puntúan los primeros
+    `candidatos` aciertos. Con búsquedas selectivas (menos aciertos que el
+    límite) el orden por relevancia es exacto.
+
+    Args:
+        tabla (str): Clave de INDICES
+        texto (str): Texto libre
+        candidatos (int): Máximo de coincidencias a puntuar
+
+    Returns:
+        tuple: (sql, parámetros), o None si el texto no tiene palabras
+    """
+    expresion = expresion_fts(texto)
+    if expresion is None:
+        return None
+    fts = f"{tabla}_fts"
+    return f"SELECT rowid, rank FROM {fts} WHERE {fts} MATCH ? LIMIT ?", (expresion, candidatos)
+
+
+def buscar_ids(tabla, texto, limite=100):
+    """
+    Ids de la tabla que coinciden con el texto.
+
+    Args:
+        tabla (str): Clave de INDICES
+        texto (str): Texto libre
+        limite (int): Máximo de resultados, de más a menos relevante (bm25).
+            None devuelve todas las coincidencias sin puntuar, en orden de id
+
+    Returns:
+        list: Ids encontrados
+    """
+    expresion = expresion_fts(texto)
+    if expresion is None:
+        return []
+    if limite is None:
+        fts = f"{tabla}_fts"
+        filas = obtener_datos(f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?", (expresion,))
+    else:
+        sql, params = subconsulta_fts(tabla, texto)
+        filas = obtener_datos(f"SELECT rowid FROM ({sql}) ORDER BY rank LIMIT ?", params + (limite,))
+    return [fila[0] for fila in filas]
@@ -0,0 +1,114 @@
+from db.db import obtener_escritor
+from db.consultas import normalizar_fecha
+from db.resumenes import NOMBRES_TABLAS as TABLAS_RESUMEN, acumular_venta
+from db.stock import descontar_stock
+
+SQL_CABECERA = """
+    INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado)
+    VALUES ('venta', ?, ?, ?, ?, ?, ?, 'completada')
+"""
+
+SQL_DETALLE = """
+    INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SQL_MOVIMIENTO = """
+    INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia)
+    VALUES ('salida', ?, ?, ?, ?)
+"""
+
+# Tablas que escribe una venta, además de Productos
+TABLAS_VENTA = ("Transacciones", "Detalle_transaccion", "Movimientos") + TABLAS_RESUMEN
+
+
+def registrar_venta(id_cliente, id_medio_pago, carrito, totales, fecha=None, descuento_global=0.0):
+    """
+    Registra una venta completa en una sola transacción atómica.
+
+    La cabecera, los renglones de detalle, el descuento de stock y los
+    movimientos de salida se escriben en el hilo escritor (db/escritor.py)
+    dentro de un mismo SAVEPOINT: o se guarda todo o no se guarda nada. Los
+    resúmenes diarios del dashboard se actualizan en esa misma escritura.
+
+    El stock se descuenta primero y de forma condicional (db/stock.py): si
+    otra caja vendió esas unidades mientras tanto, la venta no se registra.
+
+    Args:
+        id_cliente (int): Cliente de la venta
+        id_medio_pago (int): Medio de pago seleccionado
+        carrito (list): Renglones con claves 'id_producto', 'cantidad', 'precio'
+            y opcionalmente 'descuento' (fracción del renglón, 0.1 = 10 %)
+        totales (dict): Claves 'subtotal', 'iva' y 'total'
+        fecha (datetime|str): Fecha de la venta (None = ahora)
+        descuento_global (float): Fracción descontada a todos los renglones
+
+    En Detalle_transaccion.descuento se guarda el importe descontado de cada
+    renglón (ver importe_descuento), no la fracción.
+
+    Returns:
+        int: ID de la transacción creada
+
+    Raises:
+        StockInsuficiente: Con un conflicto por producto que no alcanzó
+    """
+    return enviar_venta(id_cliente, id_medio_pago, carrito, totales, fecha, descuento_global).result()
+
+
+def enviar_venta(id_cliente, id_medio_pago, carrito, totales, fecha=None, descuento_global=0.0):
+    """
+    Encola la venta en el escritor compartido sin esperar el commit.
+
+    Varias ventas enviadas a la vez (por ejemplo desde varias cajas) se
+    confirman en un mismo commit; cada una sigue siendo atómica por separado.
+    Los argumentos son los de registrar_venta.
+
+    Returns:
+        Future: Se resuelve con el ID de la transacción o con StockInsuficiente
+    """
+    fecha = normalizar_fecha(fecha)
+    escrituras = [(tabla, None) for tabla in TABLAS_VENTA]
+    # Solo cambió el stock de estos productos: el catálogo relee esas filas
+    escrituras.append(("Productos", [item["id_producto"] for item in carrito]))
+    return obtener_escritor().ejecutar(
+        _escribir_venta, id_cliente, id_medio_pago, carrito, totales, fecha, descuento_global,
+        escrituras=escrituras
+    )
+
+
+def importe_descuento(item, descuento_global=0.0):
+    """
+    Importe descontado de un renglón, con la misma cuenta que el punto de venta.
+
+    Args:
+        item (dict): Renglón con 'cantidad', 'precio' y opcionalmente 'descuento' (fracción)
+        descuento_global (float): Fracción descontada a toda la venta
+
+    Returns:
+        float: Monto a restar de cantidad * precio
+    """
+    return item["precio"] * item["cantidad"] * (descuento_global + (item.get("descuento") or 0))
+
+
+def _escribir_venta(conn, id_cliente, id_medio_pago, carrito, totales, fecha, descuento_global):
+    """Cuerpo de la venta; corre en el hilo escritor dentro de su SAVEPOINT"""
+    # Desde acá 'descuento' es el importe descontado, como en Detalle_transaccion
+    carrito = [dict(item, descuento=importe_descuento(item, descuento_global)) for item in carrito]
+    descontar_stock(conn, [(item["id_producto"], item["cantidad"]) for item in carrito])
+
+    cursor = conn.execute(SQL_CABECERA, (
+        fecha, id_cliente, id_medio_pago,
+        totales["subtotal"], totales["iva"], totales["total"]
+    ))
+    id_transaccion = cursor.lastrowid
+    referencia = f"Venta #{id_transaccion}"
+
+    conn.executemany(SQL_DETALLE, [
+        (id_transaccion, item["id_producto"], item["cantidad"], item["precio"], item["descuento"], 0)
+        for item in carrito
+    ])
+    conn.executemany(SQL_MOVIMIENTO, [
+        (fecha, -item["cantidad"], item["id_producto"], referencia) for item in carrito
+    ])
+    acumular_venta(conn, fecha, id_cliente, totales["total"], carrito)
+    return id_transaccion
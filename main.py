@@ -1,6 +1,8 @@
 import tkinter as tk
 from ui.main import MainWindow
 from ui.login import LoginWindow
+from db.db import cerrar_conexiones
+from db.migraciones import aplicar_migraciones, mantener_indices
 
 # Variable global para mantener la referencia de la app principal
 app = None
@@ -40,6 +42,9 @@ def iniciar_aplicacion(usuario):
     app = MainWindow(root, usuario, on_logout=cerrar_sesion)
 
 if __name__ == "__main__":
+    # 0. Ponemos el esquema al día (índices y cambios posteriores)
+    aplicar_migraciones()
+
     root = tk.Tk()
     
     # 1. Ocultamos la ventana principal al inicio
@@ -49,4 +54,8 @@ if __name__ == "__main__":
     LoginWindow(root, on_login_success=iniciar_aplicacion)
     
     # 3. Iniciamos el bucle
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+    # 4. Refrescamos estadísticas de índices y liberamos las conexiones
+    mantener_indices()
+    cerrar_conexiones()
\ No newline at end of file
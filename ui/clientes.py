@@ -1,11 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from threading import Timer
 from db.db import obtener_datos, ejecutar_query
+from db.cambios import Sondeo
+from db.ejecutor import EjecutorConsultas
+from db.texto_completo import subconsulta_fts
 from ui.styles import AppTheme
 from utils.helpers import get_inactive_color  
 from ui.dialogos.dialogo_clientes import DialogoCliente 
 from ui.dialogos.dialogo_direccion import DialogoDireccion 
+from ui.components.tabla_virtual import TablaVirtual
 
 class PantallaClientes(ttk.Frame):
     COLUMNAS = {
@@ -26,7 +29,7 @@ class PantallaClientes(ttk.Frame):
         0: 'Inactivo'
     }
     
-    CAMPOS_BUSQUEDA = ['c.nombres', 'c.apellido_p', 'c.apellido_m', 'c.rfc']  
+    # La búsqueda usa el índice Clientes_fts (nombres, apellidos, RFC, correo y teléfono)
     def __init__(self, parent):
         super().__init__(parent)
         self.theme = AppTheme()
@@ -36,6 +39,13 @@ class PantallaClientes(ttk.Frame):
             'estado': 'Todos',
         }
         self.orden = {'columna': None, 'ascendente': True}
+        self._espera_filtro = None
+        # Las consultas corren en segundo plano; cada pantalla tiene su canal
+        self.ejecutor = EjecutorConsultas.compartido(parent)
+        self._canal = f"clientes-{id(self)}"
+        self.bind("<Destroy>", self._al_destruir, add="+")
+        # Si otro proceso (otra caja) modifica clientes, la lista se refresca sola
+        self.sondeo = Sondeo(self, ("Clientes", "Direcciones"), self._cargar_datos)
         
         self._inicializar_ui()
         self._cargar_datos()
@@ -91,88 +101,96 @@ class PantallaClientes(ttk.Frame):
         ).pack(side=tk.RIGHT, padx=5)
 
     def _configurar_tabla(self):
-        frame = ttk.Frame(self)
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
-
-        self.tabla = ttk.Treeview(
-            frame,
-            columns=[col[0] for col in self.COLUMNAS['Principal']],
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            selectmode="browse"
+        self.tabla = TablaVirtual(
+            self,
+            self.COLUMNAS['Principal'],
+            formatear=self._formatear_fila,
+            etiquetas=lambda cliente: ('inactivo',) if cliente[7] == 0 else (),
+            al_ordenar=self._ordenar_por_columna,
+            al_seleccionar=lambda cliente: self._actualizar_boton_estado()
         )
 
-        for col in self.COLUMNAS['Principal']:
-            self.tabla.heading(col[0], text=col[1], command=lambda c=col[0]: self._ordenar_por_columna(c))
-            self.tabla.column(col[0], width=col[2], anchor=tk.CENTER)
-
         # Configurar color para inactivos
         self.tabla.tag_configure('inactivo', background=get_inactive_color())
+        self.tabla.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    def _construir_consulta(self):
+        query = """
+            SELECT 
+                c.id_cliente,
+                c.nombres || ' ' || COALESCE(c.apellido_p, '') || ' ' || COALESCE(c.apellido_m, '') AS nombre_completo,
+                c.tipo_persona,
+                d.calle || ' ' || d.numero_domicilio AS direccion_principal,
+                c.correo,
+                c.telefono,
+                c.fecha_registro,
+                c.estado
+            FROM Clientes c
+            {join_busqueda}
+            LEFT JOIN Direcciones d ON c.id_cliente = d.id_cliente AND d.principal = 1
+            {where}
+            ORDER BY {order_by}
+        """
         
-        scrollbar.config(command=self.tabla.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tabla.pack(fill=tk.BOTH, expand=True)
-        self.tabla.bind("<<TreeviewSelect>>", lambda e: self._actualizar_boton_estado())
+        parametros = []
+        busqueda = subconsulta_fts("Clientes", self.filtros['busqueda'])
+        if busqueda:
+            sql_busqueda, params_busqueda = busqueda
+            parametros.extend(params_busqueda)
+        query = query.format(
+            join_busqueda=f"JOIN ({sql_busqueda}) f ON f.rowid = c.id_cliente" if busqueda else "",
+            where=self._construir_where(),
+            order_by=self._construir_orden(por_relevancia=bool(busqueda))
+        )
+        if self.filtros['estado'] != 'Todos':
+            parametros.append(1 if self.filtros['estado'] == self.ESTADOS[1] else 0)
+        return query, parametros
 
     def _cargar_datos(self):
-        try:
-            query = """
-                SELECT 
-                    c.id_cliente,
-                    c.nombres || ' ' || COALESCE(c.apellido_p, '') || ' ' || COALESCE(c.apellido_m, '') AS nombre_completo,
-                    c.tipo_persona,
-                    d.calle || ' ' || d.numero_domicilio AS direccion_principal,
-                    c.correo,
-                    c.telefono,
-                    c.fecha_registro,
-                    c.estado
-                FROM Clientes c
-                LEFT JOIN Direcciones d ON c.id_cliente = d.id_cliente AND d.principal = 1
-                {where}
-                ORDER BY {order_by}
-            """.format(
-                where=self._construir_where(),
-                order_by=self._construir_orden()
-            )
-            
-            parametros = []
-            if self.filtros['busqueda']:
-                parametros.extend([f"%{self.filtros['busqueda']}%"] * len(self.CAMPOS_BUSQUEDA))
-            if self.filtros['estado'] != 'Todos':
-                parametros.append(1 if self.filtros['estado'] == self.ESTADOS[1] else 0)
-                
-            self.datos = obtener_datos(query, parametros)
-            
-            self._actualizar_tabla()
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error cargando datos: {str(e)}")
+        """Pide los clientes al ejecutor; una carga nueva descarta la anterior"""
+        query, parametros = self._construir_consulta()
+        self.sondeo.marcar()
+        self.ejecutor.consultar(
+            self._canal, query, parametros,
+            al_terminar=self._mostrar_datos,
+            al_fallar=lambda e: messagebox.showerror("Error", f"Error cargando datos: {str(e)}")
+        )
+
+    def al_mostrar(self):
+        """La pantalla vuelve a verse (ver CachePantallas): se refresca si hubo cambios"""
+        if self.sondeo.hay_cambios():
+            self._cargar_datos()
+
+    def _mostrar_datos(self, filas):
+        self.datos = filas
+        self._actualizar_tabla()
+
+    def _al_destruir(self, event):
+        if event.widget is self:
+            self.ejecutor.cancelar(self._canal)
+
+    def _formatear_fila(self, cliente):
+        return (
+            cliente[0],  # ID
+            cliente[1],  # Nombre
+            cliente[2],  # Tipo persona
+            cliente[3] or "Sin dirección",
+            cliente[4],  # Correo
+            cliente[5],  # Teléfono
+            cliente[6],  # Fecha Registro
+            self.ESTADOS[cliente[7]]
+        )
 
     def _actualizar_tabla(self):
-        self.tabla.delete(*self.tabla.get_children())
-        for cliente in self.datos:
-            estado = self.ESTADOS[cliente[7]]  
-            direccion = cliente[3] or "Sin dirección"
-            
-            self.tabla.insert("", tk.END, values=(
-                cliente[0],  # ID
-                cliente[1],  # Nombre
-                cliente[2],  # Tipo persona
-                direccion,
-                cliente[4],  # Correo
-                cliente[5],  # Teléfono
-                cliente[6],  # Fecha Registro
-                estado
-            ), tags=('inactivo',) if cliente[7] == 0 else ())
+        self.tabla.establecer_datos(self.datos)
+        self._actualizar_boton_estado()
 
     def _cambiar_estado_cliente(self):
-        seleccion = self.tabla.focus()
+        seleccion = self.tabla.seleccionada()
         if not seleccion:
             return
         
-        cliente_id = self.tabla.item(seleccion, "values")[0]
+        cliente_id = seleccion[0]
         
         try:
             resultado = obtener_datos(
@@ -193,10 +211,7 @@ class PantallaClientes(ttk.Frame):
                     (nuevo_estado, cliente_id)
                 )
                 
-                # 1. Quitar la selección ANTES de recargar
-                self.tabla.selection_remove(seleccion)
-                
-                # 2. Recargar datos y actualizar tabla
+                # Recargar datos y actualizar tabla (la selección se reinicia)
                 self._cargar_datos()
                 
         except Exception as e:
@@ -204,32 +219,32 @@ class PantallaClientes(ttk.Frame):
     
     def _construir_where(self):
         condiciones = []
-        if self.filtros['busqueda']:
-            condiciones.append(" OR ".join([f"{campo} LIKE ?" for campo in self.CAMPOS_BUSQUEDA]))
         if self.filtros['estado'] != 'Todos':
             condiciones.append("c.estado = ?")
             
         return "WHERE " + " AND ".join(condiciones) if condiciones else ""
 
-    def _construir_orden(self):
+    def _construir_orden(self, por_relevancia=False):
         if not self.orden['columna']:
-            return "c.id_cliente ASC"  # Orden inicial ascendente
+            # Al buscar, primero los más relevantes (bm25); si no, orden inicial ascendente
+            return "f.rank, c.id_cliente" if por_relevancia else "c.id_cliente ASC"
         return f"{self.orden['columna']} {'ASC' if self.orden['ascendente'] else 'DESC'}"
     
     def _aplicar_debounce_filtros(self):
-        if hasattr(self, '_timer_filtro'):
-            self._timer_filtro.cancel()
-        self._timer_filtro = Timer(0.3, self._aplicar_filtros)
-        self._timer_filtro.start()
+        # Espera a que se deje de escribir; after() corre en el hilo de Tk
+        if self._espera_filtro is not None:
+            self.after_cancel(self._espera_filtro)
+        self._espera_filtro = self.after(300, self._aplicar_filtros)
 
     def _aplicar_filtros(self, event=None):
+        self._espera_filtro = None
         self.filtros.update({
             'busqueda': self.entrada_busqueda.get().strip(),
             'estado': self.combo_estado.get(),
         })
         self._cargar_datos()
 
-    def _ordenar_por_columna(self, columna):
+    def _ordenar_por_columna(self, columna, ascendente):
         column_map = {
             'id_cliente': 'c.id_cliente',
             'nombre_completo': 'nombre_completo',  # Es un alias, no necesita 'c.'
@@ -238,30 +253,15 @@ class PantallaClientes(ttk.Frame):
             'estado': 'c.estado'
         }
         
-        # Obtener columna mapeada
-        nueva_columna = column_map.get(columna, 'c.id_cliente')
-        
-        # Si es la misma columna, invertir orden
-        if self.orden['columna'] == nueva_columna:
-            self.orden['ascendente'] = not self.orden['ascendente']
-        else:
-            self.orden['columna'] = nueva_columna
-            self.orden['ascendente'] = True
+        # Obtener columna mapeada; el sentido lo lleva la tabla
+        self.orden['columna'] = column_map.get(columna, 'c.id_cliente')
+        self.orden['ascendente'] = ascendente
         
         self._cargar_datos()
 
     def _actualizar_boton_estado(self):
-        seleccion = self.tabla.focus()
-        
-        if not seleccion:
-            self.btn_estado.config(state="disabled")
-            return
-            
-        # Obtener valores de la fila seleccionada
-        valores = self.tabla.item(seleccion, "values")
-        
-        # Verificar que hay datos y habilitar botón
-        if valores:
+        # Habilitar el botón solo con un cliente seleccionado
+        if self.tabla.seleccionada():
             self.btn_estado.config(state="normal")
         else:
             self.btn_estado.config(state="disabled")
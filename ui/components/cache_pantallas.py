@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict, deque
+
+# Pantallas construidas que se conservan ocultas; la menos usada se destruye
+MAXIMO_PANTALLAS = 5
+
+# Cambios de pantalla medidos que se guardan por pantalla
+MUESTRAS_TIEMPO = 50
+
+
+class CachePantallas:
+    """
+    Conserva las pantallas ya construidas y las oculta en vez de destruirlas.
+
+    Volver a una pantalla solo la re-empaqueta: no repite `_cargar_datos`, ni
+    vuelve a crear las filas de sus tablas ni los gráficos. Si la pantalla
+    define `al_mostrar()`, se llama cada vez que reaparece para que se
+    refresque solo si sus datos cambiaron (ver db/cambios.py). Se guardan como
+    mucho `maximo` pantallas; al pasarse se destruye la usada hace más tiempo.
+
+    Cada cambio se cronometra hasta que Tk termina de acomodar la pantalla
+    (update_idletasks), separando las pantallas creadas de las reutilizadas.
+
+    Atributos:
+        fabricas (dict): clave -> función sin argumentos que construye la pantalla
+        maximo (int): Pantallas que se conservan a la vez
+        actual (str): Clave de la pantalla visible
+        tiempos (dict): clave -> muestras (segundos, "creada" | "reutilizada")
+    """
+
+    def __init__(self, fabricas, maximo=MAXIMO_PANTALLAS):
+        self.fabricas = fabricas
+        self.maximo = maximo
+        self.actual = None
+        self.tiempos = {}
+        self._pantallas = OrderedDict()  # de la menos a la más recientemente usada
+
+    def __contains__(self, clave):
+        return clave in self._pantallas
+
+    def mostrar(self, clave):
+        """
+        Muestra la pantalla indicada, reutilizándola si ya estaba construida.
+
+        Args:
+            clave (str): Clave de la pantalla (ver `fabricas`)
+
+        Returns:
+            tk.Widget: La pantalla visible
+        """
+        inicio = time.perf_counter()
+        if self.actual is not None and self.actual in self._pantallas:
+            self._pantallas[self.actual].pack_forget()
+
+        pantalla = self._pantallas.get(clave)
+        reutilizada = pantalla is not None and pantalla.winfo_exists()
+        if reutilizada:
+            self._pantallas.move_to_end(clave)
+        else:
+            pantalla = self.fabricas[clave]()
+            self._pantallas[clave] = pantalla
+            self._desalojar()
+
+        self.actual = clave
+        pantalla.pack(fill="both", expand=True)
+        if reutilizada and hasattr(pantalla, "al_mostrar"):
+            pantalla.al_mostrar()
+        pantalla.update_idletasks()
+
+        self._registrar(clave, time.perf_counter() - inicio, "reutilizada" if reutilizada else "creada")
+        return pantalla
+
+    def olvidar(self, clave):
+        """Destruye una pantalla conservada (se reconstruirá al volver a ella)"""
+        pantalla = self._pantallas.pop(clave, None)
+        if pantalla is not None and pantalla.winfo_exists():
+            pantalla.destroy()
+        if clave == self.actual:
+            self.actual = None
+
+    def resumen_tiempos(self):
+        """
+        Tiempos de cambio de pantalla en milisegundos.
+
+        Returns:
+            dict: (clave, origen) -> (muestras, promedio_ms, máximo_ms)
+        """
+        resumen = {}
+        for clave, muestras in self.tiempos.items():
+            for origen in ("creada", "reutilizada"):
+                valores = [s * 1000 for s, o in muestras if o == origen]
+                if valores:
+                    resumen[(clave, origen)] = (len(valores), sum(valores) / len(valores), max(valores))
+        return resumen
+
+    def _desalojar(self):
+        while len(self._pantallas) > max(self.maximo, 1):
+            clave = next(iter(self._pantallas))
+            self.olvidar(clave)
+
+    def _registrar(self, clave, segundos, origen):
+        self.tiempos.setdefault(clave, deque(maxlen=MUESTRAS_TIEMPO)).append((segundos, origen))
@@ -0,0 +1,253 @@
+import io
+import math
+from abc import ABC, abstractmethod
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+
+COLOR_FONDO = '#ECEFF4'
+COLORES_PASTEL = ['#BF616A', '#D08770', '#EBCB8B', '#A3BE8C', '#B48EAD']
+
+
+def geometria_pastel(valores, angulo_inicio=0):
+    """
+    Ángulos de cada porción de un pastel, igual que los calcula `Axes.pie`
+    (sentido antihorario desde `angulo_inicio`). No depende de matplotlib.
+
+    Args:
+        valores (list): Tamaño de cada porción
+        angulo_inicio (float): Ángulo inicial en grados
+
+    Returns:
+        list: Tuplas (theta1, theta2, fracción) por porción
+    """
+    total = float(sum(valores)) or 1.0
+    resultado = []
+    theta = angulo_inicio
+    for valor in valores:
+        fraccion = valor / total
+        resultado.append((theta, theta + 360 * fraccion, fraccion))
+        theta += 360 * fraccion
+    return resultado
+
+
+def figura_a_png(figura, dpi=None):
+    """
+    Rasteriza una figura a PNG en memoria, listo para pasarlo a ReportLab.
+
+    Args:
+        figura (Figure): Figura de matplotlib
+        dpi (int): Resolución (None = la de la figura)
+
+    Returns:
+        io.BytesIO: Buffer posicionado al inicio
+    """
+    buffer = io.BytesIO()
+    figura.savefig(buffer, format='png', dpi=dpi or 'figure', bbox_inches='tight')
+    buffer.seek(0)
+    return buffer
+
+
+class PanelGrafico(ABC):
+    """
+    Gráfico del dashboard que se crea una sola vez y se actualiza en el lugar.
+
+    La figura, los ejes y el canvas de Tk se construyen al crear el panel; cada
+    `actualizar()` solo cambia los datos de los artistas existentes y pide un
+    `draw_idle()`, en vez de destruir y volver a crear widgets y figuras.
+    `cerrar()` libera la figura y el widget cuando la pantalla se destruye.
+    Las subclases implementan `_crear_artistas` y `_actualizar_artistas`.
+
+    Atributos:
+        figura (Figure): Figura de matplotlib (se reutiliza para el reporte PDF)
+        tiene_datos (bool): Si el último `actualizar()` recibió datos
+    """
+
+    def __init__(self, master, titulo, fila, columna, tamano=(5, 4), dpi=100):
+        self.titulo = titulo
+        self.figura = Figure(figsize=tamano, dpi=dpi)
+        self.ax = self.figura.add_subplot(111)
+        self.ax.set_title(titulo, fontsize=10)
+        self.tiene_datos = False
+        self._aviso = self.ax.text(0.5, 0.5, "Sin datos", ha="center", va="center",
+                                   transform=self.ax.transAxes, visible=False)
+        self._crear_artistas()
+
+        self.canvas = FigureCanvasTkAgg(self.figura, master=master)
+        self.canvas.get_tk_widget().grid(row=fila, column=columna, padx=10, pady=10, sticky="nsew")
+
+    def actualizar(self, datos):
+        """
+        Muestra nuevos datos reutilizando los artistas del gráfico.
+
+        Args:
+            datos (list): Filas (etiqueta, valor)
+        """
+        self.tiene_datos = bool(datos)
+        self._aviso.set_visible(not self.tiene_datos)
+        etiquetas = [str(fila[0]) for fila in datos]
+        valores = [fila[1] or 0 for fila in datos]
+        self._actualizar_artistas(etiquetas, valores)
+        self.canvas.draw_idle()
+
+    def cerrar(self):
+        """Libera la figura y destruye el widget del canvas"""
+        self.figura.clear()
+        widget = self.canvas.get_tk_widget()
+        if widget.winfo_exists():
+            widget.destroy()
+
+    # ---------- Para las subclases ----------
+
+    @abstractmethod
+    def _crear_artistas(self):
+        """Crea en self.ax los artistas vacíos que después se actualizan"""
+
+    @abstractmethod
+    def _actualizar_artistas(self, etiquetas, valores):
+        """Pone los datos en los artistas existentes, sin crear otros"""
+
+
+class GraficoBarras(PanelGrafico):
+    """Barras horizontales con un número fijo de posiciones (top N)"""
+
+    def __init__(self, master, titulo, fila, columna, posiciones=5, color='#5E81AC', **opciones):
+        self.posiciones = posiciones
+        self.color = color
+        super().__init__(master, titulo, fila, columna, **opciones)
+
+    def _crear_artistas(self):
+        self.barras = self.ax.barh(range(self.posiciones), [0] * self.posiciones, color=self.color)
+        self.ax.set_yticks(range(self.posiciones))
+        self.ax.set_ylim(self.posiciones - 0.5, -0.5)  # el primero arriba
+
+    def _actualizar_artistas(self, etiquetas, valores):
+        for i, barra in enumerate(self.barras):
+            barra.set_width(valores[i] if i < len(valores) else 0)
+            barra.set_visible(i < len(valores))
+        self.ax.set_yticklabels(etiquetas + [""] * (self.posiciones - len(etiquetas)))
+        self.ax.set_xlim(0, (max(valores) if valores else 1) * 1.05 or 1)
+
+
+class GraficoLinea(PanelGrafico):
+    """Serie temporal: una sola línea cuyos datos se reemplazan"""
+
+    def __init__(self, master, titulo, fila, columna, color='#BF616A', **opciones):
+        self.color = color
+        super().__init__(master, titulo, fila, columna, **opciones)
+
+    def _crear_artistas(self):
+        (self.linea,) = self.ax.plot([], [], marker='o', color=self.color)
+
+    def _actualizar_artistas(self, etiquetas, valores):
+        posiciones = list(range(len(valores)))
+        self.linea.set_data(posiciones, valores)
+        self.linea.set_visible(bool(valores))
+
+        # Como mucho ~12 marcas para que las fechas no se encimen
+        paso = max(1, math.ceil(len(etiquetas) / 12))
+        self.ax.set_xticks(posiciones[::paso])
+        self.ax.set_xticklabels([e[5:] for e in etiquetas[::paso]],
+                                rotation=45 if len(etiquetas) > 5 else 0,
+                                ha="right" if len(etiquetas) > 5 else "center", fontsize=8)
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class GraficoPastel(PanelGrafico):
+    """
+    Pastel (o dona, con `hueco`) con porciones reutilizables.
+
+    Las porciones existentes se reajustan cambiando sus ángulos y la posición
+    de sus textos; solo cuando cambia la cantidad de porciones se vuelven a
+    crear los artistas del pastel (la figura y el canvas se conservan).
+    """
+
+    def __init__(self, master, titulo, fila, columna, formato='%1.1f%%', angulo_inicio=45,
+                 distancia_pct=0.6, hueco=None, largo_etiqueta=None, colores=None, **opciones):
+        self.formato = formato
+        self.angulo_inicio = angulo_inicio
+        self.distancia_pct = distancia_pct
+        self.hueco = hueco
+        self.largo_etiqueta = largo_etiqueta
+        self.colores = colores
+        self.porciones, self.textos, self.porcentajes = [], [], []
+        super().__init__(master, titulo, fila, columna, **opciones)
+
+    def _crear_artistas(self):
+        self.ax.set_aspect('equal')
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self.ax.axis('off')
+        if self.hueco:
+            self.ax.add_artist(Circle((0, 0), self.hueco, fc=COLOR_FONDO, zorder=3))
+
+    def _actualizar_artistas(self, etiquetas, valores):
+        if self.largo_etiqueta:
+            etiquetas = [e[:self.largo_etiqueta] for e in etiquetas]
+        if len(valores) != len(self.porciones):
+            self._recrear_porciones(len(valores))
+
+        for i, (theta1, theta2, fraccion) in enumerate(geometria_pastel(valores, self.angulo_inicio)):
+            porcion = self.porciones[i]
+            porcion.set_theta1(theta1)
+            porcion.set_theta2(theta2)
+            medio = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(medio), math.sin(medio)
+            self.textos[i].set_text(etiquetas[i])
+            self.textos[i].set_position((1.1 * x, 1.1 * y))
+            self.textos[i].set_horizontalalignment("left" if x >= 0 else "right")
+            self.porcentajes[i].set_text(self.formato % (fraccion * 100))
+            self.porcentajes[i].set_position((self.distancia_pct * x, self.distancia_pct * y))
+
+    def _recrear_porciones(self, cantidad):
+        for artista in self.porciones + self.textos + self.porcentajes:
+            artista.remove()
+        self.porciones, self.textos, self.porcentajes = [], [], []
+        if not cantidad:
+            return
+        # Un pastel provisional de porciones iguales; los ángulos reales los
+        # fija _actualizar_artistas
+        porciones, textos, porcentajes = self.ax.pie(
+            [1] * cantidad, labels=[""] * cantidad, autopct=lambda p: "",
+            startangle=self.angulo_inicio, pctdistance=self.distancia_pct, colors=self.colores
+        )
+        self.porciones, self.textos, self.porcentajes = list(porciones), list(textos), list(porcentajes)
+        # pie() reinicia los límites de los ejes
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+
+
+class PanelGraficos:
+    """
+    Conjunto de gráficos de una pantalla, indexados por clave.
+
+    Se encarga del ciclo de vida: los gráficos se crean una sola vez y se
+    cierran juntos cuando se destruye el frame que los contiene.
+    """
+
+    def __init__(self, master):
+        self.master = master
+        self.graficos = {}
+        master.bind("<Destroy>", self._al_destruir, add="+")
+
+    def agregar(self, clave, grafico):
+        self.graficos[clave] = grafico
+        return grafico
+
+    def actualizar(self, clave, datos):
+        self.graficos[clave].actualizar(datos)
+
+    def figuras(self):
+        """Figuras con datos, por clave (las que se incluyen en el reporte)"""
+        return {clave: g.figura for clave, g in self.graficos.items() if g.tiene_datos}
+
+    def cerrar(self):
+        for grafico in self.graficos.values():
+            grafico.cerrar()
+        self.graficos.clear()
+
+    def _al_destruir(self, event):
+        if event.widget is self.master:
+            self.cerrar()
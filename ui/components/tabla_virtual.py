@@ -0,0 +1,292 @@
+import tkinter as tk
+from tkinter import ttk, font
+
+
+def _clave_por_defecto(posicion):
+    """Ordena por la posición de la fila: None al final y textos sin distinguir mayúsculas"""
+    def clave(fila):
+        valor = fila[posicion]
+        if valor is None:
+            return (1, "")
+        return (0, valor.lower() if isinstance(valor, str) else valor)
+    return clave
+
+
+class FuenteFilas:
+    """
+    Datos detrás de una TablaVirtual: la lista completa, el orden aplicado y la
+    ventana de filas que se está mostrando. No depende de Tk.
+
+    Atributos:
+        filas (list): Filas completas (tuplas o sqlite3.Row) en el orden actual
+        inicio (int): Índice de la primera fila visible
+        columna_orden (str): Columna por la que se ordena (None si no hay orden)
+        ascendente (bool): Sentido del orden
+    """
+
+    def __init__(self, columnas, claves=None):
+        self.columnas = list(columnas)
+        self.claves = claves or {}
+        self.filas = []
+        self.inicio = 0
+        self.columna_orden = None
+        self.ascendente = True
+
+    def __len__(self):
+        return len(self.filas)
+
+    def establecer(self, filas, ordenar=True):
+        """Reemplaza los datos, reaplicando el orden local si hay uno activo"""
+        self.filas = list(filas)
+        if ordenar and self.columna_orden is not None:
+            self._ordenar()
+        self.inicio = 0
+
+    def agregar(self, filas):
+        """Agrega filas al final (carga perezosa por páginas)"""
+        self.filas.extend(filas)
+
+    def cambiar_orden(self, columna):
+        """
+        Alterna el sentido si la columna ya era la de orden; si no, ordena ascendente.
+
+        Returns:
+            tuple: (columna, ascendente) resultante
+        """
+        if columna == self.columna_orden:
+            self.ascendente = not self.ascendente
+        else:
+            self.columna_orden = columna
+            self.ascendente = True
+        return self.columna_orden, self.ascendente
+
+    def _ordenar(self):
+        clave = self.claves.get(self.columna_orden) or _clave_por_defecto(self.columnas.index(self.columna_orden))
+        self.filas.sort(key=clave, reverse=not self.ascendente)
+
+    def ordenar(self, columna):
+        """Ordena en memoria por la columna (ver cambiar_orden)"""
+        self.cambiar_orden(columna)
+        self._ordenar()
+        self.inicio = 0
+
+    def limitar_inicio(self, inicio, visibles):
+        """Ajusta el inicio para que la ventana no se salga de los datos"""
+        self.inicio = max(0, min(inicio, len(self.filas) - visibles))
+        return self.inicio
+
+    def ventana(self, visibles):
+        """Filas a dibujar para `visibles` renglones a partir del inicio"""
+        return self.filas[self.inicio:self.inicio + visibles]
+
+
+class TablaVirtual(ttk.Frame):
+    """
+    Treeview que solo materializa las filas visibles.
+
+    Un Treeview con decenas de miles de items tarda en llenarse y en borrarse,
+    y cada item consume memoria de Tcl. Aquí el Treeview tiene tantos items
+    como renglones caben en pantalla; al desplazarse solo se reescriben sus
+    valores con la ventana correspondiente de los datos. La barra de
+    desplazamiento y la rueda del ratón se manejan a mano sobre esos índices.
+
+    Args:
+        parent (tk.Widget): Contenedor
+        columnas (list): Tuplas (id, texto, ancho) o (id, texto, ancho, anchor)
+        formatear (callable): fila -> valores a mostrar (por defecto la fila tal cual)
+        etiquetas (callable): fila -> tupla de tags de la fila
+        claves (dict): columna -> función clave para el orden en memoria
+        al_ordenar (callable): Si se indica, el orden lo resuelve quien llama
+            (por ejemplo en SQL): recibe (columna, ascendente) y debe volver a
+            llamar a establecer_datos
+        al_seleccionar (callable): Recibe la fila seleccionada (o None)
+        al_llegar_al_final (callable): Se llama cuando la ventana se acerca al
+            final de los datos, para cargar la siguiente página
+        orden (tuple): (columna, ascendente) inicial, solo para la flecha del encabezado
+    """
+
+    def __init__(self, parent, columnas, formatear=None, etiquetas=None, claves=None, al_ordenar=None,
+                 al_seleccionar=None, al_llegar_al_final=None, orden=None, anchor=tk.CENTER, **opciones_tree):
+        super().__init__(parent)
+        self.columnas = [c[0] for c in columnas]
+        self.textos = {c[0]: c[1] for c in columnas}
+        self.formatear = formatear or tuple
+        self.etiquetas = etiquetas
+        self.al_ordenar = al_ordenar
+        self.al_seleccionar = al_seleccionar
+        self.al_llegar_al_final = al_llegar_al_final
+        self.fuente = FuenteFilas(self.columnas, claves)
+        self._visibles = 1
+        self._seleccion = None
+        self._aviso_final = None
+        if orden:
+            self.fuente.columna_orden, self.fuente.ascendente = orden
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        opciones_tree.setdefault("selectmode", "browse")
+        self.treeview = ttk.Treeview(self, columns=self.columnas, show="headings", **opciones_tree)
+
+        for col in columnas:
+            self.treeview.heading(col[0], text=col[1], command=lambda c=col[0]: self.ordenar(c))
+            self.treeview.column(col[0], width=col[2], anchor=col[3] if len(col) > 3 else anchor)
+
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.treeview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.treeview.bind("<Configure>", self._al_redimensionar)
+        self.treeview.bind("<<TreeviewSelect>>", self._al_cambiar_seleccion)
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.treeview.bind(evento, self._al_rueda)
+        for tecla, paso in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-pagina"), ("<Next>", "pagina"),
+                            ("<Home>", "inicio"), ("<End>", "fin")):
+            self.treeview.bind(tecla, lambda e, p=paso: self._mover_seleccion(p))
+        self._actualizar_indicador_orden()
+
+    # ---------- API ----------
+
+    def establecer_datos(self, filas):
+        """Reemplaza todas las filas y vuelve al principio"""
+        # Con orden externo los datos ya vienen ordenados
+        self.fuente.establecer(filas, ordenar=self.al_ordenar is None)
+        self._seleccion = None
+        self._aviso_final = None
+        self._redibujar()
+
+    def agregar_datos(self, filas):
+        """Agrega filas al final sin mover la ventana"""
+        self.fuente.agregar(filas)
+        self._redibujar()
+
+    def filas(self):
+        return self.fuente.filas
+
+    def seleccionada(self):
+        """Fila de datos seleccionada o None"""
+        return None if self._seleccion is None else self.fuente.filas[self._seleccion]
+
+    def tag_configure(self, *args, **kwargs):
+        return self.treeview.tag_configure(*args, **kwargs)
+
+    def ordenar(self, columna):
+        if self.al_ordenar is not None:
+            self.al_ordenar(*self.fuente.cambiar_orden(columna))
+        else:
+            self.fuente.ordenar(columna)
+            self._seleccion = None
+            self._redibujar()
+        self._actualizar_indicador_orden()
+
+    # ---------- Dibujo ----------
+
+    def _alto_fila(self):
+        estilo = self.treeview.cget("style") or "Treeview"
+        alto = ttk.Style().lookup(estilo, "rowheight")
+        if alto:
+            return int(alto)
+        return font.nametofont("TkDefaultFont").metrics("linespace") + 3
+
+    def _al_redimensionar(self, event):
+        # Se descuenta un renglón para el encabezado
+        visibles = max(1, event.height // self._alto_fila() - 1)
+        if visibles != self._visibles:
+            self._visibles = visibles
+            self._redibujar()
+
+    def _redibujar(self):
+        fuente = self.fuente
+        fuente.limitar_inicio(fuente.inicio, self._visibles)
+        ventana = fuente.ventana(self._visibles)
+        items = self.treeview.get_children()
+
+        for pos, fila in enumerate(ventana):
+            tags = self.etiquetas(fila) if self.etiquetas else ()
+            if pos < len(items):
+                self.treeview.item(items[pos], values=self.formatear(fila), tags=tags)
+            else:
+                self.treeview.insert("", tk.END, iid=f"fila{pos}", values=self.formatear(fila), tags=tags)
+        if len(items) > len(ventana):
+            self.treeview.delete(*items[len(ventana):])
+
+        # La selección sigue a la fila de datos, no al item reutilizado
+        pos = None if self._seleccion is None else self._seleccion - fuente.inicio
+        if pos is not None and 0 <= pos < len(ventana):
+            self.treeview.selection_set(f"fila{pos}")
+            self.treeview.focus(f"fila{pos}")
+        elif self.treeview.selection():
+            self.treeview.selection_set(())
+
+        total = len(fuente)
+        if total:
+            self.scrollbar.set(fuente.inicio / total, (fuente.inicio + len(ventana)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        # Se pide la página siguiente cuando queda menos de una pantalla por mostrar
+        if (self.al_llegar_al_final and total and fuente.inicio + 2 * self._visibles >= total
+                and self._aviso_final != total):
+            self._aviso_final = total
+            self.after_idle(self.al_llegar_al_final)
+
+    def _desplazar_a(self, inicio):
+        self.fuente.limitar_inicio(inicio, self._visibles)
+        self._redibujar()
+
+    # ---------- Eventos ----------
+
+    def _yview(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self._desplazar_a(int(float(cantidad) * len(self.fuente)))
+        elif accion == "scroll":
+            paso = self._visibles if unidad == "pages" else 1
+            self._desplazar_a(self.fuente.inicio + int(cantidad) * paso)
+
+    def _al_rueda(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._desplazar_a(self.fuente.inicio - 3)
+        else:
+            self._desplazar_a(self.fuente.inicio + 3)
+        return "break"
+
+    def _al_cambiar_seleccion(self, event=None):
+        # <<TreeviewSelect>> llega encolado, también tras los selection_set de
+        # _redibujar: solo cuenta si apunta a otra fila de datos
+        seleccion = self.treeview.selection()
+        if not seleccion:
+            return
+        nueva = self.fuente.inicio + self.treeview.index(seleccion[0])
+        if nueva == self._seleccion:
+            return
+        self._seleccion = nueva
+        if self.al_seleccionar:
+            self.al_seleccionar(self.seleccionada())
+
+    def _mover_seleccion(self, paso):
+        total = len(self.fuente)
+        if not total:
+            return "break"
+        actual = self.fuente.inicio if self._seleccion is None else self._seleccion
+        destino = {
+            "pagina": actual + self._visibles,
+            "-pagina": actual - self._visibles,
+            "inicio": 0,
+            "fin": total - 1,
+        }.get(paso, actual + paso if isinstance(paso, int) else actual)
+        destino = max(0, min(destino, total - 1))
+
+        # Desplaza la ventana lo justo para que la fila quede a la vista
+        if destino < self.fuente.inicio:
+            self.fuente.inicio = destino
+        elif destino >= self.fuente.inicio + self._visibles:
+            self.fuente.inicio = destino - self._visibles + 1
+        self._seleccion = destino
+        self._redibujar()
+        if self.al_seleccionar:
+            self.al_seleccionar(self.seleccionada())
+        return "break"
+
+    def _actualizar_indicador_orden(self):
+        for col in self.columnas:
+            texto = self.textos[col]
+            if col == self.fuente.columna_orden:
+                texto += " ↑" if self.fuente.ascendente else " ↓"
+            self.treeview.heading(col, text=texto)
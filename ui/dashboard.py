@@ -1,44 +1,46 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import sqlite3
 from datetime import datetime, timedelta
 import os
 
 # --- GRÁFICOS ---
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+# Solo la Figure y el canvas de Tk; pyplot no se usa. reportlab y pandas se
+# importan al exportar (ver utils/carga_diferida.py)
+import matplotlib
+import matplotlib.style
+from ui.components.graficos import (PanelGraficos, GraficoPastel, GraficoBarras, GraficoLinea,
+                                    COLORES_PASTEL, figura_a_png)
 
 # --- CALENDARIO ---
 from tkcalendar import DateEntry
 
-# --- REPORTE PDF ---
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image as RLImage
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-
-# --- REPORTE EXCEL ---
-import pandas as pd
-
+from db.cambios import Sondeo
+from db.db import obtener_datos
+from db.resumenes import totales_periodo, top_productos, top_clientes, ventas_por_dia
 from ui.styles import AppTheme
+from utils.trabajos import ColaTrabajos
 
 class PantallaDashboard(ttk.Frame):
+    # Tablas de las que salen los KPIs y gráficos: si ninguna cambió y el
+    # periodo es el mismo, "Actualizar" no vuelve a consultar
+    TABLAS = ("Resumen_ventas_dia", "Resumen_producto_dia", "Resumen_cliente_dia",
+              "Productos", "Proveedores", "Clientes")
+
     def __init__(self, parent):
         super().__init__(parent)
         self.theme = AppTheme()
-        self.db_path = "data/ventas.db"
         
         # Almacenes de memoria para el reporte
-        self.figuras = {}      # Guardará los objetos Figure de matplotlib
+        self.figuras = {}      # Figuras con datos (se crean una vez, ver PanelGraficos)
         self.data_cache = {}   # Guardará los resultados de las queries SQL
+        self._periodo_cargado = None
+        self.sondeo = Sondeo(self, self.TABLAS, self.cargar_datos)
         
         # Configurar estilo de gráficos
-        plt.style.use('ggplot')
-        plt.rcParams['axes.facecolor'] = '#ECEFF4'
-        plt.rcParams['figure.facecolor'] = '#ECEFF4'
-        plt.rcParams['text.color'] = '#2E3440'
+        matplotlib.style.use('ggplot')
+        matplotlib.rcParams['axes.facecolor'] = '#ECEFF4'
+        matplotlib.rcParams['figure.facecolor'] = '#ECEFF4'
+        matplotlib.rcParams['text.color'] = '#2E3440'
         
         self.setup_ui()
         
@@ -73,7 +75,7 @@ class PantallaDashboard(ttk.Frame):
         self.cal_fin.pack(side="left", padx=5)
 
         # Botón Actualizar
-        ttk.Button(filter_frame, text="🔄 Actualizar", command=self.cargar_datos).pack(side="left", padx=10)
+        ttk.Button(filter_frame, text="🔄 Actualizar", command=self.actualizar).pack(side="left", padx=10)
 
         # Botón Exportar (NUEVO)
         btn_export = tk.Button(
@@ -100,62 +102,70 @@ class PantallaDashboard(ttk.Frame):
         self.charts_frame.rowconfigure(0, weight=1)
         self.charts_frame.rowconfigure(1, weight=1)
 
+        self._crear_kpis()
+        self._crear_graficos()
         self.cargar_datos()
 
+    def _crear_kpis(self):
+        """Tarjetas de KPIs; cargar_datos solo cambia el texto de sus valores"""
+        self.kpis = {
+            "total": self.crear_kpi_card(self.kpi_frame, "Ingresos Totales", "", "💰", "#A3BE8C"),
+            "count": self.crear_kpi_card(self.kpi_frame, "Ventas Realizadas", "", "🧾", "#5E81AC"),
+            "periodo": self.crear_kpi_card(self.kpi_frame, "Periodo Analizado", "", "📅", "#B48EAD"),
+        }
+
+    def _crear_graficos(self):
+        """Figuras y canvas del dashboard, creados una sola vez"""
+        self.graficos = PanelGraficos(self.charts_frame)
+        self.graficos.agregar("chart_prod", GraficoPastel(
+            self.charts_frame, "Top 5 Productos", 0, 0, largo_etiqueta=15, colores=COLORES_PASTEL))
+        self.graficos.agregar("chart_cli", GraficoBarras(self.charts_frame, "Top Clientes ($)", 0, 1))
+        self.graficos.agregar("chart_prov", GraficoPastel(
+            self.charts_frame, "Catálogo x Proveedor", 1, 0, formato='%1.0f%%', angulo_inicio=0,
+            distancia_pct=0.85, hueco=0.70))
+        self.graficos.agregar("chart_time", GraficoLinea(self.charts_frame, "Evolución Ventas", 1, 1))
+
     def ejecutar_consulta(self, query, params=()):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
+        return obtener_datos(query, params)
+
+    def al_mostrar(self):
+        """La pantalla vuelve a verse (ver CachePantallas): se refresca si hubo cambios"""
+        self.actualizar()
+
+    def actualizar(self):
+        """Recarga solo si cambió el periodo o alguna de las tablas del dashboard"""
+        periodo = (self.cal_inicio.get(), self.cal_fin.get())
+        if periodo != self._periodo_cargado or self.sondeo.hay_cambios():
+            self.cargar_datos()
 
     def cargar_datos(self):
         fecha_ini = self.cal_inicio.get()
         fecha_fin = self.cal_fin.get()
-
-        # Limpiar UI anterior
-        for widget in self.kpi_frame.winfo_children(): widget.destroy()
-        for widget in self.charts_frame.winfo_children(): widget.destroy()
-        self.figuras = {} # Limpiar caché de figuras
+        self._periodo_cargado = (fecha_ini, fecha_fin)
+        self.sondeo.marcar()
 
         try:
             # --- 1. KPIs ---
-            sql_total = "SELECT SUM(total) FROM Transacciones WHERE tipo='venta' AND date(fecha) BETWEEN ? AND ?"
-            res_total = self.ejecutar_consulta(sql_total, (fecha_ini, fecha_fin))[0][0] or 0
-            
-            sql_count = "SELECT COUNT(*) FROM Transacciones WHERE tipo='venta' AND date(fecha) BETWEEN ? AND ?"
-            res_count = self.ejecutar_consulta(sql_count, (fecha_ini, fecha_fin))[0][0] or 0
+            # Todo lo que depende del periodo se lee de los resúmenes diarios
+            # (db/resumenes.py), no de las transacciones crudas
+            res_total, res_count = totales_periodo(fecha_ini, fecha_fin)
             
             # Guardar KPIs en memoria
             self.data_cache['kpis'] = {"total": res_total, "count": res_count, "desde": fecha_ini, "hasta": fecha_fin}
 
-            self.crear_kpi_card(self.kpi_frame, "Ingresos Totales", f"${res_total:,.2f}", "💰", "#A3BE8C")
-            self.crear_kpi_card(self.kpi_frame, "Ventas Realizadas", f"{res_count}", "🧾", "#5E81AC")
-            self.crear_kpi_card(self.kpi_frame, "Periodo Analizado", f"{fecha_ini} a {fecha_fin}", "📅", "#B48EAD")
+            self.kpis["total"].config(text=f"${res_total:,.2f}")
+            self.kpis["count"].config(text=f"{res_count}")
+            self.kpis["periodo"].config(text=f"{fecha_ini} a {fecha_fin}")
 
             # --- 2. Top Productos (Pie) ---
-            sql_prod = """
-                SELECT p.nombre, SUM(d.cantidad) as total_qty
-                FROM Detalle_transaccion d
-                JOIN Productos p ON d.id_producto = p.id_producto
-                JOIN Transacciones t ON d.id_transaccion = t.id_transaccion
-                WHERE t.tipo='venta' AND date(t.fecha) BETWEEN ? AND ?
-                GROUP BY p.id_producto ORDER BY total_qty DESC LIMIT 5
-            """
-            data_prod = self.ejecutar_consulta(sql_prod, (fecha_ini, fecha_fin))
+            data_prod = top_productos(fecha_ini, fecha_fin)
             self.data_cache['productos'] = data_prod
-            self.generar_grafico_pastel(data_prod, 0, 0, "Top 5 Productos", "chart_prod")
+            self.graficos.actualizar("chart_prod", data_prod)
 
             # --- 3. Top Clientes (Barras) ---
-            sql_cli = """
-                SELECT c.nombres || ' ' || IFNULL(c.apellido_p, ''), SUM(t.total)
-                FROM Transacciones t
-                JOIN Clientes c ON t.id_cliente = c.id_cliente
-                WHERE t.tipo='venta' AND date(t.fecha) BETWEEN ? AND ?
-                GROUP BY c.id_cliente ORDER BY SUM(t.total) DESC LIMIT 5
-            """
-            data_cli = self.ejecutar_consulta(sql_cli, (fecha_ini, fecha_fin))
+            data_cli = top_clientes(fecha_ini, fecha_fin)
             self.data_cache['clientes'] = data_cli
-            self.generar_grafico_barras(data_cli, 0, 1, "Top Clientes ($)", "chart_cli")
+            self.graficos.actualizar("chart_cli", data_cli)
 
             # --- 4. Proveedores (Dona) ---
             sql_prov = """
@@ -166,21 +176,18 @@ class PantallaDashboard(ttk.Frame):
             """
             data_prov = self.ejecutar_consulta(sql_prov)
             self.data_cache['proveedores'] = data_prov
-            self.generar_grafico_dona(data_prov, 1, 0, "Catálogo x Proveedor", "chart_prov")
+            self.graficos.actualizar("chart_prov", data_prov)
 
             # --- 5. Ventas x Día (Línea) ---
-            sql_tiempo = """
-                SELECT date(fecha), SUM(total)
-                FROM Transacciones
-                WHERE tipo='venta' AND date(fecha) BETWEEN ? AND ?
-                GROUP BY date(fecha) ORDER BY date(fecha)
-            """
-            data_tiempo = self.ejecutar_consulta(sql_tiempo, (fecha_ini, fecha_fin))
+            data_tiempo = ventas_por_dia(fecha_ini, fecha_fin)
             self.data_cache['tiempo'] = data_tiempo
-            self.generar_grafico_linea(data_tiempo, 1, 1, "Evolución Ventas", "chart_time")
+            self.graficos.actualizar("chart_time", data_tiempo)
 
         except Exception as e:
+            self._periodo_cargado = None  # el próximo "Actualizar" reintenta
             messagebox.showerror("Error", f"Error al cargar datos: {e}")
+        finally:
+            self.figuras = self.graficos.figuras()
 
     # --- UI Helpers ---
     def crear_kpi_card(self, parent, titulo, valor, icono, color_bg):
@@ -190,73 +197,19 @@ class PantallaDashboard(ttk.Frame):
         right = tk.Frame(frame, bg=color_bg)
         right.pack(side="right", fill="both")
         tk.Label(right, text=titulo, font=("Helvetica", 10), bg=color_bg, fg="white").pack(anchor="e")
-        tk.Label(right, text=valor, font=("Helvetica", 16, "bold"), bg=color_bg, fg="white").pack(anchor="e")
-
-    def dibujar_canvas(self, fig, row, col):
-        canvas = FigureCanvasTkAgg(fig, master=self.charts_frame)
-        canvas.draw()
-        canvas.get_tk_widget().grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-
-    # --- Generadores de Gráficos (Ahora guardan la figura en self.figuras) ---
-    def generar_grafico_pastel(self, datos, row, col, titulo, key):
-        if not datos: return
-        labels = [str(r[0])[:15] for r in datos]
-        sizes = [r[1] for r in datos]
-        colors = ['#BF616A', '#D08770', '#EBCB8B', '#A3BE8C', '#B48EAD']
-        
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=45, colors=colors)
-        ax.set_title(titulo, fontsize=10)
-        
-        self.figuras[key] = fig # Guardar para reporte
-        self.dibujar_canvas(fig, row, col)
-
-    def generar_grafico_barras(self, datos, row, col, titulo, key):
-        if not datos: return
-        labels = [str(r[0]) for r in datos]
-        values = [r[1] for r in datos]
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.barh(labels, values, color='#5E81AC')
-        ax.set_title(titulo, fontsize=10)
-        ax.invert_yaxis()
-        self.figuras[key] = fig
-        self.dibujar_canvas(fig, row, col)
-
-    def generar_grafico_dona(self, datos, row, col, titulo, key):
-        if not datos: return
-        labels = [str(r[0]) for r in datos]
-        sizes = [r[1] for r in datos]
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.pie(sizes, labels=labels, autopct='%1.0f%%', pctdistance=0.85)
-        ax.add_artist(plt.Circle((0,0),0.70,fc='#ECEFF4'))
-        ax.set_title(titulo, fontsize=10)
-        self.figuras[key] = fig
-        self.dibujar_canvas(fig, row, col)
-
-    def generar_grafico_linea(self, datos, row, col, titulo, key):
-        if not datos: return
-        fechas = [r[0][5:] for r in datos]
-        valores = [r[1] for r in datos]
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.plot(fechas, valores, marker='o', color='#BF616A')
-        ax.set_title(titulo, fontsize=10)
-        if len(fechas) > 5: plt.setp(ax.get_xticklabels(), rotation=45, ha="right", fontsize=8)
-        self.figuras[key] = fig
-        self.dibujar_canvas(fig, row, col)
+        lbl_valor = tk.Label(right, text=valor, font=("Helvetica", 16, "bold"), bg=color_bg, fg="white")
+        lbl_valor.pack(anchor="e")
+        return lbl_valor
 
     # =======================================================
     #              MÓDULO DE EXPORTACIÓN
     # =======================================================
     
     def mostrar_opciones_exportar(self):
-        """Popup para elegir PDF o Excel"""
+        """Popup para elegir PDF, Excel o el detalle completo de ventas"""
         popup = tk.Toplevel(self)
         popup.title("Exportar Reporte")
-        popup.geometry("300x150")
+        popup.geometry("300x190")
         popup.resizable(False, False)
         
         # Centrar
@@ -281,9 +234,17 @@ class PantallaDashboard(ttk.Frame):
             command=lambda: [popup.destroy(), self.generar_reporte_excel()]
         ).pack(side="left", padx=10)
 
+        tk.Button(
+            popup, text="🧾 Detalle de ventas (CSV / Excel / Parquet)",
+            bg="#5E81AC", fg="white", font=("Arial", 10),
+            command=lambda: [popup.destroy(), self.exportar_detalle_ventas()]
+        ).pack(pady=5)
+
     def generar_reporte_pdf(self):
         """Genera un PDF A4 con KPIs, Gráficos y Tablas"""
         try:
+            from utils.plantillas_pdf import obtener_plantilla_reporte
+
             filename = filedialog.asksaveasfilename(
                 defaultextension=".pdf",
                 filetypes=[("PDF Document", "*.pdf")],
@@ -292,68 +253,21 @@ class PantallaDashboard(ttk.Frame):
             )
             if not filename: return
 
-            # Guardar imágenes de gráficos temporalmente
-            temp_images = []
-            for key, fig in self.figuras.items():
-                temp_path = f"temp_{key}.png"
-                fig.savefig(temp_path, format='png', bbox_inches='tight')
-                temp_images.append(temp_path)
-
-            # --- Crear PDF ---
-            doc = SimpleDocTemplate(filename, pagesize=A4, rightMargin=20*mm, leftMargin=20*mm)
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Encabezado
-            elements.append(Paragraph("<b>REPORTE GERENCIAL DE VENTAS</b>", styles["Title"]))
-            elements.append(Spacer(1, 5*mm))
-            
-            kpi = self.data_cache.get('kpis', {})
-            txt_resumen = f"""
-            <b>Periodo:</b> {kpi.get('desde')} al {kpi.get('hasta')}<br/>
-            <b>Total Ingresos:</b> ${kpi.get('total', 0):,.2f}<br/>
-            <b>Total Operaciones:</b> {kpi.get('count', 0)}
-            """
-            elements.append(Paragraph(txt_resumen, styles["Normal"]))
-            elements.append(Spacer(1, 10*mm))
-
-            # --- SECCIÓN 1: PRODUCTOS ---
-            elements.append(Paragraph("<b>1. Desempeño de Productos</b>", styles["Heading2"]))
-            # Imagen
-            if 'chart_prod' in self.figuras:
-                elements.append(RLImage("temp_chart_prod.png", width=120*mm, height=80*mm))
-            # Tabla Detallada
-            data_prod = [["Producto", "Cantidad Vendida"]] + [[str(p[0]), str(p[1])] for p in self.data_cache.get('productos', [])]
-            t_prod = Table(data_prod, colWidths=[100*mm, 40*mm])
-            t_prod.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#5E81AC")),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-                ('GRID', (0,0), (-1,-1), 1, colors.black)
-            ]))
-            elements.append(Spacer(1, 5*mm))
-            elements.append(t_prod)
-            elements.append(Spacer(1, 10*mm))
-
-            # --- SECCIÓN 2: CLIENTES ---
-            elements.append(Paragraph("<b>2. Clientes Estrella</b>", styles["Heading2"]))
-            if 'chart_cli' in self.figuras:
-                elements.append(RLImage("temp_chart_cli.png", width=120*mm, height=80*mm))
-            
-            data_cli = [["Cliente", "Total Comprado ($)"]] + [[str(c[0]), f"${c[1]:,.2f}"] for c in self.data_cache.get('clientes', [])]
-            t_cli = Table(data_cli, colWidths=[100*mm, 40*mm])
-            t_cli.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#A3BE8C")),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-                ('GRID', (0,0), (-1,-1), 1, colors.black)
-            ]))
-            elements.append(Spacer(1, 5*mm))
-            elements.append(t_cli)
-
-            doc.build(elements)
-            
-            # Limpiar temporales
-            for img in temp_images:
-                if os.path.exists(img): os.remove(img)
+            # Los gráficos pasan a la plantilla como PNG en memoria: sin
+            # archivos temporales que choquen entre dos exportaciones
+            plantilla = obtener_plantilla_reporte()
+            imagenes = {
+                key: figura_a_png(fig) for key, fig in self.figuras.items() if key in plantilla.GRAFICOS
+            }
+
+            # --- Crear PDF (plantilla construida una sola vez por proceso) ---
+            plantilla.generar(
+                filename,
+                self.data_cache.get('kpis', {}),
+                self.data_cache.get('productos', []),
+                self.data_cache.get('clientes', []),
+                imagenes
+            )
 
             messagebox.showinfo("Éxito", "Reporte PDF generado correctamente.")
             os.startfile(filename)
@@ -364,6 +278,8 @@ class PantallaDashboard(ttk.Frame):
     def generar_reporte_excel(self):
         """Genera un Excel con múltiples hojas usando Pandas"""
         try:
+            import pandas as pd
+
             filename = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel File", "*.xlsx")],
@@ -397,4 +313,48 @@ class PantallaDashboard(ttk.Frame):
             os.startfile(filename)
 
         except Exception as e:
-            messagebox.showerror("Error Excel", f"No se pudo generar el Excel.\nAsegúrese de tener 'pandas' y 'openpyxl' instalados.\nError: {e}")
\ No newline at end of file
+            messagebox.showerror("Error Excel", f"No se pudo generar el Excel.\nAsegúrese de tener 'pandas' y 'openpyxl' instalados.\nError: {e}")
+
+    def exportar_detalle_ventas(self):
+        """
+        Exporta cada renglón de venta del periodo en streaming (utils/exportacion.py).
+        Corre en la cola de fondo con una ventana de avance; la memoria usada
+        no depende del largo del periodo.
+        """
+        from utils.exportacion import exportar_detalle_ventas
+
+        desde, hasta = self.cal_inicio.get(), self.cal_fin.get()
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Excel File", "*.xlsx"), ("Parquet", "*.parquet")],
+            title="Guardar detalle de ventas",
+            initialfile=f"Detalle_Ventas_{desde}_{hasta}.csv"
+        )
+        if not filename: return
+
+        ventana = tk.Toplevel(self)
+        ventana.title("Exportando...")
+        ventana.resizable(False, False)
+        ventana.geometry(f"+{self.winfo_rootx() + 50}+{self.winfo_rooty() + 50}")
+        tk.Label(ventana, text=f"Detalle de ventas {desde} a {hasta}", font=("Arial", 10, "bold")).pack(padx=20, pady=(15, 5))
+        barra = ttk.Progressbar(ventana, length=280, maximum=1.0, mode="determinate")
+        barra.pack(padx=20, pady=(0, 15))
+
+        def al_progreso(avance):
+            if barra.winfo_exists():
+                barra["value"] = avance
+
+        def al_terminar(filas):
+            if ventana.winfo_exists():
+                ventana.destroy()
+            messagebox.showinfo("Éxito", f"Se exportaron {filas:,} renglones de venta.")
+
+        def al_fallar(error):
+            if ventana.winfo_exists():
+                ventana.destroy()
+            messagebox.showerror("Error al exportar", str(error))
+
+        ColaTrabajos.compartida("exportaciones", self).enviar(
+            exportar_detalle_ventas, filename, desde, hasta,
+            al_terminar=al_terminar, al_fallar=al_fallar, al_progreso=al_progreso, reintentos=0
+        )
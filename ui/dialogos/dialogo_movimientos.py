@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from db.db import ejecutar_query, obtener_datos, ejecutar_transaccion
+from db.db import ejecutar_query, obtener_datos
+from db.movimientos import registrar_movimiento
+from db.stock import StockInsuficiente
 from ui.dialogos.dialogo_producto import DialogoProducto
 
 class DialogoMovimiento:
@@ -225,27 +227,9 @@ class DialogoMovimiento:
             cantidad = int(self.cantidad_movimiento.get())
             referencia = self.referencia_movimiento.get().strip()
             
-            # Ajustar cantidad según tipo de movimiento
-            cantidad_ajustada = -cantidad if tipo in ['salida', 'transferencia'] else cantidad
-            
-            # Transacción en base de datos
-            queries = [
-                (
-                    """INSERT INTO Movimientos (
-                        tipo, fecha, cantidad, id_producto, referencia
-                    ) VALUES (?, datetime('now'), ?, ?, ?)""",
-                    (tipo, cantidad_ajustada, id_producto, referencia)
-                ),
-                (
-                    """UPDATE Productos 
-                    SET stock_actual = stock_actual + ? 
-                    WHERE id_producto = ?""",
-                    (cantidad_ajustada, id_producto)
-                )
-            ]
-            
-            # Ejecutar transacción atómica
-            ejecutar_transaccion(queries)
+            # El stock se ajusta de forma atómica: una salida que ya no alcanza
+            # (otra caja vendió mientras el diálogo estaba abierto) no se guarda
+            registrar_movimiento(tipo, cantidad, id_producto, referencia)
                 
             messagebox.showinfo(
                 "Éxito", 
@@ -255,6 +239,8 @@ class DialogoMovimiento:
             self.callback_actualizar()
             self._cerrar_dialogo()
             
+        except StockInsuficiente as e:
+            messagebox.showerror("Error de validación", str(e), parent=self.dialogo)
         except Exception as e:
             messagebox.showerror(
                 "Error", 
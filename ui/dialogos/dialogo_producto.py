@@ -4,6 +4,10 @@ from datetime import datetime
 from db.db import ejecutar_query, obtener_datos
 from ui.dialogos.dialogo_proveedor import DialogoProveedor
 from ui.dialogos.dialogo_categoria import DialogoCategoria
+from utils.validacion_productos import (
+    CAMPOS_NUMERICOS, CAMPOS_REQUERIDOS, MENSAJE_PRECIO_COSTO, MENSAJE_REQUERIDO, MENSAJE_STOCKS,
+    convertir_numero, mensaje_duplicado, precio_bajo_costo, stocks_coherentes
+)
 
 class DialogoProducto:
     """
@@ -236,22 +240,18 @@ class DialogoProducto:
     def _validar_requeridos(self):
         """Verifica campos obligatorios no vacíos"""
         validado = True
-        for campo in ['nombre', 'precio_venta', 'costo', 
-                    'stock_minimo', 'stock_maximo', 'stock_actual']:
+        for campo in CAMPOS_REQUERIDOS:
             valor = self.entries[campo].get().strip()
             if not valor:
-                self._mostrar_error(campo, "Este campo es requerido")
+                self._mostrar_error(campo, MENSAJE_REQUERIDO)
                 validado = False
         return validado
 
     def _validar_campos_numericos(self):
         """Valida formato correcto para campos numéricos"""
-        return (
-            self._validar_numero('precio_venta', decimal=True) and
-            self._validar_numero('costo', decimal=True) and
-            self._validar_numero('stock_minimo') and
-            self._validar_numero('stock_maximo') and
-            self._validar_numero('stock_actual')
+        return all(
+            self._validar_numero(campo, decimal=decimal)
+            for campo, decimal in CAMPOS_NUMERICOS.items()
         )
 
     def _validar_numero(self, campo, decimal=False):
@@ -268,15 +268,7 @@ class DialogoProducto:
             if not valor:
                 return False  # Ya validado en requeridos
             
-            if decimal:
-                num = float(valor)
-                if num <= 0:
-                    raise ValueError("Debe ser mayor a 0")
-            else:
-                num = int(valor)
-                if num < 0:
-                    raise ValueError("No puede ser negativo")
-            
+            convertir_numero(valor, decimal)
             return True
         except ValueError as e:
             self._mostrar_error(campo, str(e))
@@ -287,9 +279,8 @@ class DialogoProducto:
         stock_min = int(self.entries['stock_minimo'].get())
         stock_max = int(self.entries['stock_maximo'].get())
         
-        if stock_min > stock_max:
-            self._mostrar_error('stock_maximo', 
-                "El stock máximo no puede ser menor al mínimo")
+        if not stocks_coherentes(stock_min, stock_max):
+            self._mostrar_error('stock_maximo', MENSAJE_STOCKS)
             return False
         return True
 
@@ -298,10 +289,10 @@ class DialogoProducto:
         precio = float(self.entries['precio_venta'].get())
         costo = float(self.entries['costo'].get())
         
-        if precio < costo:
+        if precio_bajo_costo(precio, costo):
             return messagebox.askyesno(
                 "Confirmar", 
-                "¡El precio es menor al costo! ¿Desea continuar?"
+                f"{MENSAJE_PRECIO_COSTO} ¿Desea continuar?"
             )
         return True
 
@@ -332,7 +323,7 @@ class DialogoProducto:
         existe = obtener_datos(query, (valor,))[0][0] > 0
         
         if existe:
-            self._mostrar_error(campo, f"Este {campo.replace('_', ' ')} ya existe")
+            self._mostrar_error(campo, mensaje_duplicado(campo))
             return False
         return True
 
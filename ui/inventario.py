@@ -1,9 +1,15 @@
+import os
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 from db.db import obtener_datos
+from db.cambios import Sondeo
+from db.catalogo import CatalogoProductos, TABLAS_VIGILADAS
+from db.texto_completo import buscar_ids
 from ui.styles import AppTheme
 from utils import helpers
 from ui.dialogos.dialogo_movimientos import DialogoMovimiento
+from ui.components.tabla_virtual import TablaVirtual
+from utils.trabajos import ColaTrabajos
 
 
 class PantallaInventario(ttk.Frame):
@@ -32,32 +38,18 @@ class PantallaInventario(ttk.Frame):
         self.sort_column = 'id_producto'
         self.sort_ascending = True
         self.columnas_visibles = {'Básico': True}
+        self.sondeo = Sondeo(self, TABLAS_VIGILADAS, self._recargar)
         
         self._cargar_datos()
         self._crear_widgets()
         self._actualizar_tabla()
 
     def _cargar_datos(self):
-        self.productos = obtener_datos("""
-            SELECT 
-                p.id_producto,          -- Índice 0
-                p.nombre,               -- 1
-                c.nombre,               -- 2 (categoría)
-                pr.nombre,              -- 3 (proveedor)
-                p.stock_actual,         -- 4
-                p.stock_minimo,         -- 5
-                p.stock_maximo,         -- 6
-                p.precio_venta,         -- 7
-                p.costo,                -- 8
-                p.sku,                  -- 9
-                p.codigo_barras,        -- 10
-                p.estado                -- 11
-            FROM Productos p
-            LEFT JOIN Categorias c ON p.id_categoria = c.id_categoria
-            LEFT JOIN Proveedores pr ON p.id_proveedor = pr.id_proveedor
-            ORDER BY {}
-            """.format(f"{self.sort_column} {'ASC' if self.sort_ascending else 'DESC'}")
-        )
+        # Filas compartidas con las demás pantallas (ver db/catalogo.py);
+        # el orden de la tabla se aplica en memoria
+        self.catalogo = CatalogoProductos.compartido()
+        self.sondeo.marcar()
+        self.productos = self.catalogo.filas()
             
         raw_categorias = obtener_datos("SELECT id_categoria, nombre FROM Categorias")
         self.categorias = helpers.obtener_opciones_categorias(raw_categorias)
@@ -89,151 +81,96 @@ class PantallaInventario(ttk.Frame):
         )
         btn_entrada.pack(side=tk.RIGHT, padx=5)
 
+        ttk.Button(
+            controles_frame,
+            text="📥 Importar catálogo",
+            command=self._importar_catalogo
+        ).pack(side=tk.RIGHT, padx=5)
+
         self._configurar_tabla()
 
     def _configurar_tabla(self):
-        self.tabla_frame = ttk.Frame(self)
-        self.tabla_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        scrollbar = ttk.Scrollbar(self.tabla_frame, orient=tk.VERTICAL)
-        
-        todas_las_columnas = [
-            col[0] 
-            for grupo in self.COLUMNAS.values() 
-            for col in grupo
-        ]
-        
-        self.tabla = ttk.Treeview(
-            self.tabla_frame,
-            columns=todas_las_columnas,
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            selectmode="browse"
+        columnas = [col for grupo in self.COLUMNAS.values() for col in grupo]
+        texto = lambda pos: lambda p: str(p[pos] or "").lower()
+
+        # Solo se dibujan las filas visibles; el orden se resuelve en memoria
+        self.tabla = TablaVirtual(
+            self,
+            columnas,
+            formatear=self._formatear_fila,
+            etiquetas=self._etiquetas_fila,
+            claves={'nombre': texto(1), 'categoria': texto(2), 'proveedor': texto(3)},
+            orden=(self.sort_column, self.sort_ascending)
         )
-        
-        for grupo in self.COLUMNAS.values():
-            for col_id, col_text, width in grupo:
-                self.tabla.heading(col_id, text=col_text, 
-                                command=lambda c=col_id: self._ordenar_por_columna(c))
-                self.tabla.column(col_id, width=width, anchor=tk.CENTER)
-        
-        scrollbar.config(command=self.tabla.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tabla.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
+        self.tabla.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
         self.tabla.tag_configure('bajo_stock', foreground='#bf616a')
         self.tabla.tag_configure('minimo_stock', foreground='#ebcb8b')
         self.tabla.tag_configure('inactivo', foreground='#bf616a')
 
-    def _ordenar_por_columna(self, columna):
-        """Maneja el ordenamiento al hacer click en encabezados"""
-        if columna == self.sort_column:
-            self.sort_ascending = not self.sort_ascending
-        else:
-            self.sort_column = columna
-            self.sort_ascending = True
-            
-        # Mapeo de columnas a índices
-        column_map = {
-            'id_producto': 0,
-            'nombre': 1,
-            'categoria': 2,
-            'proveedor': 3,
-            'stock_actual': 4,
-            'stock_minimo': 5,
-            'stock_maximo': 6,
-            'precio_venta': 7,
-            'costo': 8,
-            'sku': 9,
-            'codigo_barras': 10,
-            'estado': 11
-        }
-        
-        reverse = not self.sort_ascending
-        self.productos.sort(
-            key=lambda x: (
-                str(x[column_map[columna]]).lower() 
-                if columna in ['nombre', 'categoria', 'proveedor'] 
-                else x[column_map[columna]]
-            ),
-            reverse=reverse
-        )
-        
-        self._actualizar_tabla()
-        self._actualizar_indicador_orden(columna)
+    def _etiquetas_fila(self, prod):
+        stock_actual = prod[4]
+        stock_minimo = prod[5]
+        tags = []
 
-    def _actualizar_indicador_orden(self, columna):
-        """Actualiza flechas de ordenamiento"""
-        for col in self.tabla["columns"]:
-            current_text = self.tabla.heading(col)["text"]
-            self.tabla.heading(col, text=current_text.rstrip(' ↑↓'))
-            
-        arrow = ' ↑' if self.sort_ascending else ' ↓'
-        new_text = self.tabla.heading(columna)["text"] + arrow
-        self.tabla.heading(columna, text=new_text)
+        # Determinar tag
+        if stock_actual < stock_minimo:
+            tags.append('bajo_stock')
+        elif stock_actual == stock_minimo:
+            tags.append('minimo_stock')
+        if prod[11] != 1:  # Estado inactivo
+            tags.append('inactivo')
+        return tags
 
-    def _actualizar_tabla(self, datos=None):
-        self.tabla.delete(*self.tabla.get_children())
-        datos = datos or self.productos
-        
-        for prod in datos:
-            stock_actual = prod[4]
-            stock_minimo = prod[5]
-            tags = []
-
-            # Determinar tacg
-            if stock_actual < stock_minimo:
-                tags.append('bajo_stock')
-            elif stock_actual == stock_minimo:
-                tags.append('minimo_stock')
-            if prod[11] != 1:  # Estado inactivo
-                tags.append('inactivo')
+    def _formatear_fila(self, prod):
+        # Valores con TODOS los campos
+        return [
+            prod[0],        # id_producto
+            prod[1],        # nombre
+            prod[2] or "-", # categoria
+            prod[3] or "-", # proveedor
+            helpers.formatear_stock(prod[4], prod[5])[0],  # stock_actual
+            prod[5],        # stock_minimo
+            prod[6],        # stock_maximo
+            f"${prod[7]:.2f}",  # precio_venta
+            f"${prod[8]:.2f}",  # costo
+            prod[9] or "-", # sku
+            prod[10] or "-",# codigo_barras
+            "Activo" if prod[11] == 1 else "Inactivo"  # estado
+        ]
 
-            # Construir lista de valores con TODOS los campos
-            valores = [
-                prod[0],        # id_producto
-                prod[1],        # nombre
-                prod[2] or "-", # categoria
-                prod[3] or "-", # proveedor
-                helpers.formatear_stock(prod[4], prod[5])[0],  # stock_actual
-                prod[5],        # stock_minimo
-                prod[6],        # stock_maximo
-                f"${prod[7]:.2f}",  # precio_venta
-                f"${prod[8]:.2f}",  # costo
-                prod[9] or "-", # sku
-                prod[10] or "-",# codigo_barras
-                "Activo" if prod[11] == 1 else "Inactivo"  # estado
-            ]
-            
-            self.tabla.insert("", tk.END, values=valores, tags=tags)  # <-- valores ya está definido
-        
-        # Configurar colores para estado
-        self.tabla.tag_configure('inactivo', foreground='#bf616a')
+    def _actualizar_tabla(self, datos=None):
+        self.tabla.establecer_datos(self.productos if datos is None else datos)
 
     def _aplicar_filtros(self, event=None):
         """Aplica los filtros activos"""
         categoria = self.combo_categorias.get()
-        busqueda = self.entrada_busqueda.get().strip().lower()
+        busqueda = self.entrada_busqueda.get().strip()
+        
+        # Nombre, descripción, SKU y código de barras se resuelven con Productos_fts;
+        # el ID exacto y la categoría se comparan en memoria
+        coincidencias = None
+        if busqueda:
+            coincidencias = set(buscar_ids("Productos", busqueda, limite=None))
+            if busqueda.isdigit():
+                coincidencias.add(int(busqueda))
         
+        # La categoría se resuelve con el índice del catálogo
+        if categoria == "Todas las categorías":
+            candidatos = self.productos
+        else:
+            candidatos = self.catalogo.de_categoria(categoria)
+
         filtrados = []
-        for p in self.productos:
-            # Filtro de categoría
-            cumple_categoria = (
-                categoria == "Todas las categorías" or 
-                (p[2] and p[2].lower() == categoria.lower())
-            )
-            
+        for p in candidatos:
             # Filtro de búsqueda
             cumple_busqueda = (
-                not busqueda or
-                busqueda in str(p[0]).lower() or    # ID
-                busqueda in p[1].lower() or         # Nombre
-                (p[2] and busqueda in p[2].lower()) or  # Categoría
-                (p[9] and busqueda in str(p[9]).lower()) or  # SKU 
-                (p[10] and busqueda in str(p[10]).lower())   # Código de Barras
+                coincidencias is None or
+                p[0] in coincidencias or
+                (p[2] and busqueda.lower() in p[2].lower())  # Categoría
             )
             
-            if cumple_categoria and cumple_busqueda:
+            if cumple_busqueda:
                 filtrados.append(p)
         
         self._actualizar_tabla(filtrados)
@@ -254,8 +191,71 @@ class PantallaInventario(ttk.Frame):
             if match:
                 self.lista_productos.insert(tk.END, f"{p[0]} - {p[1]}")
 
+    def al_mostrar(self):
+        """La pantalla vuelve a verse (ver CachePantallas): se refresca si hubo cambios"""
+        if self.sondeo.hay_cambios():
+            self._recargar()
+
+    def _recargar(self):
+        """Vuelve a leer el catálogo (ya invalidado por la escritura) y reaplica los filtros"""
+        self._cargar_datos()
+        self._aplicar_filtros()
+
     def _abrir_dialogo_movimiento(self):
-        DialogoMovimiento(self, self.productos, self._cargar_datos)
+        DialogoMovimiento(self, self.productos, self._recargar)
+
+    def _importar_catalogo(self):
+        """
+        Importa productos desde CSV o Excel (utils/importacion.py) en la cola de
+        fondo con una ventana de avance. Las filas rechazadas se guardan en un
+        CSV junto al archivo importado.
+        """
+        from utils.importacion import importar_productos
+
+        origen = filedialog.askopenfilename(
+            filetypes=[("Catálogo", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel File", "*.xlsx")],
+            title="Importar catálogo de productos"
+        )
+        if not origen: return
+
+        ventana = tk.Toplevel(self)
+        ventana.title("Importando...")
+        ventana.resizable(False, False)
+        ventana.geometry(f"+{self.winfo_rootx() + 50}+{self.winfo_rooty() + 50}")
+        tk.Label(ventana, text=os.path.basename(origen), font=("Arial", 10, "bold")).pack(padx=20, pady=(15, 5))
+        barra = ttk.Progressbar(ventana, length=280, maximum=1.0, mode="determinate")
+        barra.pack(padx=20, pady=(0, 15))
+
+        def al_progreso(avance):
+            if barra.winfo_exists():
+                barra["value"] = avance
+
+        def al_terminar(resultado):
+            if ventana.winfo_exists():
+                ventana.destroy()
+            mensaje = resultado.resumen()
+            if resultado.errores or resultado.advertencias:
+                reporte = os.path.splitext(origen)[0] + "_errores.csv"
+                try:
+                    resultado.guardar_errores(reporte)
+                    mensaje += f"\n\nDetalle en:\n{reporte}"
+                except OSError as e:
+                    mensaje += f"\n\nNo se pudo guardar el detalle: {e}"
+            messagebox.showinfo("Importación terminada", mensaje)
+            self._recargar()
+
+        def al_fallar(error):
+            if ventana.winfo_exists():
+                ventana.destroy()
+            messagebox.showerror("Error al importar", str(error))
+            # ErrorImportacion: los bloques anteriores al error ya están en la base
+            if getattr(error, "resultado", None) and error.resultado.insertados:
+                self._recargar()
+
+        ColaTrabajos.compartida("importaciones", self).enviar(
+            importar_productos, origen,
+            al_terminar=al_terminar, al_fallar=al_fallar, al_progreso=al_progreso, reintentos=0
+        )
 
     if __name__ == "__main__":
         root = tk.Tk()
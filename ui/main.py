@@ -2,6 +2,49 @@ import tkinter as tk
 from tkinter import ttk, font
 from ui.styles import AppTheme
 from ui.components.header import Header
+from ui.components.cache_pantallas import CachePantallas
+from utils.carga_diferida import precargar
+
+# Espera tras el login antes de precargar dependencias, para no competir con
+# el primer dibujado de la ventana
+RETRASO_PRECARGA_MS = 1500
+
+# Cada pantalla se importa al abrirla por primera vez. Los imports son
+# explícitos (no importlib) para que PyInstaller siga viendo los módulos de
+# ui y sus dependencias al armar el ejecutable.
+def _pantalla_dashboard():
+    from ui.dashboard import PantallaDashboard
+    return PantallaDashboard
+
+def _pantalla_ventas():
+    from ui.punto_venta import PantallaVentas
+    return PantallaVentas
+
+def _pantalla_inventario():
+    from ui.inventario import PantallaInventario
+    return PantallaInventario
+
+def _pantalla_clientes():
+    from ui.clientes import PantallaClientes
+    return PantallaClientes
+
+def _pantalla_transacciones():
+    from ui.transacciones import PantallaTransacciones
+    return PantallaTransacciones
+
+def _pantalla_movimientos():
+    from ui.movimientos import PantallaMovimientos
+    return PantallaMovimientos
+
+# Clave -> función que importa y devuelve la clase de la pantalla
+PANTALLAS = {
+    "dashboard": _pantalla_dashboard,
+    "ventas": _pantalla_ventas,
+    "inventario": _pantalla_inventario,
+    "clientes": _pantalla_clientes,
+    "transacciones": _pantalla_transacciones,
+    "movimientos": _pantalla_movimientos,
+}
 
 class MainWindow:
     def __init__(self, root, usuario, on_logout):
@@ -40,46 +83,36 @@ class MainWindow:
         self.main_container = ttk.Frame(self.root)
         self.main_container.pack(fill=tk.BOTH, expand=True)
         
+        # Las pantallas se ocultan al navegar y se reutilizan al volver
+        self.pantallas = CachePantallas(
+            {clave: (lambda c=clave: self._construir_pantalla(c)) for clave in ["inicio", *PANTALLAS]}
+        )
+
         # Pantalla inicial
         self.pantalla_actual = None
         self.mostrar_pantalla_inicio()
 
+        # Importa en segundo plano lo que usarán las pantallas permitidas
+        self.root.after(RETRASO_PRECARGA_MS, lambda: precargar(self.permisos))
+
     def cambiar_pantalla(self, clave_pantalla):
         if clave_pantalla != "inicio" and clave_pantalla not in self.permisos:
             return 
 
-        if self.pantalla_actual:
-            self.pantalla_actual.destroy()
-        
+        self.pantalla_actual = self.pantallas.mostrar(clave_pantalla)
+
+    def _construir_pantalla(self, clave_pantalla):
         if clave_pantalla == "inicio":
-            self.mostrar_pantalla_inicio()
-        elif clave_pantalla == "dashboard": # <--- NUEVO
-            from .dashboard import PantallaDashboard
-            self.pantalla_actual = PantallaDashboard(self.main_container)
-        elif clave_pantalla == "ventas":
-            from .punto_venta import PantallaVentas
-            self.pantalla_actual = PantallaVentas(self.main_container)
-        elif clave_pantalla == "inventario":
-            from .inventario import PantallaInventario
-            self.pantalla_actual = PantallaInventario(self.main_container)
-        elif clave_pantalla == "clientes":
-            from .clientes import PantallaClientes
-            self.pantalla_actual = PantallaClientes(self.main_container)
-        elif clave_pantalla == "transacciones":
-            from .transacciones import PantallaTransacciones
-            self.pantalla_actual = PantallaTransacciones(self.main_container)
-        elif clave_pantalla == "movimientos":
-            from .movimientos import PantallaMovimientos
-            self.pantalla_actual = PantallaMovimientos(self.main_container)
-        
-        if self.pantalla_actual and clave_pantalla != "inicio":
-            self.pantalla_actual.pack(fill=tk.BOTH, expand=True)
+            return self.crear_pantalla_inicio()
+        return PANTALLAS[clave_pantalla]()(self.main_container)
 
     def mostrar_pantalla_inicio(self):
-        self.pantalla_actual = tk.Frame(self.main_container, bg="#ECEFF4")
-        self.pantalla_actual.pack(fill=tk.BOTH, expand=True)
+        self.cambiar_pantalla("inicio")
 
-        welcome_frame = tk.Frame(self.pantalla_actual, bg="#ECEFF4")
+    def crear_pantalla_inicio(self):
+        pantalla = tk.Frame(self.main_container, bg="#ECEFF4")
+
+        welcome_frame = tk.Frame(pantalla, bg="#ECEFF4")
         welcome_frame.pack(pady=(40, 20))
 
         lbl_saludo = tk.Label(
@@ -100,7 +133,7 @@ class MainWindow:
         )
         lbl_desc.pack(pady=5)
 
-        grid_frame = tk.Frame(self.pantalla_actual, bg="#ECEFF4")
+        grid_frame = tk.Frame(pantalla, bg="#ECEFF4")
         grid_frame.pack(expand=True)
 
         # AGREGADO: Botón Dashboard
@@ -126,6 +159,8 @@ class MainWindow:
                 lambda c=clave: self.cambiar_pantalla(c)
             ).grid(row=fila, column=col, padx=20, pady=20)
 
+        return pantalla
+
     def crear_tarjeta_acceso(self, parent, texto, icono, color_bg, comando):
         btn = tk.Button(
             parent,
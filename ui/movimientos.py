@@ -1,8 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
-from db.db import obtener_datos, ejecutar_query
+from db.cambios import Sondeo
+from db.movimientos import pagina_movimientos
 from ui.styles import AppTheme
 from utils import helpers
+from ui.components.tabla_virtual import TablaVirtual
 
 
 class PantallaMovimientos(ttk.Frame):
@@ -21,96 +23,68 @@ class PantallaMovimientos(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.theme = AppTheme()
-        self.datos = []
-        self.sort_column = 'm.id_movimiento'
+        self.sort_column = 'id_movimiento'
         self.sort_ascending = False
+        self.busqueda = ""
+        self._cursor = None
+        self._espera_filtro = None
+        self.sondeo = Sondeo(self, ("Movimientos", "Productos"), self._cargar_datos)
 
         self._crear_widgets()
         self._cargar_datos()
-        self._actualizar_tabla()
 
     def _cargar_datos(self):
-        query = """
-            SELECT 
-                m.id_movimiento,
-                m.tipo,
-                strftime('%d/%m/%Y %H:%M', m.fecha) as fecha_formateada,
-                m.cantidad,
-                p.nombre AS producto,
-                COALESCE(u.nombres || ' ' || u.apellido_p, 'Sistema') AS usuario,
-                m.referencia
-            FROM Movimientos m
-            LEFT JOIN Productos p ON m.id_producto = p.id_producto
-            LEFT JOIN Usuarios u ON m.id_usuario = u.id_usuario
-            ORDER BY {} {}
-        """.format(
-            self.sort_column, 
-            'ASC' if self.sort_ascending else 'DESC'
+        """Primera página con el filtro y orden actuales (el resto se pide al desplazarse)"""
+        self.sondeo.marcar()
+        filas, self._cursor = pagina_movimientos(self.busqueda, self.sort_column, self.sort_ascending)
+        self.tabla.establecer_datos(filas)
+
+    def al_mostrar(self):
+        """La pantalla vuelve a verse (ver CachePantallas): se refresca si hubo cambios"""
+        if self.sondeo.hay_cambios():
+            self._cargar_datos()
+
+    def _cargar_siguiente_pagina(self):
+        if self._cursor is None:
+            return
+        filas, self._cursor = pagina_movimientos(
+            self.busqueda, self.sort_column, self.sort_ascending, despues=self._cursor
         )
-        self.datos = obtener_datos(query)
-
-    def _ordenar_por_columna(self, columna):
-        # Mapeo de columnas virtuales a campos reales
-        column_map = {
-            'id_movimiento': 'm.id_movimiento',
-            'tipo': 'm.tipo',
-            'fecha': 'm.fecha',
-            'cantidad': 'm.cantidad',
-            'producto': 'p.nombre',
-            'usuario': 'u.nombres',
-            'referencia': 'm.referencia'
-        }
-        
-        if self.sort_column == column_map.get(columna):
-            self.sort_ascending = not self.sort_ascending
-        else:
-            self.sort_column = column_map[columna]
-            self.sort_ascending = True
+        self.tabla.agregar_datos(filas)
 
+    def _ordenar_por_columna(self, columna, ascendente):
+        """La tabla pide el orden; se resuelve en el ORDER BY de la consulta"""
+        self.sort_column = columna
+        self.sort_ascending = ascendente
         self._cargar_datos()
-        self._aplicar_filtros()
 
     def _aplicar_filtros(self, event=None):
-        filtro = self.entrada_busqueda.get().strip().lower()
-        datos_filtrados = []
-        
-        for row in self.datos:
-            # Buscar en todos los campos relevantes
-            match = any(
-                filtro in str(value).lower()
-                for value in (
-                    row[0],  # ID
-                    row[1],  # Tipo
-                    row[2],  # Fecha
-                    abs(row[3]),  # Cantidad (valor absoluto)
-                    row[4],  # Producto
-                    row[5],  # Usuario
-                    row[6]   # Referencia
-                )
-            )
-            if match:
-                datos_filtrados.append(row)
-        
-        self._actualizar_tabla(datos_filtrados)
-
-    def _actualizar_tabla(self, datos=None):
-        self.tabla.delete(*self.tabla.get_children())
-        for item in (datos or self.datos):
-            # Formatear cantidad con signo
-            cantidad = item[3]
-            cantidad_formateada = f"+{cantidad}" if cantidad > 0 else str(cantidad)
-            
-            # Crear nueva tupla con los valores formateados
-            valores = (
-                item[0],  # ID
-                item[1].capitalize(),  # Tipo
-                item[2],  # Fecha
-                cantidad_formateada,
-                item[4] or "N/A",  # Producto
-                item[5],  # Usuario
-                item[6]   # Referencia
-            )
-            self.tabla.insert("", tk.END, values=valores)
+        # Espera a que se deje de teclear para no consultar por cada letra
+        if self._espera_filtro is not None:
+            self.after_cancel(self._espera_filtro)
+        self._espera_filtro = self.after(250, self._filtrar)
+
+    def _filtrar(self):
+        self._espera_filtro = None
+        busqueda = self.entrada_busqueda.get().strip()
+        if busqueda != self.busqueda:
+            self.busqueda = busqueda
+            self._cargar_datos()
+
+    def _formatear_fila(self, item):
+        # Formatear cantidad con signo
+        cantidad = item[3]
+        cantidad_formateada = f"+{cantidad}" if cantidad > 0 else str(cantidad)
+
+        return (
+            item[0],  # ID
+            item[1].capitalize(),  # Tipo
+            item[2],  # Fecha
+            cantidad_formateada,
+            item[4] or "N/A",  # Producto
+            item[5],  # Usuario
+            item[6]   # Referencia
+        )
 
     def _crear_widgets(self):
         # Controles superiores
@@ -126,44 +100,15 @@ class PantallaMovimientos(ttk.Frame):
         self._configurar_tabla()
 
     def _configurar_tabla(self):
-        self.tabla_frame = ttk.Frame(self)
-        self.tabla_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-        scrollbar = ttk.Scrollbar(self.tabla_frame, orient=tk.VERTICAL)
-
-        self.tabla = ttk.Treeview(
-            self.tabla_frame,
-            columns=[col[0] for col in self.COLUMNAS['Principal']],
-            show="headings",
-            yscrollcommand=scrollbar.set,
-            selectmode="browse"
+        self.tabla = TablaVirtual(
+            self,
+            self.COLUMNAS['Principal'],
+            formatear=self._formatear_fila,
+            al_ordenar=self._ordenar_por_columna,
+            al_llegar_al_final=self._cargar_siguiente_pagina,
+            orden=(self.sort_column, self.sort_ascending)
         )
-
-        for col in self.COLUMNAS['Principal']:
-            self.tabla.heading(col[0], text=col[1],
-                               command=lambda c=col[0]: self._ordenar_por_columna(c))
-            self.tabla.column(col[0], width=col[2], anchor=tk.CENTER)
-
-        scrollbar.config(command=self.tabla.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tabla.pack(fill=tk.BOTH, expand=True)
-
-    def _ordenar_por_columna(self, columna):
-        if self.sort_column == columna:
-            self.sort_ascending = not self.sort_ascending
-        else:
-            self.sort_column = columna
-            self.sort_ascending = True
-
-        # Mapeo de columnas virtuales
-        alias_map = {
-            'producto': 'p.nombre',
-            'usuario': 'u.nombre'
-        }
-        self.sort_column = alias_map.get(columna, f"m.{columna}")
-
-        self._cargar_datos()
-        self._aplicar_filtros()
+        self.tabla.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
     def _abrir_dialogo_nuevo(self):
         # Método pendiente: puedes abrir un diálogo para crear un nuevo movimiento
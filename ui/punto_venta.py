@@ -3,19 +3,23 @@ from tkinter import ttk, messagebox, simpledialog
 import os
 import platform
 import subprocess
-from datetime import datetime
-
-# --- IMPORTACIONES DE REPORTLAB (PDF) ---
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 
 # --- TUS MODULOS ---
-from db.db import obtener_datos, ejecutar_transaccion
+from db.db import obtener_datos
+from db.cambios import cambio_desde, version
+from db.catalogo import CatalogoProductos
+from db.ventas import registrar_venta
+from db.servicio import cliente_configurado
+from db.stock import StockInsuficiente
 from ui.styles import AppTheme
+from utils.trabajos import ColaTrabajos
+from utils.busqueda import IndiceProductos, STOCK
+
+# Filas visibles en el catálogo: el resto de coincidencias se acota escribiendo más
+LIMITE_RESULTADOS = 200
+
+# Tablas de las que sale la lista de clientes del combo
+TABLAS_CLIENTES = ("Clientes", "Direcciones")
 
 class PantallaVentas(ttk.Frame):
     def __init__(self, parent):
@@ -27,7 +31,14 @@ class PantallaVentas(ttk.Frame):
         self.medios_pago = []
         self.descuento_global = 0.0
         self.productos_filtrados = []
+        self.indice_productos = IndiceProductos()
+        self._ultima_busqueda = None
         self.datos_totales = {"subtotal": 0, "iva": 0, "total": 0}
+        self.ultima_boleta = None
+        # Las boletas se generan fuera del hilo de la interfaz (cola compartida entre pantallas)
+        self.cola_boletas = ColaTrabajos.compartida("boletas", self)
+        # Con VENTAS_SERVICIO_URL las ventas y el catálogo pasan por el servicio (db/servicio.py)
+        self.servicio = cliente_configurado()
         
         self._configurar_estilos_extra()
         self._cargar_datos()
@@ -46,12 +57,21 @@ class PantallaVentas(ttk.Frame):
         style.configure("Carrito.Treeview.Heading", font=("Arial", 10, "bold"), background="#ECEFF4")
 
     def _cargar_datos(self):
-        self.productos = obtener_datos("""
-            SELECT id_producto, nombre, precio_venta, sku, codigo_barras, stock_actual
-            FROM Productos WHERE estado = 1 AND stock_actual > 0
-            ORDER BY nombre
-        """)
-        
+        self._cargar_productos()
+        self._cargar_clientes()
+        self.medios_pago = obtener_datos("SELECT id_medio_pago, clave_sat, nombre FROM Medios_pago ORDER BY id_medio_pago")
+
+    def _productos_venta(self):
+        if self.servicio is not None:
+            return self.servicio.productos_venta()
+        return CatalogoProductos.compartido().productos_venta()
+
+    def _cargar_productos(self, productos=None):
+        self.productos = self._productos_venta() if productos is None else productos
+        self.indice_productos = IndiceProductos(self.productos)
+
+    def _cargar_clientes(self):
+        self._marca_clientes = version(*TABLAS_CLIENTES)
         self.clientes = obtener_datos("""
             SELECT c.id_cliente, 
                    c.nombres || ' ' || COALESCE(c.apellido_p, '') || ' ' || COALESCE(c.apellido_m, ''),
@@ -62,8 +82,26 @@ class PantallaVentas(ttk.Frame):
             LEFT JOIN Direcciones d ON c.id_cliente = d.id_cliente AND d.principal = 1
             WHERE c.estado = 1
         """)
-        
-        self.medios_pago = obtener_datos("SELECT id_medio_pago, clave_sat, nombre FROM Medios_pago ORDER BY id_medio_pago")
+
+    def al_mostrar(self):
+        """
+        La pantalla vuelve a verse (ver CachePantallas). El carrito se conserva;
+        el catálogo y los clientes se releen solo si cambiaron mientras tanto.
+        """
+        productos = self._productos_venta()
+        if productos is not self.productos:
+            self._cargar_productos(productos)
+            self._actualizar_lista_productos(forzar=True)
+        if cambio_desde(self._marca_clientes, *TABLAS_CLIENTES):
+            seleccionado = self.combo_clientes.get()
+            self._cargar_clientes()
+            # El índice del combo cambia si se agregaron clientes: se vuelve a elegir por nombre
+            nombres = [c[1] for c in self.clientes]
+            self.combo_clientes.config(values=nombres)
+            if seleccionado in nombres:
+                self.combo_clientes.current(nombres.index(seleccionado))
+            else:
+                self.combo_clientes.set("Seleccionar Cliente...")
 
     def _crear_layout_principal(self):
         paned = tk.PanedWindow(self, orient=tk.HORIZONTAL, bg="#D8DEE9", sashwidth=5)
@@ -84,7 +122,13 @@ class PantallaVentas(ttk.Frame):
         tk.Label(search_box, text="🔍 Buscar:", bg="#ECEFF4", font=("Arial", 11)).pack(side="left")
         self.entrada_busqueda = ttk.Entry(search_box, font=("Arial", 12))
         self.entrada_busqueda.pack(side="left", fill=tk.X, expand=True, padx=10)
-        self.entrada_busqueda.bind("<KeyRelease>", self._actualizar_lista_productos)
+        self.entrada_busqueda.bind("<KeyRelease>", self._al_escribir_busqueda)
+        self.entrada_busqueda.bind("<Return>", self._escanear_codigo)
+
+        # Modo escáner: el lector "teclea" el código y envía Enter; no se filtra la lista por cada tecla
+        self.modo_escaner = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_box, text="📷 Modo escáner", variable=self.modo_escaner,
+                        command=self._cambiar_modo_escaner).pack(side="left")
 
         cols_prod = ("Producto", "Precio", "Stock", "SKU")
         self.tree_productos = ttk.Treeview(left_frame, columns=cols_prod, show="headings", selectmode="browse")
@@ -101,6 +145,8 @@ class PantallaVentas(ttk.Frame):
         self.tree_productos.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.tree_productos.bind("<Double-1>", self._pedir_cantidad_producto)
 
+        self.lbl_resultados = tk.Label(left_frame, text="", bg="white", fg="#4C566A")
+        self.lbl_resultados.pack()
         tk.Label(left_frame, text="💡 Doble clic para agregar al carrito", bg="white", fg="#88C0D0").pack(pady=5)
 
         # === PANEL DERECHO (CARRITO) ===
@@ -152,19 +198,77 @@ class PantallaVentas(ttk.Frame):
 
         ttk.Button(right_frame, text="✅ COBRAR E IMPRIMIR", style="Cobrar.TButton", command=self._procesar_venta).pack(fill=tk.X, ipady=10)
 
+        estado_frame = tk.Frame(right_frame, bg="#F0F4F7")
+        estado_frame.pack(fill=tk.X, pady=(5, 0))
+        self.lbl_estado_boleta = tk.Label(estado_frame, text="", bg="#F0F4F7", fg="#4C566A", anchor="w")
+        self.lbl_estado_boleta.pack(side="left", fill=tk.X, expand=True)
+        self.btn_abrir_boleta = ttk.Button(estado_frame, text="📄 Abrir boleta", state="disabled",
+                                           command=lambda: self._abrir_archivo(self.ultima_boleta))
+        self.btn_abrir_boleta.pack(side="right")
+
     # ================= LÓGICA DE NEGOCIO =================
 
-    def _actualizar_lista_productos(self, event=None):
-        busqueda = self.entrada_busqueda.get().lower()
-        for item in self.tree_productos.get_children():
-            self.tree_productos.delete(item)
-            
-        self.productos_filtrados = []
-        for p in self.productos:
-            match = busqueda in p[1].lower() or (p[3] and busqueda in p[3].lower())
-            if match and p[5] > 0:
-                self.tree_productos.insert("", "end", values=(p[1], f"${p[2]:.2f}", p[5], p[3] or "S/N"))
-                self.productos_filtrados.append(p)
+    def _al_escribir_busqueda(self, event=None):
+        if not self.modo_escaner.get():
+            self._actualizar_lista_productos(event)
+
+    def _cambiar_modo_escaner(self):
+        self.entrada_busqueda.delete(0, tk.END)
+        self.entrada_busqueda.focus_set()
+        if self.modo_escaner.get():
+            self.lbl_resultados.config(text="📷 Escanee los productos (Enter agrega 1 unidad)")
+        else:
+            self._actualizar_lista_productos(forzar=True)
+
+    def _escanear_codigo(self, event=None):
+        """
+        Enter en la búsqueda: si el texto es un código de barras o SKU exacto,
+        agrega una unidad al carrito sin pasar por la lista ni el diálogo.
+        """
+        codigo = self.entrada_busqueda.get().strip()
+        if not codigo:
+            return "break"
+        producto = self.indice_productos.buscar_codigo(codigo)
+        if producto is None:
+            if self.modo_escaner.get():
+                self.bell()
+                self.lbl_resultados.config(text=f"⚠️ Código no encontrado: {codigo}")
+                self.entrada_busqueda.select_range(0, tk.END)
+            return "break"
+
+        en_carrito = sum(item["cantidad"] for item in self.carrito if item["id_producto"] == producto[0])
+        if producto[STOCK] - en_carrito <= 0:
+            self.bell()
+            self.lbl_resultados.config(text=f"⚠️ Sin stock: {producto[1]}")
+        else:
+            self._agregar_al_carrito_final(producto, 1)
+            self.lbl_resultados.config(text=f"✅ {producto[1]}")
+        self.entrada_busqueda.delete(0, tk.END)
+        return "break"
+
+    def _actualizar_lista_productos(self, event=None, forzar=False):
+        busqueda = self.entrada_busqueda.get()
+        # Teclas que no cambian el texto (flechas, Shift...) no redibujan la lista
+        if busqueda == self._ultima_busqueda and not forzar:
+            return
+        self._ultima_busqueda = busqueda
+
+        self.productos_filtrados, total = self.indice_productos.buscar(busqueda, limite=LIMITE_RESULTADOS)
+        self.tree_productos.delete(*self.tree_productos.get_children())
+        for p in self.productos_filtrados:
+            self.tree_productos.insert("", "end", values=(p[1], f"${p[2]:.2f}", p[5], p[3] or "S/N"))
+
+        if total > len(self.productos_filtrados):
+            self.lbl_resultados.config(text=f"Mostrando {len(self.productos_filtrados)} de {total} coincidencias")
+        else:
+            self.lbl_resultados.config(text="")
+
+    def _descontar_stock_vendido(self, carrito):
+        """Refleja en el índice el stock que acaba de salir, sin recargar el catálogo"""
+        for item in carrito:
+            producto = self.indice_productos.obtener(item["id_producto"])
+            if producto is not None:
+                self.indice_productos.actualizar_stock(item["id_producto"], producto[STOCK] - item["cantidad"])
 
     def _pedir_cantidad_producto(self, event):
         seleccion = self.tree_productos.selection()
@@ -215,23 +319,33 @@ class PantallaVentas(ttk.Frame):
         ttk.Button(dialog, text="Agregar", command=confirmar).pack(pady=10)
 
     def _agregar_al_carrito_final(self, producto, cantidad):
-        found = False
-        for item in self.carrito:
+        for idx, item in enumerate(self.carrito):
             if item["id_producto"] == producto[0]:
                 item["cantidad"] += cantidad
-                found = True
                 break
-        if not found:
+        else:
+            idx = len(self.carrito)
             self.carrito.append({"id_producto": producto[0], "nombre": producto[1], "precio": producto[2], "cantidad": cantidad, "descuento": 0.0})
-        self._actualizar_carrito()
+        # Solo se toca la fila afectada: las ráfagas del lector no redibujan el carrito completo
+        self._actualizar_fila_carrito(idx)
         self._actualizar_totales()
 
+    def _valores_fila_carrito(self, item):
+        total = (item["precio"] * item["cantidad"]) * (1 - self.descuento_global - item["descuento"])
+        return (item["cantidad"], item["nombre"], f"${total:.2f}")
+
+    def _actualizar_fila_carrito(self, idx):
+        filas = self.tabla_carrito.get_children()
+        valores = self._valores_fila_carrito(self.carrito[idx])
+        if idx < len(filas):
+            self.tabla_carrito.item(filas[idx], values=valores)
+        else:
+            self.tabla_carrito.insert("", "end", values=valores)
+
     def _actualizar_carrito(self):
-        for item in self.tabla_carrito.get_children():
-            self.tabla_carrito.delete(item)
+        self.tabla_carrito.delete(*self.tabla_carrito.get_children())
         for item in self.carrito:
-            total = (item["precio"] * item["cantidad"]) * (1 - self.descuento_global - item["descuento"])
-            self.tabla_carrito.insert("", "end", values=(item["cantidad"], item["nombre"], f"${total:.2f}"))
+            self.tabla_carrito.insert("", "end", values=self._valores_fila_carrito(item))
 
     def _actualizar_totales(self):
         subtotal_bruto = sum(i["precio"] * i["cantidad"] for i in self.carrito)
@@ -284,225 +398,64 @@ class PantallaVentas(ttk.Frame):
 
             medio_id = self.medios_pago[self.combo_medios_pago.current()][0]
 
-            # Guardar en DB
-            query_venta = ("INSERT INTO Transacciones (tipo, fecha, id_cliente, id_medio_pago, subtotal, impuestos, total, estado) VALUES (?,?,?,?,?,?,?,?)",
-                           ("venta", datetime.now(), id_cliente, medio_id, self.datos_totales["subtotal"], self.datos_totales["iva"], self.datos_totales["total"], "completada"))
-            
-            id_transaccion = ejecutar_transaccion([query_venta])
-            
-            queries_extra = []
-            for item in self.carrito:
-                queries_extra.append(("INSERT INTO Detalle_transaccion (id_transaccion, id_producto, cantidad, precio_unitario, descuento, iva_aplicado) VALUES (?,?,?,?,?,?)",
-                                     (id_transaccion, item["id_producto"], item["cantidad"], item["precio"], 0, 0)))
-                queries_extra.append(("UPDATE Productos SET stock_actual = stock_actual - ? WHERE id_producto = ?", 
-                                     (item["cantidad"], item["id_producto"])))
-                queries_extra.append(("INSERT INTO Movimientos (tipo, fecha, cantidad, id_producto, referencia) VALUES (?,?,?,?,?)",
-                                     ("salida", datetime.now(), -item["cantidad"], item["id_producto"], f"Venta #{id_transaccion}")))
-            ejecutar_transaccion(queries_extra)
-
-            # Generar PDF Escalado sin márgenes y sin columnas extra
-            ruta_pdf = self._generar_boleta_premium(id_transaccion, nom_cliente, rfc_cliente)
-            
-            respuesta = messagebox.askyesno("Venta Exitosa", f"Venta #{id_transaccion} registrada.\nBoleta guardada en:\n{ruta_pdf}\n\n¿Desea abrirla ahora?")
-            if respuesta:
-                self._abrir_archivo(ruta_pdf)
+            # Guardar en DB: cabecera, detalle y stock en una sola transacción
+            registrar = self.servicio.registrar_venta if self.servicio is not None else registrar_venta
+            id_transaccion = registrar(id_cliente, medio_id, self.carrito, self.datos_totales,
+                                       descuento_global=self.descuento_global)
+
+            # La boleta se genera en segundo plano: la caja queda libre apenas se confirma la venta
+            carrito = [dict(item) for item in self.carrito]
+            self._descontar_stock_vendido(carrito)
+            total = self.datos_totales["total"]
+            self.cola_boletas.enviar(
+                self._generar_boleta_premium, id_transaccion, nom_cliente, rfc_cliente, carrito, total,
+                al_progreso=lambda avance, i=id_transaccion: self._mostrar_estado_boleta(f"🧾 Generando boleta #{i}... {avance:.0%}"),
+                al_terminar=lambda ruta, i=id_transaccion: self._boleta_generada(i, ruta),
+                al_fallar=lambda error, i=id_transaccion: self._boleta_fallida(i, error)
+            )
+            self._mostrar_estado_boleta(f"✅ Venta #{id_transaccion} registrada. Generando boleta...")
 
             self._limpiar_todo()
 
+        except StockInsuficiente as e:
+            # Otra caja vendió esas unidades: nada se guardó y el carrito queda para corregirlo
+            for conflicto in e.conflictos:
+                self.indice_productos.actualizar_stock(conflicto.id_producto, conflicto.disponible)
+            self._actualizar_lista_productos(forzar=True)
+            messagebox.showwarning("Stock insuficiente", f"La venta no se registró.\n\n{e}")
         except Exception as e:
             messagebox.showerror("Error", f"Error procesando venta: {e}")
 
-    def _generar_boleta_premium(self, id_transaccion, nombre_cliente, rfc_cliente):
-        """Genera PDF Horizontal (A4) Escalado para ocupar toda la hoja"""
-        
-        ruta_raiz = os.getcwd()
-        nombre_archivo = os.path.join(ruta_raiz, f"Boleta_Venta_{id_transaccion}.pdf")
-
-        # Configuración A4 Landscape con MÁRGENES MÍNIMOS (5mm)
-        doc = SimpleDocTemplate(
-            nombre_archivo,
-            pagesize=landscape(A4),
-            rightMargin=5*mm, leftMargin=5*mm, 
-            topMargin=5*mm, bottomMargin=5*mm
-        )
-
-        elementos = []
-        styles = getSampleStyleSheet()
-        
-        # --- Estilos Personalizados ---
-        style_empresa = ParagraphStyle('Empresa', parent=styles['Normal'], fontSize=9, leading=11)
-        style_empresa_title = ParagraphStyle('EmpresaTitle', parent=styles['Normal'], fontSize=14, fontName='Helvetica-Bold', leading=16)
-        style_label = ParagraphStyle('Label', parent=styles['Normal'], fontSize=9, fontName='Helvetica-Bold', leading=11)
-        style_data = ParagraphStyle('Data', parent=styles['Normal'], fontSize=9, fontName='Helvetica', leading=11)
-        
-        COLOR_BORDE = colors.HexColor("#5DADE2") 
-        COLOR_FONDO_GRIS = colors.HexColor("#E5E8E8")
-
-        # Ancho útil aproximado: 297mm - 10mm (margenes) = 287mm
-        ANCHO_UTIL = 287*mm
-
-        # =========================================================
-        # 1. ENCABEZADO
-        # =========================================================
-        
-        # Izquierda (200mm)
-        datos_empresa = [
-            [Paragraph("MI EMPRESA S.A.C.", style_empresa_title)],
-            [Paragraph("AV. PRINCIPAL 123 - LIMA - PERU", style_empresa)],
-            [Paragraph("SUCURSAL: LIMA CENTRO", style_empresa)],
-            [Paragraph("Telf: (01) 555-0000 | Email: ventas@empresa.com", style_empresa)],
-        ]
-        t_empresa = Table(datos_empresa, colWidths=['100%'])
-        t_empresa.setStyle(TableStyle([('LEFTPADDING', (0,0), (-1,-1), 0)]))
-
-        # Derecha (Resto)
-        ruc_content = [
-            [Paragraph("BOLETA DE VENTA", ParagraphStyle('RucTitle', parent=styles['Normal'], alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold'))],
-            [Paragraph("ELECTRONICA", ParagraphStyle('RucSub', parent=styles['Normal'], alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold'))],
-            [Paragraph(f"RUC: {rfc_cliente if rfc_cliente != 'XAXX010101000' else '20123456789'}", ParagraphStyle('RucNum', parent=styles['Normal'], alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold', spaceBefore=5))],
-            [Paragraph(f"EB01-{id_transaccion}", ParagraphStyle('Folio', parent=styles['Normal'], alignment=TA_CENTER, fontSize=12, textColor=colors.navy))]
-        ]
-        t_ruc = Table(ruc_content, colWidths=[80*mm])
-        t_ruc.setStyle(TableStyle([
-            ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
-            ('TOPPADDING', (0,0), (-1,-1), 8),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-        ]))
-
-        # Contenedor Encabezado
-        t_header = Table([[t_empresa, t_ruc]], colWidths=[200*mm, 87*mm])
-        t_header.setStyle(TableStyle([
-            ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-        ]))
-        elementos.append(t_header)
-        elementos.append(Spacer(1, 5*mm))
-
-        # =========================================================
-        # 2. DATOS DEL CLIENTE (Sin Fecha Vencimiento)
-        # =========================================================
-        
-        fecha_emision = datetime.now().strftime("%d/%m/%Y")
-        nombre_cliente_paragraph = Paragraph(f"&nbsp; {nombre_cliente}", style_data)
-        
-        info_data = [
-            # Eliminada la fila de Fecha de Vencimiento
-            [Paragraph("Fecha de Emisión", style_label), Paragraph(":", style_label), Paragraph(fecha_emision, style_data)],
-            [Paragraph("Señor(es)", style_label), Paragraph(":", style_label), nombre_cliente_paragraph],
-            [Paragraph("DNI / RUC", style_label), Paragraph(":", style_label), Paragraph(rfc_cliente, style_data)],
-            [Paragraph("Tipo de Moneda", style_label), Paragraph(":", style_label), Paragraph("PESOS MEXICANOS", style_data)],
-            [Paragraph("Observación", style_label), Paragraph(":", style_label), Paragraph("VENTA DE MERCADERÍA", style_data)],
-        ]
-
-        # Anchos Escalados: Label(35mm), Sep(3mm), Valor(Resto=249mm)
-        t_info = Table(info_data, colWidths=[35*mm, 3*mm, 249*mm])
-        
-        t_info.setStyle(TableStyle([
-            ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            # Fondo gris para nombre cliente (Fila 1 ahora, antes era 2)
-            ('BACKGROUND', (2, 1), (2, 1), COLOR_FONDO_GRIS),
-            ('LEFTPADDING', (0,0), (-1,-1), 4),
-            ('RIGHTPADDING', (0,0), (-1,-1), 4),
-            ('TOPPADDING', (0,0), (-1,-1), 2),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 2),
-        ]))
-        
-        elementos.append(t_info)
-        elementos.append(Spacer(1, 5*mm))
-
-        # =========================================================
-        # 3. TABLA DE PRODUCTOS (Sin Código)
-        # =========================================================
-        
-        # Columnas restantes (6 columnas)
-        headers = ["Cantidad", "Unidad Medida", "Descripción", "Valor Unitario(*)", "Descuento(*)", "Importe de Venta(**)"]
-        
-        style_header_table = ParagraphStyle('TableHeader', parent=styles['Normal'], fontSize=8, fontName='Helvetica-Bold', alignment=TA_CENTER)
-        style_cell_center = ParagraphStyle('CellC', parent=styles['Normal'], fontSize=8, fontName='Helvetica', alignment=TA_CENTER)
-        style_cell_left = ParagraphStyle('CellL', parent=styles['Normal'], fontSize=8, fontName='Helvetica', alignment=TA_LEFT)
-        style_cell_right = ParagraphStyle('CellR', parent=styles['Normal'], fontSize=8, fontName='Helvetica', alignment=TA_RIGHT)
-
-        data_productos = [[Paragraph(h, style_header_table) for h in headers]]
-
-        for item in self.carrito:
-            precio_unit = item['precio']
-            cant = item['cantidad']
-            importe = precio_unit * cant
-            
-            # Eliminada la columna Código
-            row = [
-                Paragraph(f"{cant:.2f}", style_cell_center),
-                Paragraph("UNIDAD", style_cell_center),
-                Paragraph(item['nombre'], style_cell_left),
-                Paragraph(f"{precio_unit:.2f}", style_cell_right),
-                Paragraph("0.00", style_cell_right),
-                Paragraph(f"{importe:.2f}", style_cell_right),
-            ]
-            data_productos.append(row)
-
-        # ANCHOS ESCALADOS (Suma debe ser aprox 287mm)
-        # Cant(25) + Unidad(35) + Desc(135!!) + Val(30) + Desc(25) + Imp(37) = 287mm
-        col_widths = [25*mm, 35*mm, 135*mm, 30*mm, 25*mm, 37*mm]
-
-        t_productos = Table(data_productos, colWidths=col_widths)
-        
-        t_productos.setStyle(TableStyle([
-            ('LINEABOVE', (0,0), (-1,0), 0.5, colors.gray),
-            ('LINEBELOW', (0,0), (-1,0), 0.5, colors.gray),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('LEFTPADDING', (0,0), (-1,-1), 5),
-            ('RIGHTPADDING', (0,0), (-1,-1), 5),
-            ('TOPPADDING', (0,0), (-1,-1), 4),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-            ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
-            ('GRID', (0,0), (-1,-1), 0.2, colors.lightgrey),
-        ]))
-
-        elementos.append(t_productos)
-        elementos.append(Spacer(1, 5*mm))
-
-        # =========================================================
-        # 4. PIE DE PÁGINA
-        # =========================================================
-        
-        style_total_label = ParagraphStyle('TotLab', parent=styles['Normal'], fontSize=9, fontName='Helvetica-Bold', alignment=TA_RIGHT)
-        style_total_val = ParagraphStyle('TotVal', parent=styles['Normal'], fontSize=10, fontName='Helvetica', alignment=TA_RIGHT, textColor=colors.gray)
-        
-        total_str = f"S/. {self.datos_totales['total']:,.2f}"
-        
-        data_totales = [
-            [Paragraph("Otros Cargos :", style_total_label), Paragraph("0.00", style_total_val)],
-            [Paragraph("Otros Tributos :", style_total_label), Paragraph("0.00", style_total_val)],
-            [Paragraph("<b>Importe Total :</b>", ParagraphStyle('T', fontSize=10, fontName='Helvetica-Bold', alignment=TA_RIGHT)), 
-             Paragraph(f"<b>{total_str}</b>", ParagraphStyle('T', fontSize=10, fontName='Helvetica-Bold', alignment=TA_RIGHT, textColor=colors.gray))]
-        ]
-
-        # Tabla Totales (35mm + 35mm = 70mm)
-        t_totales = Table(data_totales, colWidths=[35*mm, 35*mm])
-        
-        t_totales.setStyle(TableStyle([
-            ('ALIGN', (0,0), (-1,-1), 'RIGHT'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('BACKGROUND', (1,0), (1,2), COLOR_FONDO_GRIS),
-            ('BOX', (1,0), (1,0), 0.5, colors.gray),
-            ('BOX', (1,1), (1,1), 0.5, colors.gray),
-            ('BOX', (1,2), (1,2), 0.5, colors.gray),
-            ('LEFTPADDING', (0,0), (-1,-1), 5),
-            ('RIGHTPADDING', (0,0), (-1,-1), 5),
-            ('TOPPADDING', (0,0), (-1,-1), 3),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 3),
-        ]))
-
-        # Alineación a la derecha (Espacio vacío = 217mm, Totales = 70mm)
-        t_footer_container = Table([[ "", t_totales]], colWidths=[217*mm, 70*mm])
-        t_footer_container.setStyle(TableStyle([('ALIGN', (-1,0), (-1,0), 'RIGHT')]))
-        
-        elementos.append(t_footer_container)
+    def _mostrar_estado_boleta(self, texto):
+        if self.winfo_exists():
+            self.lbl_estado_boleta.config(text=texto)
 
-        doc.build(elementos)
-        return nombre_archivo
+    def _boleta_generada(self, id_transaccion, ruta_pdf):
+        """Callback de la cola: la boleta quedó guardada en disco"""
+        if not self.winfo_exists():
+            return
+        self.ultima_boleta = ruta_pdf
+        self.lbl_estado_boleta.config(text=f"🧾 Boleta #{id_transaccion} guardada")
+        self.btn_abrir_boleta.config(state="normal")
+
+    def _boleta_fallida(self, id_transaccion, error):
+        """Callback de la cola: se agotaron los reintentos (la venta ya está registrada)"""
+        self._mostrar_estado_boleta(f"⚠️ Boleta #{id_transaccion} no generada")
+        messagebox.showerror("Boleta", f"La venta #{id_transaccion} se registró, pero no se pudo generar la boleta:\n{error}")
+
+    def _generar_boleta_premium(self, id_transaccion, nombre_cliente, rfc_cliente, carrito, total, progreso=None):
+        """
+        Genera PDF Horizontal (A4) Escalado para ocupar toda la hoja.
+        Se ejecuta en el hilo de la cola de boletas: no debe tocar widgets,
+        por eso recibe una copia del carrito y el total.
+        """
+        # reportlab se importa aquí, en la cola de fondo, y no al abrir el punto de venta
+        from utils.plantillas_pdf import obtener_plantilla_boleta
+
+        nombre_archivo = os.path.join(os.getcwd(), f"Boleta_Venta_{id_transaccion}.pdf")
+        return obtener_plantilla_boleta().generar(
+            nombre_archivo, id_transaccion, nombre_cliente, rfc_cliente, carrito, total, progreso=progreso
+        )
 
     def _abrir_archivo(self, ruta):
         try:
@@ -521,4 +474,4 @@ class PantallaVentas(ttk.Frame):
         self._actualizar_carrito()
         self._actualizar_totales()
         self.entrada_busqueda.delete(0, tk.END)
-        self._actualizar_lista_productos()
\ No newline at end of file
+        self._actualizar_lista_productos(forzar=True)
\ No newline at end of file
@@ -3,13 +3,17 @@ from tkinter import ttk, messagebox
 import sqlite3
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry  # <--- Requisito cumplido
+from db.cambios import Sondeo
+from db.db import obtener_datos
+from db.consultas import rango_fechas
 from ui.styles import AppTheme
+from ui.components.tabla_virtual import TablaVirtual
 
 class PantallaTransacciones(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.theme = AppTheme()
-        self.db_path = "data/ventas.db"
+        self.sondeo = Sondeo(self, ("Transacciones", "Clientes"), self.cargar_transacciones)
         
         self.setup_ui()
         self.cargar_transacciones()
@@ -91,41 +95,20 @@ class PantallaTransacciones(ttk.Frame):
         table_frame = tk.Frame(self, bg="#ECEFF4", padx=20, pady=10)
         table_frame.pack(fill="both", expand=True)
 
-        columns = ("ID", "Fecha", "Cliente", "Tipo", "Total", "Estado")
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame)
-        scrollbar.pack(side="right", fill="y")
-
-        # Treeview
-        self.tree = ttk.Treeview(
-            table_frame, 
-            columns=columns, 
-            show="headings", 
-            selectmode="browse",
-            yscrollcommand=scrollbar.set
-        )
-        
-        scrollbar.config(command=self.tree.yview)
-
-        # Configurar Cabeceras
+        # Configurar Cabeceras (solo se dibujan las filas visibles; orden en memoria)
         headers = [
-            ("ID", 60, "center"),
-            ("Fecha", 150, "center"),
-            ("Cliente", 250, "w"),
-            ("Tipo", 100, "center"),
-            ("Total", 100, "e"),
-            ("Estado", 100, "center")
+            ("ID", "ID", 60, "center"),
+            ("Fecha", "Fecha", 150, "center"),
+            ("Cliente", "Cliente", 250, "w"),
+            ("Tipo", "Tipo", 100, "center"),
+            ("Total", "Total", 100, "e"),
+            ("Estado", "Estado", 100, "center")
         ]
-
-        for col, width, anchor in headers:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=width, anchor=anchor)
-
+        self.tree = TablaVirtual(table_frame, headers, formatear=self._formatear_fila)
         self.tree.pack(side="left", fill="both", expand=True)
         
         # Doble click para detalles
-        self.tree.bind("<Double-1>", self.ver_detalles)
+        self.tree.treeview.bind("<Double-1>", self.ver_detalles)
 
         # ==========================================
         # 3. PANEL INFERIOR (Botones de Acción)
@@ -149,25 +132,20 @@ class PantallaTransacciones(ttk.Frame):
 
     def ejecutar_consulta(self, query, params=()):
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                return cursor.fetchall()
+            return obtener_datos(query, params)
         except sqlite3.Error as e:
             messagebox.showerror("Error BD", str(e))
             return []
 
     def cargar_transacciones(self):
-        # Limpiar tabla actual
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
         # Obtener datos de los filtros
+        self.sondeo.marcar()
         fecha_ini = self.cal_inicio.get()
         fecha_fin = self.cal_fin.get()
         busqueda = f"%{self.entry_buscar.get()}%"
+        filtro_fecha, params_fecha = rango_fechas("t.fecha", fecha_ini, fecha_fin)
 
-        query = """
+        query = f"""
             SELECT 
                 t.id_transaccion, 
                 t.fecha,
@@ -180,31 +158,33 @@ class PantallaTransacciones(ttk.Frame):
                 t.estado
             FROM Transacciones t
             LEFT JOIN Clientes c ON t.id_cliente = c.id_cliente
-            WHERE date(t.fecha) BETWEEN ? AND ?
+            WHERE {filtro_fecha}
             AND (ClienteNombre LIKE ? OR t.id_transaccion LIKE ?)
             ORDER BY t.fecha DESC
         """
 
         # Buscamos por nombre O por ID de transacción
-        datos = self.ejecutar_consulta(query, (fecha_ini, fecha_fin, busqueda, busqueda))
+        datos = self.ejecutar_consulta(query, (*params_fecha, busqueda, busqueda))
+        self.tree.establecer_datos(datos)
+
+    def al_mostrar(self):
+        """La pantalla vuelve a verse (ver CachePantallas): se refresca si hubo cambios"""
+        if self.sondeo.hay_cambios():
+            self.cargar_transacciones()
 
-        for fila in datos:
-            # Formatear el total con signo de moneda
-            fila_lista = list(fila)
-            total_val = fila_lista[4]
-            fila_lista[4] = f"${total_val:,.2f}"
-            
-            # Insertar en tabla
-            self.tree.insert("", "end", values=fila_lista)
+    def _formatear_fila(self, fila):
+        # Formatear el total con signo de moneda
+        fila_lista = list(fila)
+        fila_lista[4] = f"${fila_lista[4]:,.2f}"
+        return fila_lista
 
     def ver_detalles(self, event=None):
-        seleccion = self.tree.selection()
+        seleccion = self.tree.seleccionada()
         if not seleccion:
             messagebox.showwarning("Atención", "Seleccione una transacción para ver los detalles.")
             return
 
-        item = self.tree.item(seleccion[0])
-        datos = item['values']
+        datos = self._formatear_fila(seleccion)
         
         id_transaccion = datos[0]
         cliente_nombre = datos[2]
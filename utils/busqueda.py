@@ -0,0 +1,211 @@
+import bisect
+import heapq
+import re
+import unicodedata
+
+# Posiciones de la tupla de producto que usa el punto de venta
+# (id_producto, nombre, precio_venta, sku, codigo_barras, stock_actual)
+ID, NOMBRE, PRECIO, SKU, CODIGO_BARRAS, STOCK = range(6)
+
+_SEPARADORES = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto):
+    """
+    Pasa un texto a minúsculas sin acentos, como se compara en las búsquedas.
+
+    Args:
+        texto (str): Texto original (puede ser None)
+
+    Returns:
+        str: Texto normalizado
+    """
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize("NFKD", str(texto).lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    """
+    Divide un texto normalizado en palabras alfanuméricas.
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        list: Tokens sin repetir, en orden de aparición
+    """
+    return list(dict.fromkeys(t for t in _SEPARADORES.split(normalizar(texto)) if t))
+
+
+class IndiceProductos:
+    """
+    Índice en memoria del catálogo para buscar mientras se escribe.
+
+    Cada producto aporta los tokens de su nombre, SKU y código de barras. Los
+    tokens se guardan ordenados, así que un prefijo se resuelve con dos
+    búsquedas binarias en lugar de recorrer todo el catálogo. Las altas, bajas
+    y cambios de stock tocan solo las entradas del producto afectado.
+
+    Atributos:
+        productos (dict): id_producto -> tupla del producto
+    """
+
+    def __init__(self, productos=()):
+        self.productos = {}
+        self._claves_orden = {}
+        self._codigos = {}
+        self._por_codigo = {}
+        self._tokens_producto = {}
+        self._postings = {}
+        self._tokens = []
+        # Carga inicial: se indexa todo y los tokens se ordenan una sola vez
+        for producto in productos:
+            self._indexar(tuple(producto))
+        self._tokens = sorted(self._postings)
+
+    def __len__(self):
+        return len(self.productos)
+
+    def __contains__(self, id_producto):
+        return id_producto in self.productos
+
+    def obtener(self, id_producto):
+        return self.productos.get(id_producto)
+
+    # ---------- Mantenimiento incremental ----------
+
+    def agregar(self, producto):
+        """
+        Agrega o reemplaza un producto en el índice.
+
+        Args:
+            producto (tuple): (id_producto, nombre, precio_venta, sku, codigo_barras, stock_actual)
+        """
+        producto = tuple(producto)
+        if producto[ID] in self.productos:
+            self.quitar(producto[ID])
+        for token in self._indexar(producto):
+            bisect.insort(self._tokens, token)
+
+    def _indexar(self, producto):
+        """Registra el producto en los diccionarios y devuelve los tokens nuevos"""
+        id_producto = producto[ID]
+        tokens = set(tokenizar(producto[NOMBRE]))
+        tokens.update(tokenizar(producto[SKU]))
+        tokens.update(tokenizar(producto[CODIGO_BARRAS]))
+
+        self.productos[id_producto] = producto
+        self._claves_orden[id_producto] = (normalizar(producto[NOMBRE]), id_producto)
+        self._codigos[id_producto] = (normalizar(producto[SKU]).strip(), normalizar(producto[CODIGO_BARRAS]).strip())
+        for codigo in self._codigos[id_producto]:
+            if codigo:
+                self._por_codigo[codigo] = id_producto
+        self._tokens_producto[id_producto] = tokens
+        nuevos = []
+        for token in tokens:
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = {id_producto}
+                nuevos.append(token)
+            else:
+                ids.add(id_producto)
+        return nuevos
+
+    def quitar(self, id_producto):
+        """Elimina un producto del índice (no falla si no existe)"""
+        if self.productos.pop(id_producto, None) is None:
+            return
+        del self._claves_orden[id_producto]
+        for codigo in self._codigos.pop(id_producto):
+            if self._por_codigo.get(codigo) == id_producto:
+                del self._por_codigo[codigo]
+        for token in self._tokens_producto.pop(id_producto):
+            ids = self._postings[token]
+            ids.discard(id_producto)
+            if not ids:
+                del self._postings[token]
+                del self._tokens[bisect.bisect_left(self._tokens, token)]
+
+    def actualizar_stock(self, id_producto, stock):
+        """
+        Cambia el stock de un producto sin reindexar sus textos.
+
+        Args:
+            id_producto (int): Producto a actualizar
+            stock (int): Nuevo stock actual
+        """
+        producto = self.productos.get(id_producto)
+        if producto is not None:
+            self.productos[id_producto] = producto[:STOCK] + (stock,) + producto[STOCK + 1:]
+
+    # ---------- Consultas ----------
+
+    def buscar_codigo(self, codigo):
+        """
+        Busca un producto por código de barras o SKU exacto (lo que envía un lector).
+
+        Args:
+            codigo (str): Código leído
+
+        Returns:
+            tuple: Producto encontrado o None
+        """
+        id_producto = self._por_codigo.get(normalizar(codigo).strip())
+        return None if id_producto is None else self.productos[id_producto]
+
+    def _ids_con_prefijo(self, prefijo):
+        inicio = bisect.bisect_left(self._tokens, prefijo)
+        fin = bisect.bisect_left(self._tokens, prefijo + "\uffff", inicio)
+        if fin - inicio == 1:
+            return self._postings[self._tokens[inicio]]
+        ids = set()
+        for token in self._tokens[inicio:fin]:
+            ids |= self._postings[token]
+        return ids
+
+    def _puntaje(self, id_producto, consulta, tokens_consulta):
+        """Menor es mejor: código exacto, nombre que empieza igual, palabras completas, resto"""
+        if consulta in self._codigos[id_producto]:
+            return 0
+        nombre = self._claves_orden[id_producto][0]
+        if nombre.startswith(consulta):
+            return 1
+        if tokens_consulta <= self._tokens_producto[id_producto]:
+            return 2
+        return 3
+
+    def buscar(self, texto, limite=200, solo_con_stock=True):
+        """
+        Busca productos cuyas palabras empiecen por cada palabra del texto.
+
+        Args:
+            texto (str): Lo escrito en la caja de búsqueda
+            limite (int): Máximo de resultados a devolver
+            solo_con_stock (bool): Omitir productos sin stock
+
+        Returns:
+            tuple: (lista de productos ordenados por relevancia y nombre,
+                    total de coincidencias antes de aplicar el límite)
+        """
+        tokens = tokenizar(texto)
+        if tokens:
+            # Se intersecta empezando por el prefijo más selectivo
+            conjuntos = sorted((self._ids_con_prefijo(t) for t in tokens), key=len)
+            candidatos = set(conjuntos[0]).intersection(*conjuntos[1:])
+        else:
+            candidatos = self.productos.keys()
+
+        if solo_con_stock:
+            candidatos = [i for i in candidatos if self.productos[i][STOCK] > 0]
+
+        consulta = normalizar(texto).strip()
+        tokens_consulta = set(tokens)
+        if tokens:
+            clave = lambda i: (self._puntaje(i, consulta, tokens_consulta), self._claves_orden[i])
+        else:
+            clave = self._claves_orden.__getitem__
+
+        mejores = heapq.nsmallest(limite, candidatos, key=clave)
+        return [self.productos[i] for i in mejores], len(candidatos)
@@ -0,0 +1,94 @@
+"""
+Carga diferida y precarga de dependencias pesadas.
+
+reportlab, matplotlib, pandas y tkcalendar tardan cientos de milisegundos en
+importarse. Las pantallas los importan en el punto de primer uso (dentro de la
+función que los necesita), así que abrir el punto de venta no paga reportlab
+hasta la primera boleta, y esa boleta se arma en la cola de fondo.
+
+Después del login se pueden "calentar" en un hilo de fondo: cuando el usuario
+abra la pantalla o genere la primera boleta, los módulos ya estarán en
+sys.modules. La precarga se desactiva con VENTAS_PRECARGA=0.
+"""
+import importlib
+import os
+import threading
+import time
+
+# Pantalla -> pasos de precarga. Un paso "modulo" se importa; un paso
+# "modulo:funcion" además llama a la función (por ejemplo, para dejar
+# construida una plantilla cacheada).
+PRECARGAS = {
+    "ventas": ["ui.punto_venta", "utils.plantillas_pdf:obtener_plantilla_boleta"],
+    # ui.dashboard trae matplotlib y tkcalendar; el reporte, reportlab y pandas
+    "dashboard": ["ui.dashboard", "utils.plantillas_pdf:obtener_plantilla_reporte", "pandas"],
+    "transacciones": ["ui.transacciones"],
+}
+
+# Segundos que tomó cada paso de la última precarga (para diagnóstico)
+tiempos = {}
+
+
+def precarga_habilitada():
+    """La precarga está activa salvo que VENTAS_PRECARGA sea '0'"""
+    return os.environ.get("VENTAS_PRECARGA", "1") != "0"
+
+
+def pasos_para(pantallas):
+    """
+    Pasos de precarga de las pantallas indicadas, sin repetir y en orden.
+
+    Args:
+        pantallas (list): Claves de pantalla (por ejemplo los permisos del usuario)
+
+    Returns:
+        list: Pasos "modulo" o "modulo:funcion"
+    """
+    pasos = []
+    for pantalla in pantallas:
+        for paso in PRECARGAS.get(pantalla, []):
+            if paso not in pasos:
+                pasos.append(paso)
+    return pasos
+
+
+def ejecutar_paso(paso):
+    """Importa el módulo del paso (y llama a su función, si la indica)"""
+    nombre, _, funcion = paso.partition(":")
+    modulo = importlib.import_module(nombre)
+    if funcion:
+        getattr(modulo, funcion)()
+
+
+def precargar(pantallas, al_terminar=None):
+    """
+    Importa en un hilo de fondo las dependencias de las pantallas indicadas.
+
+    Un paso que falla (por ejemplo, una dependencia no instalada) se salta:
+    el error volverá a aparecer, con su mensaje normal, en el primer uso real.
+
+    Args:
+        pantallas (list): Claves de pantalla
+        al_terminar (callable): Recibe el dict de tiempos (se llama en el hilo
+            de fondo; no debe tocar widgets)
+
+    Returns:
+        threading.Thread: Hilo de la precarga (None si está desactivada)
+    """
+    if not precarga_habilitada():
+        return None
+
+    def trabajar():
+        for paso in pasos_para(pantallas):
+            inicio = time.perf_counter()
+            try:
+                ejecutar_paso(paso)
+            except Exception:
+                continue
+            tiempos[paso] = time.perf_counter() - inicio
+        if al_terminar:
+            al_terminar(dict(tiempos))
+
+    hilo = threading.Thread(target=trabajar, name="precarga", daemon=True)
+    hilo.start()
+    return hilo
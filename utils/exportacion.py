@@ -0,0 +1,219 @@
+"""
+Exportación en streaming del detalle de ventas (CSV, Excel o Parquet).
+
+Pensada para rangos grandes (por ejemplo, un año completo para contabilidad):
+los renglones se leen con fetchmany en bloques de tamaño fijo y cada bloque
+se escribe antes de leer el siguiente, así que la memoria usada no depende
+del rango de fechas. Excel usa el modo write-only de openpyxl, que vuelca las
+filas a disco a medida que llegan; Parquet escribe un row group por bloque.
+
+No toca widgets: se ejecuta en la cola de trabajos y reporta el avance con el
+callable `progreso` (0 a 1).
+"""
+import csv
+import os
+
+from db.consultas import rango_fechas
+from db.db import obtener_gestor
+from db.resumenes import IMPORTE_RENGLON
+
+TAMANO_BLOQUE = 5000
+
+# (encabezado, tipo para Parquet)
+COLUMNAS = [
+    ("id_transaccion", "int64"),
+    ("fecha", "string"),
+    ("id_cliente", "int64"),
+    ("cliente", "string"),
+    ("id_producto", "int64"),
+    ("sku", "string"),
+    ("producto", "string"),
+    ("cantidad", "int64"),
+    ("precio_unitario", "float64"),
+    ("descuento", "float64"),
+    ("importe", "float64"),
+]
+
+# descuento es el importe descontado del renglón; importe, el neto (db/resumenes.py)
+SQL_DETALLE = f"""
+    SELECT
+        t.id_transaccion,
+        t.fecha,
+        t.id_cliente,
+        c.nombres || ' ' || IFNULL(c.apellido_p, ''),
+        d.id_producto,
+        p.sku,
+        p.nombre,
+        d.cantidad,
+        d.precio_unitario,
+        IFNULL(d.descuento, 0),
+        {IMPORTE_RENGLON}
+    FROM Transacciones t
+    JOIN Detalle_transaccion d ON d.id_transaccion = t.id_transaccion
+    LEFT JOIN Clientes c ON c.id_cliente = t.id_cliente
+    LEFT JOIN Productos p ON p.id_producto = d.id_producto
+    WHERE t.tipo = 'venta' AND {{filtro}}
+    ORDER BY t.fecha, t.id_transaccion
+"""
+
+SQL_CONTAR = """
+    SELECT COUNT(*)
+    FROM Transacciones t
+    JOIN Detalle_transaccion d ON d.id_transaccion = t.id_transaccion
+    WHERE t.tipo = 'venta' AND {filtro}
+"""
+
+FORMATOS = {".csv": "csv", ".xlsx": "xlsx", ".parquet": "parquet"}
+
+
+def iterar_detalle_ventas(desde, hasta, tamano_bloque=TAMANO_BLOQUE, conn=None):
+    """
+    Recorre los renglones de venta del rango en bloques.
+
+    Args:
+        desde (str|date): Primer día incluido
+        hasta (str|date): Último día incluido
+        tamano_bloque (int): Filas por bloque (fetchmany)
+        conn (sqlite3.Connection): Conexión a usar (por defecto la del hilo)
+
+    Yields:
+        list: Bloques de tuplas con las columnas de COLUMNAS
+    """
+    conn = conn or obtener_gestor().conexion()
+    filtro, params = rango_fechas("t.fecha", desde, hasta)
+    cursor = conn.execute(SQL_DETALLE.format(filtro=filtro), params)
+    try:
+        while True:
+            bloque = cursor.fetchmany(tamano_bloque)
+            if not bloque:
+                break
+            yield [tuple(fila) for fila in bloque]
+    finally:
+        cursor.close()
+
+
+def contar_detalle_ventas(desde, hasta, conn=None):
+    """Cantidad de renglones de venta del rango (para calcular el avance)"""
+    conn = conn or obtener_gestor().conexion()
+    filtro, params = rango_fechas("t.fecha", desde, hasta)
+    return conn.execute(SQL_CONTAR.format(filtro=filtro), params).fetchone()[0]
+
+
+def formato_de(ruta):
+    """Deduce el formato de exportación por la extensión del archivo"""
+    extension = os.path.splitext(str(ruta))[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: '{extension}' (use {', '.join(FORMATOS)})")
+    return FORMATOS[extension]
+
+
+def exportar_detalle_ventas(destino, desde, hasta, formato=None, tamano_bloque=TAMANO_BLOQUE, progreso=None):
+    """
+    Exporta el detalle de ventas del rango sin cargarlo completo en memoria.
+
+    Args:
+        destino (str): Ruta del archivo a crear
+        desde (str|date): Primer día incluido
+        hasta (str|date): Último día incluido
+        formato (str): 'csv', 'xlsx' o 'parquet' (None = según la extensión)
+        tamano_bloque (int): Filas leídas y escritas por vez
+        progreso (callable): Recibe el avance entre 0 y 1 tras cada bloque
+
+    Returns:
+        int: Renglones exportados
+    """
+    escritor = _ESCRITORES[formato or formato_de(destino)](destino)
+    total = contar_detalle_ventas(desde, hasta) if progreso else 0
+    escritas = 0
+    try:
+        for bloque in iterar_detalle_ventas(desde, hasta, tamano_bloque):
+            escritor.escribir(bloque)
+            escritas += len(bloque)
+            if progreso:
+                progreso(min(escritas / total, 1.0) if total else 1.0)
+        escritor.cerrar()
+    except Exception:
+        escritor.abortar()
+        raise
+    if progreso and not escritas:
+        progreso(1.0)
+    return escritas
+
+
+# ---------- Escritores por formato ----------
+
+class _EscritorCSV:
+    def __init__(self, destino):
+        self.destino = destino
+        # utf-8-sig: Excel reconoce los acentos al abrir el CSV
+        self.archivo = open(destino, "w", newline="", encoding="utf-8-sig")
+        self.csv = csv.writer(self.archivo)
+        self.csv.writerow([nombre for nombre, _ in COLUMNAS])
+
+    def escribir(self, filas):
+        self.csv.writerows(filas)
+
+    def cerrar(self):
+        self.archivo.close()
+
+    def abortar(self):
+        self.archivo.close()
+        _borrar(self.destino)
+
+
+class _EscritorXLSX:
+    def __init__(self, destino):
+        from openpyxl import Workbook
+
+        self.destino = destino
+        self.libro = Workbook(write_only=True)
+        self.hoja = self.libro.create_sheet("Detalle de ventas")
+        self.hoja.append([nombre for nombre, _ in COLUMNAS])
+
+    def escribir(self, filas):
+        for fila in filas:
+            self.hoja.append(fila)
+
+    def cerrar(self):
+        self.libro.save(self.destino)
+
+    def abortar(self):
+        self.libro.close()
+        _borrar(self.destino)
+
+
+class _EscritorParquet:
+    def __init__(self, destino):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.destino = destino
+        self.esquema = pa.schema([(nombre, getattr(pa, tipo)()) for nombre, tipo in COLUMNAS])
+        self.escritor = pq.ParquetWriter(destino, self.esquema)
+
+    def escribir(self, filas):
+        # Un row group por bloque, armado por columnas
+        columnas = list(zip(*filas))
+        self.escritor.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(valores, type=campo.type) for valores, campo in zip(columnas, self.esquema)],
+            schema=self.esquema
+        ))
+
+    def cerrar(self):
+        self.escritor.close()
+
+    def abortar(self):
+        self.escritor.close()
+        _borrar(self.destino)
+
+
+_ESCRITORES = {"csv": _EscritorCSV, "xlsx": _EscritorXLSX, "parquet": _EscritorParquet}
+
+
+def _borrar(ruta):
+    """Elimina un archivo a medio escribir"""
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
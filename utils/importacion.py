@@ -0,0 +1,426 @@
+"""
+Importación masiva del catálogo de productos desde CSV o Excel.
+
+Pensada para el catálogo completo de un proveedor (decenas de miles de
+productos), que por DialogoProducto habría que cargar de a uno con dos COUNT
+y un INSERT por producto:
+
+- El archivo se lee en streaming (módulo csv o el modo read-only de
+  openpyxl) y se procesa en bloques de tamaño fijo: la memoria usada no
+  depende del tamaño del archivo.
+- Cada bloque se valida columna por columna con las mismas reglas y mensajes
+  del formulario (utils/validacion_productos.py).
+- Los SKU y códigos de barras repetidos contra la base se buscan con una sola
+  consulta por bloque; los repetidos dentro del archivo, con conjuntos en
+  memoria.
+- Las filas válidas se insertan con un executemany por bloque en el hilo
+  escritor, mientras se valida el bloque siguiente. Cada bloque se confirma
+  por separado para no frenar a las cajas durante toda la importación.
+
+Las filas con errores no se insertan; quedan en el resultado con su número de
+fila (el de la hoja, contando el encabezado) para guardarlas en un CSV.
+
+No toca widgets: se ejecuta en la cola de trabajos y reporta el avance con el
+callable `progreso` (0 a 1).
+"""
+import csv
+import os
+from collections import namedtuple
+
+from db.db import obtener_datos, obtener_escritor
+from utils.validacion_productos import (
+    CAMPOS_NUMERICOS, CAMPOS_REQUERIDOS, MENSAJE_PRECIO_COSTO, MENSAJE_REQUERIDO, MENSAJE_STOCKS,
+    convertir_numero, mensaje_duplicado, precio_bajo_costo, stocks_coherentes
+)
+
+# La consulta de duplicados usa hasta 2 parámetros por fila: los bloques
+# quedan por debajo del límite de 999 variables de las versiones viejas de SQLite
+TAMANO_BLOQUE = 450
+
+# Columnas del archivo (encabezados, sin importar mayúsculas ni el orden)
+ENCABEZADOS = [
+    "nombre", "descripcion", "precio_venta", "costo", "codigo_barras", "sku",
+    "stock_minimo", "stock_maximo", "stock_actual", "categoria", "proveedor",
+]
+
+# Mismo INSERT que DialogoProducto._guardar_en_db
+SQL_INSERTAR = """
+    INSERT INTO Productos (
+        nombre, descripcion, precio_venta, costo,
+        codigo_barras, sku, stock_minimo, stock_maximo, stock_actual,
+        id_categoria, id_proveedor, fecha_creacion, estado
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), 1)
+"""
+
+FORMATOS = {".csv": "csv", ".xlsx": "xlsx"}
+
+ErrorFila = namedtuple("ErrorFila", "fila campo valor mensaje")
+
+
+class ErrorImportacion(RuntimeError):
+    """
+    La importación se cortó a mitad del archivo (archivo dañado, error de la base...).
+
+    Los bloques confirmados antes del error quedan insertados: `resultado`
+    dice cuántos, para no volver a importarlos a ciegas.
+    """
+
+    def __init__(self, resultado, causa):
+        self.resultado = resultado
+        super().__init__(
+            f"{causa}\n\nLa importación se detuvo tras leer {resultado.leidas:,} filas; "
+            f"{resultado.insertados:,} productos ya quedaron insertados."
+        )
+
+
+class ResultadoImportacion:
+    """Conteos de una importación y detalle de las filas rechazadas u observadas"""
+
+    def __init__(self, simulada=False):
+        self.simulada = simulada
+        self.leidas = 0
+        self.insertados = 0
+        self.errores = []       # ErrorFila de filas no insertadas
+        self.advertencias = []  # ErrorFila de filas insertadas igual (precio bajo costo aceptado)
+
+    @property
+    def rechazadas(self):
+        """Cantidad de filas con al menos un error"""
+        return len({error.fila for error in self.errores})
+
+    def resumen(self):
+        """Texto corto para mostrar al terminar"""
+        verbo = "Se insertarían" if self.simulada else "Se insertaron"
+        texto = f"{verbo} {self.insertados:,} de {self.leidas:,} productos."
+        if self.errores:
+            texto += f"\n{self.rechazadas:,} filas con errores no se importaron."
+        if self.advertencias:
+            texto += f"\n{len(self.advertencias):,} productos con precio menor al costo."
+        return texto
+
+    def guardar_errores(self, ruta):
+        """
+        Escribe errores y advertencias en un CSV (fila, campo, valor, mensaje, tipo).
+
+        Args:
+            ruta (str): Archivo a crear
+        """
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(list(ErrorFila._fields) + ["tipo"])
+            for tipo, lista in (("error", self.errores), ("advertencia", self.advertencias)):
+                for error in sorted(lista, key=lambda e: e.fila):
+                    escritor.writerow(list(error) + [tipo])
+
+
+def formato_de(ruta):
+    """Deduce el formato de importación por la extensión del archivo"""
+    extension = os.path.splitext(str(ruta))[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: '{extension}' (use {', '.join(FORMATOS)})")
+    return FORMATOS[extension]
+
+
+def importar_productos(origen, formato=None, tamano_bloque=TAMANO_BLOQUE,
+                       aceptar_precio_bajo_costo=False, simular=False, progreso=None):
+    """
+    Importa productos desde un CSV o Excel sin cargar el archivo completo en memoria.
+
+    Args:
+        origen (str): Ruta del archivo (primera fila con los encabezados de ENCABEZADOS)
+        formato (str): 'csv' o 'xlsx' (None = según la extensión)
+        tamano_bloque (int): Filas validadas e insertadas por vez
+        aceptar_precio_bajo_costo (bool): Importar igual los productos con precio
+            menor al costo (quedan como advertencia); si no, se rechazan
+        simular (bool): Solo validar, sin insertar nada
+        progreso (callable): Recibe el avance entre 0 y 1 tras cada bloque
+
+    Returns:
+        ResultadoImportacion: Conteos, errores y advertencias
+
+    Raises:
+        ValueError: Si el formato no es soportado o faltan columnas requeridas
+            (antes de insertar nada)
+        ErrorImportacion: Si algo falla después de empezar a leer filas; lleva
+            el resultado parcial con lo ya insertado
+    """
+    lector = _LECTORES[formato or formato_de(origen)](origen)
+    resultado = ResultadoImportacion(simulada=simular)
+    pendiente = None
+    error = None
+    try:
+        validador = _ValidadorProductos(aceptar_precio_bajo_costo)
+        validador.revisar_encabezados(lector.encabezados)
+        try:
+            for bloque in _en_bloques(lector.filas(), tamano_bloque):
+                resultado.leidas += len(bloque)
+                filas = validador.validar(bloque)
+                if simular:
+                    resultado.insertados += len(filas)
+                elif filas:
+                    # El escritor inserta este bloque mientras se valida el siguiente
+                    if pendiente:
+                        anterior, pendiente = pendiente, None
+                        resultado.insertados += anterior.result()
+                    pendiente = obtener_escritor().ejecutar(
+                        _insertar_bloque, filas, escrituras=[("Productos", None)]
+                    )
+                if progreso:
+                    progreso(lector.avance())
+        except Exception as e:
+            error = e
+        finally:
+            # Un bloque ya encolado se confirma aunque después algo falle: se
+            # espera para contarlo en el resultado
+            if pendiente:
+                try:
+                    resultado.insertados += pendiente.result()
+                except Exception as e:
+                    error = error or e
+        resultado.errores = validador.errores
+        resultado.advertencias = validador.advertencias
+    finally:
+        lector.cerrar()
+    if error is not None:
+        raise ErrorImportacion(resultado, error) from error
+    if progreso:
+        progreso(1.0)
+    return resultado
+
+
+def _insertar_bloque(conn, filas):
+    """Corre en el hilo escritor, dentro del SAVEPOINT de su escritura"""
+    conn.executemany(SQL_INSERTAR, filas)
+    return len(filas)
+
+
+def _en_bloques(filas, tamano):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def _texto(valor):
+    """Texto recortado o None; Excel devuelve los códigos numéricos como int o float"""
+    if valor is None:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip() or None
+
+
+# ---------- Validación ----------
+
+class _ValidadorProductos:
+    """
+    Valida bloques de filas columna por columna y recuerda lo ya visto
+    (SKU y códigos de barras) entre bloques.
+    """
+
+    def __init__(self, aceptar_precio_bajo_costo):
+        self.aceptar_precio_bajo_costo = aceptar_precio_bajo_costo
+        self.errores = []
+        self.advertencias = []
+        # Primera fila del archivo con cada valor, para los repetidos
+        self.vistos = {"sku": {}, "codigo_barras": {}}
+        # Tablas chicas: una consulta cada una para toda la importación
+        self.ids = {
+            "categoria": self._por_nombre("SELECT nombre, id_categoria FROM Categorias ORDER BY id_categoria"),
+            "proveedor": self._por_nombre("SELECT nombre, id_proveedor FROM Proveedores ORDER BY id_proveedor"),
+        }
+
+    @staticmethod
+    def _por_nombre(query):
+        ids = {}
+        for nombre, id_ in obtener_datos(query):
+            ids.setdefault(str(nombre).strip().lower(), id_)
+        return ids
+
+    def revisar_encabezados(self, encabezados):
+        faltan = [campo for campo in CAMPOS_REQUERIDOS if campo not in encabezados]
+        if faltan:
+            raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltan)}")
+
+    def validar(self, bloque):
+        """
+        Args:
+            bloque (list): Pares (número de fila, dict encabezado -> valor)
+
+        Returns:
+            list: Tuplas listas para SQL_INSERTAR, de las filas sin errores
+        """
+        errores = {}
+
+        def fallar(numero, campo, valor, mensaje):
+            errores.setdefault(numero, []).append(ErrorFila(numero, campo, valor, mensaje))
+
+        textos = {
+            campo: [_texto(fila.get(campo)) for _, fila in bloque]
+            for campo in ("nombre", "descripcion", "codigo_barras", "sku", "categoria", "proveedor")
+        }
+        numeros = {campo: [None] * len(bloque) for campo in CAMPOS_NUMERICOS}
+
+        # Requeridos y numéricos (DialogoProducto._validar_requeridos y _validar_campos_numericos)
+        for campo in CAMPOS_REQUERIDOS:
+            for i, (numero, fila) in enumerate(bloque):
+                valor = fila.get(campo)
+                if _texto(valor) is None:
+                    fallar(numero, campo, valor, MENSAJE_REQUERIDO)
+                elif campo in CAMPOS_NUMERICOS:
+                    try:
+                        numeros[campo][i] = convertir_numero(valor, CAMPOS_NUMERICOS[campo])
+                    except ValueError as e:
+                        fallar(numero, campo, valor, str(e))
+
+        # Reglas entre columnas (_validar_stocks y _validar_precio_costo)
+        advertencias = []
+        columnas = zip(numeros["stock_minimo"], numeros["stock_maximo"], numeros["precio_venta"], numeros["costo"])
+        for (numero, _), (minimo, maximo, precio, costo) in zip(bloque, columnas):
+            if minimo is not None and maximo is not None and not stocks_coherentes(minimo, maximo):
+                fallar(numero, "stock_maximo", maximo, MENSAJE_STOCKS)
+            if precio is not None and costo is not None and precio_bajo_costo(precio, costo):
+                if self.aceptar_precio_bajo_costo:
+                    advertencias.append(ErrorFila(numero, "precio_venta", precio, MENSAJE_PRECIO_COSTO))
+                else:
+                    fallar(numero, "precio_venta", precio, MENSAJE_PRECIO_COSTO)
+
+        # Categoría y proveedor por nombre (vacío = sin asignar, como "Seleccionar...")
+        ids = {}
+        for campo in ("categoria", "proveedor"):
+            ids[campo] = []
+            for (numero, _), nombre in zip(bloque, textos[campo]):
+                id_ = self.ids[campo].get(nombre.lower()) if nombre else None
+                if nombre and id_ is None:
+                    fallar(numero, campo, nombre, f"No existe {'la categoría' if campo == 'categoria' else 'el proveedor'}")
+                ids[campo].append(id_)
+
+        self._validar_unicos(bloque, textos, errores, fallar)
+
+        filas = []
+        for i, (numero, _) in enumerate(bloque):
+            if numero in errores:
+                continue
+            filas.append((
+                textos["nombre"][i], textos["descripcion"][i],
+                float(numeros["precio_venta"][i]), float(numeros["costo"][i]),
+                textos["codigo_barras"][i], textos["sku"][i],
+                numeros["stock_minimo"][i], numeros["stock_maximo"][i], numeros["stock_actual"][i],
+                ids["categoria"][i], ids["proveedor"][i],
+            ))
+
+        for lista in errores.values():
+            self.errores.extend(lista)
+        self.advertencias.extend(a for a in advertencias if a.fila not in errores)
+        return filas
+
+    def _validar_unicos(self, bloque, textos, errores, fallar):
+        """SKU y código de barras: una consulta contra la base y conjuntos para el archivo"""
+        existentes = _existentes(
+            {campo: {v for v in textos[campo] if v} for campo in self.vistos}
+        )
+        for i, (numero, _) in enumerate(bloque):
+            for campo, vistos in self.vistos.items():
+                valor = textos[campo][i]
+                if not valor:
+                    continue
+                # Primero el archivo: el bloque anterior puede estar ya confirmado
+                # y entonces también aparecería en la base
+                if valor in vistos:
+                    fallar(numero, campo, valor, f"Repetido en el archivo (fila {vistos[valor]})")
+                elif valor in existentes[campo]:
+                    fallar(numero, campo, valor, mensaje_duplicado(campo))
+            # Solo las filas que se van a insertar reservan su SKU y código
+            if numero not in errores:
+                for campo, vistos in self.vistos.items():
+                    if textos[campo][i]:
+                        vistos[textos[campo][i]] = numero
+
+
+def _existentes(valores):
+    """
+    SKU y códigos de barras que ya están en Productos, en una sola consulta.
+
+    Args:
+        valores (dict): 'sku' / 'codigo_barras' -> conjunto de valores a buscar
+
+    Returns:
+        dict: Mismas claves -> conjunto de los valores que ya existen
+    """
+    partes, params = [], []
+    for campo, conjunto in valores.items():
+        if conjunto:
+            partes.append(
+                f"SELECT '{campo}', {campo} FROM Productos WHERE {campo} IN ({', '.join('?' * len(conjunto))})"
+            )
+            params.extend(conjunto)
+    existentes = {campo: set() for campo in valores}
+    if partes:
+        for campo, valor in obtener_datos(" UNION ALL ".join(partes), tuple(params)):
+            existentes[campo].add(valor)
+    return existentes
+
+
+# ---------- Lectores por formato ----------
+
+def _normalizar(encabezado):
+    return str(encabezado or "").strip().lower().replace(" ", "_")
+
+
+class _LectorCSV:
+    def __init__(self, origen):
+        self.tamano = os.path.getsize(origen)
+        # utf-8-sig: acepta el BOM que agrega Excel al guardar como CSV
+        self.archivo = open(origen, newline="", encoding="utf-8-sig")
+        muestra = self.archivo.read(4096)
+        self.archivo.seek(0)
+        try:
+            # Excel en español separa con ';'
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        self.csv = csv.reader(self.archivo, dialecto)
+        self.encabezados = [_normalizar(e) for e in next(self.csv, [])]
+
+    def filas(self):
+        for numero, valores in enumerate(self.csv, start=2):
+            if any(v.strip() for v in valores):
+                yield numero, dict(zip(self.encabezados, valores))
+
+    def avance(self):
+        # Posición del archivo binario: va un búfer adelantada, alcanza para la barra
+        return min(self.archivo.buffer.tell() / self.tamano, 1.0) if self.tamano else 1.0
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class _LectorXLSX:
+    def __init__(self, origen):
+        from openpyxl import load_workbook
+
+        self.libro = load_workbook(origen, read_only=True, data_only=True)
+        self.hoja = self.libro.worksheets[0]
+        self.total = self.hoja.max_row or 0
+        self.leidas = 0
+        self.iterador = self.hoja.iter_rows(values_only=True)
+        self.encabezados = [_normalizar(e) for e in next(self.iterador, ())]
+
+    def filas(self):
+        for numero, valores in enumerate(self.iterador, start=2):
+            self.leidas = numero
+            if any(_texto(v) is not None for v in valores):
+                yield numero, dict(zip(self.encabezados, valores))
+
+    def avance(self):
+        return min(self.leidas / self.total, 1.0) if self.total else 0.0
+
+    def cerrar(self):
+        self.libro.close()
+
+
+_LECTORES = {"csv": _LectorCSV, "xlsx": _LectorXLSX}
@@ -0,0 +1,294 @@
+"""
+Plantillas PDF reutilizables (boletas de venta y reporte del dashboard).
+
+Los estilos de párrafo, los TableStyle y las medidas se construyen una sola vez
+por proceso; cada documento solo sustituye los datos. Las plantillas no tocan
+widgets, así que pueden usarse desde la cola de trabajos en segundo plano.
+"""
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image as RLImage
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
+
+COLOR_BORDE = colors.HexColor("#5DADE2")
+COLOR_FONDO_GRIS = colors.HexColor("#E5E8E8")
+
+
+class PlantillaBoleta:
+    """Boleta de venta A4 horizontal con márgenes mínimos (5mm)"""
+
+    # Ancho útil aproximado: 297mm - 10mm (margenes) = 287mm
+    ANCHO_UTIL = 287*mm
+    # Cant(25) + Unidad(35) + Desc(135) + Val(30) + Desc(25) + Imp(37) = 287mm
+    ANCHOS_PRODUCTOS = [25*mm, 35*mm, 135*mm, 30*mm, 25*mm, 37*mm]
+    ENCABEZADOS = ["Cantidad", "Unidad Medida", "Descripción", "Valor Unitario(*)", "Descuento(*)", "Importe de Venta(**)"]
+
+    def __init__(self):
+        base = getSampleStyleSheet()['Normal']
+        self.estilos = {
+            'empresa': ParagraphStyle('Empresa', parent=base, fontSize=9, leading=11),
+            'empresa_titulo': ParagraphStyle('EmpresaTitle', parent=base, fontSize=14, fontName='Helvetica-Bold', leading=16),
+            'etiqueta': ParagraphStyle('Label', parent=base, fontSize=9, fontName='Helvetica-Bold', leading=11),
+            'dato': ParagraphStyle('Data', parent=base, fontSize=9, fontName='Helvetica', leading=11),
+            'ruc_titulo': ParagraphStyle('RucTitle', parent=base, alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold'),
+            'ruc_sub': ParagraphStyle('RucSub', parent=base, alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold'),
+            'ruc_num': ParagraphStyle('RucNum', parent=base, alignment=TA_CENTER, fontSize=14, fontName='Helvetica-Bold', spaceBefore=5),
+            'folio': ParagraphStyle('Folio', parent=base, alignment=TA_CENTER, fontSize=12, textColor=colors.navy),
+            'encabezado_tabla': ParagraphStyle('TableHeader', parent=base, fontSize=8, fontName='Helvetica-Bold', alignment=TA_CENTER),
+            'celda_centro': ParagraphStyle('CellC', parent=base, fontSize=8, fontName='Helvetica', alignment=TA_CENTER),
+            'celda_izq': ParagraphStyle('CellL', parent=base, fontSize=8, fontName='Helvetica', alignment=TA_LEFT),
+            'celda_der': ParagraphStyle('CellR', parent=base, fontSize=8, fontName='Helvetica', alignment=TA_RIGHT),
+            'total_etiqueta': ParagraphStyle('TotLab', parent=base, fontSize=9, fontName='Helvetica-Bold', alignment=TA_RIGHT),
+            'total_valor': ParagraphStyle('TotVal', parent=base, fontSize=10, fontName='Helvetica', alignment=TA_RIGHT, textColor=colors.gray),
+            'importe_etiqueta': ParagraphStyle('T', fontSize=10, fontName='Helvetica-Bold', alignment=TA_RIGHT),
+            'importe_valor': ParagraphStyle('T', fontSize=10, fontName='Helvetica-Bold', alignment=TA_RIGHT, textColor=colors.gray),
+        }
+
+        self.tabla_estilos = {
+            'empresa': TableStyle([('LEFTPADDING', (0,0), (-1,-1), 0)]),
+            'ruc': TableStyle([
+                ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
+                ('TOPPADDING', (0,0), (-1,-1), 8),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+            ]),
+            'encabezado': TableStyle([
+                ('VALIGN', (0,0), (-1,-1), 'TOP'),
+                ('LEFTPADDING', (0,0), (-1,-1), 0),
+                ('RIGHTPADDING', (0,0), (-1,-1), 0),
+            ]),
+            'info': TableStyle([
+                ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
+                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+                # Fondo gris para nombre cliente
+                ('BACKGROUND', (2, 1), (2, 1), COLOR_FONDO_GRIS),
+                ('LEFTPADDING', (0,0), (-1,-1), 4),
+                ('RIGHTPADDING', (0,0), (-1,-1), 4),
+                ('TOPPADDING', (0,0), (-1,-1), 2),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 2),
+            ]),
+            'productos': TableStyle([
+                ('LINEABOVE', (0,0), (-1,0), 0.5, colors.gray),
+                ('LINEBELOW', (0,0), (-1,0), 0.5, colors.gray),
+                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+                ('LEFTPADDING', (0,0), (-1,-1), 5),
+                ('RIGHTPADDING', (0,0), (-1,-1), 5),
+                ('TOPPADDING', (0,0), (-1,-1), 4),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+                ('BOX', (0,0), (-1,-1), 1, COLOR_BORDE),
+                ('GRID', (0,0), (-1,-1), 0.2, colors.lightgrey),
+            ]),
+            'totales': TableStyle([
+                ('ALIGN', (0,0), (-1,-1), 'RIGHT'),
+                ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+                ('BACKGROUND', (1,0), (1,2), COLOR_FONDO_GRIS),
+                ('BOX', (1,0), (1,0), 0.5, colors.gray),
+                ('BOX', (1,1), (1,1), 0.5, colors.gray),
+                ('BOX', (1,2), (1,2), 0.5, colors.gray),
+                ('LEFTPADDING', (0,0), (-1,-1), 5),
+                ('RIGHTPADDING', (0,0), (-1,-1), 5),
+                ('TOPPADDING', (0,0), (-1,-1), 3),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 3),
+            ]),
+            'pie': TableStyle([('ALIGN', (-1,0), (-1,0), 'RIGHT')]),
+        }
+
+        # Textos fijos del emisor
+        self.datos_empresa = [
+            ("MI EMPRESA S.A.C.", 'empresa_titulo'),
+            ("AV. PRINCIPAL 123 - LIMA - PERU", 'empresa'),
+            ("SUCURSAL: LIMA CENTRO", 'empresa'),
+            ("Telf: (01) 555-0000 | Email: ventas@empresa.com", 'empresa'),
+        ]
+
+    def generar(self, destino, id_transaccion, nombre_cliente, rfc_cliente, carrito, total, progreso=None):
+        """
+        Genera la boleta.
+
+        Args:
+            destino (str|file): Ruta del PDF o archivo abierto en modo binario
+            id_transaccion (int): Folio de la venta
+            nombre_cliente (str): Nombre mostrado en la boleta
+            rfc_cliente (str): RFC/RUC del cliente
+            carrito (list): Renglones con 'nombre', 'precio' y 'cantidad'
+            total (float): Importe total de la venta
+            progreso (callable): Recibe el avance (0.5 al armar, 1.0 al terminar)
+
+        Returns:
+            str|file: El mismo destino recibido
+        """
+        e = self.estilos
+        te = self.tabla_estilos
+
+        doc = SimpleDocTemplate(
+            destino,
+            pagesize=landscape(A4),
+            rightMargin=5*mm, leftMargin=5*mm,
+            topMargin=5*mm, bottomMargin=5*mm
+        )
+        elementos = []
+
+        # 1. ENCABEZADO
+        t_empresa = Table([[Paragraph(texto, e[estilo])] for texto, estilo in self.datos_empresa], colWidths=['100%'])
+        t_empresa.setStyle(te['empresa'])
+
+        ruc = rfc_cliente if rfc_cliente != 'XAXX010101000' else '20123456789'
+        t_ruc = Table([
+            [Paragraph("BOLETA DE VENTA", e['ruc_titulo'])],
+            [Paragraph("ELECTRONICA", e['ruc_sub'])],
+            [Paragraph(f"RUC: {ruc}", e['ruc_num'])],
+            [Paragraph(f"EB01-{id_transaccion}", e['folio'])]
+        ], colWidths=[80*mm])
+        t_ruc.setStyle(te['ruc'])
+
+        t_header = Table([[t_empresa, t_ruc]], colWidths=[200*mm, 87*mm])
+        t_header.setStyle(te['encabezado'])
+        elementos.append(t_header)
+        elementos.append(Spacer(1, 5*mm))
+
+        # 2. DATOS DEL CLIENTE
+        fecha_emision = datetime.now().strftime("%d/%m/%Y")
+        info_data = [
+            [Paragraph("Fecha de Emisión", e['etiqueta']), Paragraph(":", e['etiqueta']), Paragraph(fecha_emision, e['dato'])],
+            [Paragraph("Señor(es)", e['etiqueta']), Paragraph(":", e['etiqueta']), Paragraph(f"&nbsp; {nombre_cliente}", e['dato'])],
+            [Paragraph("DNI / RUC", e['etiqueta']), Paragraph(":", e['etiqueta']), Paragraph(rfc_cliente, e['dato'])],
+            [Paragraph("Tipo de Moneda", e['etiqueta']), Paragraph(":", e['etiqueta']), Paragraph("PESOS MEXICANOS", e['dato'])],
+            [Paragraph("Observación", e['etiqueta']), Paragraph(":", e['etiqueta']), Paragraph("VENTA DE MERCADERÍA", e['dato'])],
+        ]
+        # Anchos: Label(35mm), Sep(3mm), Valor(Resto=249mm)
+        t_info = Table(info_data, colWidths=[35*mm, 3*mm, 249*mm])
+        t_info.setStyle(te['info'])
+        elementos.append(t_info)
+        elementos.append(Spacer(1, 5*mm))
+
+        # 3. TABLA DE PRODUCTOS
+        data_productos = [[Paragraph(h, e['encabezado_tabla']) for h in self.ENCABEZADOS]]
+        for item in carrito:
+            precio_unit = item['precio']
+            cant = item['cantidad']
+            data_productos.append([
+                Paragraph(f"{cant:.2f}", e['celda_centro']),
+                Paragraph("UNIDAD", e['celda_centro']),
+                Paragraph(item['nombre'], e['celda_izq']),
+                Paragraph(f"{precio_unit:.2f}", e['celda_der']),
+                Paragraph("0.00", e['celda_der']),
+                Paragraph(f"{precio_unit * cant:.2f}", e['celda_der']),
+            ])
+        t_productos = Table(data_productos, colWidths=self.ANCHOS_PRODUCTOS)
+        t_productos.setStyle(te['productos'])
+        elementos.append(t_productos)
+        elementos.append(Spacer(1, 5*mm))
+
+        # 4. PIE DE PÁGINA
+        total_str = f"S/. {total:,.2f}"
+        t_totales = Table([
+            [Paragraph("Otros Cargos :", e['total_etiqueta']), Paragraph("0.00", e['total_valor'])],
+            [Paragraph("Otros Tributos :", e['total_etiqueta']), Paragraph("0.00", e['total_valor'])],
+            [Paragraph("<b>Importe Total :</b>", e['importe_etiqueta']), Paragraph(f"<b>{total_str}</b>", e['importe_valor'])]
+        ], colWidths=[35*mm, 35*mm])
+        t_totales.setStyle(te['totales'])
+
+        # Alineación a la derecha (Espacio vacío = 217mm, Totales = 70mm)
+        t_footer_container = Table([["", t_totales]], colWidths=[217*mm, 70*mm])
+        t_footer_container.setStyle(te['pie'])
+        elementos.append(t_footer_container)
+        if progreso:
+            progreso(0.5)
+
+        doc.build(elementos)
+        if progreso:
+            progreso(1.0)
+        return destino
+
+
+class PlantillaReporte:
+    """Reporte gerencial A4 del dashboard (KPIs, gráficos y tablas)"""
+
+    # Gráficos del dashboard que aparecen en el reporte (los demás no se rasterizan)
+    GRAFICOS = ("chart_prod", "chart_cli")
+
+    def __init__(self):
+        self.estilos = getSampleStyleSheet()
+        self.tabla_estilos = {
+            'productos': self._estilo_tabla("#5E81AC"),
+            'clientes': self._estilo_tabla("#A3BE8C"),
+        }
+
+    @staticmethod
+    def _estilo_tabla(color_encabezado):
+        return TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.HexColor(color_encabezado)),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('GRID', (0,0), (-1,-1), 1, colors.black)
+        ])
+
+    def generar(self, destino, kpi, productos, clientes, imagenes):
+        """
+        Genera el reporte.
+
+        Args:
+            destino (str|file): Ruta del PDF o archivo abierto en modo binario
+            kpi (dict): Claves 'desde', 'hasta', 'total' y 'count'
+            productos (list): Filas (nombre, cantidad vendida)
+            clientes (list): Filas (nombre, total comprado)
+            imagenes (dict): Clave del gráfico -> ruta o archivo de imagen
+                (por ejemplo un io.BytesIO con el PNG)
+
+        Returns:
+            str|file: El mismo destino recibido
+        """
+        styles = self.estilos
+        doc = SimpleDocTemplate(destino, pagesize=A4, rightMargin=20*mm, leftMargin=20*mm)
+        elements = []
+
+        # Encabezado
+        elements.append(Paragraph("<b>REPORTE GERENCIAL DE VENTAS</b>", styles["Title"]))
+        elements.append(Spacer(1, 5*mm))
+
+        txt_resumen = f"""
+        <b>Periodo:</b> {kpi.get('desde')} al {kpi.get('hasta')}<br/>
+        <b>Total Ingresos:</b> ${kpi.get('total', 0):,.2f}<br/>
+        <b>Total Operaciones:</b> {kpi.get('count', 0)}
+        """
+        elements.append(Paragraph(txt_resumen, styles["Normal"]))
+        elements.append(Spacer(1, 10*mm))
+
+        # --- SECCIÓN 1: PRODUCTOS ---
+        elements.append(Paragraph("<b>1. Desempeño de Productos</b>", styles["Heading2"]))
+        if 'chart_prod' in imagenes:
+            elements.append(RLImage(imagenes['chart_prod'], width=120*mm, height=80*mm))
+        data_prod = [["Producto", "Cantidad Vendida"]] + [[str(p[0]), str(p[1])] for p in productos]
+        t_prod = Table(data_prod, colWidths=[100*mm, 40*mm])
+        t_prod.setStyle(self.tabla_estilos['productos'])
+        elements.append(Spacer(1, 5*mm))
+        elements.append(t_prod)
+        elements.append(Spacer(1, 10*mm))
+
+        # --- SECCIÓN 2: CLIENTES ---
+        elements.append(Paragraph("<b>2. Clientes Estrella</b>", styles["Heading2"]))
+        if 'chart_cli' in imagenes:
+            elements.append(RLImage(imagenes['chart_cli'], width=120*mm, height=80*mm))
+        data_cli = [["Cliente", "Total Comprado ($)"]] + [[str(c[0]), f"${c[1]:,.2f}"] for c in clientes]
+        t_cli = Table(data_cli, colWidths=[100*mm, 40*mm])
+        t_cli.setStyle(self.tabla_estilos['clientes'])
+        elements.append(Spacer(1, 5*mm))
+        elements.append(t_cli)
+
+        doc.build(elements)
+        return destino
+
+
+@lru_cache(maxsize=None)
+def obtener_plantilla_boleta():
+    """Plantilla de boleta compartida por todo el proceso"""
+    return PlantillaBoleta()
+
+
+@lru_cache(maxsize=None)
+def obtener_plantilla_reporte():
+    """Plantilla de reporte compartida por todo el proceso"""
+    return PlantillaReporte()
@@ -0,0 +1,128 @@
+import itertools
+import queue
+import threading
+import time
+
+
+class ColaTrabajos:
+    """
+    Ejecuta trabajos pesados en un hilo de fondo y devuelve sus resultados al
+    hilo de Tkinter.
+
+    Tkinter no es seguro entre hilos: el trabajador nunca toca widgets. Los
+    avisos de progreso, finalización o error se encolan y el hilo principal los
+    despacha con `after()`, así que los callbacks pueden actualizar la interfaz
+    sin restricciones.
+
+    Atributos:
+        root (tk.Misc): Widget usado para programar `after()` (normalmente la raíz)
+        reintentos (int): Reintentos por defecto cuando un trabajo falla
+        intervalo_ms (int): Cada cuánto se revisan los eventos pendientes
+    """
+
+    _compartidas = {}
+
+    def __init__(self, root, nombre="trabajos", reintentos=1, espera_reintento=0.5, intervalo_ms=50):
+        self.root = root
+        self.nombre = nombre
+        self.reintentos = reintentos
+        self.espera_reintento = espera_reintento
+        self.intervalo_ms = intervalo_ms
+        self._trabajos = queue.Queue()
+        self._eventos = queue.Queue()
+        self._ids = itertools.count(1)
+        self._pendientes = 0
+        self._revisando = False
+        self._hilo = threading.Thread(target=self._trabajar, name=f"cola-{nombre}", daemon=True)
+        self._hilo.start()
+
+    @classmethod
+    def compartida(cls, nombre, root, **opciones):
+        """Devuelve una cola por nombre, creándola la primera vez (sobrevive al cambio de pantalla)"""
+        cola = cls._compartidas.get(nombre)
+        if cola is None or not cola._hilo.is_alive():
+            cola = cls(root.winfo_toplevel(), nombre=nombre, **opciones)
+            cls._compartidas[nombre] = cola
+        return cola
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None, al_progreso=None, reintentos=None):
+        """
+        Encola un trabajo.
+
+        Args:
+            funcion (callable): Trabajo a ejecutar en el hilo de fondo. Si se
+                indica `al_progreso`, recibe además `progreso=` (callable con un
+                float entre 0 y 1)
+            *args: Argumentos para la función
+            al_terminar (callable): Recibe el resultado (en el hilo de Tk)
+            al_fallar (callable): Recibe la excepción tras agotar reintentos
+            al_progreso (callable): Recibe el avance reportado
+            reintentos (int): Sobrescribe los reintentos por defecto
+
+        Returns:
+            int: Identificador del trabajo
+        """
+        id_trabajo = next(self._ids)
+        callbacks = {"terminar": al_terminar, "fallar": al_fallar, "progreso": al_progreso}
+        intentos = 1 + (self.reintentos if reintentos is None else reintentos)
+        self._pendientes += 1
+        self._trabajos.put((id_trabajo, funcion, args, callbacks, intentos))
+        self._programar_revision()
+        return id_trabajo
+
+    def pendientes(self):
+        """Cantidad de trabajos encolados o en ejecución"""
+        return self._pendientes
+
+    def detener(self):
+        """Termina el hilo trabajador al acabar los trabajos encolados"""
+        self._trabajos.put(None)
+
+    # ---------- Hilo de fondo ----------
+
+    def _trabajar(self):
+        while True:
+            trabajo = self._trabajos.get()
+            if trabajo is None:
+                break
+            id_trabajo, funcion, args, callbacks, intentos = trabajo
+
+            kwargs = {}
+            if callbacks["progreso"]:
+                kwargs["progreso"] = lambda avance, i=id_trabajo: self._eventos.put(("progreso", i, avance, callbacks))
+
+            for intento in range(1, intentos + 1):
+                try:
+                    resultado = funcion(*args, **kwargs)
+                    self._eventos.put(("terminar", id_trabajo, resultado, callbacks))
+                    break
+                except Exception as e:
+                    if intento == intentos:
+                        self._eventos.put(("fallar", id_trabajo, e, callbacks))
+                    else:
+                        time.sleep(self.espera_reintento)
+
+    # ---------- Hilo de Tk ----------
+
+    def _programar_revision(self):
+        if not self._revisando:
+            self._revisando = True
+            self.root.after(self.intervalo_ms, self._despachar_eventos)
+
+    def _despachar_eventos(self):
+        self._revisando = False
+        try:
+            while True:
+                try:
+                    tipo, id_trabajo, valor, callbacks = self._eventos.get_nowait()
+                except queue.Empty:
+                    break
+                if tipo != "progreso":
+                    self._pendientes -= 1
+                callback = callbacks[tipo]
+                if callback:
+                    callback(valor)
+        finally:
+            # Aunque un callback falle, los eventos restantes se siguen despachando
+            if self._pendientes > 0 or not self._eventos.empty():
+                self._programar_revision()
@@ -0,0 +1,69 @@
+"""
+Reglas de validación de productos, sin widgets.
+
+Las usan el formulario de DialogoProducto (un producto) y la importación
+masiva de utils/importacion.py (miles de filas), así que ambos aceptan y
+rechazan exactamente lo mismo y con los mismos mensajes.
+"""
+
+CAMPOS_REQUERIDOS = ('nombre', 'precio_venta', 'costo', 'stock_minimo', 'stock_maximo', 'stock_actual')
+
+# Campo -> acepta decimales
+CAMPOS_NUMERICOS = {
+    'precio_venta': True,
+    'costo': True,
+    'stock_minimo': False,
+    'stock_maximo': False,
+    'stock_actual': False,
+}
+
+MENSAJE_REQUERIDO = "Este campo es requerido"
+MENSAJE_STOCKS = "El stock máximo no puede ser menor al mínimo"
+MENSAJE_PRECIO_COSTO = "¡El precio es menor al costo!"
+
+
+def convertir_numero(valor, decimal=False):
+    """
+    Convierte un valor del formulario o del archivo a número.
+
+    Args:
+        valor (str|int|float): Valor a convertir (los textos se recortan)
+        decimal (bool): Precio o costo (float > 0); si no, entero >= 0
+
+    Returns:
+        float|int: El número convertido
+
+    Raises:
+        ValueError: Con el mensaje a mostrar junto al campo
+    """
+    if isinstance(valor, str):
+        valor = valor.strip()
+    if decimal:
+        num = float(valor)
+        if num <= 0:
+            raise ValueError("Debe ser mayor a 0")
+    else:
+        if isinstance(valor, float):
+            # Excel guarda los enteros como 12.0; 12.5 no debe truncarse en silencio
+            if not valor.is_integer():
+                raise ValueError("Debe ser un número entero")
+            valor = int(valor)
+        num = int(valor)
+        if num < 0:
+            raise ValueError("No puede ser negativo")
+    return num
+
+
+def stocks_coherentes(stock_minimo, stock_maximo):
+    """True si el mínimo no supera al máximo"""
+    return stock_minimo <= stock_maximo
+
+
+def precio_bajo_costo(precio, costo):
+    """True si se vendería a pérdida (el formulario pide confirmación)"""
+    return precio < costo
+
+
+def mensaje_duplicado(campo):
+    """Mensaje para un SKU o código de barras que ya existe en Productos"""
+    return f"Este {campo.replace('_', ' ')} ya existe"